@@ -8,7 +8,6 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 import os
 import logging
-import json
 import glob
 import time
 import sys
@@ -19,6 +18,12 @@ SCRIPT_DIR = os.path.join(BASE_DIR, 'backend')
 LOGS_DIR = os.path.join(SCRIPT_DIR, 'Logs')
 ORIGINAL_BASE_DIR = os.path.join(BASE_DIR, 'backend', 'Original')
 
+# Path resolution lives in utils.calsen_paths so calculations can resolve paths in-process
+if SCRIPT_DIR not in sys.path:
+    sys.path.append(SCRIPT_DIR)
+from utils.calsen_paths import get_path_index, list_parameters as list_indexed_parameters
+from utils.sensitivity_manifest import list_artifacts, PARAM_CONFIG
+
 # Ensure logs directory exists
 os.makedirs(LOGS_DIR, exist_ok=True)
 
@@ -66,6 +71,12 @@ def find_configuration_files(version, param_id=None, mode=None, variation=None):
     if not param_id and not mode and variation is None:
         return [sensitivity_dir]
 
+    # Configuration files recorded in the sweep manifest
+    recorded = list_artifacts(sensitivity_dir, version, param_id, mode, variation, PARAM_CONFIG)
+    found_files = [record["path"] for record in recorded if os.path.exists(record["path"])]
+    if found_files:
+        return found_files
+
     # Build search pattern based on provided filters
     search_pattern = sensitivity_dir
 
@@ -93,214 +104,6 @@ def find_configuration_files(version, param_id=None, mode=None, variation=None):
 
     return found_files
 
-def build_paths_for_version(version):
-    """
-    Build all required paths for a given version using the sensitivity config.
-
-    Args:
-        version (int): Version number
-
-    Returns:
-        dict: Dictionary of path sets for each enabled parameter
-    """
-    logger.info(f"Building paths for version {version}")
-
-    # Standard paths
-    code_files_path = ORIGINAL_BASE_DIR
-
-    # Path to sensitivity config file
-    sensitivity_config_path = os.path.join(
-        code_files_path,
-        f"Batch({version})",
-        f"Results({version})",
-        "Sensitivity",
-        "Reports",
-        "sensitivity_config.json"
-    )
-
-    # Load sensitivity config if available
-    if os.path.exists(sensitivity_config_path):
-        logger.info(f"Found sensitivity configuration at {sensitivity_config_path}")
-        try:
-            with open(sensitivity_config_path, 'r') as f:
-                sensitivity_config = json.load(f)
-                # Extract parameters from the nested structure if needed
-                if 'parameters' in sensitivity_config:
-                    sensitivity_config = sensitivity_config['parameters']
-        except Exception as e:
-            logger.error(f"Error loading sensitivity configuration: {str(e)}")
-            return None
-    else:
-        # Try to find any sensitivity directories if config not found
-        logger.warning(f"No sensitivity configuration found at {sensitivity_config_path}")
-        sensitivity_dir = os.path.join(
-            code_files_path,
-            f"Batch({version})",
-            f"Results({version})",
-            "Sensitivity"
-        )
-
-        if not os.path.exists(sensitivity_dir):
-            logger.warning(f"No sensitivity directory found at {sensitivity_dir}")
-            return None
-
-        # Look for parameter directories
-        param_dirs = glob.glob(os.path.join(sensitivity_dir, "S*"))
-        if not param_dirs:
-            logger.warning(f"No parameter directories found in {sensitivity_dir}")
-            return None
-
-        # Build a simple config based on directory structure
-        sensitivity_config = {}
-        for param_dir in param_dirs:
-            param_id = os.path.basename(param_dir)
-            mode_dirs = glob.glob(os.path.join(param_dir, "*"))
-
-            if mode_dirs:
-                mode = os.path.basename(mode_dirs[0])
-                sensitivity_config[param_id] = {
-                    "enabled": True,
-                    "mode": mode,
-                    "number": param_id[1:] if param_id.startswith('S') and param_id[1:].isdigit() else None
-                }
-
-    # Build path sets for all enabled S parameters
-    path_sets = {}
-
-    for param_id, config in sensitivity_config.items():
-        if not config.get('enabled', False):
-            continue
-
-        # Convert S10 to S10, ensure proper formatting
-        if param_id.startswith('S') and param_id[1:].isdigit():
-            s_param = param_id
-            s_num = param_id[1:]
-        else:
-            continue
-
-        # Get mode and determine variation format
-        mode = config.get('mode', 'percentage').lower()
-        values = config.get('values', [])
-
-        if not values:
-            continue
-
-        # Determine variations based on mode
-        try:
-            # For all modes, use the values provided directly without special handling
-            variations = [float(v) for v in values if v is not None]
-        except (TypeError, ValueError):
-            logger.warning(f"Invalid values for {mode} mode in {param_id}: {values}")
-            continue
-
-        if not variations:
-            continue
-
-        # Process each variation
-        param_paths = {}
-
-        for variation in variations:
-            # Format variation string
-            var_str = f"{variation:+.2f}"
-
-            # Build paths for this variation
-            # Economic variation directory (lowercase mode)
-            Econ_var_dir = os.path.join(
-                code_files_path,
-                f"Batch({version})",
-                f"Results({version})",
-                "Sensitivity",
-                s_param,
-                mode.lower(),  # Ensure lowercase for consistency
-                "Configuration",
-                f"{s_param}_{var_str}"
-            )
-            # Parameter variation directory (lowercase mode)
-            param_var_dir = os.path.join(
-                code_files_path,
-                f"Batch({version})",
-                f"Results({version})",
-                "Sensitivity",
-                s_param,
-                mode.lower(),  # Ensure lowercase for consistency
-                var_str
-            )
-
-            # Mode directory with capitalized name
-            # With this:
-            mode_dir_mapping = {
-                'percentage': 'Percentage',
-                'directvalue': 'DirectValue',
-                'absolutedeparture': 'AbsoluteDeparture',
-                'montecarlo': 'MonteCarlo'
-            }
-            mode_dir_name = mode_dir_mapping.get(mode.lower(), 'Percentage')  # Default to Percentage
-
-            # Configuration directory (capitalized mode)
-            config_var_dir = os.path.join(
-                code_files_path,
-                f"Batch({version})",
-                f"Results({version})",
-                "Sensitivity",
-                mode_dir_name,
-                "Configuration",
-                f"{s_param}_{var_str}"
-            )
-
-            # Configuration matrix file
-            config_matrix_file = os.path.join(
-                param_var_dir,
-                f"General_Configuration_Matrix({version}).csv"
-            )
-
-            # Look for alternate locations if not found
-            if not os.path.exists(config_matrix_file):
-                alt_config_matrix_file = os.path.join(
-                    code_files_path,
-                    f"Batch({version})",
-                    f"Results({version})",
-                    f"General_Configuration_Matrix({version}).csv"
-                )
-                if os.path.exists(alt_config_matrix_file):
-                    config_matrix_file = alt_config_matrix_file
-
-            # Configuration file
-            config_file = os.path.join(
-                code_files_path,
-                f"Batch({version})",
-                f"ConfigurationPlotSpec({version})",
-                f"configurations({version}).py"
-            )
-
-            # Only include if paths exist or can be created
-            os.makedirs(param_var_dir, exist_ok=True)
-            os.makedirs(config_var_dir, exist_ok=True)
-
-            # Add paths for this variation
-            var_key = var_str
-            param_paths[var_key] = {
-                "param_var_dir": param_var_dir,
-                "config_var_dir": config_var_dir,
-                "config_matrix_file": config_matrix_file,
-                "config_file": config_file,
-                "Econ_var_dir": Econ_var_dir,
-                "mode": mode,
-                "variation": variation,
-                "variation_str": var_str
-            }
-
-        # Add this parameter's paths to the main collection
-        if param_paths:
-            path_sets[s_param] = {
-                "mode": mode,
-                "variations": param_paths,
-                "compareToKey": config.get('compareToKey', 'S13'),
-                "comparisonType": config.get('comparisonType', 'primary')
-            }
-
-    logger.info(f"Built path sets for {len(path_sets)} parameters")
-    return path_sets
-
 # =====================================
 # API Endpoints
 # =====================================
@@ -356,8 +159,8 @@ def get_config_paths():
 
         logger.info(f"Processing get_config_paths request for version {version}")
 
-        # Build path sets for this version
-        path_sets = build_paths_for_version(version)
+        # Path sets for this version from the memoized index
+        path_sets = get_path_index(version, ORIGINAL_BASE_DIR)
 
         if not path_sets:
             logger.warning(f"No enabled configurations found for version {version}")
@@ -468,23 +271,13 @@ def list_parameters():
 
         logger.info(f"Listing parameters for version {version}")
 
-        # Get path sets which contain parameter information
-        path_sets = build_paths_for_version(version)
+        # Parameter information from the memoized path index
+        parameters = list_indexed_parameters(version, ORIGINAL_BASE_DIR)
 
-        if not path_sets:
+        if not parameters:
             logger.warning(f"No enabled parameters found for version {version}")
             return jsonify({"error": f"No enabled parameters found for version {version}"}), 404
 
-        # Extract parameter information
-        parameters = {}
-        for param_id, path_set in path_sets.items():
-            parameters[param_id] = {
-                "mode": path_set.get("mode"),
-                "variations": list(path_set.get("variations", {}).keys()),
-                "compareToKey": path_set.get("compareToKey"),
-                "comparisonType": path_set.get("comparisonType")
-            }
-
         # Prepare response
         response = {
             "status": "success",
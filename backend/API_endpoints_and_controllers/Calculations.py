@@ -8,6 +8,7 @@ import time
 import sys
 import threading
 from queue import Queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tabulate import tabulate
 from datetime import datetime
 #
@@ -32,6 +33,9 @@ DEFAULT_TOLERANCE_UPPER = 1000
 DEFAULT_INCREASE_RATE = 1.02
 DEFAULT_DECREASE_RATE = 0.985
 
+# Versions of a /run request processed at the same time (the request may set maxWorkers)
+RUN_MAX_WORKERS = int(os.environ.get('CALCULATIONS_MAX_WORKERS', os.cpu_count() or 1))
+
 # =====================================
 # Script Configurations
 # =====================================
@@ -203,6 +207,67 @@ def process_version(version, calculation_script, selected_v, selected_f, selecte
         error_msg = f"Error processing version {version}: {str(e)}"
         logger.exception(error_msg)
         return error_msg
+
+def get_version_optimization_params(version, optimization_params, defaults):
+    """
+    Get the price optimization parameters of one version.
+
+    Args:
+        version (str or int): Version number
+        optimization_params (dict): Request optimizationParams, with 'global' and per-version entries
+        defaults (dict): toleranceLower, toleranceUpper, increaseRate and decreaseRate of the request
+
+    Returns:
+        dict: Parameters of the version, the request's unless it has its own
+    """
+    version_params = optimization_params.get(str(version))
+    if not version_params:
+        return dict(defaults)
+
+    params = {key: version_params.get(key, value) for key, value in defaults.items()}
+    logger.info(f"Using version-specific optimization parameters for version {version}:")
+    logger.info(f"  - Tolerance bounds: Lower={params['toleranceLower']}, Upper={params['toleranceUpper']}")
+    logger.info(f"  - Adjustment rates: Increase={params['increaseRate']}, Decrease={params['decreaseRate']}")
+    return params
+
+def run_version(version, calculation_script, params, *args):
+    """
+    Process one version and report the outcome.
+
+    Args:
+        version (str or int): Version number
+        calculation_script (str): Calculation script path
+        params (dict): Optimization parameters of the version
+        *args: selected_v, selected_f, selected_r, selected_rf, target_row, calculation_option
+               and sen_parameters, as passed to process_version
+
+    Returns:
+        dict: Report with the version, status, error message, duration and optimization parameters
+    """
+    selected_v, selected_f, selected_r, selected_rf, target_row, calculation_option, sen_parameters = args
+    started = time.time()
+    error = process_version(
+        version,
+        calculation_script,
+        selected_v,
+        selected_f,
+        selected_r,
+        selected_rf,
+        target_row,
+        calculation_option,
+        params['toleranceLower'],
+        params['toleranceUpper'],
+        params['increaseRate'],
+        params['decreaseRate'],
+        sen_parameters
+    )
+    return {
+        "version": version,
+        "status": "error" if error else "success",
+        "error": error,
+        "duration": round(time.time() - started, 3),
+        "optimizationParams": params
+    }
 # =====================================
 # Price Optimization Streaming
 # =====================================
@@ -608,60 +673,73 @@ def run_scripts():
         # Change to script directory for relative path operations
         os.chdir(SCRIPT_DIR)
 
-        # Process each version
+        from Configuration_management.build_versions import order_by_base_version
+
+        # Process the versions concurrently; versions stored as a delta wait for their base version
         calculation_script = CALCULATION_SCRIPTS[selected_calculation_option]
-        for version in selected_versions:
-            logger.info(f"Processing version {version}")
-
-            # Check for version-specific optimization parameters
-            version_tolerance_lower = tolerance_lower
-            version_tolerance_upper = tolerance_upper
-            version_increase_rate = increase_rate
-            version_decrease_rate = decrease_rate
-
-            # Override with version-specific parameters if provided
-            if str(version) in optimization_params:
-                version_params = optimization_params[str(version)]
-                version_tolerance_lower = version_params.get('toleranceLower', tolerance_lower)
-                version_tolerance_upper = version_params.get('toleranceUpper', tolerance_upper)
-                version_increase_rate = version_params.get('increaseRate', increase_rate)
-                version_decrease_rate = version_params.get('decreaseRate', decrease_rate)
-
-                logger.info(f"Using version-specific optimization parameters for version {version}:")
-                logger.info(f"  - Tolerance bounds: Lower={version_tolerance_lower}, Upper={version_tolerance_upper}")
-                logger.info(f"  - Adjustment rates: Increase={version_increase_rate}, Decrease={version_decrease_rate}")
-
-            error = process_version(
-                version,
-                calculation_script,
-                selected_v,
-                selected_f,
-                selected_r,  # Add R parameters
-                selected_rf,  # Add RF parameters
-                target_row,
-                selected_calculation_option,
-                version_tolerance_lower,
-                version_tolerance_upper,
-                version_increase_rate,
-                version_decrease_rate,
-                sen_parameters
-            )
-            if error:
-                logger.error(f"Error processing version {version}: {error}")
-                return jsonify({"error": error}), 500
-
-        logger.info("Waiting 1 second before executing R scripts...")
-        time.sleep(1)
+        versions = list(dict.fromkeys(selected_versions))
+        max_workers = max(1, min(int(data.get('maxWorkers') or RUN_MAX_WORKERS), len(versions)))
+        defaults = {
+            'toleranceLower': tolerance_lower,
+            'toleranceUpper': tolerance_upper,
+            'increaseRate': increase_rate,
+            'decreaseRate': decrease_rate
+        }
+        started = time.time()
+        reports = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='run-version') as executor:
+            for wave in order_by_base_version(versions):
+                futures = {}
+                for version in wave:
+                    logger.info(f"Processing version {version}")
+                    futures[executor.submit(
+                        run_version,
+                        version,
+                        calculation_script,
+                        get_version_optimization_params(version, optimization_params, defaults),
+                        selected_v,
+                        selected_f,
+                        selected_r,
+                        selected_rf,
+                        target_row,
+                        selected_calculation_option,
+                        sen_parameters
+                    )] = version
+                for future in as_completed(futures):
+                    version = futures[future]
+                    try:
+                        reports[str(version)] = future.result()
+                    except Exception as e:
+                        reports[str(version)] = {"version": version, "status": "error", "error": str(e)}
+                    if reports[str(version)]["error"]:
+                        logger.error(f"Error processing version {version}: {reports[str(version)]['error']}")
+
+        failed = [str(v) for v in versions if reports[str(v)]["status"] != "success"]
+        status = "success" if not failed else ("error" if len(failed) == len(reports) else "partial")
 
         # Prepare response
         response_data = {
-            "status": "success",
-            "message": "Calculation completed successfully",
+            "status": status,
+            "message": "Calculation completed successfully" if not failed else
+                       f"Calculation failed for {len(failed)} of {len(reports)} versions",
             "timestamp": datetime.now().isoformat(),
-            "yearColumns": year_columns_config
+            "yearColumns": year_columns_config,
+            "workers": max_workers,
+            "duration": round(time.time() - started, 3),
+            "succeeded": [str(v) for v in versions if reports[str(v)]["status"] == "success"],
+            "failed": failed,
+            "versions": {str(v): reports[str(v)] for v in versions}
         }
 
-        logger.info("Calculation completed successfully")
+        if status == "error":
+            response_data["error"] = reports[failed[0]]["error"]
+            return jsonify(response_data), 500
+
+        logger.info(f"Calculation finished: {status} ({len(response_data['succeeded'])} succeeded, {len(failed)} failed)")
+        # Some versions failed: report them whatever the calculation option
+        if status == "partial":
+            return jsonify(response_data), 207
         return jsonify(response_data) if selected_calculation_option == 'calculateForPrice' else ('', 204)
 
     except Exception as e:
@@ -669,6 +747,34 @@ def run_scripts():
         logger.exception(error_msg)
         return jsonify({"error": error_msg}), 500
 
+@app.route('/build-configs', methods=['POST'])
+def build_configs():
+    """
+    Build the configuration of several versions concurrently.
+
+    Runs formatter, module1, config_modules and Table for every requested
+    version on a process pool and returns a per-version status report.
+    """
+    try:
+        data = request.get_json() or {}
+        versions = data.get('versions', [])
+        if not versions:
+            return jsonify({"error": "No versions provided"}), 400
+
+        from Configuration_management.build_versions import build_versions
+
+        logger.info(f"Building configurations for versions {versions}")
+        report = build_versions(versions, max_workers=data.get('maxWorkers'))
+        logger.info(f"Configuration build finished: {report['status']} "
+                    f"({len(report['succeeded'])} succeeded, {len(report['failed'])} failed)")
+
+        return jsonify(report), (500 if report['status'] == 'error' else 200)
+
+    except Exception as e:
+        error_msg = f"Error building configurations: {str(e)}"
+        logger.exception(error_msg)
+        return jsonify({"error": error_msg}), 500
+
 # =====================================
 # Application Entry Point
 # =====================================
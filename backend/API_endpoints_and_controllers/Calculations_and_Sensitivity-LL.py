@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify, send_file, Response
+from flask import Flask, request, jsonify, send_file, Response, has_request_context
 from flask_cors import CORS
 import subprocess
 import os
@@ -13,6 +13,7 @@ import threading
 import filelock
 import tempfile
 import functools
+import itertools
 import shutil
 import copy
 import logging
@@ -22,6 +23,7 @@ import argparse
 import csv
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional, Union, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import importlib.util
 import matplotlib.pyplot as plt
 import matplotlib
@@ -37,37 +39,111 @@ SCRIPT_DIR = os.path.join(BASE_DIR, 'backend')
 LOGS_DIR = os.path.join(SCRIPT_DIR, 'Logs')
 ORIGINAL_BASE_DIR = os.path.join(BASE_DIR, 'backend', 'Original')
 
+# Make backend packages importable
+if SCRIPT_DIR not in sys.path:
+    sys.path.append(SCRIPT_DIR)
+from Configuration_management.config_bundle import (
+    get_bundle_path, write_config_bundle, load_config_modules, write_config_module_files
+)
+from Core_calculation_engines.sensitivity_engine import SensitivityEngine
+from Core_calculation_engines.monte_carlo import iter_monte_carlo, get_monte_carlo_folder, write_summary
+from Core_calculation_engines.sobol_sensitivity import run_sobol_analysis, get_sobol_report_path
+from Core_calculation_engines.scenario_paths import run_scenarios, get_scenario_report_path
+from Core_calculation_engines.design_optimizer import (
+    run_optimization, store_optimization_report, get_optimization_report_path
+)
+from Core_calculation_engines.tornado import build_tornado
+from Core_calculation_engines.grid_sweep import iter_grid, assemble_grid, get_grid_report_path
+from Core_calculation_engines.goal_seek import solve_break_even, write_goal_seek_table, get_goal_seek_table_path
+from Core_calculation_engines.distributed_sweep import (
+    SweepCoordinator, DistributedEvaluator, engine_spec, launch_local_workers
+)
+from utils.stage_completion import wait_for_stage, mark_stage_complete, clear_stage
+from utils.calsen_paths import resolve_variation_paths, list_parameters
+from utils.sensitivity_manifest import (
+    record_artifact, record_variation_directory, find_artifact, PARAM_CONFIG, ECONOMIC_SUMMARY
+)
+from utils.sensitivity_results_store import (
+    record_results, record_result_data, import_results_file, load_results, export_results_view
+)
+from utils.job_queue import (
+    JobScheduler, JobError, JobCancelled, SUCCEEDED, CANCELLED, TIMED_OUT, current_job, bind_job, run_process
+)
+from utils.run_workspace import (
+    WorkspaceRegistry, PAYLOAD_REGISTERED, BASELINE_COMPLETED, CONFIG_COMPLETED, RUNS_COMPLETED
+)
+from utils.sweep_checkpoint import sweep_id
+from utils.baseline_cache import (
+    get_results_folder, get_baseline_inputs, baseline_fingerprint, find_cached_baseline,
+    list_baseline_outputs, invalidate_baseline, record_baseline
+)
+from utils.stage_pipeline import StagePipeline
+
+# Layout of config modules written into sensitivity variation directories:
+# 'bundle' writes one indexed {version}_config_modules.bundle per variation,
+# 'files' writes one {version}_config_module_{start}.json per interval
+CONFIG_MODULE_LAYOUT = os.environ.get('CONFIG_MODULE_LAYOUT', 'bundle').lower()
+
+# Maximum number of sensitivity variations calculated concurrently
+SENSITIVITY_MAX_WORKERS = int(os.environ.get('SENSITIVITY_MAX_WORKERS', os.cpu_count() or 4))
+
+# Engine used by /calculate-sensitivity:
+# 'subprocess' runs CFA-b.py once per variation directory,
+# 'inmemory' evaluates all variations on the loaded baseline and persists only results
+SENSITIVITY_ENGINE = os.environ.get('SENSITIVITY_ENGINE', 'subprocess').lower()
+
+# Default of the "pipeline" option of /calculate-sensitivity: extract and plot
+# each parameter's results while later parameters are still calculating
+SENSITIVITY_PIPELINE = os.environ.get('SENSITIVITY_PIPELINE', 'off').lower() in ('1', 'true', 'on')
+
+# Address ("host:port") the sweep coordinator listens on for worker hosts;
+# distributed sweeps are unavailable when unset. Worker hosts authenticate
+# with the token in SWEEP_TOKEN (see distributed_sweep.py)
+SWEEP_COORDINATOR_ADDRESS = os.environ.get('SWEEP_COORDINATOR_ADDRESS', '')
+
+# Worker processes started on this machine with the coordinator (single-box runs)
+SWEEP_LOCAL_WORKERS = int(os.environ.get('SWEEP_LOCAL_WORKERS', 0))
+
+# Sensitivity variations per distributed work unit
+DISTRIBUTED_BATCH_SIZE = int(os.environ.get('DISTRIBUTED_BATCH_SIZE', 50))
+
+# Variations the in-memory engine evaluates between cancellation checks
+IN_MEMORY_CHUNK_SIZE = int(os.environ.get('IN_MEMORY_CHUNK_SIZE', 500))
+
+# Maximum seconds a stage waits for the completion signal of the stage it depends on
+STAGE_WAIT_TIMEOUT = float(os.environ.get('STAGE_WAIT_TIMEOUT', 60))
+
+# CPU slots of the job scheduler; jobs on different versions run concurrently within them
+JOB_SCHEDULER_CAPACITY = int(os.environ.get('JOB_SCHEDULER_CAPACITY', os.cpu_count() or 4))
+
 # Create logs directory
 os.makedirs(LOGS_DIR, exist_ok=True)
 
 # Status file paths
 SENSITIVITY_CONFIG_STATUS_PATH = os.path.join(LOGS_DIR, "sensitivity_config_status.json")
 SENSITIVITY_CONFIG_DATA_PATH = os.path.join(LOGS_DIR, "sensitivity_config_data.pkl")
-CONFIG_LOCK_FILE = os.path.join(LOGS_DIR, "sensitivity_config.lock")
-RUN_LOCK_FILE = os.path.join(LOGS_DIR, "runs.lock")
-VISUALIZATION_LOCK_FILE = os.path.join(LOGS_DIR, "visualization.lock")
-PAYLOAD_LOCK_FILE = os.path.join(LOGS_DIR, "payload.lock")
-BASELINE_LOCK_FILE = os.path.join(LOGS_DIR, "baseline.lock")
-
-# Global locks for synchronization
-GLOBAL_CONFIG_LOCK = threading.Lock()
-GLOBAL_RUN_LOCK = threading.Lock()
-GLOBAL_PRICE_LOCK = threading.Lock()
-GLOBAL_VISUALIZE_LOCK = threading.Lock()
-GLOBAL_PAYLOAD_LOCK = threading.Lock()
-GLOBAL_BASELINE_LOCK = threading.Lock()
-
-# Event flags for pipeline execution control
-PAYLOAD_REGISTERED = threading.Event()
-BASELINE_COMPLETED = threading.Event()
-CONFIG_COMPLETED = threading.Event()
-RUNS_COMPLETED = threading.Event()
+JOB_QUEUE_PATH = os.path.join(LOGS_DIR, "jobs.db")
+
+# Per-run workspaces (state, configuration snapshot, artifacts) and their time to live in seconds
+RUN_WORKSPACES_DIR = os.path.join(LOGS_DIR, "runs")
+RUN_WORKSPACE_TTL = float(os.environ.get('RUN_WORKSPACE_TTL', 7 * 24 * 3600))
+
+# Pipeline runs: each run keeps its own step events, state and configuration snapshot
+RUN_WORKSPACES = WorkspaceRegistry(RUN_WORKSPACES_DIR)
 
 # Timeout for waiting (in seconds)
 WAIT_TIMEOUT = 600  # 10 minutes
 
-# Pipeline active flag (holds all routes except the active one)
-PIPELINE_ACTIVE = threading.Event()
+# Persistent queue of long-running operations (runs, sensitivity calculations, Sobol analysis),
+# opened at JOB_QUEUE_PATH on first use (see get_job_scheduler)
+JOB_SCHEDULER = None
+JOB_SCHEDULER_LOCK = threading.Lock()
+# Handlers of the job kinds, registered with the scheduler when it is opened
+JOB_HANDLERS = {}
+
+# Coordinator handing sweep units to worker hosts (see get_sweep_coordinator)
+SWEEP_COORDINATOR = None
+SWEEP_COORDINATOR_LOCK = threading.Lock()
 
 # Configure logger
 logging.basicConfig(
@@ -116,6 +192,16 @@ CALCULATION_SCRIPTS = {
     'freeFlowNPV': get_calculation_script
 }
 
+# Standardized sensitivity directory names of the analysis modes
+MODE_DIR_MAPPING = {
+    'percentage': 'Percentage',
+    'directvalue': 'DirectValue',
+    'absolutedeparture': 'AbsoluteDeparture',
+    'montecarlo': 'MonteCarlo',
+    'symmetrical': 'Symmetrical',
+    'multipoint': 'Multipoint'
+}
+
 # =====================================
 # Integrated Sensitivity File Manager
 # =====================================
@@ -141,18 +227,8 @@ class SensitivityFileManager:
         Returns:
             dict: Dictionary of paths for different file types
         """
-        # Map modes to standardized directory names
-        mode_dir_mapping = {
-            'percentage': 'Percentage',
-            'directvalue': 'DirectValue',
-            'absolutedeparture': 'AbsoluteDeparture',
-            'montecarlo': 'MonteCarlo',
-            'symmetrical': 'Symmetrical',
-            'multipoint': 'Multipoint'
-        }
-
         # Get standardized directory name with capitalized first letter
-        mode_dir = mode_dir_mapping.get(mode.lower(), mode.capitalize())
+        mode_dir = MODE_DIR_MAPPING.get(mode.lower(), mode.capitalize())
 
         # Base paths
         results_folder = os.path.join(
@@ -218,25 +294,24 @@ class SensitivityFileManager:
                 version, param_id, mode, compare_to_key
             )
 
-            # Set atomic file lock for thread safety
-            lock_file = f"{paths['results_file']}.lock"
-            lock = filelock.FileLock(lock_file, timeout=60)
-
-            with lock:
-                # Ensure all directories exist
-                os.makedirs(os.path.dirname(paths['results_file']), exist_ok=True)
+            # Record the variations in the results store, keeping results written before it existed
+            import_results_file(
+                paths['sensitivity_dir'], version, param_id, compare_to_key, mode, paths['results_file']
+            )
+            record_result_data(paths['sensitivity_dir'], version, result_data, param_id, compare_to_key, mode)
 
-                # Write results data to file
-                with open(paths['results_file'], 'w') as f:
-                    json.dump(result_data, f, indent=2)
+            # Refresh the JSON results file as a view of the store
+            export_results_view(
+                paths['sensitivity_dir'], version, param_id, compare_to_key, mode, paths['results_file']
+            )
 
-                self.logger.info(f"Stored calculation results for {param_id} at {paths['results_file']}")
+            self.logger.info(f"Stored calculation results for {param_id} at {paths['results_file']}")
 
-                return {
-                    "status": "success",
-                    "path": paths['results_file'],
-                    "message": f"Successfully stored results for {param_id}"
-                }
+            return {
+                "status": "success",
+                "path": paths['results_file'],
+                "message": f"Successfully stored results for {param_id}"
+            }
 
         except Exception as e:
             error_msg = f"Error storing calculation results for {param_id}: {str(e)}"
@@ -265,6 +340,15 @@ class SensitivityFileManager:
                 version, param_id, mode, compare_to_key
             )
 
+            # The results store is authoritative; the results file is only a view of it
+            result_data = load_results(paths['sensitivity_dir'], version, param_id, compare_to_key, mode)
+            if result_data is not None:
+                return {
+                    "status": "success",
+                    "data": result_data,
+                    "path": paths['results_file']
+                }
+
             # Check if results file exists
             if not os.path.exists(paths['results_file']):
                 return {
@@ -448,9 +532,32 @@ def apply_sensitivity_variation(config, param_id, variation, mode):
 # =====================================
 # Integrated Config Module Copying
 # =====================================
+def wait_for_config_modules(version, source_dir):
+    """
+    Wait until the config_modules stage of a version has produced its outputs.
+
+    The stage signals completion with a marker next to its outputs. When the
+    baseline has already run the configuration scripts in this process there
+    is nothing left to wait for, so only the current state is checked.
+
+    Args:
+        version (int): Version number
+        source_dir (str): Results folder holding the version's config modules
+
+    Returns:
+        bool: True if the config modules are complete
+    """
+    outputs = [
+        get_bundle_path(source_dir, version),
+        os.path.join(source_dir, f"General_Configuration_Matrix({version}).csv")
+    ]
+    workspace = get_run_workspace()
+    timeout = 0 if workspace is not None and workspace.is_set(BASELINE_COMPLETED) else STAGE_WAIT_TIMEOUT
+    return wait_for_stage(source_dir, 'config_modules', timeout=timeout, outputs=outputs)
+
 def process_config_modules(version, sen_parameters):
     """
-    Process all configuration modules (1-100) for all parameter variations.
+    Process all configuration modules of a version for all parameter variations.
     Apply sensitivity variations and save modified configurations.
 
     Args:
@@ -483,10 +590,10 @@ def process_config_modules(version, sen_parameters):
         os.makedirs(config_plot_spec_dir, exist_ok=True)
         sensitivity_logger.info(f"Created/ensured ConfigurationPlotSpec directory: {config_plot_spec_dir}")
 
-        # Short pause to ensure files exist
-        sensitivity_logger.info("Starting brief pause to ensure files exist...")
-        time.sleep(3)
-        sensitivity_logger.info("Resuming after pause, checking for files...")
+        # Start as soon as the config_modules stage has signalled completion
+        clear_stage(sensitivity_dir, 'config_copy')
+        if not wait_for_config_modules(version, source_dir):
+            sensitivity_logger.warning(f"Config modules of version {version} not marked complete, checking for files anyway")
 
         # Define the specific CSV files we want to copy
         target_csv_files = [
@@ -512,6 +619,10 @@ def process_config_modules(version, sen_parameters):
         if not py_file_exists:
             sensitivity_logger.warning(f"Python configuration file not found: {config_file}")
 
+        # Load the version's config modules once (bundle or module files)
+        source_modules = load_config_modules(source_dir, version)
+        sensitivity_logger.info(f"Loaded {len(source_modules)} source config modules from {source_dir}")
+
         # Process each parameter's variation directory
         for param_id, param_config in sen_parameters.items():
             if not param_config.get('enabled'):
@@ -591,22 +702,12 @@ def process_config_modules(version, sen_parameters):
                 if param_key not in processing_summary['processed_modules']:
                     processing_summary['processed_modules'][param_key] = []
 
-                # Process all possible module files (1-100)
-                for module_num in range(1, 101):
-                    source_config_path = os.path.join(source_dir, f"{version}_config_module_{module_num}.json")
-                    target_config_path = os.path.join(param_var_dir, f"{version}_config_module_{module_num}.json")
-
-                    # Skip if source JSON file doesn't exist
-                    if not os.path.exists(source_config_path):
-                        continue
-
+                # Apply the variation to every interval module of the version
+                modified_modules = {}
+                for module_num, config_module in source_modules:
                     processing_summary['total_found'] += 1
 
                     try:
-                        # Load the source config module
-                        with open(source_config_path, 'r') as f:
-                            config_module = json.load(f)
-
                         # Apply sensitivity variation to the config
                         modified_config = apply_sensitivity_variation(
                             copy.deepcopy(config_module),
@@ -615,9 +716,13 @@ def process_config_modules(version, sen_parameters):
                             normalized_mode
                         )
 
-                        # Save the modified config
-                        with open(target_config_path, 'w') as f:
-                            json.dump(modified_config, f, indent=4)
+                        if CONFIG_MODULE_LAYOUT == 'files':
+                            # Save the modified config as its own module file
+                            target_config_path = os.path.join(param_var_dir, f"{version}_config_module_{module_num}.json")
+                            with open(target_config_path, 'w') as f:
+                                json.dump(modified_config, f, indent=4)
+                        else:
+                            modified_modules[module_num] = modified_config
 
                         processing_summary['total_modified'] += 1
                         processing_summary['processed_modules'][param_key].append(module_num)
@@ -631,6 +736,22 @@ def process_config_modules(version, sen_parameters):
                         sensitivity_logger.error(error_msg)
                         processing_summary['errors'].append(error_msg)
 
+                # Save all modified modules of this variation as one indexed bundle
+                if modified_modules:
+                    try:
+                        write_config_bundle(get_bundle_path(param_var_dir, version), modified_modules, version)
+                        sensitivity_logger.info(f"Saved {len(modified_modules)} modified config modules to bundle in {param_var_dir}")
+                    except Exception as e:
+                        error_msg = f"Failed to write config module bundle for {param_id}, variation {var_str}: {str(e)}"
+                        sensitivity_logger.error(error_msg)
+                        processing_summary['errors'].append(error_msg)
+
+                # Record the variation's artifacts in the sweep manifest
+                try:
+                    record_variation_directory(sensitivity_dir, version, param_id, normalized_mode, variation, param_var_dir)
+                except Exception as e:
+                    sensitivity_logger.warning(f"Could not record {param_id} variation {var_str} in manifest: {str(e)}")
+
         sensitivity_logger.info(
             f"Config module processing completed: "
             f"found {processing_summary['total_found']} JSON files, "
@@ -647,6 +768,13 @@ def process_config_modules(version, sen_parameters):
         datapoints_file = generate_sensitivity_datapoints(version, sen_parameters)
         sensitivity_logger.info(f"SensitivityPlotDatapoints generation completed: {datapoints_file}")
 
+        # Signal that every variation directory has its configuration
+        mark_stage_complete(sensitivity_dir, 'config_copy', {
+            "version": version,
+            "modified": processing_summary['total_modified'],
+            "errors": len(processing_summary['errors'])
+        })
+
         return processing_summary
 
     except Exception as e:
@@ -676,21 +804,15 @@ def generate_sensitivity_datapoints(version, sen_parameters):
 
     # Find a base configuration module to extract baseline values
     base_config = None
-    base_config_path = None
     param_key = None  # Initialize param_key to avoid unbound local variable error
 
-    for module_num in range(1, 101):
-        potential_path = os.path.join(source_dir, f"{version}_config_module_{module_num}.json")
-        if os.path.exists(potential_path):
-            base_config_path = potential_path
-            try:
-                with open(base_config_path, 'r') as f:
-                    base_config = json.load(f)
-                sensitivity_logger.info(f"Loaded base configuration from {base_config_path}")
-                break
-            except Exception as e:
-                sensitivity_logger.warning(f"Failed to load {potential_path}: {str(e)}")
-                continue
+    try:
+        source_modules = load_config_modules(source_dir, version)
+        if source_modules:
+            base_config = source_modules[0][1]
+            sensitivity_logger.info(f"Loaded base configuration module {source_modules[0][0]} from {source_dir}")
+    except Exception as e:
+        sensitivity_logger.warning(f"Failed to load config modules from {source_dir}: {str(e)}")
 
     if not base_config:
         sensitivity_logger.warning("No base configuration module found. Using fallback values.")
@@ -885,29 +1007,84 @@ def generate_sensitivity_datapoints(version, sen_parameters):
 # =====================================
 # Pipeline Control Functions
 # =====================================
-def reset_execution_pipeline():
-    """Reset all execution pipeline events to initial state"""
-    PAYLOAD_REGISTERED.clear()
-    BASELINE_COMPLETED.clear()
-    CONFIG_COMPLETED.clear()
-    RUNS_COMPLETED.clear()
-    PIPELINE_ACTIVE.clear()
+def get_run_workspace(run_id=None):
+    """
+    Get the workspace of the pipeline run a request belongs to.
 
-def initialize_pipeline():
-    """Initialize the pipeline and set it to active"""
-    reset_execution_pipeline()
-    PIPELINE_ACTIVE.set()
-    return time.strftime("%Y%m%d_%H%M%S")
+    The run is taken from the runId of the request (JSON body, query string
+    or X-Run-Id header). Requests without one belong to the most recent
+    active run.
+
+    Args:
+        run_id (str, optional): Run ID; taken from the current request if None
+
+    Returns:
+        RunWorkspace: The run's workspace, or None if there is no such run
+    """
+    if run_id is None and has_request_context():
+        data = request.get_json(silent=True)
+        run_id = data.get('runId') if isinstance(data, dict) else None
+        run_id = run_id or request.args.get('runId') or request.headers.get('X-Run-Id')
+    if run_id:
+        return RUN_WORKSPACES.get(run_id)
+    return RUN_WORKSPACES.latest(active_only=True)
+
+def get_sweep_checkpoint(name, spec, data=None):
+    """
+    Open the checkpoint of a sweep in the workspace of the request's run.
+
+    A sweep started again with the same inputs skips the units an
+    interrupted run completed, unless the request sets "resume" to false,
+    which starts it over.
+
+    Args:
+        name (str): Sweep kind
+        spec (dict): Inputs that define the sweep
+        data (dict, optional): Request JSON
+
+    Returns:
+        tuple: (SweepCheckpoint, sweep ID); the checkpoint is None outside a run
+    """
+    sweep = sweep_id(name, spec)
+    workspace = get_run_workspace()
+    if workspace is None:
+        return None, sweep
+    checkpoint = workspace.checkpoint
+    if data is not None and data.get('resume') is False:
+        checkpoint.clear(sweep)
+    return checkpoint, sweep
+
+def reset_execution_pipeline(workspace=None, reason="Pipeline reset"):
+    """
+    Reset the pipeline of a run, or of every run if none is given.
+
+    The jobs of an active run are cancelled, so its child processes stop
+    instead of running on for an abandoned run.
+    """
+    for run_workspace in ([workspace] if workspace is not None else RUN_WORKSPACES.list()):
+        if run_workspace.active.is_set():
+            get_job_scheduler().cancel_jobs(f"run:{run_workspace.run_id}", reason)
+            run_workspace.cancel(reason)
+        else:
+            run_workspace.reset()
 
-def cancel_pipeline_after_timeout(timeout_seconds=1800):
-    """Cancel the pipeline after a timeout"""
+def initialize_pipeline():
+    """Create the workspace of a new run and set its pipeline to active"""
+    # Reclaim the workspaces of old runs first
+    RUN_WORKSPACES.collect(RUN_WORKSPACE_TTL)
+    workspace = RUN_WORKSPACES.create()
+    workspace.activate()
+    return workspace
+
+def cancel_pipeline_after_timeout(workspace, timeout_seconds=1800):
+    """Cancel the pipeline of a run after a timeout"""
     def timeout_handler():
         # Wait for timeout
         time.sleep(timeout_seconds)
-        # If pipeline is still active, reset it
-        if PIPELINE_ACTIVE.is_set():
-            reset_execution_pipeline()
-            print(f"Pipeline automatically reset after {timeout_seconds}s timeout")
+        # If the run's pipeline is still active, cancel it with its jobs
+        if workspace.active.is_set():
+            reset_execution_pipeline(workspace, f"Pipeline timed out after {timeout_seconds}s")
+            print(f"Pipeline of run {workspace.run_id} automatically reset after {timeout_seconds}s timeout")
 
     # Start timeout thread
     timer_thread = threading.Thread(target=timeout_handler)
@@ -918,49 +1095,204 @@ def cancel_pipeline_after_timeout(timeout_seconds=1800):
 # =====================================
 # Helper Functions
 # =====================================
-def with_file_lock(lock_file_path, operation_name="operation"):
-    """Decorator to create a file lock for the decorated function"""
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            lock = filelock.FileLock(lock_file_path, timeout=180)  # 3 minute timeout
-            try:
-                with lock:
-                    return func(*args, **kwargs)
-            except filelock.Timeout:
-                raise Exception(f"Timeout waiting for {operation_name} lock")
-        return wrapper
-    return decorator
+def get_request_versions(data):
+    """
+    Get the versions a request operates on, used as the conflict keys of its job.
+
+    Endpoints that prefer the saved sensitivity configuration over the request
+    may process the saved version, so both are included.
+
+    Args:
+        data (dict): Request JSON
+
+    Returns:
+        list: Version numbers
+    """
+    versions = data.get('version') or data.get('selectedVersions') or []
+    versions = list(versions) if isinstance(versions, (list, tuple)) else [versions]
+    workspace = get_run_workspace(data.get('runId'))
+    if workspace is not None and os.path.exists(workspace.payload_path):
+        versions.extend((atomic_read_json(workspace.payload_path) or {}).get('selectedVersions', [])[:1])
+    _, saved_config = check_sensitivity_config_status(data.get('runId'))
+    versions.extend((saved_config or {}).get('versions', [])[:1])
+    return list(dict.fromkeys(str(version) for version in versions)) or ['1']
+
+def run_endpoint_job(func, payload):
+    """
+    Run a queued endpoint call in a request context rebuilt from the job payload.
+
+    Args:
+        func (callable): Endpoint function
+        payload (dict): Path, method and JSON body of the original request
+
+    Returns:
+        dict: Status code and JSON body of the response
+
+    Raises:
+        JobError: If the endpoint responded with an error status
+    """
+    with app.test_request_context(payload['path'], method=payload['method'], json=payload['json']):
+        response = app.make_response(func())
+        result = {"statusCode": response.status_code, "body": response.get_json(silent=True)}
+    if response.status_code >= 400:
+        body = result['body'] if isinstance(result['body'], dict) else {}
+        raise JobError(body.get('error') or f"Endpoint responded with {response.status_code}", result)
+    return result
+
+def get_job_scheduler():
+    """
+    Get the job scheduler, opening its queue at JOB_QUEUE_PATH on first use.
+
+    Returns:
+        JobScheduler: Scheduler with the handlers of every job kind registered
+    """
+    global JOB_SCHEDULER
+    with JOB_SCHEDULER_LOCK:
+        if JOB_SCHEDULER is None:
+            JOB_SCHEDULER = JobScheduler(JOB_QUEUE_PATH, capacity=JOB_SCHEDULER_CAPACITY)
+            for kind, handler in JOB_HANDLERS.items():
+                JOB_SCHEDULER.register(kind, handler)
+        return JOB_SCHEDULER
+
+def get_sweep_coordinator():
+    """
+    Get the sweep coordinator, starting it (and any local workers) on first use.
+
+    Returns:
+        SweepCoordinator: Running coordinator
+
+    Raises:
+        ValueError: If SWEEP_COORDINATOR_ADDRESS is not set
+    """
+    global SWEEP_COORDINATOR
+    with SWEEP_COORDINATOR_LOCK:
+        if SWEEP_COORDINATOR is None:
+            if not SWEEP_COORDINATOR_ADDRESS:
+                raise ValueError("Distributed sweeps need SWEEP_COORDINATOR_ADDRESS (host:port) to be set")
+            SWEEP_COORDINATOR = SweepCoordinator(SWEEP_COORDINATOR_ADDRESS).start()
+            if SWEEP_LOCAL_WORKERS:
+                launch_local_workers(
+                    SWEEP_COORDINATOR.address, SWEEP_LOCAL_WORKERS,
+                    base_dir=ORIGINAL_BASE_DIR, token=SWEEP_COORDINATOR.token
+                )
+        return SWEEP_COORDINATOR
+
+def get_sweep_evaluator(engine, data):
+    """
+    Get the evaluator of a Monte Carlo or grid sweep.
+
+    Args:
+        engine (SensitivityEngine): Engine of the sweep
+        data (dict): Request data; "distributed" spreads the sweep over the worker hosts
+
+    Returns:
+        DistributedEvaluator: Evaluator on the workers, or None to evaluate on the engine
+    """
+    if not data.get('distributed'):
+        return None
+    return DistributedEvaluator(
+        get_sweep_coordinator(),
+        engine_spec(engine.version, engine.selected_v, engine.selected_f, engine.target_row, engine.base_dir),
+        check=check_job_cancelled
+    )
+
+def check_job_cancelled():
+    """Raise JobCancelled if the job running this request has been cancelled or timed out."""
+    context = current_job()
+    if context is not None:
+        context.check()
+
+def job_response(job):
+    """Build the HTTP response of a finished job."""
+    result = job.get('result') or {}
+    if job['status'] in (CANCELLED, TIMED_OUT):
+        # Whatever the endpoint completed before it stopped is returned with the error
+        return jsonify({
+            "error": job.get('error') or f"Job {job['id']} {job['status']}",
+            "status": job['status'],
+            "jobId": job['id'],
+            "partialResult": result.get('body')
+        }), 504 if job['status'] == TIMED_OUT else 409
+    if 'statusCode' in result:
+        return jsonify(result['body']), result['statusCode']
+    if job['status'] == SUCCEEDED:
+        return jsonify({"status": "success", "jobId": job['id']}), 200
+    return jsonify({
+        "error": job.get('error') or f"Job {job['id']} {job['status']}",
+        "status": job['status'],
+        "jobId": job['id']
+    }), 500
+
+def with_job_queue(kind, operation_name="operation", cpus=None):
+    """
+    Decorator to run the decorated endpoint as a job of the scheduler.
+
+    The job is keyed by the versions of the request, so calls on unrelated
+    versions run concurrently while calls on the same version run in order,
+    and by its pipeline run, so abandoning the run cancels the job. The
+    caller waits for the job unless the request sets "async", in which case
+    the job ID is returned immediately. The request may set "timeout"
+    (seconds) as the job's deadline.
 
-def with_memory_lock(lock_obj, operation_name="operation"):
-    """Decorator to apply a threading lock for the decorated function"""
+    Args:
+        kind (str): Job kind
+        operation_name (str): Name of the operation for messages
+        cpus (callable, optional): Maps the request JSON to the CPU slots the job uses
+    """
     def decorator(func):
+        JOB_HANDLERS[kind] = functools.partial(run_endpoint_job, func)
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            if not lock_obj.acquire(timeout=180):  # 3 minute timeout
-                raise Exception(f"Timeout waiting for in-memory {operation_name} lock")
-            try:
-                return func(*args, **kwargs)
-            finally:
-                lock_obj.release()
+            data = request.get_json(silent=True) or {}
+            # Pin the job to the run the request belongs to now, not when it starts
+            workspace = get_run_workspace()
+            keys = [f"version:{version}" for version in get_request_versions(data)]
+            if workspace is not None:
+                data = {**data, 'runId': workspace.run_id}
+                keys.append(f"run:{workspace.run_id}")
+            scheduler = get_job_scheduler()
+            scheduler.start()
+            job_id = scheduler.submit(
+                kind,
+                {"path": request.path, "method": request.method, "json": data},
+                keys=keys,
+                cpus=cpus(data) if cpus else 1,
+                timeout=data.get('timeout')
+            )
+            if data.get('async'):
+                return jsonify({
+                    "status": "queued",
+                    "message": f"{operation_name.capitalize()} queued",
+                    "jobId": job_id,
+                    "statusUrl": f"/jobs/{job_id}"
+                }), 202
+            return job_response(scheduler.wait(job_id))
         return wrapper
     return decorator
 
-def with_pipeline_check(required_event=None, next_event=None, operation_name="operation"):
-    """Decorator to check pipeline status and validate required events"""
+def with_pipeline_check(required_step=None, next_step=None, operation_name="operation"):
+    """Decorator to check the pipeline status of the request's run and validate required steps"""
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            # Check if pipeline is active
-            if not PIPELINE_ACTIVE.is_set():
+            # Check if the run's pipeline is active
+            workspace = get_run_workspace()
+            if workspace is None or not workspace.active.is_set():
+                if workspace is not None and workspace.cancel_reason:
+                    return jsonify({
+                        "error": f"Pipeline run {workspace.run_id} was cancelled: {workspace.cancel_reason}",
+                        "status": "cancelled",
+                        "message": "Start a new run with /register_payload"
+                    }), 409
                 return jsonify({
                     "error": "Pipeline is not active",
                     "status": "inactive",
                     "message": "Initialize pipeline first with /register_payload"
                 }), 409
 
-            # Check if required event is set
-            if required_event is not None and not required_event.is_set():
+            # Check if required step is completed
+            if required_step is not None and not workspace.is_set(required_step):
                 return jsonify({
                     "error": f"Cannot execute {operation_name} - prerequisite step not completed",
                     "status": "blocked",
@@ -970,9 +1302,9 @@ def with_pipeline_check(required_event=None, next_event=None, operation_name="op
             # Execute the function
             result = func(*args, **kwargs)
 
-            # Set next event if successful and provided
-            if next_event is not None and isinstance(result, tuple) and result[1] == 200:
-                next_event.set()
+            # Mark next step if successful and provided
+            if next_step is not None and isinstance(result, tuple) and result[1] == 200:
+                workspace.mark(next_step)
 
             return result
         return wrapper
@@ -1332,28 +1664,39 @@ def save_sensitivity_config_files(version, reports_dir, sen_parameters):
                     'timestamp': time.strftime("%Y-%m-%d %H:%M:%S")
                 })
                 saved_files.append(param_file)
+                record_artifact(sensitivity_dir, version, param_id, mode, variation, PARAM_CONFIG, param_file)
 
         return saved_files
 
-def check_sensitivity_config_status():
-    """Thread-safe configuration status check with proper locking"""
+def check_sensitivity_config_status(run_id=None):
+    """
+    Thread-safe configuration status check with proper locking.
+
+    Reads the configuration snapshot of the request's run workspace (or of
+    run_id); runs without one fall back to the most recently saved configuration.
+    """
+    status_path, data_path = SENSITIVITY_CONFIG_STATUS_PATH, SENSITIVITY_CONFIG_DATA_PATH
+    workspace = get_run_workspace(run_id)
+    if workspace is not None and os.path.exists(workspace.config_status_path):
+        status_path, data_path = workspace.config_status_path, workspace.config_data_path
+
     status_lock_file = os.path.join(LOGS_DIR, "status_check.lock")
     lock = filelock.FileLock(status_lock_file, timeout=30)
 
     with lock:
-        if not os.path.exists(SENSITIVITY_CONFIG_STATUS_PATH):
+        if not os.path.exists(status_path):
             return False, None
 
         try:
             # Use atomic read for thread safety
-            status = atomic_read_json(SENSITIVITY_CONFIG_STATUS_PATH)
+            status = atomic_read_json(status_path)
 
             if not status or not status.get('configured', False):
                 return False, None
 
-            if os.path.exists(SENSITIVITY_CONFIG_DATA_PATH):
+            if os.path.exists(data_path):
                 # Use atomic read for thread safety
-                config_data = atomic_read_pickle(SENSITIVITY_CONFIG_DATA_PATH)
+                config_data = atomic_read_pickle(data_path)
                 return True, config_data
 
             return True, None
@@ -1374,26 +1717,22 @@ def get_sensitivity_data(version, param_id, mode, compare_to_key):
     Returns:
         dict: Sensitivity data including variations and values
     """
-    # Map mode to directory name
-    mode_dir_mapping = {
-        'percentage': 'Percentage',
-        'directvalue': 'DirectValue',
-        'absolutedeparture': 'AbsoluteDeparture',
-        'montecarlo': 'MonteCarlo'
-    }
-    mode_dir = mode_dir_mapping.get(mode.lower(), 'Percentage')
+    mode_dir = MODE_DIR_MAPPING.get(mode.lower(), 'Percentage')
 
     # Build path to results file
     base_dir = os.path.join(BASE_DIR, 'backend', 'Original')
+    sensitivity_dir = os.path.join(base_dir, f'Batch({version})', f'Results({version})', 'Sensitivity')
     results_path = os.path.join(
-        base_dir,
-        f'Batch({version})',
-        f'Results({version})',
-        'Sensitivity',
+        sensitivity_dir,
         mode_dir,
         f"{param_id}_vs_{compare_to_key}_{mode.lower()}_results.json"
     )
 
+    # Prefer the results store over its exported view
+    results_data = load_results(sensitivity_dir, version, param_id, compare_to_key, mode)
+    if results_data is not None:
+        return results_data
+
     # Check if results file exists
     if not os.path.exists(results_path):
         print(f"Results file not found: {results_path}")
@@ -1460,11 +1799,16 @@ def check_endpoint_availability():
     # Get the current path
     path = request.path
 
-    # Check if we're in active pipeline mode but not on an always accessible endpoint
-    if PIPELINE_ACTIVE.is_set() and path not in always_accessible:
+    # Job queue inspection never interferes with the pipeline
+    if path == '/jobs' or path.startswith('/jobs/'):
+        return None
+
+    # Pipeline steps must follow the order of their own run; other endpoints stay available
+    workspace = get_run_workspace()
+    if workspace is not None and workspace.active.is_set() and path not in always_accessible:
         # Allow baseline_calculation only if payload is registered but baseline not completed
         if path == '/baseline_calculation':
-            if PAYLOAD_REGISTERED.is_set() and not BASELINE_COMPLETED.is_set():
+            if workspace.is_set(PAYLOAD_REGISTERED) and not workspace.is_set(BASELINE_COMPLETED):
                 return None  # Allow request to proceed
             return jsonify({
                 "error": "Baseline calculation cannot be executed at this time",
@@ -1474,7 +1818,7 @@ def check_endpoint_availability():
 
         # Allow sensitivity/configure only if baseline is completed but config not completed
         elif path == '/sensitivity/configure':
-            if BASELINE_COMPLETED.is_set() and not CONFIG_COMPLETED.is_set():
+            if workspace.is_set(BASELINE_COMPLETED) and not workspace.is_set(CONFIG_COMPLETED):
                 return None  # Allow request to proceed
             return jsonify({
                 "error": "Sensitivity configuration cannot be executed at this time",
@@ -1484,7 +1828,7 @@ def check_endpoint_availability():
 
         # Allow runs only if config is completed but runs not completed
         elif path == '/runs':
-            if CONFIG_COMPLETED.is_set() and not RUNS_COMPLETED.is_set():
+            if workspace.is_set(CONFIG_COMPLETED) and not workspace.is_set(RUNS_COMPLETED):
                 return None  # Allow request to proceed
             return jsonify({
                 "error": "Runs cannot be executed at this time",
@@ -1492,15 +1836,7 @@ def check_endpoint_availability():
                 "message": "Complete sensitivity configuration first"
             }), 409
 
-        # Block all other endpoints during active pipeline
-        else:
-            return jsonify({
-                "error": "Endpoint temporarily unavailable",
-                "status": "pipeline_active",
-                "message": "Pipeline is active and only specific endpoints are available"
-            }), 503
-
-    # Allow access to always accessible endpoints or when pipeline is not active
+    # Other endpoints do not touch run state, so active runs no longer hold them
     return None
 
 # =====================================
@@ -2106,7 +2442,7 @@ def generate_plots(version):
 # =====================================
 # Process Sensitivity Results Functions
 # =====================================
-def extract_price_from_summary(version, param_id, variation):
+def extract_price_from_summary(version, param_id, variation, summary_file=None):
     """
     Extract price value from economic summary for a specific parameter variation.
 
@@ -2114,6 +2450,7 @@ def extract_price_from_summary(version, param_id, variation):
         version (int): Version number
         param_id (str): Parameter ID (e.g., "S35")
         variation (float): Variation value
+        summary_file (str, optional): Economic_Summary file of the variation, when already known
 
     Returns:
         float: Extracted price value or None if not found
@@ -2122,9 +2459,13 @@ def extract_price_from_summary(version, param_id, variation):
         # Format variation string for directory name
         var_str = f"{variation:+.2f}"
 
-        # First, find the correct Economic_Summary file for this variation
-        # Check in the parameter variation directory
-        search_paths = [
+        # Look the Economic_Summary file up in the sweep manifest first
+        sensitivity_dir = os.path.join(ORIGINAL_BASE_DIR, f'Batch({version})', f'Results({version})', 'Sensitivity')
+        if not summary_file:
+            summary_file = find_artifact(sensitivity_dir, version, param_id, variation, ECONOMIC_SUMMARY)
+
+        # Otherwise search the parameter variation directories
+        search_paths = [] if summary_file else [
             # Main directory search pattern
             os.path.join(
                 ORIGINAL_BASE_DIR,
@@ -2159,7 +2500,6 @@ def extract_price_from_summary(version, param_id, variation):
             )
         ]
 
-        summary_file = None
         for pattern in search_paths:
             matches = glob.glob(pattern)
             if matches:
@@ -2246,7 +2586,8 @@ def process_sensitivity_results(version, wait_time_minutes=3):
 
     Args:
         version (int): Version number
-        wait_time_minutes (float): Wait time in minutes before processing
+        wait_time_minutes (float): Maximum time in minutes to wait for the config copy
+                                   stage to signal completion
 
     Returns:
         dict: Processing summary
@@ -2254,12 +2595,12 @@ def process_sensitivity_results(version, wait_time_minutes=3):
     # Log start information
     logger.info(f"=== Starting Sensitivity Results Processing ===")
     logger.info(f"Version: {version}")
-    logger.info(f"Wait time: {wait_time_minutes} minutes")
+    logger.info(f"Maximum wait time: {wait_time_minutes} minutes")
 
-    # Wait for specified time
-    if wait_time_minutes > 0:
-        logger.info(f"Waiting {wait_time_minutes} minutes before processing...")
-        time.sleep(wait_time_minutes * 60)
+    # Start as soon as the variation configurations are complete
+    sensitivity_dir = os.path.join(ORIGINAL_BASE_DIR, f'Batch({version})', f'Results({version})', 'Sensitivity')
+    if not wait_for_stage(sensitivity_dir, 'config_copy', timeout=max(wait_time_minutes, 0) * 60):
+        logger.warning("Variation configurations not marked complete, processing available results")
 
     # Load sensitivity configuration
     is_configured, config_data = check_sensitivity_config_status()
@@ -2405,20 +2746,14 @@ def generate_sensitivity_datapoints_from_config(version, sen_parameters):
 
     # Find a base configuration module to extract baseline values
     base_config = None
-    base_config_path = None
 
-    for module_num in range(1, 101):
-        potential_path = os.path.join(source_dir, f"{version}_config_module_{module_num}.json")
-        if os.path.exists(potential_path):
-            base_config_path = potential_path
-            try:
-                with open(base_config_path, 'r') as f:
-                    base_config = json.load(f)
-                sensitivity_logger.info(f"Loaded base configuration from {base_config_path}")
-                break
-            except Exception as e:
-                sensitivity_logger.warning(f"Failed to load {potential_path}: {str(e)}")
-                continue
+    try:
+        source_modules = load_config_modules(source_dir, version)
+        if source_modules:
+            base_config = source_modules[0][1]
+            sensitivity_logger.info(f"Loaded base configuration module {source_modules[0][0]} from {source_dir}")
+    except Exception as e:
+        sensitivity_logger.warning(f"Failed to load config modules from {source_dir}: {str(e)}")
 
     if not base_config:
         sensitivity_logger.warning("No base configuration module found. Using fallback values.")
@@ -2612,7 +2947,7 @@ def generate_sensitivity_datapoints_from_config(version, sen_parameters):
 
 def process_config_modules_for_sensitivity(version, sen_parameters):
     """
-    Process all configuration modules (1-100) for all parameter variations.
+    Process all configuration modules of a version for all parameter variations.
     Apply sensitivity variations and save modified configurations.
 
     Args:
@@ -2649,10 +2984,10 @@ def process_config_modules_for_sensitivity(version, sen_parameters):
         os.makedirs(config_plot_spec_dir, exist_ok=True)
         sensitivity_logger.info(f"Created/ensured ConfigurationPlotSpec directory: {config_plot_spec_dir}")
 
-        # Short pause before looking for CSV files to ensure they exist
-        sensitivity_logger.info("Starting short pause to ensure CSV files exist...")
-        time.sleep(3)  # 3-second pause to ensure files exist
-        sensitivity_logger.info("Resuming after pause, checking for CSV files...")
+        # Start as soon as the config_modules stage has signalled completion
+        clear_stage(sensitivity_dir, 'config_copy')
+        if not wait_for_config_modules(version, source_dir):
+            sensitivity_logger.warning(f"Config modules of version {version} not marked complete, checking for files anyway")
 
         # Define the specific CSV files we want to copy
         target_csv_files = [
@@ -2678,8 +3013,12 @@ def process_config_modules_for_sensitivity(version, sen_parameters):
         if not py_file_exists:
             sensitivity_logger.warning(f"Python configuration file not found: {config_file}")
 
+        # Load the version's config modules once (bundle or module files)
+        source_modules = load_config_modules(source_dir, version)
+        sensitivity_logger.info(f"Loaded {len(source_modules)} source config modules from {source_dir}")
+
         # Process each parameter's variation directory
-        for param_id, param_config in SenParameters.items():
+        for param_id, param_config in sen_parameters.items():
             if not param_config.get('enabled'):
                 continue
 
@@ -2758,22 +3097,12 @@ def process_config_modules_for_sensitivity(version, sen_parameters):
                 if param_key not in processing_summary['processed_modules']:
                     processing_summary['processed_modules'][param_key] = []
 
-                # Process all possible module files (1-100)
-                for module_num in range(1, 101):
-                    source_config_path = os.path.join(source_dir, f"{version}_config_module_{module_num}.json")
-                    target_config_path = os.path.join(param_var_dir, f"{version}_config_module_{module_num}.json")
-
-                    # Skip if source JSON file doesn't exist
-                    if not os.path.exists(source_config_path):
-                        continue
-
+                # Apply the variation to every interval module of the version
+                modified_modules = {}
+                for module_num, config_module in source_modules:
                     processing_summary['total_found'] += 1
 
                     try:
-                        # Load the source config module
-                        with open(source_config_path, 'r') as f:
-                            config_module = json.load(f)
-
                         # Apply sensitivity variation to the config
                         modified_config = apply_sensitivity_variation(
                             copy.deepcopy(config_module),
@@ -2782,9 +3111,13 @@ def process_config_modules_for_sensitivity(version, sen_parameters):
                             normalized_mode
                         )
 
-                        # Save the modified config
-                        with open(target_config_path, 'w') as f:
-                            json.dump(modified_config, f, indent=4)
+                        if CONFIG_MODULE_LAYOUT == 'files':
+                            # Save the modified config as its own module file
+                            target_config_path = os.path.join(param_var_dir, f"{version}_config_module_{module_num}.json")
+                            with open(target_config_path, 'w') as f:
+                                json.dump(modified_config, f, indent=4)
+                        else:
+                            modified_modules[module_num] = modified_config
 
                         processing_summary['total_modified'] += 1
                         processing_summary['processed_modules'][param_key].append(module_num)
@@ -2798,6 +3131,22 @@ def process_config_modules_for_sensitivity(version, sen_parameters):
                         sensitivity_logger.error(error_msg)
                         processing_summary['errors'].append(error_msg)
 
+                # Save all modified modules of this variation as one indexed bundle
+                if modified_modules:
+                    try:
+                        write_config_bundle(get_bundle_path(param_var_dir, version), modified_modules, version)
+                        sensitivity_logger.info(f"Saved {len(modified_modules)} modified config modules to bundle in {param_var_dir}")
+                    except Exception as e:
+                        error_msg = f"Failed to write config module bundle for {param_id}, variation {var_str}: {str(e)}"
+                        sensitivity_logger.error(error_msg)
+                        processing_summary['errors'].append(error_msg)
+
+                # Record the variation's artifacts in the sweep manifest
+                try:
+                    record_variation_directory(sensitivity_dir, version, param_id, normalized_mode, variation, param_var_dir)
+                except Exception as e:
+                    sensitivity_logger.warning(f"Could not record {param_id} variation {var_str} in manifest: {str(e)}")
+
         sensitivity_logger.info(
             f"Config module processing completed: "
             f"found {processing_summary['total_found']} JSON files, "
@@ -2811,9 +3160,16 @@ def process_config_modules_for_sensitivity(version, sen_parameters):
 
         # Generate the SensitivityPlotDatapoints_{version}.json file
         sensitivity_logger.info("Generating SensitivityPlotDatapoints_{version}.json file with actual base values...")
-        datapoints_file = generate_sensitivity_datapoints_from_config(version, SenParameters)
+        datapoints_file = generate_sensitivity_datapoints_from_config(version, sen_parameters)
         sensitivity_logger.info(f"SensitivityPlotDatapoints generation completed: {datapoints_file}")
 
+        # Signal that every variation directory has its configuration
+        mark_stage_complete(sensitivity_dir, 'config_copy', {
+            "version": version,
+            "modified": processing_summary['total_modified'],
+            "errors": len(processing_summary['errors'])
+        })
+
         return processing_summary
 
     except Exception as e:
@@ -2827,60 +3183,50 @@ def process_config_modules_for_sensitivity(version, sen_parameters):
 # =====================================
 @app.route('/status', methods=['GET'])
 def get_pipeline_status():
-    """Get current pipeline execution status"""
+    """Get current pipeline execution status of a run (the most recent active run by default)"""
+    workspace = get_run_workspace()
+    state = workspace.state() if workspace is not None else None
     status = {
-        "pipeline_active": PIPELINE_ACTIVE.is_set(),
+        "runId": workspace.run_id if workspace is not None else None,
+        "pipeline_active": bool(state and state["active"]),
         "steps": {
-            "payload_registered": PAYLOAD_REGISTERED.is_set(),
-            "baseline_completed": BASELINE_COMPLETED.is_set(),
-            "config_completed": CONFIG_COMPLETED.is_set(),
-            "runs_completed": RUNS_COMPLETED.is_set()
+            "payload_registered": bool(state and state["steps"][PAYLOAD_REGISTERED]),
+            "baseline_completed": bool(state and state["steps"][BASELINE_COMPLETED]),
+            "config_completed": bool(state and state["steps"][CONFIG_COMPLETED]),
+            "runs_completed": bool(state and state["steps"][RUNS_COMPLETED])
         },
-        "current_step": "none",
+        "current_step": state["currentStep"] if state else "none",
+        "checkpoints": workspace.checkpoint.summary() if workspace is not None else {},
+        "activeRuns": [run.run_id for run in RUN_WORKSPACES.list() if run.active.is_set()],
         "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
     }
 
-    # Determine current step
-    if PIPELINE_ACTIVE.is_set():
-        if not PAYLOAD_REGISTERED.is_set():
-            status["current_step"] = "register_payload"
-        elif not BASELINE_COMPLETED.is_set():
-            status["current_step"] = "baseline_calculation"
-        elif not CONFIG_COMPLETED.is_set():
-            status["current_step"] = "sensitivity_configure"
-        elif not RUNS_COMPLETED.is_set():
-            status["current_step"] = "runs"
-        else:
-            status["current_step"] = "complete"
-
     return jsonify(status)
 
 # =====================================
 # Register Payload Endpoint
 # =====================================
 @app.route('/register_payload', methods=['POST'])
-@with_file_lock(PAYLOAD_LOCK_FILE, "payload registration")
-@with_memory_lock(GLOBAL_PAYLOAD_LOCK, "payload registration")
 def register_payload():
-    """Register payload and initialize pipeline"""
+    """Register payload and initialize the pipeline of a new run in its own workspace"""
     try:
-        # Initialize new pipeline (resets all events)
-        run_id = initialize_pipeline()
+        # Initialize new pipeline (a new run with its own events and state)
+        workspace = initialize_pipeline()
+        run_id = workspace.run_id
 
         # Start timeout timer to automatically reset pipeline after 30 minutes
-        cancel_pipeline_after_timeout(1800)
+        cancel_pipeline_after_timeout(workspace, 1800)
 
-        data = request.get_json()
+        data = request.get_json(silent=True)
         if not data:
-            PIPELINE_ACTIVE.clear()  # Reset pipeline active flag
+            reset_execution_pipeline(workspace)  # Reset pipeline active flag
             return jsonify({"error": "No data provided"}), 400
 
-        # Store payload data
-        payload_path = os.path.join(LOGS_DIR, f"payload_{run_id}.json")
-        atomic_write_json(payload_path, data)
+        # Store payload data in the run's workspace
+        atomic_write_json(workspace.payload_path, data)
 
-        # Set payload registered event
-        PAYLOAD_REGISTERED.set()
+        # Set payload registered step
+        workspace.mark(PAYLOAD_REGISTERED)
 
         return jsonify({
             "status": "success",
@@ -2891,7 +3237,8 @@ def register_payload():
         }), 200
     except Exception as e:
         # Reset pipeline on error
-        reset_execution_pipeline()
+        if 'workspace' in locals():
+            reset_execution_pipeline(workspace)
         return jsonify({
             "error": f"Error registering payload: {str(e)}",
             "status": "failed"
@@ -2900,108 +3247,138 @@ def register_payload():
 # Baseline Calculation Endpoint
 # =====================================
 @app.route('/baseline_calculation', methods=['POST'], endpoint='baseline_calc_endpoint')
-@with_file_lock(BASELINE_LOCK_FILE, "baseline calculation")
-@with_memory_lock(GLOBAL_BASELINE_LOCK, "baseline calculation")
-@with_pipeline_check(required_event=PAYLOAD_REGISTERED, next_event=BASELINE_COMPLETED, operation_name="baseline calculation")
+@with_job_queue('baseline', "baseline calculation")
+@with_pipeline_check(required_step=PAYLOAD_REGISTERED, next_step=BASELINE_COMPLETED, operation_name="baseline calculation")
 def baseline_calculation():
-    """Perform baseline calculation without sensitivity variations"""
+    """
+    Perform baseline calculation without sensitivity variations.
+
+    Every selected version is fingerprinted from its payload fields and input
+    files; a version whose baseline is up to date returns its cached result
+    and artifacts instead of running the scripts again (force=true always
+    recalculates).
+    """
     try:
         data = request.get_json()
-        run_id = data.get('runId')
+        workspace = get_run_workspace()
+        run_id = workspace.run_id
 
-        # If no runtime data provided but runId is present, try to load from stored payload
-        if run_id and (not data.get('selectedVersions') or not data.get('selectedCalculationOption')):
-            payload_path = os.path.join(LOGS_DIR, f"payload_{run_id}.json")
-            if os.path.exists(payload_path):
-                stored_data = atomic_read_json(payload_path)
+        # If no runtime data provided, load the payload stored in the run's workspace
+        if not data.get('selectedVersions') or not data.get('selectedCalculationOption'):
+            if os.path.exists(workspace.payload_path):
+                stored_data = atomic_read_json(workspace.payload_path)
                 if stored_data:
                     data.update(stored_data)
 
         # Extract configuration
-        version = data.get('selectedVersions', [1])[0]
+        versions = data.get('selectedVersions', [1])
+        version = versions[0]
         selectedV = data.get('selectedV', {f'V{i+1}': 'off' for i in range(10)})
         selectedF = data.get('selectedF', {f'F{i+1}': 'off' for i in range(5)})
         calculation_option = data.get('selectedCalculationOption', 'freeFlowNPV')
         target_row = int(data.get('targetRow', 20))
+        force = bool(data.get('force'))
 
         # Get calculation script
         calculation_script_func = CALCULATION_SCRIPTS.get(calculation_option)
         if not calculation_script_func:
-            BASELINE_COMPLETED.clear()  # Reset baseline completion flag
+            workspace.clear(BASELINE_COMPLETED)  # Reset baseline completion flag
             return jsonify({
                 "error": f"No script found for calculation mode: {calculation_option}",
                 "status": "error"
             }), 400
 
-        calculation_script = calculation_script_func(version)
+        baselines = {}
+        for version_id in versions:
+            calculation_script = calculation_script_func(version_id)
+            results_folder = get_results_folder(ORIGINAL_BASE_DIR, version_id)
+            fingerprint = baseline_fingerprint({
+                "version": version_id,
+                "selectedV": selectedV,
+                "selectedF": selectedF,
+                "calculationOption": calculation_option,
+                "targetRow": target_row
+            }, get_baseline_inputs(ORIGINAL_BASE_DIR, version_id, COMMON_PYTHON_SCRIPTS + [calculation_script]))
+
+            # Reuse the baseline when neither the payload nor the inputs changed
+            cached = None if force else find_cached_baseline(results_folder, fingerprint)
+            if cached is not None:
+                logger.info(f"Baseline of version {version_id} is up to date, reusing cached result")
+                baselines[version_id] = {**cached['result'], "cached": True, "artifacts": sorted(cached['artifacts'])}
+                continue
 
-        # Execute configuration management scripts first
-        for script in COMMON_PYTHON_SCRIPTS:
-            script_name = os.path.basename(script)
+            invalidate_baseline(results_folder)
 
-            result = subprocess.run(
-                ['python', script, str(version)],
-                capture_output=True,
-                text=True
-            )
+            # Execute configuration management scripts first
+            for script in COMMON_PYTHON_SCRIPTS:
+                script_name = os.path.basename(script)
 
-            if result.returncode != 0:
-                error_msg = f"Script execution failed: {script_name}\nError: {result.stderr}"
-                BASELINE_COMPLETED.clear()  # Reset baseline completion flag
-                return jsonify({
-                    "error": error_msg,
-                    "status": "error"
-                }), 500
+                result = run_process(['python', script, str(version_id)])
 
-            time.sleep(0.5)  # Ensure proper sequencing
+                if result.returncode != 0:
+                    error_msg = f"Script execution failed: {script_name}\nError: {result.stderr}"
+                    workspace.clear(BASELINE_COMPLETED)  # Reset baseline completion flag
+                    return jsonify({
+                        "error": error_msg,
+                        "status": "error"
+                    }), 500
 
-        # Run baseline calculation
-        start_time = time.time()
-        result = subprocess.run(
-            [
+            # Run baseline calculation
+            calculation_start = time.time()
+            result = run_process([
                 'python',
                 calculation_script,
-                str(version),
+                str(version_id),
                 json.dumps(selectedV),
                 json.dumps(selectedF),
                 str(target_row),
                 calculation_option,
                 '{}'  # Empty SenParameters for baseline
-            ],
-            capture_output=True,
-            text=True
-        )
+            ])
 
-        execution_time = time.time() - start_time
+            execution_time = time.time() - calculation_start
 
-        if result.returncode != 0:
-            error_msg = f"Baseline calculation failed: {result.stderr}"
-            BASELINE_COMPLETED.clear()  # Reset baseline completion flag
-            return jsonify({
-                "error": error_msg,
-                "status": "error"
-            }), 500
+            if result.returncode != 0:
+                error_msg = f"Baseline calculation failed: {result.stderr}"
+                workspace.clear(BASELINE_COMPLETED)  # Reset baseline completion flag
+                return jsonify({
+                    "error": error_msg,
+                    "status": "error"
+                }), 500
+
+            baseline = {
+                "version": version_id,
+                "calculationOption": calculation_option,
+                "targetRow": target_row,
+                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "executionTime": execution_time,
+                "stdout": result.stdout,
+                "returnCode": result.returncode
+            }
+            artifacts = list_baseline_outputs(results_folder, version_id)
+            record_baseline(results_folder, fingerprint, baseline, artifacts)
+            baselines[version_id] = {**baseline, "cached": False, "artifacts": artifacts}
 
-        # Store calculation result
-        result_path = os.path.join(LOGS_DIR, f"baseline_result_{run_id}.json")
+        # Store calculation result among the run's artifacts
+        result_path = workspace.artifact("baseline_result.json")
         atomic_write_json(result_path, {
-            "version": version,
-            "calculationOption": calculation_option,
-            "targetRow": target_row,
-            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-            "executionTime": execution_time,
-            "stdout": result.stdout,
-            "returnCode": result.returncode
+            **{name: value for name, value in baselines[version].items() if name != 'artifacts'},
+            "versions": baselines
         })
 
-        # BASELINE_COMPLETED event is set by the decorator
+        # BASELINE_COMPLETED step is marked by the decorator
 
+        recalculated = [version_id for version_id, baseline in baselines.items() if not baseline['cached']]
         return jsonify({
             "status": "success",
-            "message": "Baseline calculation completed successfully",
+            "message": "Baseline calculation completed successfully" if recalculated
+            else "Baseline is up to date; cached result reused",
             "runId": run_id,
             "version": version,
-            "executionTime": f"{execution_time:.2f}s",
+            "executionTime": f"{sum(baselines[version_id]['executionTime'] for version_id in recalculated):.2f}s",
+            "cached": not recalculated,
+            "recalculatedVersions": recalculated,
+            "versions": baselines,
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
             "next_step": "/sensitivity/configure"
         }), 200
@@ -3016,9 +3393,8 @@ def baseline_calculation():
 # Sensitivity Configuration Endpoint
 # =====================================
 @app.route('/sensitivity/configure', methods=['POST'], endpoint='sensitivity_configure_endpoint')
-@with_file_lock(CONFIG_LOCK_FILE, "sensitivity configuration")
-@with_memory_lock(GLOBAL_CONFIG_LOCK, "sensitivity configuration")
-@with_pipeline_check(required_event=BASELINE_COMPLETED, next_event=CONFIG_COMPLETED, operation_name="sensitivity configuration")
+@with_job_queue('sensitivity_configure', "sensitivity configuration")
+@with_pipeline_check(required_step=BASELINE_COMPLETED, next_step=CONFIG_COMPLETED, operation_name="sensitivity configuration")
 def configure_sensitivity():
     """Generate and save sensitivity configurations"""
     try:
@@ -3026,13 +3402,13 @@ def configure_sensitivity():
         if not data:
             return jsonify({"error": "No data provided"}), 400
 
-        run_id = data.get('runId', time.strftime("%Y%m%d_%H%M%S"))
+        workspace = get_run_workspace()
+        run_id = workspace.run_id
 
-        # If no runtime data provided but runId is present, try to load from stored payload
-        if run_id and (not data.get('selectedVersions') or not data.get('SenParameters')):
-            payload_path = os.path.join(LOGS_DIR, f"payload_{run_id}.json")
-            if os.path.exists(payload_path):
-                stored_data = atomic_read_json(payload_path)
+        # If no runtime data provided, load the payload stored in the run's workspace
+        if not data.get('selectedVersions') or not data.get('SenParameters'):
+            if os.path.exists(workspace.payload_path):
+                stored_data = atomic_read_json(workspace.payload_path)
                 if stored_data:
                     data.update(stored_data)
 
@@ -3055,20 +3431,22 @@ def configure_sensitivity():
         # Save configuration files with thread-safe function
         saved_files = save_sensitivity_config_files(version, config_dir, config['SenParameters'])
 
-        # Save configuration status using atomic write
-        atomic_write_json(SENSITIVITY_CONFIG_STATUS_PATH, {
+        # Save configuration status and data in the run's workspace using atomic writes;
+        # the shared copies remain the latest configuration for requests without a run
+        config_status = {
             'configured': True,
             'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
             'runId': run_id,
             'version': version,
             'configDir': config_dir,
             'sensitivityDir': sensitivity_dir
-        })
-
-        # Save configuration data using atomic write
-        atomic_write_pickle(SENSITIVITY_CONFIG_DATA_PATH, config)
+        }
+        for status_path, data_path in [(workspace.config_status_path, workspace.config_data_path),
+                                       (SENSITIVITY_CONFIG_STATUS_PATH, SENSITIVITY_CONFIG_DATA_PATH)]:
+            atomic_write_pickle(data_path, config)
+            atomic_write_json(status_path, config_status)
 
-        # CONFIG_COMPLETED event is set by the decorator
+        # CONFIG_COMPLETED step is marked by the decorator
 
         execution_time = time.time() - start_time
 
@@ -3087,8 +3465,8 @@ def configure_sensitivity():
     except Exception as e:
         # Don't clear event flag here - let the decorator handle it
 
-        # Update configuration status to indicate failure using atomic write
-        atomic_write_json(SENSITIVITY_CONFIG_STATUS_PATH, {
+        # Update the run's configuration status to indicate failure using atomic write
+        atomic_write_json(workspace.config_status_path if 'workspace' in locals() else SENSITIVITY_CONFIG_STATUS_PATH, {
             'configured': False,
             'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
             'runId': run_id if 'run_id' in locals() else time.strftime("%Y%m%d_%H%M%S"),
@@ -3104,9 +3482,8 @@ def configure_sensitivity():
 # Run Calculations Endpoint
 # =====================================
 @app.route('/runs', methods=['POST'], endpoint='runs_endpoint')
-@with_file_lock(RUN_LOCK_FILE, "calculation runs")
-@with_memory_lock(GLOBAL_RUN_LOCK, "calculation runs")
-@with_pipeline_check(required_event=CONFIG_COMPLETED, next_event=RUNS_COMPLETED, operation_name="calculation runs")
+@with_job_queue('runs', "calculation runs")
+@with_pipeline_check(required_step=CONFIG_COMPLETED, next_step=RUNS_COMPLETED, operation_name="calculation runs")
 def run_calculations():
     """Execute sensitivity calculations based on configured parameters"""
     run_id = time.strftime("%Y%m%d_%H%M%S")
@@ -3119,6 +3496,7 @@ def run_calculations():
 
         # Check if sensitivity configurations have been generated using thread-safe function
         is_configured, saved_config = check_sensitivity_config_status()
+        config_data_path = get_run_workspace().config_data_path
 
         # If sensitivity configurations haven't been generated, return an error
         if not is_configured:
@@ -3173,13 +3551,16 @@ def run_calculations():
             # Save configuration data with explicit version using thread-safe function
             if isinstance(config['versions'], list) and version not in config['versions']:
                 config['versions'].append(version)
-            atomic_write_pickle(SENSITIVITY_CONFIG_DATA_PATH, config)
+            atomic_write_pickle(config_data_path, config)
         except Exception:
             pass
 
-        # Step 2: Process sensitivity parameters if enabled
+        # Step 2: Process sensitivity parameters if enabled; units completed by an
+        # interrupted attempt of this run are skipped
         enabled_params = [k for k, v in config['SenParameters'].items() if v.get('enabled')]
-        if enabled_params:
+        checkpoint, sweep = get_sweep_checkpoint('runs', {'version': version, 'config': config}, data)
+        finished = checkpoint.completed(sweep) if checkpoint is not None else {}
+        if enabled_params and 'process_results' not in finished:
             try:
                 process_script = os.path.join(
                     SCRIPT_DIR,
@@ -3188,12 +3569,15 @@ def run_calculations():
                 )
 
                 if os.path.exists(process_script):
-                    process_result = subprocess.run(
+                    process_result = run_process(
                         ['python', process_script, str(version), '0.5'],  # 30 second wait time
-                        capture_output=True,
-                        text=True
+                        # Process the configuration snapshot of this run
+                        env={**os.environ, 'SENSITIVITY_CONFIG_DATA_PATH': config_data_path}
                     )
 
+                    if process_result.returncode == 0 and checkpoint is not None:
+                        checkpoint.record(sweep, 'process_results')
+
                     if process_result.returncode != 0:
                         # Try running with backup approach if the first attempt failed
                         for param_id, param_config in config['SenParameters'].items():
@@ -3222,21 +3606,26 @@ def run_calculations():
                                 for variation in variations:
                                     var_str = f"{variation:+.2f}"
 
-                                    # Find modified config files
-                                    mode_dir = 'symmetrical' if mode.lower() == 'symmetrical' else 'multiple'
-                                    config_pattern = os.path.join(
-                                        sensitivity_dir,
-                                        param_id,
-                                        mode_dir,
-                                        var_str,
-                                        f"{version}_config_module_*.json"
-                                    )
-
-                                    config_files = glob.glob(config_pattern)
+                                    # Find modified config modules in the directory the
+                                    # config module copy wrote them to
+                                    if mode in ['symmetrical', 'multiple']:
+                                        mode_dir = 'symmetrical'
+                                    elif mode in ['discrete']:
+                                        mode_dir = 'multipoint'
+                                    else:
+                                        mode_dir = mode.lower()
+                                    var_dir = os.path.join(sensitivity_dir, param_id, mode_dir, var_str)
+
+                                    # The calculation script takes one module file per run, so
+                                    # bundled modules are written out as module files first
+                                    config_files = write_config_module_files(var_dir, version)
                                     if config_files:
                                         for config_file in config_files:
+                                            unit = f"{param_id}|{var_str}|{os.path.basename(config_file)}"
+                                            if unit in finished:
+                                                continue
                                             try:
-                                                subprocess.run(
+                                                unit_result = run_process(
                                                     [
                                                         'python',
                                                         calculation_script,
@@ -3247,12 +3636,14 @@ def run_calculations():
                                                         str(variation),
                                                         param_config.get('compareToKey', 'S13')
                                                     ],
-                                                    capture_output=True,
-                                                    text=True,
                                                     timeout=300  # 5 minute timeout
                                                 )
+                                                if unit_result.returncode == 0 and checkpoint is not None:
+                                                    checkpoint.record(sweep, unit)
                                             except subprocess.TimeoutExpired:
                                                 continue
+            except JobCancelled:
+                raise
             except Exception:
                 pass
 
@@ -3285,37 +3676,484 @@ def run_calculations():
         }), 500
 
 # =====================================
-# Calculate Sensitivity Endpoint
+# Parallel Sensitivity Variation Helpers
 # =====================================
-@app.route('/calculate-sensitivity', methods=['POST'])
-@with_file_lock(RUN_LOCK_FILE, "sensitivity calculations")
-@with_memory_lock(GLOBAL_RUN_LOCK, "sensitivity calculations")
-def calculate_sensitivity():
-    """
-    Execute specific sensitivity calculations using CFA-b.py with paths from CalSen service.
-    This endpoint runs after the general sensitivity configurations and runs have completed.
-    It leverages the CalSen service for path resolution to ensure consistent file locations.
+def get_sensitivity_max_workers(requested=None):
     """
-    run_id = time.strftime("%Y%m%d_%H%M%S")
+    Determine how many sensitivity variations may run concurrently.
 
+    Args:
+        requested (int, optional): Concurrency requested by the caller
+
+    Returns:
+        int: Number of workers, at least 1
+    """
     try:
-        # Check if sensitivity configurations have been generated using thread-safe function
-        is_configured, saved_config = check_sensitivity_config_status()
+        workers = int(requested) if requested else SENSITIVITY_MAX_WORKERS
+    except (TypeError, ValueError):
+        workers = SENSITIVITY_MAX_WORKERS
+    return max(1, workers)
 
-        if not is_configured:
-            return jsonify({
-                "error": "Sensitivity configurations have not been generated yet",
-                "message": "Please complete the /sensitivity/configure and /runs endpoints before calculating specific sensitivities",
-                "nextStep": "Call /sensitivity/configure endpoint first"
-            }), 400
+def list_variation_outputs(directories, since):
+    """
+    List the files a variation wrote to its output directories.
 
-        # Use the saved configuration data if available, otherwise use the request data
-        data = request.get_json()
-        if saved_config:
-            config = saved_config
-        elif data:
-            config = {
-                'versions': data.get('selectedVersions', [1]),
+    Args:
+        directories (list): Output directories of the variation
+        since (float): Time the variation started
+
+    Returns:
+        list: Paths of the files modified since the variation started
+    """
+    outputs = []
+    for directory in directories:
+        if not directory or not os.path.isdir(directory):
+            continue
+        for root, _, files in os.walk(directory):
+            for name in files:
+                file_path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(file_path) >= since:
+                        outputs.append(file_path)
+                except OSError:
+                    pass
+    return outputs
+
+def remove_partial_outputs(directories, since):
+    """
+    Remove the files a stopped variation wrote, leaving older files in place.
+
+    Args:
+        directories (list): Output directories of the variation
+        since (float): Time the variation started
+    """
+    for file_path in list_variation_outputs(directories, since):
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+def variation_unit(task):
+    """Checkpoint unit of a variation task."""
+    return f"{task['param_id']}|{task['mode'].lower()}|{task['var_str']}"
+
+def run_sensitivity_variation(cfa_b_script, version, config, task, timeout=300):
+    """
+    Run CFA-b.py for a single parameter variation.
+
+    The process runs with the variation's own directory as working directory,
+    so its log and output files never collide with other variations. Within
+    a job the process stops with the job (cancellation or deadline), and the
+    partial outputs of a variation that did not finish are removed.
+
+    Args:
+        cfa_b_script (str): Path to CFA-b.py
+        version (int): Version number
+        config (dict): Saved sensitivity configuration (selectedV, selectedF, targetRow, ...)
+        task (dict): Variation task with param_id, variation, mode, compare_to_key, var_path
+                     and optionally the resolved paths of the variation
+        timeout (int): Timeout in seconds
+
+    Returns:
+        tuple: (task, outcome) where outcome has value, success and optionally error;
+               after success, task['outputs'] lists the files the variation wrote
+    """
+    command = [
+        sys.executable, cfa_b_script,
+        str(version),
+        json.dumps(config.get('selectedV', {f'V{i+1}': 'off' for i in range(10)})),
+        json.dumps(config.get('selectedF', {f'F{i+1}': 'off' for i in range(5)})),
+        str(config.get('targetRow', 20)),
+        config.get('calculationOption', 'freeFlowNPV'),
+        '--param_id', task['param_id'],
+        '--variation', str(task['variation']),
+        '--compare_to_key', task['compare_to_key'],
+        '--mode', task['mode']
+    ]
+
+    # Hand the resolved paths to CFA-b.py so it does not look them up again
+    env = os.environ.copy()
+    paths = task.get('paths')
+    if paths:
+        env['RESULTS_FOLDER'] = paths['param_var_dir']
+        env['CONFIG_MATRIX_FILE'] = paths['config_matrix_file']
+        env['CONFIG_FILE'] = paths['config_file']
+
+    started = time.time()
+    output_dirs = [task['var_path'], paths['param_var_dir'] if paths else None]
+    try:
+        result = run_process(command, timeout=timeout, cwd=task['var_path'], env=env)
+        if result.returncode == 0:
+            task['outputs'] = list_variation_outputs(output_dirs, started)
+            return task, {'value': task['variation'], 'success': True}
+        return task, {'value': task['variation'], 'success': False, 'error': result.stderr}
+
+    except subprocess.TimeoutExpired as e:
+        remove_partial_outputs(output_dirs, started)
+        return task, {
+            'value': task['variation'],
+            'success': False,
+            'error': f'Calculation timed out after {e.timeout:.0f}s'
+        }
+    except JobCancelled as e:
+        remove_partial_outputs(output_dirs, started)
+        return task, {'value': task['variation'], 'success': False, 'cancelled': True, 'error': str(e)}
+    except Exception as e:
+        return task, {'value': task['variation'], 'success': False, 'error': str(e)}
+
+def run_sensitivity_variations_in_memory(version, config, tasks, solve_for_price=False, materialize=False,
+                                         on_complete=None):
+    """
+    Evaluate all parameter variations on the in-memory sensitivity engine.
+
+    The baseline is loaded once and every variation is applied as an overlay;
+    no variation directory is written unless materialize is set.
+
+    Args:
+        version (int): Version number
+        config (dict): Saved sensitivity configuration (selectedV, selectedF, targetRow, ...)
+        tasks (list): Variation tasks with param_id, variation, mode and var_path
+        solve_for_price (bool): Search the selling price per variation (calculateForPrice)
+        materialize (bool): Also write each variation directory for debugging
+        on_complete (callable, optional): Called with (task, outcome) for every variation,
+                                          as soon as its chunk completes
+
+    Returns:
+        list: List of (task, outcome) tuples
+    """
+    engine = get_request_engine({'version': version}, config)
+
+    completed = []
+    runnable = []
+    for task in tasks:
+        try:
+            engine.resolve_parameter_key(task['param_id'])
+            runnable.append(task)
+        except ValueError as e:
+            completed.append((task, {'value': task['variation'], 'success': False, 'error': str(e)}))
+            if on_complete:
+                on_complete(*completed[-1])
+
+    # Evaluate in chunks so a cancelled job stops between them
+    for start in range(0, len(runnable), IN_MEMORY_CHUNK_SIZE):
+        check_job_cancelled()
+        chunk = runnable[start:start + IN_MEMORY_CHUNK_SIZE]
+        results = engine.evaluate_batch(
+            [[(task['param_id'], task['variation'], task['mode'])] for task in chunk],
+            solve_for_price=solve_for_price
+        )
+        for task, result in zip(chunk, results):
+            outcome = {
+                'value': task['variation'],
+                'success': True,
+                'price': result['price'],
+                'npv': result['npv'],
+                'metrics': result['metrics']
+            }
+            if materialize:
+                engine.materialize_variation(
+                    [(task['param_id'], task['variation'], task['mode'])],
+                    task['var_path'],
+                    solve_for_price=solve_for_price
+                )
+            completed.append((task, outcome))
+            if on_complete:
+                on_complete(task, outcome)
+
+    return completed
+
+def run_sensitivity_variations_distributed(version, config, tasks, solve_for_price=False, on_complete=None):
+    """
+    Evaluate all parameter variations on the workers of the sweep coordinator.
+
+    The variations are sent in units of DISTRIBUTED_BATCH_SIZE; every worker
+    evaluates its units on the in-memory engine, so results match the
+    'inmemory' engine.
+
+    Args:
+        version (int): Version number
+        config (dict): Saved sensitivity configuration (selectedV, selectedF, targetRow, ...)
+        tasks (list): Variation tasks with param_id, variation and mode
+        solve_for_price (bool): Search the selling price per variation (calculateForPrice)
+        on_complete (callable, optional): Called with (task, outcome) as each variation's result arrives
+
+    Returns:
+        list: List of (task, outcome) tuples
+    """
+    evaluator = DistributedEvaluator(
+        get_sweep_coordinator(),
+        engine_spec(
+            version,
+            config.get('selectedV', {f'V{i+1}': 'off' for i in range(10)}),
+            config.get('selectedF', {f'F{i+1}': 'off' for i in range(5)}),
+            config.get('targetRow', 20),
+            ORIGINAL_BASE_DIR
+        ),
+        check=check_job_cancelled
+    )
+
+    completed = []
+    outcomes = evaluator.map_variations(
+        [(task['param_id'], task['variation'], task['mode']) for task in tasks],
+        solve_for_price=solve_for_price,
+        batch_size=DISTRIBUTED_BATCH_SIZE
+    )
+    for task, outcome in zip(tasks, outcomes):
+        completed.append((task, outcome))
+        if on_complete:
+            on_complete(task, outcome)
+    return completed
+
+def merge_sensitivity_results(version, sensitivity_dir, completed):
+    """
+    Record completed variations in the results store and export their results files.
+
+    Every variation is a single-row upsert in the store; each
+    {param}_vs_{compare}_{mode}_results.json file touched by the request is
+    then exported once as a view of the store.
+
+    Args:
+        version (int): Version number
+        sensitivity_dir (str): Sensitivity folder of the version
+        completed (list): List of (task, outcome) tuples
+    """
+    by_file = {}
+    for task, outcome in completed:
+        if outcome['success']:
+            by_file.setdefault(task['results_file'], []).append((task, outcome))
+
+    for results_file, file_results in by_file.items():
+        first = file_results[0][0]
+        result_set = (version, first['param_id'], first['compare_to_key'], first['mode'])
+        try:
+            import_results_file(sensitivity_dir, *result_set, results_file)
+            # In-memory results also carry price, npv and metrics
+            record_results(
+                sensitivity_dir,
+                *result_set,
+                {task['var_str']: outcome for task, outcome in file_results}
+            )
+            export_results_view(sensitivity_dir, *result_set, results_file)
+        except Exception as e:
+            # Log error but continue with the other results files
+            sensitivity_logger.error(f"Error saving results to {results_file}: {str(e)}")
+
+def plot_sensitivity_result(sensitivity_dir, result_data, plot_types):
+    """
+    Plot the price of every variation of one parameter.
+
+    Plots are written as {plot_type}_{param}_{compare}_primary.png into the
+    mode's plot type folders, where /api/sensitivity/visualize finds them.
+
+    Args:
+        sensitivity_dir (str): Sensitivity folder of the version
+        result_data (dict): Result set of the parameter (see load_results)
+        plot_types (list): Plot types to write (waterfall, bar, point)
+
+    Returns:
+        dict: Plot path keyed by plot type
+    """
+    param_id = result_data['param_id']
+    compare_to_key = result_data.get('compare_to_key', 'S13')
+    mode = result_data.get('mode', 'percentage')
+    mode_dir = MODE_DIR_MAPPING.get(mode.lower(), 'Percentage')
+
+    variations = {
+        var_str: outcome['price']
+        for var_str, outcome in sorted(result_data['variations'].items(), key=lambda item: float(item[0]))
+        if isinstance(outcome, dict) and outcome.get('price') is not None
+    }
+    if not variations:
+        return {}
+
+    plots = {}
+    for plot_type in plot_types:
+        plot_dir = os.path.join(sensitivity_dir, mode_dir, plot_type)
+        os.makedirs(plot_dir, exist_ok=True)
+        plot_path = os.path.join(plot_dir, f"{plot_type}_{param_id}_{compare_to_key}_primary.png")
+        create_png_plot({
+            "x_param": param_id,
+            "y_param": compare_to_key,
+            "plot_type": plot_type,
+            "axis_label": "Average Selling Price",
+            "datapoints": {"baseline": {}, "variations": variations}
+        }, plot_path)
+        plots[plot_type] = plot_path
+    return plots
+
+def start_sensitivity_pipeline(version, sensitivity_dir, sen_parameters, tasks):
+    """
+    Start the result extraction and plotting stages of a sensitivity sweep.
+
+    Each variation put into the "extract" stage as it completes has its price
+    read from its Economic_Summary and is recorded in the results store right
+    away. Once every variation of a parameter is in, its results file is
+    exported and the parameter is plotted in the "plot" stage, while the
+    variations of later parameters are still calculating.
+
+    Args:
+        version (int): Version number
+        sensitivity_dir (str): Sensitivity folder of the version
+        sen_parameters (dict): Sensitivity parameters of the sweep
+        tasks (list): Every variation task of the sweep, including resumed ones
+
+    Returns:
+        StagePipeline: Running pipeline; its plots attribute maps parameter IDs to the plots written
+    """
+    pending = {}
+    for task in tasks:
+        pending[task['results_file']] = pending.get(task['results_file'], 0) + 1
+    pending_lock = threading.Lock()
+
+    # Stage workers belong to the current job, like the calculation workers
+    pipeline = StagePipeline('sensitivity', initializer=bind_job, initargs=(current_job(),))
+    pipeline.plots = {}
+
+    def extract(item):
+        task, outcome = item
+        result_set = (version, task['param_id'], task['compare_to_key'], task['mode'])
+        try:
+            if outcome['success']:
+                if outcome.get('price') is None:
+                    summary_file = next((
+                        path for path in task.get('outputs') or []
+                        if os.path.basename(path).startswith('Economic_Summary') and path.endswith('.csv')
+                    ), None)
+                    price = extract_price_from_summary(version, task['param_id'], task['variation'], summary_file)
+                    if price is not None:
+                        outcome['price'] = price
+                import_results_file(sensitivity_dir, *result_set, task['results_file'])
+                record_results(sensitivity_dir, *result_set, {task['var_str']: outcome})
+        finally:
+            with pending_lock:
+                pending[task['results_file']] -= 1
+                finished = pending[task['results_file']] == 0
+            if finished:
+                # Last variation of the parameter: export its results file and plot it
+                result_data = export_results_view(sensitivity_dir, *result_set, task['results_file'])
+                if result_data is not None:
+                    pipeline.put('plot', (task, result_data))
+
+    def plot(item):
+        task, result_data = item
+        param_config = sen_parameters.get(task['param_id'], {})
+        plot_types = [plot_type for plot_type in ('waterfall', 'bar', 'point') if param_config.get(plot_type)]
+        pipeline.plots[task['param_id']] = plot_sensitivity_result(
+            sensitivity_dir, result_data, plot_types or ['waterfall', 'bar', 'point']
+        )
+
+    pipeline.add_stage('extract', extract)
+    # One plotting worker: pyplot is not thread-safe
+    pipeline.add_stage('plot', plot)
+    return pipeline
+
+# =====================================
+# Calculate Sensitivity Endpoint
+# =====================================
+def get_request_version(data, saved_config):
+    """
+    Version a sensitivity request runs against.
+
+    Args:
+        data (dict): Request data
+        saved_config (dict): Saved sensitivity configuration
+
+    Returns:
+        int: The request's version, else the first saved version
+    """
+    return data.get('version') or (saved_config.get('versions') or [1])[0]
+
+def get_enabled_parameters(data, saved_config):
+    """
+    Sensitivity parameters a request analyses.
+
+    Args:
+        data (dict): Request data
+        saved_config (dict): Saved sensitivity configuration
+
+    Returns:
+        list: The request's parameters, else the enabled saved S-parameters
+    """
+    return data.get('parameters') or [
+        param_id for param_id, param_config in saved_config.get('SenParameters', {}).items()
+        if param_config.get('enabled')
+    ]
+
+def get_request_engine(data, saved_config):
+    """
+    Build the in-memory sensitivity engine of a request.
+
+    Version, V/F selections and target row come from the request, falling back
+    to the saved sensitivity configuration.
+
+    Args:
+        data (dict): Request data
+        saved_config (dict): Saved sensitivity configuration
+
+    Returns:
+        SensitivityEngine: Engine over the request's version in ORIGINAL_BASE_DIR
+    """
+    return SensitivityEngine(
+        get_request_version(data, saved_config),
+        data.get('selectedV') or saved_config.get('selectedV', {f'V{i+1}': 'off' for i in range(10)}),
+        data.get('selectedF') or saved_config.get('selectedF', {f'F{i+1}': 'off' for i in range(5)}),
+        data.get('targetRow') or saved_config.get('targetRow', 20),
+        base_dir=ORIGINAL_BASE_DIR
+    )
+
+def get_solve_for_price(data, config):
+    """
+    Whether a sweep searches the selling price per variation.
+
+    The request's solveForPrice wins; without it the price is solved when
+    the saved calculation option is calculateForPrice.
+
+    Args:
+        data (dict): Request data (may be None)
+        config (dict): Saved sensitivity configuration (may be None)
+
+    Returns:
+        bool: True to solve for the price
+    """
+    default = (config or {}).get('calculationOption') == 'calculateForPrice'
+    return bool((data or {}).get('solveForPrice', default))
+
+@app.route('/calculate-sensitivity', methods=['POST'])
+@with_job_queue(
+    'calculate_sensitivity',
+    "sensitivity calculations",
+    cpus=lambda data: 1 if (data.get('engine') or SENSITIVITY_ENGINE) in ('inmemory', 'distributed')
+    else get_sensitivity_max_workers(data.get('maxWorkers'))
+)
+def calculate_sensitivity():
+    """
+    Execute specific sensitivity calculations using CFA-b.py with paths from the CalSen resolver.
+    This endpoint runs after the general sensitivity configurations and runs have completed.
+    It resolves paths in-process with the CalSen path index to ensure consistent file locations.
+    With "pipeline", results are extracted and plotted per parameter while
+    the variations of later parameters are still calculating. The
+    'distributed' engine spreads the variations over the sweep workers.
+    """
+    run_id = time.strftime("%Y%m%d_%H%M%S")
+
+    try:
+        # Check if sensitivity configurations have been generated using thread-safe function
+        is_configured, saved_config = check_sensitivity_config_status()
+
+        if not is_configured:
+            return jsonify({
+                "error": "Sensitivity configurations have not been generated yet",
+                "message": "Please complete the /sensitivity/configure and /runs endpoints before calculating specific sensitivities",
+                "nextStep": "Call /sensitivity/configure endpoint first"
+            }), 400
+
+        # Use the saved configuration data if available, otherwise use the request data
+        data = request.get_json()
+        if saved_config:
+            config = saved_config
+        elif data:
+            config = {
+                'versions': data.get('selectedVersions', [1]),
                 'selectedV': data.get('selectedV', {f'V{i+1}': 'off' for i in range(10)}),
                 'selectedF': data.get('selectedF', {f'F{i+1}': 'off' for i in range(5)}),
                 'calculationOption': data.get('selectedCalculationOption', 'freeFlowNPV'),
@@ -3349,15 +4187,8 @@ def calculate_sensitivity():
         calculation_results = {}
         overall_success = True
 
-        # Mode mapping for standardized directory names
-        mode_dir_mapping = {
-            'percentage': 'Percentage',
-            'directvalue': 'DirectValue',
-            'absolutedeparture': 'AbsoluteDeparture',
-            'montecarlo': 'MonteCarlo'
-        }
-
-        # Process each parameter with thread-safe approach
+        # Build one task per parameter variation; each task gets its own output directory
+        tasks = []
         for param_id, param_config in enabled_params:
             mode = param_config.get('mode', 'percentage')
             values = param_config.get('values', [])
@@ -3378,156 +4209,155 @@ def calculate_sensitivity():
             if not variations:
                 continue
 
-            param_results = {"variations": {}, "success": True}
-
-            # Process each variation with thread-safe approach
-            param_lock = threading.Lock()
-            with param_lock:
-                for variation in variations:
-                    var_str = f"{variation:+.2f}"
-
-                    # Create mode directory if it doesn't exist
-                    mode_dir = mode_dir_mapping.get(mode.lower(), 'Percentage')
-                    mode_path = os.path.join(sensitivity_dir, mode_dir)
-                    os.makedirs(mode_path, exist_ok=True)
-
-                    # Create parameter directory if it doesn't exist
-                    param_path = os.path.join(mode_path, param_id)
-                    os.makedirs(param_path, exist_ok=True)
+            calculation_results[param_id] = {"variations": {}, "success": True}
 
-                    # Create variation directory if it doesn't exist
-                    var_path = os.path.join(param_path, var_str)
-                    os.makedirs(var_path, exist_ok=True)
-
-                    # Run CFA-b.py for this variation
-                    try:
-                        # Use atomic operations for thread safety
-                        with tempfile.NamedTemporaryFile(mode='w+', delete=False, suffix='.json') as temp_file:
-                            # Create a temporary config file for this run
-                            temp_config = {
-                                "version": version,
-                                "param_id": param_id,
-                                "variation": variation,
-                                "compare_to_key": compare_to_key,
-                                "mode": mode,
-                                "output_dir": var_path
-                            }
-                            json.dump(temp_config, temp_file)
-                            temp_file_path = temp_file.name
-
-                        # Run the calculation script with the temporary config file
-                        result = subprocess.run(
-                            [sys.executable, cfa_b_script,
-                             '--config', temp_file_path,
-                             '--version', str(version),
-                             '--param', param_id,
-                             '--variation', str(variation),
-                             '--compare', compare_to_key,
-                             '--mode', mode],
-                            capture_output=True,
-                            text=True,
-                            timeout=300  # 5 minute timeout
-                        )
+            mode_path = os.path.join(sensitivity_dir, MODE_DIR_MAPPING.get(mode.lower(), 'Percentage'))
+            for variation in variations:
+                var_str = f"{variation:+.2f}"
+                var_path = os.path.join(mode_path, param_id, var_str)
+                tasks.append({
+                    "param_id": param_id,
+                    "variation": variation,
+                    "var_str": var_str,
+                    "mode": mode,
+                    "compare_to_key": compare_to_key,
+                    "var_path": var_path,
+                    "results_file": os.path.join(
+                        mode_path,
+                        f"{param_id}_vs_{compare_to_key}_{mode.lower()}_results.json"
+                    )
+                })
 
-                        # Clean up the temporary file
-                        try:
-                            os.unlink(temp_file_path)
-                        except:
-                            pass
+        engine = (data.get('engine') if data else None) or SENSITIVITY_ENGINE
+        solve_for_price = get_solve_for_price(data, config)
+        materialize = bool(data.get('materialize')) if data else False
+        pipelined = bool(data.get('pipeline', SENSITIVITY_PIPELINE)) if data else SENSITIVITY_PIPELINE
 
-                        # Check if calculation was successful
-                        if result.returncode == 0:
-                            # Save results to a JSON file
-                            results_file = os.path.join(
-                                mode_path,
-                                f"{param_id}_vs_{compare_to_key}_{mode.lower()}_results.json"
-                            )
-
-                            # Create or update results file
-                            try:
-                                if os.path.exists(results_file):
-                                    with open(results_file, 'r') as f:
-                                        existing_results = json.load(f)
-
-                                    # Update existing results
-                                    if 'variations' in existing_results:
-                                        existing_results['variations'][var_str] = {
-                                            'value': variation,
-                                            'success': True
-                                        }
-                                    else:
-                                        existing_results['variations'] = {
-                                            var_str: {
-                                                'value': variation,
-                                                'success': True
-                                            }
-                                        }
-
-                                    # Write updated results
-                                    with open(results_file, 'w') as f:
-                                        json.dump(existing_results, f, indent=2)
-                                else:
-                                    # Create new results file
-                                    new_results = {
-                                        'param_id': param_id,
-                                        'compare_to_key': compare_to_key,
-                                        'mode': mode,
-                                        'variations': {
-                                            var_str: {
-                                                'value': variation,
-                                                'success': True
-                                            }
-                                        }
-                                    }
-                                    with open(results_file, 'w') as f:
-                                        json.dump(new_results, f, indent=2)
-                            except Exception as e:
-                                # Log error but continue processing
-                                print(f"Error saving results for {param_id} variation {var_str}: {str(e)}")
-
-                            # Update param_results
-                            param_results['variations'][var_str] = {
-                                'value': variation,
-                                'success': True
-                            }
-                        else:
-                            # Update param_results with error
-                            param_results['variations'][var_str] = {
-                                'value': variation,
-                                'success': False,
-                                'error': result.stderr
-                            }
-                            param_results['success'] = False
-                            overall_success = False
-
-                    except subprocess.TimeoutExpired:
-                        # Update param_results with timeout error
-                        param_results['variations'][var_str] = {
-                            'value': variation,
-                            'success': False,
-                            'error': 'Calculation timed out after 5 minutes'
-                        }
-                        param_results['success'] = False
-                        overall_success = False
+        # Variations an interrupted run of the same sweep completed are not calculated again
+        checkpoint, sweep = get_sweep_checkpoint('calculate_sensitivity', {
+            'version': version,
+            'selectedV': config.get('selectedV'),
+            'selectedF': config.get('selectedF'),
+            'targetRow': config.get('targetRow'),
+            'calculationOption': config.get('calculationOption'),
+            'engine': engine,
+            'solveForPrice': solve_for_price
+        }, data)
+        completed = []
+        if checkpoint is not None:
+            finished = checkpoint.completed(sweep)
+            completed = [(task, finished[variation_unit(task)]) for task in tasks if variation_unit(task) in finished]
+            tasks = [task for task in tasks if variation_unit(task) not in finished]
+            if completed:
+                sensitivity_logger.info(f"Resuming sweep {sweep}: {len(completed)} variations already completed")
+        resumed = len(completed)
+        started = time.time()
+
+        pipeline = None
+        if pipelined:
+            pipeline = start_sensitivity_pipeline(
+                version, sensitivity_dir, config['SenParameters'], tasks + [task for task, _ in completed]
+            )
+            for item in completed:
+                pipeline.put('extract', item)
+
+        def record_variation(task, outcome):
+            if checkpoint is not None and outcome['success']:
+                outputs = task.get('outputs')
+                if outputs is None and materialize:
+                    # Materialized in-memory variations are checkpointed with their directory
+                    outputs = list_variation_outputs([task['var_path']], started)
+                checkpoint.record(sweep, variation_unit(task), outcome, outputs)
+            if pipeline is not None:
+                # Handed over last: extraction adds the price to the outcome
+                pipeline.put('extract', (task, outcome))
 
-                    except Exception as e:
-                        # Update param_results with general error
-                        param_results['variations'][var_str] = {
-                            'value': variation,
-                            'success': False,
-                            'error': str(e)
-                        }
-                        param_results['success'] = False
-                        overall_success = False
+        try:
+            if engine == 'inmemory':
+                # Evaluate every variation on the loaded baseline; only results are persisted
+                sensitivity_logger.info(f"Evaluating {len(tasks)} sensitivity variations in memory")
+                completed.extend(run_sensitivity_variations_in_memory(
+                    version, config, tasks,
+                    solve_for_price=solve_for_price,
+                    materialize=materialize,
+                    on_complete=record_variation
+                ))
+            elif engine == 'distributed':
+                # Shard the variations over the worker hosts of the sweep coordinator
+                sensitivity_logger.info(f"Distributing {len(tasks)} sensitivity variations to sweep workers")
+                completed.extend(run_sensitivity_variations_distributed(
+                    version, config, tasks,
+                    solve_for_price=solve_for_price,
+                    on_complete=record_variation
+                ))
+            else:
+                # Run the variations on a bounded pool of CFA-b.py processes
+                max_workers = get_sensitivity_max_workers(data.get('maxWorkers') if data else None)
+                sensitivity_logger.info(f"Running {len(tasks)} sensitivity variations with {max_workers} workers")
+
+                for task in tasks:
+                    os.makedirs(task['var_path'], exist_ok=True)
+                    task['paths'] = resolve_variation_paths(version, task['param_id'], task['variation'], ORIGINAL_BASE_DIR)
+
+                context = current_job()
+                # Workers belong to the job, so cancelling it terminates their processes
+                with ThreadPoolExecutor(max_workers=max_workers, initializer=bind_job, initargs=(context,)) as executor:
+                    futures = {
+                        executor.submit(run_sensitivity_variation, cfa_b_script, version, config, task): task
+                        for task in tasks
+                    }
+                    stopped = False
+                    for future in as_completed(futures):
+                        if future.cancelled():
+                            continue
+                        completed.append(future.result())
+                        record_variation(*completed[-1])
+                        if not stopped and context is not None and context.cancelled.is_set():
+                            # Stop dispatching queued variations; running ones are terminated with the job
+                            stopped = True
+                            for pending in futures:
+                                if pending.cancel():
+                                    completed.append((futures[pending], {
+                                        'value': futures[pending]['variation'],
+                                        'success': False,
+                                        'cancelled': True,
+                                        'error': context.cancel_reason
+                                    }))
+                                    record_variation(*completed[-1])
+        finally:
+            # Extraction and plotting of the last parameters finish here
+            pipeline_summary = pipeline.close() if pipeline is not None else None
+
+        for task, outcome in completed:
+            calculation_results[task['param_id']]['variations'][task['var_str']] = outcome
+            if not outcome['success']:
+                calculation_results[task['param_id']]['success'] = False
+                overall_success = False
+
+        if pipeline is not None:
+            for param_id, plots in pipeline.plots.items():
+                calculation_results[param_id]['plots'] = plots
+        else:
+            # Record the successful variations and export each results file once
+            merge_sensitivity_results(version, sensitivity_dir, completed)
 
-            # Add param_results to calculation_results
-            calculation_results[param_id] = param_results
+        cancelled = sum(1 for _, outcome in completed if outcome.get('cancelled'))
+        if cancelled:
+            return jsonify({
+                "status": "cancelled",
+                "message": f"Sensitivity calculations cancelled; {cancelled} variations did not run to completion",
+                "runId": run_id,
+                "resumed": resumed,
+                "results": calculation_results
+            }), 409
 
         # Return results
         return jsonify({
             "status": "success" if overall_success else "partial_success",
             "message": "Sensitivity calculations completed",
             "runId": run_id,
+            "resumed": resumed,
+            "pipeline": pipeline_summary,
             "results": calculation_results
         })
 
@@ -3537,12 +4367,553 @@ def calculate_sensitivity():
             "runId": run_id
         }), 500
 
+# =====================================
+# Variation Materialization Endpoint
+# =====================================
+@app.route('/sensitivity/materialize', methods=['POST'])
+def materialize_sensitivity_variation():
+    """
+    Write the directory of one in-memory sensitivity variation for debugging.
+
+    Expects JSON with version, paramId, variation and optionally mode,
+    selectedV, selectedF, targetRow and solveForPrice. Values missing from
+    the request are taken from the saved sensitivity configuration.
+    """
+    try:
+        data = request.get_json() or {}
+        _, saved_config = check_sensitivity_config_status()
+        saved_config = saved_config or {}
+
+        param_id = data.get('paramId')
+        if not param_id or data.get('variation') is None:
+            return jsonify({"error": "paramId and variation are required"}), 400
+
+        version = get_request_version(data, saved_config)
+        variation = float(data['variation'])
+        param_config = saved_config.get('SenParameters', {}).get(param_id, {})
+        mode = data.get('mode') or param_config.get('mode', 'percentage')
+
+        engine = get_request_engine(data, saved_config)
+
+        var_path = os.path.join(
+            ORIGINAL_BASE_DIR, f'Batch({version})', f'Results({version})', 'Sensitivity',
+            MODE_DIR_MAPPING.get(mode.lower(), 'Percentage'), param_id, f"{variation:+.2f}"
+        )
+        engine.materialize_variation([(param_id, variation, mode)], var_path,
+                                     solve_for_price=get_solve_for_price(data, saved_config))
+        record_variation_directory(
+            os.path.join(ORIGINAL_BASE_DIR, f'Batch({version})', f'Results({version})', 'Sensitivity'),
+            version, param_id, mode, variation, var_path
+        )
+
+        return jsonify({
+            "status": "success",
+            "version": version,
+            "paramId": param_id,
+            "variation": variation,
+            "path": var_path
+        })
+
+    except (ValueError, FileNotFoundError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Error materializing sensitivity variation: {str(e)}"}), 500
+
+# =====================================
+# Monte Carlo Sensitivity Endpoint
+# =====================================
+@app.route('/sensitivity/monte-carlo', methods=['POST'])
+def monte_carlo_sensitivity():
+    """
+    Run a Monte Carlo sensitivity analysis on the in-memory engine.
+
+    Expects JSON with optional version, distributions ({paramId: spec}),
+    samples, chunkSize, seed, solveForPrice and stream. Distributions missing
+    from the request are taken from saved parameters in montecarlo mode that
+    have a "distribution". With stream set, the running statistics are sent
+    as one JSON line per chunk; otherwise the final summary is returned.
+    The latest summary is kept in the version's MonteCarlo results folder.
+    With distributed set, the chunks are evaluated on the sweep workers.
+    Within a pipeline run, the run state is checkpointed after every chunk,
+    so the same request resumes an interrupted run (resume=false starts over).
+    """
+    try:
+        data = request.get_json() or {}
+        _, saved_config = check_sensitivity_config_status()
+        saved_config = saved_config or {}
+
+        version = get_request_version(data, saved_config)
+        distributions = data.get('distributions') or {
+            param_id: param_config['distribution']
+            for param_id, param_config in saved_config.get('SenParameters', {}).items()
+            if param_config.get('enabled') and param_config.get('mode', '').lower() == 'montecarlo'
+            and param_config.get('distribution')
+        }
+
+        engine = get_request_engine(data, saved_config)
+
+        samples = data.get('samples', 10000)
+        solve_for_price = get_solve_for_price(data, saved_config)
+        checkpoint, sweep = get_sweep_checkpoint('monte_carlo', {
+            'version': version,
+            'selectedV': data.get('selectedV') or saved_config.get('selectedV'),
+            'selectedF': data.get('selectedF') or saved_config.get('selectedF'),
+            'targetRow': engine.target_row,
+            'distributions': distributions,
+            'samples': samples,
+            'seed': data.get('seed'),
+            'solveForPrice': solve_for_price
+        }, data)
+        checkpoint_file, seed = None, data.get('seed')
+        if checkpoint is not None:
+            # A run is only resumable with its seed: unseeded runs keep the one drawn first
+            state = checkpoint.completed(sweep).get('state') or {}
+            seed = seed if seed is not None else state.get('seed', int(np.random.SeedSequence().entropy % 2 ** 63))
+            checkpoint_file = get_run_workspace().artifact(f"{sweep.replace(':', '_')}.npz")
+            if not state and os.path.exists(checkpoint_file):
+                # Saved after the last verified chunk (or tampered with): start over
+                os.remove(checkpoint_file)
+
+        summaries = iter_monte_carlo(
+            engine,
+            distributions,
+            samples=samples,
+            chunk_size=data.get('chunkSize', 2000),
+            seed=seed,
+            solve_for_price=solve_for_price,
+            checkpoint_file=checkpoint_file,
+            evaluator=get_sweep_evaluator(engine, data)
+        )
+        # The first chunk validates the distributions before anything is returned
+        first = next(summaries)
+
+        results_folder = get_monte_carlo_folder(version, ORIGINAL_BASE_DIR)
+        progress_file = os.path.join(results_folder, f"monte_carlo_progress({version}).json")
+        results_file = os.path.join(results_folder, f"monte_carlo_results({version}).json")
+
+        def save(summary):
+            write_summary(summary, progress_file)
+            if checkpoint is not None:
+                checkpoint.record(sweep, 'state', {'seed': seed, 'completed': summary['completed']}, [checkpoint_file])
+
+        def run():
+            summary = first
+            save(summary)
+            yield summary
+            for summary in summaries:
+                save(summary)
+                yield summary
+            write_summary(summary, results_file)
+            if checkpoint is not None:
+                # Only interrupted runs resume; the next request starts a new run
+                checkpoint.clear(sweep)
+                os.remove(checkpoint_file)
+            sensitivity_logger.info(
+                f"Monte Carlo run of version {version} finished: {summary['samples']} draws in {summary['duration']}s"
+            )
+
+        if data.get('stream'):
+            return Response(
+                (json.dumps(summary) + "\n" for summary in run()),
+                mimetype='application/x-ndjson'
+            )
+
+        summary = None
+        for summary in run():
+            pass
+        return jsonify({"status": "success", "resultsFile": results_file, **summary})
+
+    except (ValueError, FileNotFoundError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Error running Monte Carlo sensitivity: {str(e)}"}), 500
+
+# =====================================
+# Global Sensitivity (Sobol) Endpoint
+# =====================================
+def get_parameter_ranges(sen_parameters):
+    """
+    Derive variation ranges of the enabled S-parameters from their configured values.
+
+    A parameter's range spans its smallest and largest value; a single value v
+    spans -|v| to +|v|.
+
+    Args:
+        sen_parameters (dict): Sensitivity parameters keyed by parameter ID
+
+    Returns:
+        dict: {"low", "high", "apply"} per parameter ID
+    """
+    ranges = {}
+    for param_id, param_config in sen_parameters.items():
+        if not param_config.get('enabled'):
+            continue
+        values = []
+        for value in param_config.get('values', []):
+            try:
+                values.append(float(value))
+            except (TypeError, ValueError):
+                pass
+        if not values:
+            continue
+
+        low, high = min(values), max(values)
+        if low == high:
+            low, high = -abs(low), abs(low)
+        mode = param_config.get('mode', 'percentage').lower()
+        ranges[param_id] = {
+            "low": low,
+            "high": high,
+            "apply": mode if mode in ('percentage', 'directvalue', 'absolutedeparture') else 'percentage'
+        }
+    return ranges
+
+@app.route('/sensitivity/sobol', methods=['POST'])
+@with_job_queue('sobol', "global sensitivity analysis")
+def sobol_sensitivity():
+    """
+    Estimate first-order and total-order Sobol indices of the enabled S-parameters.
+
+    Expects JSON with optional version, parameters ({paramId: {low, high, apply}}),
+    baseSamples, maxEvaluations, tolerance, bootstrap, confidence, seed and
+    solveForPrice. Parameter ranges missing from the request are derived from
+    the saved sensitivity values. The report is written to the version's
+    sensitivity Reports folder.
+    """
+    try:
+        data = request.get_json() or {}
+        _, saved_config = check_sensitivity_config_status()
+        saved_config = saved_config or {}
+
+        version = get_request_version(data, saved_config)
+        parameters = data.get('parameters') or get_parameter_ranges(saved_config.get('SenParameters', {}))
+
+        engine = get_request_engine(data, saved_config)
+
+        report = run_sobol_analysis(
+            engine,
+            parameters,
+            base_samples=data.get('baseSamples', 512),
+            max_evaluations=data.get('maxEvaluations', 200000),
+            tolerance=data.get('tolerance', 0.01),
+            bootstrap=data.get('bootstrap', 200),
+            confidence=data.get('confidence', 0.95),
+            seed=data.get('seed'),
+            solve_for_price=get_solve_for_price(data, saved_config),
+            check=check_job_cancelled
+        )
+
+        report_path = get_sobol_report_path(version, ORIGINAL_BASE_DIR)
+        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+        atomic_write_json(report_path, report)
+        sensitivity_logger.info(
+            f"Sobol analysis of version {version}: {report['evaluations']} evaluations, "
+            f"converged={report['converged']} in {report['duration']}s"
+        )
+
+        return jsonify({"status": "success", "reportFile": report_path, **report})
+
+    except (ValueError, FileNotFoundError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Error running Sobol analysis: {str(e)}"}), 500
+
+# =====================================
+# Stochastic Scenario Endpoint
+# =====================================
+@app.route('/sensitivity/scenarios', methods=['POST'])
+@with_job_queue('scenarios', "scenario path analysis")
+def scenario_sensitivity():
+    """
+    Evaluate stochastic year-by-year paths of per-interval parameters.
+
+    Expects JSON with optional version, processes ({paramId: spec}),
+    scenarios, correlation (matrix in process order), seed, chunkSize and
+    solveForPrice. Processes missing from the request are taken from saved
+    parameters in scenario mode that have a "process". The report, with
+    NPV and price distributions per year, is written to the version's
+    sensitivity Reports folder.
+    """
+    try:
+        data = request.get_json() or {}
+        _, saved_config = check_sensitivity_config_status()
+        saved_config = saved_config or {}
+
+        version = get_request_version(data, saved_config)
+        processes = data.get('processes') or {
+            param_id: param_config['process']
+            for param_id, param_config in saved_config.get('SenParameters', {}).items()
+            if param_config.get('enabled') and param_config.get('mode', '').lower() == 'scenario'
+            and param_config.get('process')
+        }
+
+        engine = get_request_engine(data, saved_config)
+
+        report = run_scenarios(
+            engine,
+            processes,
+            scenarios=data.get('scenarios', 5000),
+            correlation=data.get('correlation'),
+            seed=data.get('seed'),
+            solve_for_price=get_solve_for_price(data, saved_config),
+            chunk_size=data.get('chunkSize', 5000),
+            check=check_job_cancelled
+        )
+
+        report_path = get_scenario_report_path(version, ORIGINAL_BASE_DIR)
+        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+        atomic_write_json(report_path, report)
+
+        return jsonify({"status": "success", "reportFile": report_path, **report})
+
+    except (ValueError, FileNotFoundError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Error running scenario analysis: {str(e)}"}), 500
+
+# =====================================
+# Design-Space Optimization Endpoint
+# =====================================
+@app.route('/sensitivity/optimize', methods=['POST'])
+@with_job_queue('optimization', "design-space optimization")
+def optimize_design():
+    """
+    Optimize several decision variables of a version on the in-memory engine.
+
+    Expects JSON with variables ({paramId or V/F switch: {low, high, apply}})
+    and optional version, objective ('price' or 'npv'), constraints, method
+    ('differential_evolution' or 'gradient'), polish, populationSize,
+    maxGenerations, mutation, crossover, tolerance, gradientStep,
+    gradientIterations and seed. The report, with the optimization path, is
+    written to the version's sensitivity Reports folder; with store set, the
+    path is also stored in the ClickHouse optimization_paths table.
+    """
+    try:
+        data = request.get_json() or {}
+        _, saved_config = check_sensitivity_config_status()
+        saved_config = saved_config or {}
+
+        version = get_request_version(data, saved_config)
+
+        engine = get_request_engine(data, saved_config)
+
+        report = run_optimization(
+            engine,
+            data.get('variables'),
+            objective=data.get('objective', 'price'),
+            constraints=data.get('constraints'),
+            method=data.get('method', 'differential_evolution'),
+            polish=data.get('polish', True),
+            population_size=data.get('populationSize', 32),
+            max_generations=data.get('maxGenerations', 100),
+            mutation=data.get('mutation', 0.7),
+            crossover=data.get('crossover', 0.9),
+            tolerance=data.get('tolerance', 1e-4),
+            gradient_step=data.get('gradientStep', 0.01),
+            gradient_iterations=data.get('gradientIterations', 50),
+            seed=data.get('seed'),
+            check=check_job_cancelled
+        )
+        if data.get('store'):
+            report['stored'] = store_optimization_report(report, data.get('zoneId', ''))
+
+        report_path = get_optimization_report_path(version, ORIGINAL_BASE_DIR)
+        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+        atomic_write_json(report_path, report)
+
+        return jsonify({"status": "success", "reportFile": report_path, **report})
+
+    except (ValueError, FileNotFoundError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Error running design-space optimization: {str(e)}"}), 500
+
+# =====================================
+# Tornado Endpoint
+# =====================================
+@app.route('/sensitivity/tornado', methods=['POST'])
+def tornado_sensitivity():
+    """
+    Evaluate the low/high swing of every parameter in one batch and return tornado bars.
+
+    Expects JSON with optional version, parameters (list of S-parameter IDs),
+    swing ({mode, low, high, overrides}), solveForPrice (default true) and
+    sortBy ('npv' or 'price'). Parameters default to the enabled saved
+    sensitivity parameters.
+    """
+    try:
+        data = request.get_json() or {}
+        _, saved_config = check_sensitivity_config_status()
+        saved_config = saved_config or {}
+
+        param_ids = get_enabled_parameters(data, saved_config)
+        if not param_ids:
+            return jsonify({"error": "No sensitivity parameters given or enabled"}), 400
+
+        engine = get_request_engine(data, saved_config)
+
+        tornado = build_tornado(
+            engine,
+            param_ids,
+            swing=data.get('swing'),
+            solve_for_price=data.get('solveForPrice', True),
+            sort_by=data.get('sortBy', 'npv')
+        )
+        return jsonify({"status": "success", **tornado})
+
+    except (ValueError, FileNotFoundError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Error building tornado data: {str(e)}"}), 500
+
+# =====================================
+# Two-Parameter Grid Endpoint
+# =====================================
+@app.route('/sensitivity/grid', methods=['POST'])
+def grid_sensitivity():
+    """
+    Evaluate a two-parameter grid for heatmaps on the in-memory engine.
+
+    Expects JSON with x and y axes ({paramId, values or low/high/steps, mode}),
+    optional version, solveForPrice (default true), batchCells and stream.
+    With stream set, every completed grid row is sent as one JSON line and
+    the last line carries the break-even contour; otherwise the full NPV and
+    price matrices are returned. The grid is kept in the version's
+    sensitivity Reports folder. With distributed set, the row batches are
+    evaluated on the sweep workers. Within a pipeline run, every completed row
+    is checkpointed, so the same request resumes an interrupted grid
+    (resume=false starts over).
+    """
+    try:
+        data = request.get_json() or {}
+        _, saved_config = check_sensitivity_config_status()
+        saved_config = saved_config or {}
+
+        x_axis, y_axis = data.get('x'), data.get('y')
+        if not isinstance(x_axis, dict) or not isinstance(y_axis, dict) \
+                or not x_axis.get('paramId') or not y_axis.get('paramId'):
+            return jsonify({"error": "Both x and y axes with a paramId are required"}), 400
+
+        version = get_request_version(data, saved_config)
+        engine = get_request_engine(data, saved_config)
+
+        solve_for_price = data.get('solveForPrice', True)
+        checkpoint, sweep = get_sweep_checkpoint('grid', {
+            'version': version,
+            'selectedV': data.get('selectedV') or saved_config.get('selectedV'),
+            'selectedF': data.get('selectedF') or saved_config.get('selectedF'),
+            'targetRow': engine.target_row,
+            'x': x_axis,
+            'y': y_axis,
+            'solveForPrice': solve_for_price
+        }, data)
+        resumed_rows = sorted(checkpoint.completed(sweep).values(), key=lambda row: row['row']) \
+            if checkpoint is not None else []
+
+        evaluator = get_sweep_evaluator(engine, data)
+
+        def evaluate_rows():
+            for row in iter_grid(engine, x_axis, y_axis, solve_for_price=solve_for_price,
+                                 batch_cells=data.get('batchCells', 5000),
+                                 skip_rows=[row['row'] for row in resumed_rows],
+                                 evaluator=evaluator):
+                if checkpoint is not None:
+                    checkpoint.record(sweep, row['row'], row)
+                yield row
+
+        # Rows of an interrupted grid come first, then the remaining rows as they are evaluated
+        rows = itertools.chain(resumed_rows, evaluate_rows())
+        started = time.time()
+        # The first row validates the axes before anything is returned
+        first = next(rows)
+        report_path = get_grid_report_path(version, x_axis['paramId'], y_axis['paramId'], ORIGINAL_BASE_DIR)
+
+        def finish(completed):
+            grid = assemble_grid(engine, x_axis, y_axis, completed, time.time() - started)
+            os.makedirs(os.path.dirname(report_path), exist_ok=True)
+            atomic_write_json(report_path, grid)
+            sensitivity_logger.info(
+                f"Grid {x_axis['paramId']} x {y_axis['paramId']} of version {version}: "
+                f"{len(grid['npv'])}x{len(grid['y']['values'])} cells in {grid['duration']}s"
+            )
+            return grid
+
+        if data.get('stream'):
+            def run():
+                completed = [first]
+                yield json.dumps(first) + "\n"
+                for row in rows:
+                    completed.append(row)
+                    yield json.dumps(row) + "\n"
+                grid = finish(completed)
+                yield json.dumps({
+                    "done": True,
+                    "reportFile": report_path,
+                    "breakEvenContour": grid["breakEvenContour"],
+                    "duration": grid["duration"]
+                }) + "\n"
+
+            return Response(run(), mimetype='application/x-ndjson')
+
+        grid = finish([first] + list(rows))
+        return jsonify({"status": "success", "reportFile": report_path, **grid})
+
+    except (ValueError, FileNotFoundError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Error evaluating sensitivity grid: {str(e)}"}), 500
+
+# =====================================
+# Goal Seek Endpoint
+# =====================================
+@app.route('/sensitivity/goal-seek', methods=['POST'])
+def goal_seek_sensitivity():
+    """
+    Find the break-even value of several S-parameters at once.
+
+    Expects JSON with optional version, parameters (list of S-parameter IDs),
+    brackets ({paramId: {mode, low, high}}), tolerance and maxIterations.
+    Parameters default to the enabled saved sensitivity parameters. The
+    results table is written to the version's sensitivity Reports folder.
+    """
+    try:
+        data = request.get_json() or {}
+        _, saved_config = check_sensitivity_config_status()
+        saved_config = saved_config or {}
+
+        version = get_request_version(data, saved_config)
+        param_ids = get_enabled_parameters(data, saved_config)
+        if not param_ids:
+            return jsonify({"error": "No sensitivity parameters given or enabled"}), 400
+
+        engine = get_request_engine(data, saved_config)
+
+        goal_seek = solve_break_even(
+            engine,
+            param_ids,
+            brackets=data.get('brackets'),
+            tolerance=float(data.get('tolerance', 1000)),
+            max_iterations=int(data.get('maxIterations', 100))
+        )
+
+        table_path = get_goal_seek_table_path(version, ORIGINAL_BASE_DIR)
+        write_goal_seek_table(goal_seek, table_path)
+        sensitivity_logger.info(
+            f"Goal seek of version {version}: {len(goal_seek['results'])} parameters in {goal_seek['duration']}s"
+        )
+
+        return jsonify({"status": "success", "tableFile": table_path, **goal_seek})
+
+    except (ValueError, FileNotFoundError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Error running goal seek: {str(e)}"}), 500
+
 # =====================================
 # Sensitivity Visualization Endpoint
 # =====================================
 @app.route('/api/sensitivity/visualize', methods=['POST'])
-@with_file_lock(VISUALIZATION_LOCK_FILE, "sensitivity visualization")
-@with_memory_lock(GLOBAL_VISUALIZE_LOCK, "sensitivity visualization")
+@with_job_queue('visualize', "sensitivity visualization")
 def sensitivity_visualize():
     """
     Generate visualization data for sensitivity analysis.
@@ -3584,13 +4955,7 @@ def sensitivity_visualize():
 
         # Check if plots exist or need to be generated
         plots_info = {}
-        mode_dir_mapping = {
-            'percentage': 'Percentage',
-            'directvalue': 'DirectValue',
-            'absolutedeparture': 'AbsoluteDeparture',
-            'montecarlo': 'MonteCarlo'
-        }
-        mode_dir = mode_dir_mapping.get(mode.lower(), 'Percentage')
+        mode_dir = MODE_DIR_MAPPING.get(mode.lower(), 'Percentage')
 
         base_dir = os.path.join(BASE_DIR, 'backend', 'Original')
         sensitivity_dir = os.path.join(
@@ -3698,16 +5063,16 @@ def get_sensitivity_parameters():
     try:
         version = request.args.get('version', '1')
 
-        # Try to get parameters from CalSen service first
+        # Try to get parameters from the CalSen path index first
         try:
-            response = requests.post(
-                "http://localhost:2750/list_parameters",
-                json={"version": int(version)},
-                timeout=5
-            )
-
-            if response.status_code == 200:
-                return jsonify(response.json())
+            parameters = list_parameters(int(version), ORIGINAL_BASE_DIR)
+            if parameters:
+                return jsonify({
+                    "status": "success",
+                    "version": int(version),
+                    "parameters": parameters,
+                    "count": len(parameters)
+                })
         except Exception:
             # Continue with fallback
             pass
@@ -3773,6 +5138,9 @@ def run_all_sensitivity():
     """
     Unified wrapper to execute all sensitivity endpoints sequentially.
     Meant to replicate frontend's full analysis process with a single call.
+    With a runId, every completed step is checkpointed in the run's
+    workspace with the digests of the files it wrote, so calling it again
+    for the run resumes after the last step whose files are unchanged.
     """
     try:
         payload = request.get_json()
@@ -3785,8 +5153,39 @@ def run_all_sensitivity():
 
         enabled_params = payload.get('enabledParams', [])
 
+        run_id = payload.get('runId')
+        checkpoint, sweep = get_sweep_checkpoint('run_all_sensitivity', {
+            'version': version, 'enabledParams': enabled_params
+        }, payload) if run_id else (None, None)
+        finished = checkpoint.completed(sweep) if checkpoint is not None else {}
+        results_folder = get_results_folder(ORIGINAL_BASE_DIR, version)
+        recorded = {}
+        ran = []
+
+        def step(name, call):
+            # Steps completed before an interruption return their recorded response,
+            # unless an earlier step had to run again (its files were missing or changed)
+            if name in finished and not ran:
+                return finished[name]
+            ran.append(name)
+            started = time.time()
+            response = call()
+            if checkpoint is not None and isinstance(response, dict) and 'error' not in response \
+                    and response.get('status') not in ('error', 'failed', 'cancelled'):
+                artifacts = list_variation_outputs([results_folder], started)
+                checkpoint.record(sweep, name, response, artifacts)
+                # Earlier steps whose files this step rewrote are recorded with the new digests
+                for earlier, (earlier_response, earlier_artifacts) in recorded.items():
+                    if set(earlier_artifacts) & set(artifacts):
+                        checkpoint.record(sweep, earlier, earlier_response, earlier_artifacts)
+                recorded[name] = (response, artifacts)
+            return response
+
         def post(path, body=None):
-            r = requests.post(f"{base_url}{path}", headers=headers, json=body or payload)
+            body = body or payload
+            if run_id:
+                body = {**body, 'runId': run_id}
+            r = requests.post(f"{base_url}{path}", headers=headers, json=body)
             return r.json()
 
         def get(path):
@@ -3795,8 +5194,8 @@ def run_all_sensitivity():
 
         # Execute the full pipeline in sequence
         result = {
-            "configure": post('/sensitivity/configure'),
-            "runs": post('/runs')
+            "configure": step('configure', lambda: post('/sensitivity/configure')),
+            "runs": step('runs', lambda: post('/runs'))
         }
 
         # If specific parameters are enabled, run calculations for each
@@ -3810,7 +5209,10 @@ def run_all_sensitivity():
                         param_id: {"enabled": True}
                     }
                 }
-                param_results[param_id] = post('/calculate-sensitivity', param_payload)
+                param_results[param_id] = step(
+                    f"calculate_sensitivity:{param_id}",
+                    lambda: post('/calculate-sensitivity', param_payload)
+                )
             result["calculate_sensitivity"] = param_results
 
         # Check if calsen_paths.json exists
@@ -3818,11 +5220,12 @@ def run_all_sensitivity():
 
         # Run script_econ.py
         if result["check_calsen_paths"].get("exists", False):
-            result["run_script_econ"] = post('/run-script-econ', {"version": version})
+            result["run_script_econ"] = step('run_script_econ', lambda: post('/run-script-econ', {"version": version}))
 
         return jsonify({
             "status": "success",
             "message": "All sensitivity routes triggered via unified endpoint.",
+            "resumedSteps": sorted(set(finished) - set(ran)),
             "results": result
         })
 
@@ -4205,11 +5608,11 @@ def run_process_sensitivity_results():
     """
     data = request.get_json()
     version = data.get('version', '1')
-    wait_time_minutes = data.get('wait_time_minutes', 0.5)  # Default to 30 seconds
+    wait_time_minutes = data.get('wait_time_minutes', 0.5)  # Maximum wait for the config copy stage
 
     try:
         # Call the incorporated process_sensitivity_results function
-        logger.info(f"Processing sensitivity results for version {version} with wait time {wait_time_minutes} minutes")
+        logger.info(f"Processing sensitivity results for version {version} (waiting up to {wait_time_minutes} minutes for configurations)")
         result = process_sensitivity_results(int(version), float(wait_time_minutes))
 
         if result.get('status') == 'success':
@@ -4232,13 +5635,62 @@ def run_process_sensitivity_results():
             'message': f'Error processing sensitivity results: {str(e)}'
         }), 500
 
+# =====================================
+# Job Queue Endpoints
+# =====================================
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    """List queued, running and finished jobs, optionally filtered by status, kind and version."""
+    version = request.args.get('version')
+    scheduler = get_job_scheduler()
+    jobs = scheduler.list_jobs(
+        status=request.args.get('status'),
+        kind=request.args.get('kind'),
+        key=f"version:{version}" if version else None,
+        limit=request.args.get('limit', 100, type=int)
+    )
+    return jsonify({"jobs": jobs, "scheduler": scheduler.stats()})
+
+@app.route('/jobs/stats', methods=['GET'])
+def job_queue_stats():
+    """Get job counts per state and the scheduler's CPU slot usage."""
+    return jsonify(get_job_scheduler().stats())
+
+@app.route('/jobs/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get a job with its result once finished."""
+    job = get_job_scheduler().get(job_id)
+    if job is None:
+        return jsonify({"error": f"Job {job_id} not found"}), 404
+    return jsonify(job)
+
+@app.route('/jobs/<int:job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued or running job; its child processes are terminated."""
+    reason = (request.get_json(silent=True) or {}).get('reason') or "Cancelled by request"
+    job = get_job_scheduler().cancel(job_id, reason)
+    if job is None:
+        return jsonify({"error": f"Job {job_id} not found"}), 404
+    return jsonify(job)
+
 # =====================================
 # Pipeline Reset Endpoint
 # =====================================
+@app.route('/sweep-workers', methods=['GET'])
+def sweep_workers():
+    """List the worker hosts connected to the sweep coordinator."""
+    if not SWEEP_COORDINATOR_ADDRESS:
+        return jsonify({"enabled": False, "workers": []})
+    return jsonify({"enabled": True, **get_sweep_coordinator().status()})
+
 @app.route('/reset_pipeline', methods=['POST'])
 def reset_pipeline():
-    """Reset the execution pipeline and clear all event flags"""
-    reset_execution_pipeline()
+    """Reset the pipeline of the run given by runId, or of every run, cancelling their jobs"""
+    run_id = (request.get_json(silent=True) or {}).get('runId') or request.args.get('runId')
+    workspace = RUN_WORKSPACES.get(run_id) if run_id else None
+    if run_id and workspace is None:
+        return jsonify({"error": f"Run {run_id} not found"}), 404
+    reset_execution_pipeline(workspace)
     return jsonify({
         "status": "success",
         "message": "Pipeline reset successfully",
@@ -4260,17 +5712,21 @@ def health_check():
     except requests.exceptions.RequestException:
         pass
 
+    # Pipeline state of the most recent active run
+    workspace = RUN_WORKSPACES.latest(active_only=True)
+
     return jsonify({
         "status": "ok",
         "server": "sensitivity-analysis-server-with-pipeline-control",
         "version": "2.0.0",
         "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
         "pipeline": {
-            "active": PIPELINE_ACTIVE.is_set(),
-            "payload_registered": PAYLOAD_REGISTERED.is_set(),
-            "baseline_completed": BASELINE_COMPLETED.is_set(),
-            "config_completed": CONFIG_COMPLETED.is_set(),
-            "runs_completed": RUNS_COMPLETED.is_set()
+            "runId": workspace.run_id if workspace is not None else None,
+            "active": workspace is not None,
+            "payload_registered": workspace is not None and workspace.is_set(PAYLOAD_REGISTERED),
+            "baseline_completed": workspace is not None and workspace.is_set(BASELINE_COMPLETED),
+            "config_completed": workspace is not None and workspace.is_set(CONFIG_COMPLETED),
+            "runs_completed": workspace is not None and workspace.is_set(RUNS_COMPLETED)
         },
         "services": {
             "calsen_service": calsen_service_status
@@ -4281,16 +5737,14 @@ def health_check():
 # Application Entry Point
 # =====================================
 if __name__ == '__main__':
-    # Ensure all lock files are cleaned up on startup
-    for lock_file in [CONFIG_LOCK_FILE, RUN_LOCK_FILE, VISUALIZATION_LOCK_FILE,
-                      PAYLOAD_LOCK_FILE, BASELINE_LOCK_FILE]:
-        if os.path.exists(lock_file):
-            try:
-                os.remove(lock_file)
-            except:
-                pass
-
     # Initialize event flags
     reset_execution_pipeline()
 
+    # Resume queued jobs in the serving process (the debug reloader parent only watches files)
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        get_job_scheduler().start()
+        # Accept worker hosts before the first distributed sweep
+        if SWEEP_COORDINATOR_ADDRESS:
+            get_sweep_coordinator()
+
     app.run(debug=True, host='127.0.0.1', port=2500)
@@ -1,6 +1,7 @@
 from flask import Flask, request, jsonify
 import os
 import re
+import sys
 from flask_cors import CORS
 from pathlib import Path
 
@@ -11,6 +12,9 @@ CORS(app)  # Enable CORS for all routes
 script_dir = Path(__file__).resolve().parent.parent
 UPLOAD_DIR = script_dir.parent / "Original"
 
+sys.path.append(str(script_dir))
+from Configuration_management.config_diff import get_raw_config_path
+
 def medieval_parse_and_sanitize(content):
     filtered_values_json = []
     filtered_value_objects = []
@@ -172,7 +176,8 @@ def load_configuration():
     if not version:
         return jsonify({"error": "Version is required"}), 400
 
-    original_file_path = UPLOAD_DIR / f'Batch({version})/ConfigurationPlotSpec({version})/U_configurations({version}).py'
+    # Versions created from a base version load the base version's raw configuration until saved
+    original_file_path = get_raw_config_path(version)
     
     try:
         with open(original_file_path, 'r', encoding='utf-8') as f:
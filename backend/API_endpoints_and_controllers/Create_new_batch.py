@@ -1,9 +1,14 @@
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 import os
+import sys
+import json
 import shutil
 import threading
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Configuration_management.config_diff import diff_versions, get_delta_path, load_version_config
+
 app = Flask(__name__)
 CORS(app)
 #
@@ -51,7 +56,7 @@ def find_next_missing_versions(versions):
     next_new_version = max_version + 1
     return missing_versions, next_new_version
 
-def create_new_batch():
+def create_new_batch(base_version=None):
     with lock:
         current_versions = get_all_versions()
         missing_versions, next_new_version = find_next_missing_versions(current_versions)
@@ -61,13 +66,19 @@ def create_new_batch():
             create_batch(version)
 
         # Create a new batch for the next version after the highest
-        create_batch(next_new_version)
+        create_batch(next_new_version, base_version)
 
         # Return the new batch number
         return next_new_version
 
-def create_batch(version):
-    """Create a batch for the specified version number."""
+def create_batch(version, base_version=None):
+    """Create a batch for the specified version number.
+
+    With base_version the new batch is stored as base + delta (an empty
+    delta at creation) instead of a copy of the template configuration.
+    Only the delta is written; the build compiles the configuration from
+    the base version and the delta when it needs it.
+    """
     new_batch_folder = os.path.join(STATIC_FOLDER, f'Batch({version})')
     new_config_folder = os.path.join(new_batch_folder, f'ConfigurationPlotSpec({version})')
     results_folder = os.path.join(new_batch_folder, f'Results({version})')
@@ -82,6 +93,18 @@ def create_batch(version):
     if not os.path.exists(results_folder):
         os.makedirs(results_folder)
 
+    # Store the new version as a delta of an existing version
+    if base_version is not None:
+        load_version_config(base_version)  # Fails early if the base version has no configuration
+        with open(get_delta_path(version), 'w') as f:
+            json.dump({
+                "base_version": int(base_version),
+                "version": int(version),
+                "attributes": {"changed": {}, "removed": []},
+                "filtered_values": {"added": [], "removed": []}
+            }, f, indent=4)
+        return
+
     # Copy from Batch(0)/ConfigurationPlotSpec(0)
     previous_config_folder = os.path.join(STATIC_FOLDER, f'Batch(0)', f'ConfigurationPlotSpec(0)')
     if os.path.exists(previous_config_folder):
@@ -100,7 +123,8 @@ def create_batch(version):
 def create_new_batch_route():
     try:
         # Create a new batch and get the new batch number
-        NewBatchNumber = create_new_batch()
+        data = request.get_json(silent=True) or {}
+        NewBatchNumber = create_new_batch(data.get('baseVersion'))
         return jsonify({
             "message": "New batch created successfully", 
             "NewBatchNumber": NewBatchNumber
@@ -108,5 +132,20 @@ def create_new_batch_route():
     except Exception as e:
         return jsonify({"message": "Error creating new batches", "error": str(e)}), 500
 
+@app.route('/config_diff', methods=['POST'])
+def config_diff_route():
+    """Return the structured delta between two versions' compiled configurations."""
+    try:
+        data = request.get_json(silent=True) or {}
+        base_version = data.get('baseVersion')
+        version = data.get('version')
+        if base_version is None or version is None:
+            return jsonify({"message": "baseVersion and version are required"}), 400
+        return jsonify(diff_versions(base_version, version)), 200
+    except FileNotFoundError as e:
+        return jsonify({"message": "Configuration not found", "error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"message": "Error computing configuration diff", "error": str(e)}), 500
+
 if __name__ == '__main__':
     app.run(debug=True, port=8001)
@@ -1,7 +1,11 @@
 from flask import Flask, request, jsonify
 import os
 import re
+import sys
 from flask_cors import CORS
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Configuration_management.config_diff import get_raw_config_path
 #
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
@@ -169,7 +173,8 @@ def load_configuration():
     if not version:
         return jsonify({"error": "Version is required"}), 400
 
-    original_file_path = os.path.join(UPLOAD_DIR, f'Batch({version})/ConfigurationPlotSpec({version})/U_configurations({version}).py')
+    # Versions created from a base version load the base version's raw configuration until saved
+    original_file_path = get_raw_config_path(version)
     
     try:
         with open(original_file_path, 'r', encoding='utf-8') as f:
@@ -3,18 +3,18 @@
 Process Sensitivity Results
 
 This script runs independently after the main sensitivity calculation flow:
-1. Waits for configuration modifications to complete
+1. Waits for the config copy stage to signal that configuration modifications are complete
 2. Executes CFA_Sensitivity.py on each modified configuration
 3. Extracts actual prices and metrics from economic summaries
 4. Constructs a standardized result data structure
 5. Stores results in the expected location using SensitivityFileManager
 
 Usage:
-    python process_sensitivity_results.py <version> [wait_time_minutes]
+    python process_sensitivity_results.py <version> [max_wait_minutes]
 
 Arguments:
     version: The calculation version number
-    wait_time_minutes: Optional waiting time in minutes before processing (default: 3)
+    max_wait_minutes: Optional maximum time in minutes to wait for the configurations (default: 30)
 """
 import os
 import sys
@@ -29,13 +29,18 @@ import glob
 # Add parent directory to path to allow importing modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from Sensitivity_File_Manager import SensitivityFileManager
+from utils.stage_completion import wait_for_stage
+from utils.sensitivity_manifest import find_artifact, ECONOMIC_SUMMARY, CONFIG_MODULES
 
 # Base directories setup
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 SCRIPT_DIR = os.path.join(BASE_DIR, 'backend')
 LOGS_DIR = os.path.join(SCRIPT_DIR, 'Logs')
 ORIGINAL_BASE_DIR = os.path.join(BASE_DIR, 'backend', 'Original')
-SENSITIVITY_CONFIG_DATA_PATH = os.path.join(LOGS_DIR, "sensitivity_config_data.pkl")
+# The server passes the configuration snapshot of the run being processed
+SENSITIVITY_CONFIG_DATA_PATH = os.environ.get(
+    'SENSITIVITY_CONFIG_DATA_PATH', os.path.join(LOGS_DIR, "sensitivity_config_data.pkl")
+)
 
 # Configure logger
 logging.basicConfig(
@@ -66,9 +71,12 @@ def extract_price_from_summary(version, param_id, variation):
         # Format variation string for directory name
         var_str = f"{variation:+.2f}"
         
-        # First, find the correct Economic_Summary file for this variation
-        # Check in the parameter variation directory
-        search_paths = [
+        # Look the Economic_Summary file up in the sweep manifest first
+        sensitivity_dir = os.path.join(ORIGINAL_BASE_DIR, f'Batch({version})', f'Results({version})', 'Sensitivity')
+        summary_file = find_artifact(sensitivity_dir, version, param_id, variation, ECONOMIC_SUMMARY)
+        
+        # Otherwise search the parameter variation directories
+        search_paths = [] if summary_file else [
             # Main directory search pattern
             os.path.join(
                 ORIGINAL_BASE_DIR,
@@ -103,7 +111,6 @@ def extract_price_from_summary(version, param_id, variation):
             )
         ]
         
-        summary_file = None
         for pattern in search_paths:
             matches = glob.glob(pattern)
             if matches:
@@ -230,11 +237,17 @@ def check_configuration_readiness(version, param_id, mode, variations):
         bool: True if all configuration files are ready, False otherwise
     """
     all_ready = True
+    sensitivity_dir = os.path.join(ORIGINAL_BASE_DIR, f'Batch({version})', f'Results({version})', 'Sensitivity')
     
     for variation in variations:
         var_str = f"{variation:+.2f}"
         mode_dir = 'symmetrical' if mode.lower() == 'symmetrical' else 'multiple'
         
+        # Config modules recorded in the sweep manifest need no directory listing
+        if find_artifact(sensitivity_dir, version, param_id, variation, CONFIG_MODULES):
+            logger.info(f"Found configuration for {param_id} variation {var_str} in manifest")
+            continue
+        
         # Check if the parameter variation directory exists and has config files
         var_dir = os.path.join(
             ORIGINAL_BASE_DIR,
@@ -251,8 +264,9 @@ def check_configuration_readiness(version, param_id, mode, variations):
             all_ready = False
             continue
             
-        # Check for configuration files
+        # Check for configuration files (module bundle or per-interval module files)
         config_files = glob.glob(os.path.join(var_dir, f"{version}_config_module_*.json"))
+        config_files += glob.glob(os.path.join(var_dir, f"{version}_config_modules.bundle"))
         
         if not config_files:
             logger.info(f"No configuration files found in {var_dir}")
@@ -293,45 +307,28 @@ def main():
         logger.warning("No sensitivity parameters found in configuration")
         sys.exit(1)
     
-    # Wait for configurations to be ready
-    start_time = time.time()
-    configs_ready = False
-    
-    while not configs_ready:
-        # Check if all parameter variations have configurations
-        configs_ready = True
-        
-        for param_id, param_config in sen_parameters.items():
-            if not param_config.get('enabled'):
-                continue
-                
-            mode = param_config.get('mode', 'symmetrical')
-            values = param_config.get('values', [])
-            
-            # Determine variations based on mode
-            if mode.lower() == 'symmetrical':
-                base_variation = values[0]
-                variations = [base_variation, -base_variation]
-            else:
-                variations = values
-            
-            # Check if configurations for this parameter are ready
-            param_ready = check_configuration_readiness(version, param_id, mode, variations)
-            
-            if not param_ready:
-                configs_ready = False
-                logger.info(f"Configurations for {param_id} not ready yet")
-        
-        # Check if we've exceeded the maximum wait time
-        elapsed_minutes = (time.time() - start_time) / 60
-        if elapsed_minutes >= max_wait_time:
-            logger.warning(f"Maximum wait time of {max_wait_time} minutes exceeded, proceeding anyway")
-            break
-            
-        if not configs_ready:
-            logger.info(f"Waiting 30 seconds before checking again...")
-            time.sleep(30)
-    
+    # Wait for the config copy stage to signal completion; it returns at once if already done
+    sensitivity_dir = os.path.join(ORIGINAL_BASE_DIR, f'Batch({version})', f'Results({version})', 'Sensitivity')
+    if not wait_for_stage(sensitivity_dir, 'config_copy', timeout=max_wait_time * 60):
+        logger.warning(f"Maximum wait time of {max_wait_time} minutes exceeded, proceeding anyway")
+
+    for param_id, param_config in sen_parameters.items():
+        if not param_config.get('enabled'):
+            continue
+
+        mode = param_config.get('mode', 'symmetrical')
+        values = param_config.get('values', [])
+
+        # Determine variations based on mode
+        if mode.lower() == 'symmetrical':
+            base_variation = values[0]
+            variations = [base_variation, -base_variation]
+        else:
+            variations = values
+
+        if not check_configuration_readiness(version, param_id, mode, variations):
+            logger.info(f"Configurations for {param_id} are incomplete")
+
     # Load sensitivity configuration
     config_data = load_sensitivity_config(version)
     
@@ -5,8 +5,8 @@ This module provides functionality to copy configuration modules for sensitivity
 It is designed to work independently from the main calculation orchestration.
 
 Key features:
-1. Applies sensitivity variations to all configuration modules (1-100)
-2. Implements a pause before execution to ensure files exist
+1. Applies sensitivity variations to every configuration module of the version
+2. Starts as soon as the config_modules stage signals that its files exist
 3. Organized configuration copying for each sensitivity parameter
 4. Complete logging and error handling
 5. Generates SensitivityPlotDatapoints_{version}.json for plot visualization
@@ -40,6 +40,21 @@ os.makedirs(LOGS_DIR, exist_ok=True)
 LOG_FILE_PATH = os.path.join(LOGS_DIR, "CONFIG_COPY.log")
 SENSITIVITY_LOG_PATH = os.path.join(LOGS_DIR, "SENSITIVITY.log")
 
+# Make backend packages importable
+if SCRIPT_DIR not in sys.path:
+    sys.path.append(SCRIPT_DIR)
+from Configuration_management.config_bundle import get_bundle_path, write_config_bundle, load_config_modules
+from utils.stage_completion import wait_for_stage, mark_stage_complete, clear_stage
+from utils.sensitivity_manifest import record_variation_directory
+
+# Layout of config modules written into sensitivity variation directories:
+# 'bundle' writes one indexed {version}_config_modules.bundle per variation,
+# 'files' writes one {version}_config_module_{start}.json per interval
+CONFIG_MODULE_LAYOUT = os.environ.get('CONFIG_MODULE_LAYOUT', 'bundle').lower()
+
+# Maximum seconds to wait for the config_modules stage to signal completion
+STAGE_WAIT_TIMEOUT = float(os.environ.get('STAGE_WAIT_TIMEOUT', 60))
+
 # Sensitivity configuration status file
 SENSITIVITY_CONFIG_STATUS_PATH = os.path.join(LOGS_DIR, "sensitivity_config_status.json")
 SENSITIVITY_CONFIG_DATA_PATH = os.path.join(LOGS_DIR, "sensitivity_config_data.pkl")
@@ -147,20 +162,14 @@ def generate_sensitivity_datapoints(version, SenParameters):
 
     # Find a base configuration module to extract baseline values
     base_config = None
-    base_config_path = None
 
-    for module_num in range(1, 101):
-        potential_path = os.path.join(source_dir, f"{version}_config_module_{module_num}.json")
-        if os.path.exists(potential_path):
-            base_config_path = potential_path
-            try:
-                with open(base_config_path, 'r') as f:
-                    base_config = json.load(f)
-                sensitivity_logger.info(f"Loaded base configuration from {base_config_path}")
-                break
-            except Exception as e:
-                sensitivity_logger.warning(f"Failed to load {potential_path}: {str(e)}")
-                continue
+    try:
+        source_modules = load_config_modules(source_dir, version)
+        if source_modules:
+            base_config = source_modules[0][1]
+            sensitivity_logger.info(f"Loaded base configuration module {source_modules[0][0]} from {source_dir}")
+    except Exception as e:
+        sensitivity_logger.warning(f"Failed to load config modules from {source_dir}: {str(e)}")
 
     if not base_config:
         sensitivity_logger.warning("No base configuration module found. Using fallback values.")
@@ -354,7 +363,7 @@ def generate_sensitivity_datapoints(version, SenParameters):
 
 def process_config_modules(version, SenParameters):
     """
-    Process all configuration modules (1-100) for all parameter variations.
+    Process all configuration modules of a version for all parameter variations.
     Apply sensitivity variations and save modified configurations.
 
     Args:
@@ -392,10 +401,15 @@ def process_config_modules(version, SenParameters):
         os.makedirs(config_plot_spec_dir, exist_ok=True)
         sensitivity_logger.info(f"Created/ensured ConfigurationPlotSpec directory: {config_plot_spec_dir}")
 
-        # 5-minute pause before looking for CSV files to ensure they exist
-        sensitivity_logger.info("Starting 5-minute pause to ensure CSV files exist...")
-        time.sleep(3)  # 5-minute pause to ensure files exist
-        sensitivity_logger.info("Resuming after 5-minute pause, checking for CSV files...")
+        # Start as soon as the config_modules stage has signalled completion. Without a
+        # marker, its bundle (written last) means it has run; module1.py writes the
+        # matrix before config_modules starts, so the matrix alone does not
+        clear_stage(sensitivity_dir, 'config_copy')
+        if not wait_for_stage(source_dir, 'config_modules', timeout=STAGE_WAIT_TIMEOUT, outputs=[
+            get_bundle_path(source_dir, version),
+            os.path.join(source_dir, f"General_Configuration_Matrix({version}).csv")
+        ]):
+            sensitivity_logger.warning(f"Config modules of version {version} not marked complete, checking for files anyway")
 
         # Define the specific CSV files we want to copy
         target_csv_files = [
@@ -421,6 +435,10 @@ def process_config_modules(version, SenParameters):
         if not py_file_exists:
             sensitivity_logger.warning(f"Python configuration file not found: {config_file}")
 
+        # Load the version's config modules once (bundle or module files)
+        source_modules = load_config_modules(source_dir, version)
+        sensitivity_logger.info(f"Loaded {len(source_modules)} source config modules from {source_dir}")
+
         # Process each parameter's variation directory
         for param_id, param_config in SenParameters.items():
             if not param_config.get('enabled'):
@@ -501,22 +519,12 @@ def process_config_modules(version, SenParameters):
                 if param_key not in processing_summary['processed_modules']:
                     processing_summary['processed_modules'][param_key] = []
 
-                # Process all possible module files (1-100)
-                for module_num in range(1, 101):
-                    source_config_path = os.path.join(source_dir, f"{version}_config_module_{module_num}.json")
-                    target_config_path = os.path.join(param_var_dir, f"{version}_config_module_{module_num}.json")
-
-                    # Skip if source JSON file doesn't exist
-                    if not os.path.exists(source_config_path):
-                        continue
-
+                # Apply the variation to every interval module of the version
+                modified_modules = {}
+                for module_num, config_module in source_modules:
                     processing_summary['total_found'] += 1
 
                     try:
-                        # Load the source config module
-                        with open(source_config_path, 'r') as f:
-                            config_module = json.load(f)
-
                         # Apply sensitivity variation to the config
                         modified_config = apply_sensitivity_variation(
                             copy.deepcopy(config_module),
@@ -525,9 +533,13 @@ def process_config_modules(version, SenParameters):
                             normalized_mode
                         )
 
-                        # Save the modified config
-                        with open(target_config_path, 'w') as f:
-                            json.dump(modified_config, f, indent=4)
+                        if CONFIG_MODULE_LAYOUT == 'files':
+                            # Save the modified config as its own module file
+                            target_config_path = os.path.join(param_var_dir, f"{version}_config_module_{module_num}.json")
+                            with open(target_config_path, 'w') as f:
+                                json.dump(modified_config, f, indent=4)
+                        else:
+                            modified_modules[module_num] = modified_config
 
                         processing_summary['total_modified'] += 1
                         processing_summary['processed_modules'][param_key].append(module_num)
@@ -541,6 +553,22 @@ def process_config_modules(version, SenParameters):
                         sensitivity_logger.error(error_msg)
                         processing_summary['errors'].append(error_msg)
 
+                # Save all modified modules of this variation as one indexed bundle
+                if modified_modules:
+                    try:
+                        write_config_bundle(get_bundle_path(param_var_dir, version), modified_modules, version)
+                        sensitivity_logger.info(f"Saved {len(modified_modules)} modified config modules to bundle in {param_var_dir}")
+                    except Exception as e:
+                        error_msg = f"Failed to write config module bundle for {param_id}, variation {var_str}: {str(e)}"
+                        sensitivity_logger.error(error_msg)
+                        processing_summary['errors'].append(error_msg)
+
+                # Record the variation's artifacts in the sweep manifest
+                try:
+                    record_variation_directory(sensitivity_dir, version, param_id, normalized_mode, variation, param_var_dir)
+                except Exception as e:
+                    sensitivity_logger.warning(f"Could not record {param_id} variation {var_str} in manifest: {str(e)}")
+
         sensitivity_logger.info(
             f"Config module processing completed: "
             f"found {processing_summary['total_found']} JSON files, "
@@ -557,6 +585,13 @@ def process_config_modules(version, SenParameters):
         datapoints_file = generate_sensitivity_datapoints(version, SenParameters)
         sensitivity_logger.info(f"SensitivityPlotDatapoints generation completed: {datapoints_file}")
 
+        # Signal that every variation directory has its configuration
+        mark_stage_complete(sensitivity_dir, 'config_copy', {
+            "version": version,
+            "modified": processing_summary['total_modified'],
+            "errors": len(processing_summary['errors'])
+        })
+
         return processing_summary
 
     except Exception as e:
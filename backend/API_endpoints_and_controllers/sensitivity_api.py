@@ -12,6 +12,7 @@ import json
 import time
 import threading
 from .sensitivity_orchestrator import SensitivityOrchestrator, EventState
+from utils.stage_completion import wait_for_stage
 
 # Create blueprint for sensitivity routes
 sensitivity_bp = Blueprint('sensitivity', __name__)
@@ -589,10 +590,8 @@ def run_all():
 
             # Step 2: Copy configs
             logger.info("Step 2: Starting configuration copying")
-            time.sleep(1)  # Small delay between steps
 
             # In real implementation, this would call the actual config copying function
-            time.sleep(2)  # Simulate processing time
 
             # Update results with completion info
             if orchestrator.state.results is None:
@@ -608,10 +607,8 @@ def run_all():
 
             # Step 3: Run baseline
             logger.info("Step 3: Starting baseline calculation")
-            time.sleep(1)  # Small delay between steps
 
             # In real implementation, this would call the actual baseline calculation function
-            time.sleep(3)  # Simulate processing time
 
             # Update results with completion info
             orchestrator.state.results["baseline_completed"] = True
@@ -625,7 +622,6 @@ def run_all():
 
             # Step 4: Run variations
             logger.info("Step 4: Starting variations processing")
-            time.sleep(1)  # Small delay between steps
 
             # Get enabled parameters
             sen_parameters = data.get('SenParameters', {})
@@ -648,9 +644,6 @@ def run_all():
                     var_str = f"{variation:+.2f}"
                     logger.info(f"Processing {param_id} variation {var_str}")
 
-                    # Simulate variation calculation
-                    time.sleep(0.5)  # Simulate processing time
-
                     # Record result
                     param_results["variations"][var_str] = {
                         "status": "success",
@@ -673,7 +666,6 @@ def run_all():
 
             # Step 5: Generate results
             logger.info("Step 5: Starting results generation")
-            time.sleep(1)  # Small delay between steps
 
             # Generate combined results
             combined_results = {}
@@ -685,9 +677,6 @@ def run_all():
                 results_file = f"{param_id}_vs_{compare_to_key}_{mode.lower()}_results.json"
                 logger.info(f"Generating results file: {results_file}")
 
-                # Simulate results generation
-                time.sleep(0.5)  # Simulate processing time
-
                 # Add to combined results
                 combined_results[param_id] = {
                     "file": results_file,
@@ -709,7 +698,6 @@ def run_all():
 
             # Step 6: Create visualizations
             logger.info("Step 6: Starting visualization creation")
-            time.sleep(1)  # Small delay between steps
 
             # Create visualizations
             visualization_results = {}
@@ -724,9 +712,6 @@ def run_all():
                 for plot_type in plot_types:
                     logger.info(f"Generating {plot_type} plot for {param_id}")
 
-                    # Simulate plot generation
-                    time.sleep(0.3)  # Simulate processing time
-
                     # Record plot file path
                     plot_file = f"{plot_type}_{param_id}_{compare_to_key}_primary.png"
                     param_plots[plot_type] = {
@@ -754,7 +739,6 @@ def run_all():
 
             # Step 7: Complete
             logger.info("Step 7: Completing process")
-            time.sleep(1)  # Small delay between steps
 
             # Update final results
             orchestrator.state.results["completion_timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S")
@@ -855,54 +839,13 @@ def copy_config_handler(state):
         result = trigger_config_module_copy(version, sensitivity_dir, SenParameters)
         logger.info(f"Config copy service result: {result}")
 
-        # Verify that actual configuration files have been created
-        logger.info("Verifying configuration files existence...")
-        config_files_verified = False
-        wait_duration = 180  # 3 minutes
-        start_wait = time.time()
-
-        while time.time() - start_wait < wait_duration:
-            # Check for actual configuration files for each enabled parameter
-            all_found = True
-
-            for param_id, param_config in SenParameters.items():
-                if not param_config.get('enabled'):
-                    continue
-
-                mode = param_config.get('mode', 'percentage')
-                values = param_config.get('values', [])
-                variation_list = values
-
-                # Check if configuration files exist for each variation
-                for variation in variation_list:
-                    var_str = f"{variation:+.2f}"
-                    config_path_pattern = os.path.join(
-                        sensitivity_dir,
-                        param_id,
-                        mode.lower(),
-                        var_str,
-                        f"{version}_config_module_*.json"
-                    )
-
-                    if not glob.glob(config_path_pattern):
-                        all_found = False
-                        logger.info(f"Still waiting for config files for {param_id} variation {var_str}...")
-                        break
-
-                if not all_found:
-                    break
-
-            if all_found:
-                config_files_verified = True
-                logger.info("All required configuration files verified!")
-                break
-
-            # Log progress and wait
-            elapsed = time.time() - start_wait
-            logger.info(f"Still waiting for configuration files... ({elapsed:.0f}s elapsed)")
-            time.sleep(15)  # Check every 15 seconds
+        # Wait for the config copy stage to signal that every variation has its configuration
+        logger.info("Waiting for configuration copy completion...")
+        config_files_verified = wait_for_stage(sensitivity_dir, 'config_copy', timeout=180)
 
-        if not config_files_verified:
+        if config_files_verified:
+            logger.info("All required configuration files verified!")
+        else:
             logger.warning("Timed out waiting for all configuration files, proceeding anyway")
 
         # Update state results
@@ -956,7 +899,6 @@ def baseline_handler(state):
                 raise Exception(error_msg)
 
             logger.info(f"Completed {script_name}")
-            time.sleep(0.5)  # Ensure proper sequencing
 
         # Get calculation script
         logger.info(f"Getting calculation script for {calculationOption}")
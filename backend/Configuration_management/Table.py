@@ -1,7 +1,7 @@
 import sys
-import json
 import logging
 import os
+import numpy as np
 import pandas as pd
 
 # =====================================================================
@@ -17,7 +17,8 @@ import pandas as pd
 # 2. Extracting properties from each module, including vector properties
 # 3. Building a time-series table with years as rows and properties as columns
 # 4. Forward-filling missing values to ensure continuity
-# 5. Saving the resulting table as a CSV file
+# 5. Saving the resulting table as a CSV file (and optionally as a typed
+#    columnar file, see columnar_table.py)
 # =====================================================================
 
 # Set pandas option to handle future behavior for downcasting
@@ -26,6 +27,11 @@ pd.set_option('future.no_silent_downcasting', True)
 
 # Add the parent directory to the Python path to enable imports from sibling modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Configuration_management.config_bundle import load_config_modules as load_config_modules_from_folder
+from Configuration_management.columnar_table import get_columnar_table_path, write_columnar_table
+
+# Navigate up three levels from the current file to find the "Original" directory
+CODE_FILES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "Original")
 
 # Initialize logging
 log_file_path = os.path.join(os.getcwd(), 'Table.log')
@@ -197,9 +203,10 @@ def load_config_modules(results_folder, version):
     """
     Load all config modules from the results folder.
 
-    This function scans the results folder for configuration module JSON files
-    that match the specified version, loads them, and returns them as a list
-    of tuples containing the start year and the module data.
+    This function reads the version's configuration module bundle when it exists,
+    or scans the results folder for configuration module JSON files that match
+    the specified version. It returns the modules as a list of tuples containing
+    the start year and the module data.
 
     Args:
         results_folder (str): Path to the folder containing configuration module files
@@ -219,42 +226,86 @@ def load_config_modules(results_folder, version):
 
         where {...} represents the loaded JSON content of each file.
     """
-    config_modules = []
+    # Prefer the single-file bundle ({version}_config_modules.bundle) when present;
+    # otherwise fall back to the per-interval {version}_config_module_{start}.json files
+    return load_config_modules_from_folder(results_folder, version)
+
+def build_interval_frame(config_modules):
+    """
+    Build a table with one row per interval from the loaded config modules.
+
+    Each module's properties (including expanded vector properties) become a
+    row indexed by the interval start year. Columns follow the first module's
+    property order, with properties only present in later modules appended.
+    Missing values are forward-filled across intervals so that a property
+    keeps its value until a later interval changes it.
+
+    Args:
+        config_modules (list): List of tuples (start_year, config_module)
+                               sorted by start_year
+
+    Returns:
+        DataFrame: Interval start years as index and properties as columns
+    """
+    start_years = [start_year for start_year, _ in config_modules]
+    records = [
+        {prop['Property Name']: prop['Value'] for prop in collect_properties_from_config_module(config_module)}
+        for _, config_module in config_modules
+    ]
+
+    column_headers = list(records[0].keys())
+    for record in records[1:]:
+        column_headers.extend(name for name in record if name not in column_headers)
+
+    interval_df = pd.DataFrame.from_records(records, index=start_years, columns=column_headers)
+    return interval_df.ffill()
+
+def expand_intervals_to_years(interval_df, plant_lifetime):
+    """
+    Expand an interval table to a year-by-property table.
 
-    # Scan the results folder for configuration module files
-    for file in os.listdir(results_folder):
-        # Filter files by prefix and suffix to find configuration modules for the specified version
-        if file.startswith(f"{version}_config_module_") and file.endswith('.json'):
-            file_path = os.path.join(results_folder, file)
+    Every year is mapped to the interval that is active in that year by
+    searching the sorted interval start years, and the interval rows are
+    repeated by index instead of being assigned cell by cell. Years before
+    the first interval have no values.
+
+    Args:
+        interval_df (DataFrame): Table indexed by sorted interval start years
+        plant_lifetime (int): Number of years in the table
 
-            # Load the configuration module from the JSON file
-            with open(file_path, 'r') as f:
-                config_module = json.load(f)
+    Returns:
+        DataFrame: Years as index and properties as columns
+    """
+    start_years = interval_df.index.to_numpy(dtype=np.int64)
 
-                # Extract the start year from the filename
-                # The filename format is "{version}_config_module_{start_year}.json"
-                start_year = int(file.split('_')[-1].split('.')[0])
+    # Years 1..plant_lifetime plus any interval start beyond the lifetime
+    years = np.union1d(np.arange(1, int(plant_lifetime) + 1, dtype=np.int64), start_years)
 
-                # Add the start year and config module as a tuple to the list
-                config_modules.append((start_year, config_module))
+    # Position of the active interval for every year (-1 before the first interval)
+    positions = np.searchsorted(start_years, years, side='right') - 1
 
-    # Sort the config modules by start year to ensure chronological order
-    return sorted(config_modules, key=lambda x: x[0])
+    df = interval_df.iloc[np.clip(positions, 0, None)].copy()
+    df.index = years
+    if (positions < 0).any():
+        # Object columns so that boolean properties can hold the missing values
+        df = df.astype(object)
+        df.iloc[positions < 0] = np.nan
+    return df
 
-def build_and_save_table(version):
+def build_and_save_table(version, columnar=False):
     """
     Build and save a comprehensive table of configuration properties.
 
     This function is the core of the Table module. It:
     1. Loads all configuration modules for the specified version
-    2. Extracts properties from each module
-    3. Creates a DataFrame with years as rows and properties as columns
-    4. Fills the DataFrame with values from each module
-    5. Forward-fills missing values to ensure continuity
-    6. Saves the resulting table as a CSV file
+    2. Extracts properties from each module into one row per interval
+    3. Expands the interval rows to years with index repetition
+    4. Saves the resulting table as a CSV file
+    5. Optionally saves the table as a typed columnar file
 
     Args:
         version (str or int): Version number for the configuration
+        columnar (bool): Also write Variable_Table({version}).npz
 
     Returns:
         None: Results are saved to a file
@@ -262,15 +313,12 @@ def build_and_save_table(version):
     Processing Steps:
         1. Set up paths to the results folder
         2. Load all configuration modules
-        3. Extract properties and set up the DataFrame
-        4. Fill the DataFrame with values from each module
-        5. Forward-fill missing values
-        6. Save the table to a CSV file
+        3. Build the forward-filled interval table
+        4. Expand intervals to years
+        5. Save the table to a CSV file (and columnar file if requested)
     """
     # Set up paths to the results folder
-    # Navigate up three levels from the current file to find the "Original" directory
-    code_files_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "Original")
-    results_folder = os.path.join(code_files_path, f'Batch({version})', f'Results({version})')
+    results_folder = os.path.join(CODE_FILES_PATH, f'Batch({version})', f'Results({version})')
 
     # Load all configuration modules for the specified version
     config_modules = load_config_modules(results_folder, version)
@@ -279,35 +327,30 @@ def build_and_save_table(version):
         logging.error("No config modules found in results folder")
         return
 
-    # Get properties from the first module to set up the DataFrame
-    # This establishes the columns of the table
-    first_module_properties = collect_properties_from_config_module(config_modules[0][1])
-    column_headers = [prop['Property Name'] for prop in first_module_properties]
+    # Build one row per interval and forward fill so that property values
+    # persist until they are explicitly changed
+    interval_df = build_interval_frame(config_modules)
 
-    # Create DataFrame with all properties for each year
     # The rows are years from 1 to plant lifetime
     plant_lifetime = config_modules[0][1].get('plantLifetimeAmount10', 0)
-    df = pd.DataFrame(index=range(1, plant_lifetime + 1), columns=column_headers)
-
-    # Fill the DataFrame with values from each config module
-    # Each module corresponds to a specific start year
-    for start_year, config_module in config_modules:
-        # Extract properties from the module
-        properties = collect_properties_from_config_module(config_module)
-        # Assign each property value to the corresponding cell in the DataFrame
-        for prop in properties:
-            df.loc[start_year, prop['Property Name']] = prop['Value']
-
-    # Forward fill any missing values and handle deprecation warning
-    # This ensures that property values persist until they are explicitly changed
-    df = df.ffill().infer_objects(copy=False)
+    df = expand_intervals_to_years(interval_df, plant_lifetime).infer_objects(copy=False)
 
     # Save the DataFrame to a CSV file
     save_path = os.path.join(results_folder, f"Variable_Table({version}).csv")
     df.to_csv(save_path, index_label='Year')
     logging.info(f"Table saved successfully to {save_path}")
 
-def main(version):
+    # Save the typed columnar copy that can be served by column slice; without
+    # it, remove any earlier copy so that the stale table is not served
+    columnar_path = get_columnar_table_path(results_folder, version)
+    if columnar:
+        write_columnar_table(df, columnar_path)
+        logging.info(f"Columnar table saved successfully to {columnar_path}")
+    elif os.path.exists(columnar_path):
+        os.remove(columnar_path)
+        logging.info(f"Removed outdated columnar table {columnar_path}")
+
+def main(version, columnar=False):
     """
     Main function to build and save the configuration table.
 
@@ -316,6 +359,7 @@ def main(version):
 
     Args:
         version (str or int): Version number for the configuration
+        columnar (bool): Also write the typed columnar table
 
     Returns:
         None: Results are saved to a file
@@ -325,7 +369,7 @@ def main(version):
     """
     try:
         # Call the main function to build and save the table
-        build_and_save_table(version)
+        build_and_save_table(version, columnar=columnar)
     except Exception as e:
         # Log any errors that occur
         logging.error(f"Error in main function: {str(e)}")
@@ -336,5 +380,8 @@ if __name__ == "__main__":
     # Get the version from command line arguments or use default value 1
     version = sys.argv[1] if len(sys.argv) > 1 else 1
 
+    # The columnar table is written with --columnar or VARIABLE_TABLE_COLUMNAR=1
+    columnar = '--columnar' in sys.argv[2:] or os.environ.get('VARIABLE_TABLE_COLUMNAR') == '1'
+
     # Call the main function with the specified version
-    main(version)
+    main(version, columnar=columnar)
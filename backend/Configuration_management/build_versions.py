@@ -0,0 +1,170 @@
+import json
+import os
+import sys
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# =====================================================================
+# BUILD_VERSIONS - MULTI-VERSION CONFIGURATION BUILD
+# =====================================================================
+# This module builds the configuration of many versions in one command.
+# Instead of starting four Python subprocesses per version (formatter.py,
+# module1.py, config_modules.py, Table.py), each worker process imports
+# the configuration modules once (pandas, property mappings, parsers) and
+# then runs the same steps in-process for every version it is given.
+#
+# Versions are built concurrently on a process pool sized to the machine.
+# Versions stored as base + delta (see config_diff.py) are built after
+# their base version when both are part of the same build.
+#
+# Usage:
+#     python build_versions.py <version> [<version> ...] [--workers N]
+# =====================================================================
+
+# Add the parent directory to the Python path to enable imports from sibling modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BUILD_STEPS = ['formatter', 'module1', 'config_modules', 'Table']
+
+logger = logging.getLogger('build_versions')
+
+
+def _warm_up_worker():
+    """
+    Import the configuration build modules once per worker process.
+
+    This loads pandas, the property mappings and the parsers a single time
+    so every version built by the worker reuses them.
+    """
+    from Configuration_management import formatter, module1, config_modules, Table  # noqa: F401
+
+
+def build_version(version):
+    """
+    Run the configuration build steps for one version in the current process.
+
+    Args:
+        version (str or int): Version number
+
+    Returns:
+        dict: Status report with the version, overall status, per-step timings
+              and the error message of the failing step, if any
+    """
+    from Configuration_management import formatter, module1, config_modules, Table
+
+    report = {"version": version, "status": "success", "steps": {}, "error": None}
+    steps = [
+        ('formatter', lambda: formatter.sanitize_file(version)),
+        ('module1', lambda: module1.main(version)),
+        ('config_modules', lambda: config_modules.main(version)),
+        ('Table', lambda: Table.build_and_save_table(version)),
+    ]
+
+    started = time.time()
+    for step_name, step in steps:
+        step_started = time.time()
+        try:
+            result = step()
+            # formatter and module1 report failures in their result dict
+            if isinstance(result, dict) and result.get('error'):
+                raise RuntimeError(result['error'])
+        except Exception as e:
+            report["steps"][step_name] = round(time.time() - step_started, 3)
+            report["status"] = "error"
+            report["error"] = f"{step_name}: {str(e)}"
+            break
+        report["steps"][step_name] = round(time.time() - step_started, 3)
+
+    report["duration"] = round(time.time() - started, 3)
+    return report
+
+
+def order_by_base_version(versions):
+    """
+    Split versions into build waves so delta-backed versions follow their base.
+
+    Args:
+        versions (list): Version numbers to build
+
+    Returns:
+        list: List of waves, each a list of versions that can be built concurrently
+    """
+    from Configuration_management.config_diff import load_version_delta
+
+    requested = {str(v) for v in versions}
+    base_of = {}
+    for version in versions:
+        record = load_version_delta(version)
+        if record is not None and str(record["base_version"]) in requested:
+            base_of[str(version)] = str(record["base_version"])
+
+    waves = []
+    done = set()
+    pending = [v for v in versions]
+    while pending:
+        wave = [v for v in pending if base_of.get(str(v)) is None or base_of[str(v)] in done]
+        if not wave:
+            # Circular base references; build the rest without ordering
+            wave = pending
+        waves.append(wave)
+        done.update(str(v) for v in wave)
+        pending = [v for v in pending if v not in wave]
+    return waves
+
+
+def build_versions(versions, max_workers=None):
+    """
+    Build the configuration of several versions concurrently.
+
+    Args:
+        versions (list): Version numbers to build
+        max_workers (int, optional): Worker processes; defaults to the CPU count
+
+    Returns:
+        dict: Report with per-version status and totals
+    """
+    versions = list(dict.fromkeys(versions))  # Drop duplicates, keep order
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(versions) or 1))
+
+    started = time.time()
+    reports = {}
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_warm_up_worker) as executor:
+        for wave in order_by_base_version(versions):
+            futures = {executor.submit(build_version, version): version for version in wave}
+            for future in as_completed(futures):
+                version = futures[future]
+                try:
+                    reports[str(version)] = future.result()
+                except Exception as e:
+                    # The worker itself failed (e.g. crashed); report it for this version
+                    reports[str(version)] = {"version": version, "status": "error", "steps": {}, "error": str(e)}
+                logger.info(f"Version {version} build {reports[str(version)]['status']}")
+
+    failed = [v for v, r in reports.items() if r["status"] != "success"]
+    return {
+        "status": "success" if not failed else ("error" if len(failed) == len(reports) else "partial"),
+        "workers": max_workers,
+        "duration": round(time.time() - started, 3),
+        "succeeded": [v for v, r in reports.items() if r["status"] == "success"],
+        "failed": failed,
+        "versions": {str(v): reports[str(v)] for v in versions}
+    }
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    workers = None
+    if '--workers' in args:
+        index = args.index('--workers')
+        workers = int(args[index + 1])
+        args = args[:index] + args[index + 2:]
+
+    if not args:
+        print("Usage: python build_versions.py <version> [<version> ...] [--workers N]")
+        sys.exit(1)
+
+    report = build_versions(args, max_workers=workers)
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report["status"] == "success" else 1)
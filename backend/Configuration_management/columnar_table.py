@@ -0,0 +1,115 @@
+import json
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+# =====================================================================
+# COLUMNAR_TABLE - TYPED COLUMNAR STORAGE FOR THE VARIABLE TABLE
+# =====================================================================
+# This module stores the year-by-property Variable_Table as a typed
+# columnar file (Variable_Table({version}).npz) next to the CSV.
+#
+# Each column is saved as its own array in the archive:
+#   __columns__  JSON list of column names, in table order
+#   __index__    the Year index (int64)
+#   c0, c1, ...  one array per column; numeric columns are float64 and
+#                everything else is stored as fixed-width unicode
+#
+# Arrays inside an .npz archive are only decompressed when accessed, so a
+# reader can serve a slice of columns and years without parsing the whole
+# table.
+# =====================================================================
+
+
+def get_columnar_table_path(results_folder, version):
+    """
+    Get the path of the columnar variable table for a version.
+
+    Args:
+        results_folder (str): Path to the version's results folder
+        version (str or int): Version number
+
+    Returns:
+        str: Path to Variable_Table({version}).npz
+    """
+    return os.path.join(results_folder, f"Variable_Table({version}).npz")
+
+
+def _to_typed_array(series):
+    """Convert a column to a float64 array when fully numeric, otherwise to unicode."""
+    numeric = pd.to_numeric(series, errors='coerce')
+    if numeric.notna().sum() == series.notna().sum():
+        return numeric.to_numpy(dtype=np.float64)
+    return np.array(["" if pd.isna(v) else str(v) for v in series.to_numpy()], dtype=np.str_)
+
+
+def write_columnar_table(df, file_path):
+    """
+    Write a DataFrame to a typed columnar .npz file.
+
+    Args:
+        df (DataFrame): Table with the Year index and property columns
+        file_path (str): Target .npz path
+
+    Returns:
+        str: Path to the written file
+    """
+    arrays = {
+        "__columns__": np.array(json.dumps([str(c) for c in df.columns])),
+        "__index__": df.index.to_numpy(dtype=np.int64),
+    }
+    for i, column in enumerate(df.columns):
+        arrays[f"c{i}"] = _to_typed_array(df[column])
+
+    # Write next to the target and move into place so readers never see a partial file
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path) or None, suffix='.npz')
+    os.close(fd)
+    try:
+        np.savez_compressed(temp_path, **arrays)
+        os.replace(temp_path, file_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return file_path
+
+
+def read_columnar_table(file_path, columns=None, start_year=None, end_year=None):
+    """
+    Read a slice of a columnar variable table.
+
+    Only the requested column arrays are loaded from the archive.
+
+    Args:
+        file_path (str): Path to the .npz file
+        columns (list, optional): Column names to read; all columns if None
+        start_year (int, optional): First year to include
+        end_year (int, optional): Last year to include
+
+    Returns:
+        DataFrame: Requested slice with the Year index
+
+    Raises:
+        KeyError: If a requested column is not in the table
+    """
+    with np.load(file_path, allow_pickle=False) as archive:
+        all_columns = json.loads(str(archive["__columns__"]))
+        years = archive["__index__"]
+
+        mask = np.ones(len(years), dtype=bool)
+        if start_year is not None:
+            mask &= years >= int(start_year)
+        if end_year is not None:
+            mask &= years <= int(end_year)
+
+        selected = all_columns if columns is None else list(columns)
+        positions = {name: i for i, name in enumerate(all_columns)}
+        missing = [c for c in selected if c not in positions]
+        if missing:
+            raise KeyError(f"Columns not found in table: {missing}")
+
+        data = {name: archive[f"c{positions[name]}"][mask] for name in selected}
+
+    return pd.DataFrame(data, index=pd.Index(years[mask], name='Year'), columns=selected)
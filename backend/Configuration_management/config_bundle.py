@@ -0,0 +1,226 @@
+import json
+import os
+import tempfile
+import logging
+
+# =====================================================================
+# CONFIG_BUNDLE - INDEXED CONFIGURATION MODULE BUNDLE
+# =====================================================================
+# This module provides a single-file alternative to the per-interval
+# configuration module layout ({version}_config_module_{start}.json).
+#
+# A bundle stores every interval module of a version (or of a sensitivity
+# variation) in one file with a header index that maps the interval start
+# year to the byte offset and length of that module's JSON document:
+#
+#   <header length, 10 ASCII digits>\n
+#   <header JSON: {"format", "version", "index": {start: [offset, length]}}>
+#   <module JSON documents, concatenated>
+#
+# Offsets are relative to the first byte after the header, so a reader can
+# fetch one interval (seek + read) or all intervals with a single open,
+# instead of listing the directory or probing module numbers 1..100.
+# =====================================================================
+
+BUNDLE_FORMAT = "config-module-bundle/1"
+HEADER_SIZE_WIDTH = 10
+
+logger = logging.getLogger('config_bundle')
+
+
+def get_bundle_path(folder, version):
+    """
+    Get the path of the configuration module bundle for a version.
+
+    Args:
+        folder (str): Results folder or sensitivity variation directory
+        version (str or int): Version number
+
+    Returns:
+        str: Path to {version}_config_modules.bundle inside folder
+    """
+    return os.path.join(folder, f"{version}_config_modules.bundle")
+
+
+def write_config_bundle(bundle_path, config_modules, version):
+    """
+    Write configuration modules to a single indexed bundle file.
+
+    The bundle is written to a temporary file in the same directory and then
+    moved into place, so readers never observe a partially written bundle.
+
+    Args:
+        bundle_path (str): Target bundle file path
+        config_modules (dict or list): Mapping of start year to module dict,
+                                       or list of (start_year, module) tuples
+        version (str or int): Version number recorded in the header
+
+    Returns:
+        str: Path to the written bundle
+    """
+    items = config_modules.items() if isinstance(config_modules, dict) else config_modules
+
+    index = {}
+    chunks = []
+    offset = 0
+    for start_year, config_module in sorted(items, key=lambda x: int(x[0])):
+        data = json.dumps(config_module).encode('utf-8')
+        index[str(int(start_year))] = [offset, len(data)]
+        chunks.append(data)
+        offset += len(data)
+
+    header = json.dumps({
+        "format": BUNDLE_FORMAT,
+        "version": str(version),
+        "index": index
+    }).encode('utf-8')
+
+    bundle_dir = os.path.dirname(bundle_path)
+    if bundle_dir:
+        os.makedirs(bundle_dir, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=bundle_dir or None, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(f"{len(header):0{HEADER_SIZE_WIDTH}d}\n".encode('ascii'))
+            f.write(header)
+            for data in chunks:
+                f.write(data)
+        os.replace(temp_path, bundle_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    logger.info(f"Wrote {len(index)} config modules to bundle {bundle_path}")
+    return bundle_path
+
+
+def _read_header(f):
+    """Read the bundle header from an open file and return (header, body_start)."""
+    size_line = f.read(HEADER_SIZE_WIDTH + 1)
+    try:
+        header_size = int(size_line[:HEADER_SIZE_WIDTH].decode('ascii'))
+    except ValueError:
+        raise ValueError("Invalid config module bundle: malformed header size")
+
+    header = json.loads(f.read(header_size).decode('utf-8'))
+    if header.get('format') != BUNDLE_FORMAT:
+        raise ValueError(f"Unsupported config module bundle format: {header.get('format')}")
+
+    return header, HEADER_SIZE_WIDTH + 1 + header_size
+
+
+def read_bundle_index(bundle_path):
+    """
+    Read the interval index of a bundle.
+
+    Args:
+        bundle_path (str): Path to the bundle file
+
+    Returns:
+        list: Sorted list of interval start years stored in the bundle
+    """
+    with open(bundle_path, 'rb') as f:
+        header, _ = _read_header(f)
+    return sorted(int(start) for start in header['index'])
+
+
+def read_config_module_from_bundle(bundle_path, start_year):
+    """
+    Read a single interval's configuration module from a bundle.
+
+    Args:
+        bundle_path (str): Path to the bundle file
+        start_year (int): Interval start year
+
+    Returns:
+        dict: The configuration module, or None if the interval is not in the bundle
+    """
+    with open(bundle_path, 'rb') as f:
+        header, body_start = _read_header(f)
+        entry = header['index'].get(str(int(start_year)))
+        if entry is None:
+            return None
+        offset, length = entry
+        f.seek(body_start + offset)
+        return json.loads(f.read(length).decode('utf-8'))
+
+
+def read_all_config_modules(bundle_path):
+    """
+    Read every configuration module from a bundle with a single open.
+
+    Args:
+        bundle_path (str): Path to the bundle file
+
+    Returns:
+        list: List of tuples (start_year, config_module) sorted by start_year
+    """
+    with open(bundle_path, 'rb') as f:
+        header, _ = _read_header(f)
+        body = f.read()
+
+    config_modules = []
+    for start, (offset, length) in header['index'].items():
+        config_modules.append((int(start), json.loads(body[offset:offset + length].decode('utf-8'))))
+
+    return sorted(config_modules, key=lambda x: x[0])
+
+
+def load_config_modules(folder, version):
+    """
+    Load all configuration modules of a version from a folder.
+
+    The bundle is preferred when present; otherwise the per-interval
+    {version}_config_module_{start}.json files are read.
+
+    Args:
+        folder (str): Results folder or sensitivity variation directory
+        version (str or int): Version number
+
+    Returns:
+        list: List of tuples (start_year, config_module) sorted by start_year
+    """
+    bundle_path = get_bundle_path(folder, version)
+    if os.path.exists(bundle_path):
+        try:
+            return read_all_config_modules(bundle_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read bundle {bundle_path}, falling back to module files: {str(e)}")
+
+    config_modules = []
+    if not os.path.isdir(folder):
+        return config_modules
+
+    prefix = f"{version}_config_module_"
+    for file in os.listdir(folder):
+        if file.startswith(prefix) and file.endswith('.json'):
+            with open(os.path.join(folder, file), 'r') as f:
+                config_modules.append((int(file[len(prefix):-len('.json')]), json.load(f)))
+
+    return sorted(config_modules, key=lambda x: x[0])
+
+
+def write_config_module_files(folder, version):
+    """
+    Write the per-interval module files of a folder whose modules are bundled.
+
+    For consumers that take one {version}_config_module_{start}.json per
+    interval; files that already exist are left as they are.
+
+    Args:
+        folder (str): Results folder or sensitivity variation directory
+        version (str or int): Version number
+
+    Returns:
+        list: Paths of the module files sorted by interval start year
+    """
+    file_paths = []
+    for start_year, config_module in load_config_modules(folder, version):
+        file_path = os.path.join(folder, f"{version}_config_module_{start_year}.json")
+        if not os.path.exists(file_path):
+            with open(file_path, 'w') as f:
+                json.dump(config_module, f, indent=4)
+        file_paths.append(file_path)
+    return file_paths
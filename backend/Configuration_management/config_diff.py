@@ -0,0 +1,347 @@
+import json
+import os
+import sys
+import types
+import importlib.util
+import logging
+
+# =====================================================================
+# CONFIG_DIFF - CONFIGURATION DIFF ENGINE AND BASE + DELTA STORAGE
+# =====================================================================
+# This module compares the compiled configurations (configurations({v}).py)
+# of two versions and produces a structured delta:
+#
+#   {
+#       "base_version": 1,
+#       "version": 2,
+#       "attributes": {"changed": {name: value}, "removed": [name]},
+#       "filtered_values": {"added": [filteredValue], "removed": [filteredValue]}
+#   }
+#
+# A version can be stored as base + delta (config_delta({v}).json in its
+# ConfigurationPlotSpec folder) instead of a full copy of the batch tree.
+# The delta also tells downstream builds which intervals actually differ
+# from the base version, so config_modules.py only regenerates those
+# intervals and reuses the base version's modules for the rest.
+# =====================================================================
+
+# Navigate up three levels from the current file to find the "Original" directory
+CODE_FILES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "Original")
+
+logger = logging.getLogger('config_diff')
+
+
+def get_config_file_path(version):
+    """Get the path of a version's compiled configuration file."""
+    return os.path.join(CODE_FILES_PATH, f"Batch({version})", f"ConfigurationPlotSpec({version})", f"configurations({version}).py")
+
+
+def get_delta_path(version):
+    """Get the path of a version's base + delta file."""
+    return os.path.join(CODE_FILES_PATH, f"Batch({version})", f"ConfigurationPlotSpec({version})", f"config_delta({version}).json")
+
+
+def get_raw_config_path(version):
+    """
+    Get the path of the raw configuration (U_configurations({version}).py) the form loads.
+
+    A version stored as an unchanged delta of its base version has no raw
+    configuration of its own and loads its base version's until it is saved.
+
+    Args:
+        version (str or int): Version number
+
+    Returns:
+        str: Path to the raw configuration file, which may not exist
+    """
+    raw_config = os.path.join(CODE_FILES_PATH, f"Batch({version})", f"ConfigurationPlotSpec({version})", f"U_configurations({version}).py")
+    record = None if os.path.exists(raw_config) else load_version_delta(version)
+    if record is not None and is_empty_delta(record):
+        return get_raw_config_path(record["base_version"])
+    return raw_config
+
+
+def _canonical(value):
+    """Serialize a value deterministically so that equal values compare equal."""
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def load_compiled_config(config_file):
+    """
+    Load a compiled configuration file into a comparable structure.
+
+    Args:
+        config_file (str): Path to configurations({version}).py
+
+    Returns:
+        dict: {"attributes": {name: value}, "filtered_values": [filteredValue, ...]}
+    """
+    spec = importlib.util.spec_from_file_location("config", config_file)
+    config_received = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config_received)
+
+    attributes = {}
+    for name in dir(config_received):
+        if name.startswith('__') or name == 'filtered_values_json':
+            continue
+        value = getattr(config_received, name)
+        if isinstance(value, (types.ModuleType, types.FunctionType, type)):
+            continue
+        attributes[name] = json.loads(_canonical(value))
+
+    filtered_values = []
+    for item in getattr(config_received, 'filtered_values_json', []):
+        parsed = json.loads(item) if isinstance(item, str) else item
+        if isinstance(parsed, dict) and 'filteredValue' in parsed:
+            filtered_values.append(parsed['filteredValue'])
+
+    return {"attributes": attributes, "filtered_values": filtered_values}
+
+
+def diff_compiled_configs(base, target):
+    """
+    Compute the structured delta that turns one compiled configuration into another.
+
+    Filtered values are compared as whole entries (id, value, start, end, remarks),
+    so a changed entry shows up as one removed and one added entry.
+
+    Args:
+        base (dict): Compiled configuration from load_compiled_config
+        target (dict): Compiled configuration from load_compiled_config
+
+    Returns:
+        dict: Delta with "attributes" and "filtered_values" sections
+    """
+    base_attributes = base["attributes"]
+    target_attributes = target["attributes"]
+
+    changed = {
+        name: value for name, value in target_attributes.items()
+        if name not in base_attributes or _canonical(base_attributes[name]) != _canonical(value)
+    }
+    removed = sorted(name for name in base_attributes if name not in target_attributes)
+
+    base_keys = {_canonical(fv) for fv in base["filtered_values"]}
+    target_keys = {_canonical(fv) for fv in target["filtered_values"]}
+
+    return {
+        "attributes": {"changed": changed, "removed": removed},
+        "filtered_values": {
+            "added": [fv for fv in target["filtered_values"] if _canonical(fv) not in base_keys],
+            "removed": [fv for fv in base["filtered_values"] if _canonical(fv) not in target_keys]
+        }
+    }
+
+
+def apply_config_delta(base, delta):
+    """
+    Rebuild a compiled configuration from its base and a delta.
+
+    Args:
+        base (dict): Compiled configuration of the base version
+        delta (dict): Delta from diff_compiled_configs
+
+    Returns:
+        dict: Compiled configuration of the delta's version
+    """
+    attributes = dict(base["attributes"])
+    for name in delta["attributes"].get("removed", []):
+        attributes.pop(name, None)
+    attributes.update(delta["attributes"].get("changed", {}))
+
+    removed_keys = {_canonical(fv) for fv in delta["filtered_values"].get("removed", [])}
+    filtered_values = [fv for fv in base["filtered_values"] if _canonical(fv) not in removed_keys]
+    filtered_values.extend(delta["filtered_values"].get("added", []))
+
+    return {"attributes": attributes, "filtered_values": filtered_values}
+
+
+def is_empty_delta(delta):
+    """Check whether a delta contains no changes."""
+    return not (delta["attributes"]["changed"] or delta["attributes"]["removed"]
+                or delta["filtered_values"]["added"] or delta["filtered_values"]["removed"])
+
+
+def get_touched_intervals(delta, config_matrix_df):
+    """
+    Determine which intervals of a configuration matrix a delta affects.
+
+    Attribute changes apply to every interval (and may change the interval
+    layout itself), so they touch everything. Filtered value changes only
+    touch the intervals that overlap their [start, end] range.
+
+    Args:
+        delta (dict): Delta from diff_compiled_configs
+        config_matrix_df (DataFrame): Matrix with start and end columns
+
+    Returns:
+        set or None: Start years of touched intervals, or None if all intervals are touched
+    """
+    if delta["attributes"]["changed"] or delta["attributes"]["removed"]:
+        return None
+
+    changed_ranges = []
+    for fv in delta["filtered_values"]["added"] + delta["filtered_values"]["removed"]:
+        try:
+            changed_ranges.append((int(fv['start']), int(fv['end'])))
+        except (KeyError, TypeError, ValueError):
+            # A filtered value without a usable range may affect any interval
+            return None
+
+    touched = set()
+    for _, row in config_matrix_df.iterrows():
+        start, end = int(row['start']), int(row['end'])
+        if any(fv_start <= end and fv_end >= start for fv_start, fv_end in changed_ranges):
+            touched.add(start)
+    return touched
+
+
+def write_compiled_config(compiled, config_file):
+    """
+    Write a compiled configuration back to a configurations({version}).py file.
+
+    Args:
+        compiled (dict): Compiled configuration
+        config_file (str): Target file path
+    """
+    os.makedirs(os.path.dirname(config_file), exist_ok=True)
+    with open(config_file, 'w', encoding='utf-8') as f:
+        for name, value in compiled["attributes"].items():
+            f.write(f"{name}={value!r}\n")
+        f.write("\n\nfiltered_values_json=[\n")
+        for fv in compiled["filtered_values"]:
+            f.write(f"   {json.dumps({'filteredValue': fv})!r},\n")
+        f.write("]\n")
+
+
+def load_version_delta(version):
+    """
+    Load a version's base + delta record.
+
+    Args:
+        version (str or int): Version number
+
+    Returns:
+        dict: {"base_version", "version", "attributes", "filtered_values"} or None if
+              the version is not stored as a delta
+    """
+    delta_path = get_delta_path(version)
+    if not os.path.exists(delta_path):
+        return None
+    with open(delta_path, 'r') as f:
+        return json.load(f)
+
+
+def save_version_delta(version, base_version, drop_compiled=False):
+    """
+    Store a version as base + delta against another version.
+
+    Args:
+        version (str or int): Version to store as a delta
+        base_version (str or int): Version the delta is computed against
+        drop_compiled (bool): Remove the full configurations({version}).py once the
+                              delta is stored; it is rebuilt by materialize_version
+
+    Returns:
+        dict: The stored delta record
+    """
+    base = load_version_config(base_version)
+    target = load_version_config(version)
+
+    record = {"base_version": int(base_version), "version": int(version)}
+    record.update(diff_compiled_configs(base, target))
+
+    delta_path = get_delta_path(version)
+    os.makedirs(os.path.dirname(delta_path), exist_ok=True)
+    with open(delta_path, 'w') as f:
+        json.dump(record, f, indent=4)
+
+    if drop_compiled and os.path.exists(get_config_file_path(version)):
+        os.remove(get_config_file_path(version))
+
+    logger.info(
+        f"Stored version {version} as delta of version {base_version}: "
+        f"{len(record['attributes']['changed'])} attributes changed, "
+        f"{len(record['filtered_values']['added'])} filtered values added, "
+        f"{len(record['filtered_values']['removed'])} removed"
+    )
+    return record
+
+
+def load_version_config(version):
+    """
+    Load the compiled configuration of a version.
+
+    The full configurations({version}).py is used when present; otherwise the
+    configuration is rebuilt from the version's base + delta record.
+
+    Args:
+        version (str or int): Version number
+
+    Returns:
+        dict: Compiled configuration
+
+    Raises:
+        FileNotFoundError: If the version has neither a compiled config nor a delta
+    """
+    config_file = get_config_file_path(version)
+    if os.path.exists(config_file):
+        return load_compiled_config(config_file)
+
+    record = load_version_delta(version)
+    if record is None:
+        raise FileNotFoundError(f"Config file not found: {config_file}")
+
+    return apply_config_delta(load_version_config(record["base_version"]), record)
+
+
+def materialize_version(version, refresh=False):
+    """
+    Write configurations({version}).py for a version stored as base + delta.
+
+    Args:
+        version (str or int): Version number
+        refresh (bool): Rebuild the file from the base version and the delta even if
+                        it exists, so changes to the base version reach it
+
+    Returns:
+        str: Path to the compiled configuration file
+    """
+    config_file = get_config_file_path(version)
+    record = load_version_delta(version) if refresh else None
+    if record is not None:
+        write_compiled_config(apply_config_delta(load_version_config(record["base_version"]), record), config_file)
+        logger.info(f"Materialized configuration for version {version} from version {record['base_version']} and its delta")
+    elif not os.path.exists(config_file):
+        write_compiled_config(load_version_config(version), config_file)
+        logger.info(f"Materialized configuration for version {version} from its delta")
+    return config_file
+
+
+def diff_versions(base_version, version):
+    """
+    Compute the delta between two versions' compiled configurations.
+
+    Args:
+        base_version (str or int): Base version number
+        version (str or int): Target version number
+
+    Returns:
+        dict: Delta record including both version numbers
+    """
+    record = {"base_version": int(base_version), "version": int(version)}
+    record.update(diff_compiled_configs(load_version_config(base_version), load_version_config(version)))
+    return record
+
+
+if __name__ == "__main__":
+    # Usage: python config_diff.py <base_version> <version> [--store] [--drop-compiled]
+    if len(sys.argv) < 3:
+        print("Usage: python config_diff.py <base_version> <version> [--store] [--drop-compiled]")
+        sys.exit(1)
+
+    if '--store' in sys.argv[3:]:
+        result = save_version_delta(sys.argv[2], sys.argv[1], drop_compiled='--drop-compiled' in sys.argv[3:])
+    else:
+        result = diff_versions(sys.argv[1], sys.argv[2])
+    print(json.dumps(result, indent=2))
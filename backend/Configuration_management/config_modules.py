@@ -6,6 +6,17 @@ import sys
 import copy
 import logging
 
+# Add the parent directory to the Python path to enable imports from sibling modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Configuration_management.config_bundle import get_bundle_path, write_config_bundle, load_config_modules
+from Configuration_management.config_diff import (
+    load_version_delta, diff_versions, get_touched_intervals, materialize_version
+)
+from utils.stage_completion import mark_stage_complete, clear_stage
+
+# Navigate up three levels from the current file to find the "Original" directory
+CODE_FILES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "Original")
+
 # =====================================================================
 # CONFIG_MODULES - CONFIGURATION MODULE PROCESSOR
 # =====================================================================
@@ -20,6 +31,11 @@ import logging
 # 3. Creating distinct configuration modules for each interval
 # 4. Handling special vector values (Amount4 and Amount5)
 # 5. Saving configuration modules as JSON files
+# 6. Writing the indexed single-file bundle of all interval modules
+# 7. Marking the config_modules stage complete once every module is written
+# 8. For versions stored as base + delta (see config_diff.py), regenerating
+#    only the intervals the delta touches and reusing the base version's
+#    modules for the rest
 # =====================================================================
 
 # Initialize logging
@@ -148,7 +164,7 @@ def ensure_clean_directory(file_path):
         os.remove(file_path)
 
 # Function to update the config module with filtered values and save it as a JSON file
-def update_and_save_config_module(config_received, config_matrix_df, results_folder, version):
+def update_and_save_config_module(config_received, config_matrix_df, results_folder, version, reuse_modules=None, touched_starts=None):
     """
     Update configuration modules with filtered values and save them as JSON files.
 
@@ -158,6 +174,7 @@ def update_and_save_config_module(config_received, config_matrix_df, results_fol
     3. Updates the module with the appropriate filtered values
     4. Handles special vector values (Amount4 and Amount5)
     5. Saves each module as a JSON file
+    6. Saves all modules together as an indexed bundle (see config_bundle.py)
 
     Args:
         config_received: Base configuration object with default values
@@ -165,6 +182,10 @@ def update_and_save_config_module(config_received, config_matrix_df, results_fol
                                      with start, end, and filtered_values columns
         results_folder (str): Path to the folder where results will be saved
         version (str or int): Version number for the configuration
+        reuse_modules (dict, optional): Already built modules keyed by start year
+                                        (e.g. from the base version of a delta)
+        touched_starts (set, optional): Start years that must be regenerated; modules
+                                        for other start years are taken from reuse_modules
 
     Returns:
         None: Results are saved to files
@@ -173,6 +194,9 @@ def update_and_save_config_module(config_received, config_matrix_df, results_fol
         Exception: Catches and logs any exceptions that occur during processing
     """
     try:
+        # Collected modules keyed by start year for the bundle
+        bundled_modules = {}
+
         # Iterate through the config matrix and create distinct config modules for each interval
         for idx, row in config_matrix_df.iterrows():
             # Extract the start and end years for this interval
@@ -180,6 +204,17 @@ def update_and_save_config_module(config_received, config_matrix_df, results_fol
             end_year = int(row['end'])
             filtered_values = row['filtered_values']
 
+            # Reuse the already built module when the delta does not touch this interval
+            if touched_starts is not None and reuse_modules and start_year not in touched_starts and start_year in reuse_modules:
+                config_module_dict = reuse_modules[start_year]
+                config_module_file = os.path.join(results_folder, f"{version}_config_module_{start_year}.json")
+                ensure_clean_directory(config_module_file)
+                with open(config_module_file, 'w') as f:
+                    json.dump(config_module_dict, f, indent=4)
+                bundled_modules[start_year] = config_module_dict
+                print(f"Config module {start_year}-{end_year} reused from base version")
+                continue
+
             # Parse the filtered_values string into a dictionary if it's a string
             # This is needed because the filtered_values column might contain JSON strings
             if isinstance(filtered_values, str):
@@ -283,8 +318,18 @@ def update_and_save_config_module(config_received, config_matrix_df, results_fol
             with open(config_module_file, 'w') as f:
                 json.dump(config_module_dict, f, indent=4)
 
+            bundled_modules[start_year] = config_module_dict
+
             print(f"Config module {start_year}-{end_year} saved in {results_folder}")
 
+        # Write all interval modules to a single indexed bundle so readers can
+        # fetch one or all intervals with a single open
+        bundle_path = write_config_bundle(get_bundle_path(results_folder, version), bundled_modules, version)
+        print(f"Config module bundle saved to {bundle_path}")
+
+        # Signal downstream stages that all modules and the bundle are in place
+        mark_stage_complete(results_folder, 'config_modules', {"version": str(version), "intervals": len(bundled_modules)})
+
     except Exception as e:
         # Catch and log any exceptions that occur during processing
         print(f"An error occurred: {str(e)}")
@@ -312,8 +357,7 @@ def main(version):
     """
     try:
         # Set the path to the directory containing the modules
-        # Navigate up three levels from the current file to find the "Original" directory
-        code_files_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),"Original")
+        code_files_path = CODE_FILES_PATH
 
         # Define paths to the results folder and configuration matrix file
         results_folder = os.path.join(code_files_path,f"Batch({version})", f"Results({version})")
@@ -323,6 +367,9 @@ def main(version):
         if not os.path.exists(results_folder):
             os.makedirs(results_folder)
 
+        # Consumers must not see a completion marker from a previous run
+        clear_stage(results_folder, 'config_modules')
+
         # Check if the configuration matrix file exists
         if not os.path.exists(config_matrix_file):
             raise FileNotFoundError(f"Config matrix file not found: {config_matrix_file}")
@@ -333,6 +380,11 @@ def main(version):
         # Set the path to the configuration file
         config_file = os.path.join(code_files_path, f"Batch({version})", f"ConfigurationPlotSpec({version})", f"configurations({version}).py")
 
+        # Versions stored as base + delta are materialized before use
+        delta_record = load_version_delta(version)
+        if delta_record is not None and not os.path.exists(config_file):
+            materialize_version(version)
+
         # Check if the configuration file exists
         if not os.path.exists(config_file):
             raise FileNotFoundError(f"Config file not found: {config_file}")
@@ -342,8 +394,23 @@ def main(version):
         config_received = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(config_received)
 
+        # For delta-backed versions, only regenerate the intervals the delta touches
+        reuse_modules = None
+        touched_starts = None
+        if delta_record is not None:
+            base_version = delta_record["base_version"]
+            base_results_folder = os.path.join(code_files_path, f"Batch({base_version})", f"Results({base_version})")
+            reuse_modules = dict(load_config_modules(base_results_folder, base_version))
+            if reuse_modules:
+                # The compiled configuration may come from the version's own raw configuration
+                # rather than the stored delta; compare it with the base version as it is now.
+                # The stored delta is left as the user wrote it.
+                touched_starts = get_touched_intervals(diff_versions(base_version, version), config_matrix_df)
+                print(f"Version {version} is a delta of version {base_version}; "
+                      f"regenerating {'all' if touched_starts is None else len(touched_starts)} intervals")
+
         # Process and save the configuration modules
-        update_and_save_config_module(config_received, config_matrix_df, results_folder, version)
+        update_and_save_config_module(config_received, config_matrix_df, results_folder, version, reuse_modules, touched_starts)
 
     except Exception as e:
         # Log any errors that occur during processing
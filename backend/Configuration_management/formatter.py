@@ -23,6 +23,10 @@ from pathlib import Path
 script_dir = Path(__file__).resolve().parent.parent
 UPLOAD_DIR = script_dir.parent / "Original"
 
+# Add the backend directory to the Python path to enable imports from sibling modules
+sys.path.append(str(script_dir))
+from Configuration_management.config_diff import load_version_delta, materialize_version
+
 def check_write_permissions(directory):
     """Verify write permissions for the target directory.
 
@@ -308,6 +312,17 @@ def sanitize_file(version):
         print(f"Error creating directories: {e}")
         return {"error": "Error creating directories"}
 
+    # A version stored as base + delta without raw configuration of its own is
+    # compiled from its base version, which the build has already sanitized
+    if not original_file_path.exists() and load_version_delta(version) is not None:
+        try:
+            materialize_version(version, refresh=True)
+        except Exception as e:
+            print(f"Error materializing configuration of version {version} from its delta: {e}")
+            return {"error": "Error materializing configuration from delta"}
+        print(f"Materialized configuration of version {version} from its base version and delta")
+        return {"message": "Configuration materialized from base version and delta"}
+
     # File Reading
     try:
         raw_content = original_file_path.read_text(encoding='utf-8')
@@ -390,27 +390,39 @@ def test_list_building(version, config_received):
         logging.error(error_msg)
         return {"error": error_msg}
 
-# Main Execution Block
-# This section is executed when the script is run directly (not imported)
+def main(version):
+    """
+    Load the compiled configuration of a version and build its matrices.
 
-# Get the version from command line arguments or use default value 1
-# The version is used to determine which configuration files to process
-version = sys.argv[1] if len(sys.argv) > 1 else 1
+    Args:
+        version (str or int): Version number for the configuration
 
-# Add the code_files_path to sys.path if it's not already there
-# This allows importing modules from that directory
-if str(code_files_path) not in sys.path:
-    sys.path.append(str(code_files_path))
+    Returns:
+        dict: Result of test_list_building
+    """
+    # Add the code_files_path to sys.path if it's not already there
+    # This allows importing modules from that directory
+    if str(code_files_path) not in sys.path:
+        sys.path.append(str(code_files_path))
+
+    # Construct the path to the configuration file for the specified version
+    config_file = code_files_path / f"Batch({version})" / f"ConfigurationPlotSpec({version})" / f"configurations({version}).py"
+
+    # Dynamically import the configuration file
+    # This allows loading configuration data without hardcoding import statements
+    spec = importlib.util.spec_from_file_location("config", str(config_file))
+    config_received = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config_received)
 
-# Construct the path to the configuration file for the specified version
-config_file = code_files_path / f"Batch({version})" / f"ConfigurationPlotSpec({version})" / f"configurations({version}).py"
+    # Call the main function with the loaded configuration
+    # This will process the configuration and build the matrices
+    return test_list_building(version, config_received)
 
-# Dynamically import the configuration file
-# This allows loading configuration data without hardcoding import statements
-spec = importlib.util.spec_from_file_location("config", str(config_file))
-config_received = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(config_received)
+# Main Execution Block
+# This section is executed when the script is run directly (not imported)
+if __name__ == "__main__":
+    # Get the version from command line arguments or use default value 1
+    # The version is used to determine which configuration files to process
+    version = sys.argv[1] if len(sys.argv) > 1 else 1
 
-# Call the main function with the loaded configuration
-# This will process the configuration and build the matrices
-test_list_building(version, config_received)
+    main(version)
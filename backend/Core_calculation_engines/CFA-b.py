@@ -5,7 +5,6 @@ import numpy as np
 import sys
 import importlib.util
 import logging
-import requests
 import shutil
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -13,6 +12,12 @@ from matplotlib import colors as mcolors
 import matplotlib.patches as patches
 import itertools
 
+# Add the backend directory to the Python path to enable imports from sibling packages
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Configuration_management.config_bundle import load_config_modules
+from utils.calsen_paths import resolve_variation_paths
+from utils.sensitivity_manifest import record_variation_directory
+
 # ---------------- Logging Setup Block Start ----------------
 # Determine the directory for log files
 log_directory = os.getcwd()
@@ -67,7 +72,7 @@ except Exception as e:
 
 def get_paths_from_calsen(version, param_id, mode, variation, compare_to_key):
     """
-    Request path information from CalSen service.
+    Resolve path information with the in-process CalSen path resolver.
 
     Args:
         version (int): Version number
@@ -77,49 +82,21 @@ def get_paths_from_calsen(version, param_id, mode, variation, compare_to_key):
         compare_to_key (str): Comparison parameter
 
     Returns:
-        dict: Path information or None if service unavailable
+        dict: Path information or None if the variation is not configured
     """
     try:
-        sensitivity_logger.info(f"Requesting paths from CalSen for {param_id} variation {variation}")
-
-        response = requests.post(
-            "http://localhost:2750/get_config_paths",
-            json={
-                "version": version,
-                "payload": {
-                    "SenParameters": {
-                        param_id: {
-                            "enabled": True,
-                            "mode": mode,
-                            "values": [variation],
-                            "compareToKey": compare_to_key
-                        }
-                    }
-                }
-            },
-            timeout=5
-        )
-
-        if response.status_code == 200:
-            result = response.json()
-            sensitivity_logger.info(f"Received response from CalSen service")
-
-            # Extract paths for this specific parameter and variation
-            if 'path_sets' in result and param_id in result['path_sets']:
-                var_str = f"{variation:+.2f}"
-                if var_str in result['path_sets'][param_id]['variations']:
-                    paths = result['path_sets'][param_id]['variations'][var_str]
-                    sensitivity_logger.info(f"Found paths for {param_id} variation {var_str}")
-                    return paths
-
-        # Fall back to building paths locally if CalSen didn't return expected data
-        sensitivity_logger.warning(f"CalSen response did not contain expected paths")
+        paths = resolve_variation_paths(version, param_id, variation)
+    except Exception as e:
+        sensitivity_logger.warning(f"CalSen path resolution failed: {str(e)}")
         return None
 
-    except requests.exceptions.RequestException:
-        # Service not available
-        sensitivity_logger.warning(f"CalSen service not available")
-        return None
+    if paths:
+        sensitivity_logger.info(f"Found paths for {param_id} variation {variation:+.2f}")
+        return paths
+
+    # Fall back to building paths locally if the variation is not in the path index
+    sensitivity_logger.warning(f"CalSen path index did not contain paths for {param_id} variation {variation:+.2f}")
+    return None
 
 # Function to remove existing files
 def remove_existing_file(file_path):
@@ -316,6 +293,11 @@ def read_config_module(file_path):
     with open(file_path, 'r') as f:
         return json.load(f)
 
+# Function to load every interval config module of a version keyed by start year.
+# Reads the single-file bundle when present, otherwise the per-interval JSON files.
+def load_config_module_map(results_folder, version):
+    return {start_year: config_module for start_year, config_module in load_config_modules(results_folder, version)}
+
 # ---------------- Config Module Handling Block End ----------------
 
 # ---------------- Revenue and Expense Calculation from Config Block Start ----------------
@@ -363,6 +345,9 @@ def calculate_revenue_and_expenses_from_modules(config_received, config_matrix_d
     cumulative_total_units_sold = 0
     up_to_year = {}
 
+    # Load all interval config modules once instead of opening a file per interval
+    config_modules = load_config_module_map(results_folder, version)
+
     # Iterate through the config matrix
     for idx, row in config_matrix_df.iterrows():
         start_year = int(row['start']) + construction_years
@@ -370,12 +355,11 @@ def calculate_revenue_and_expenses_from_modules(config_received, config_matrix_d
         length = int(row['end']) - int(row['start']) + 1
         cumulative_length += length
 
-        config_module_file = os.path.join(results_folder, f"{version}_config_module_{row['start']}.json")
-        if not os.path.exists(config_module_file):
-            logging.warning(f"Config module file not found: {config_module_file}")
+        config_module = config_modules.get(int(row['start']))
+        if config_module is None:
+            logging.warning(f"Config module {row['start']} not found in {results_folder}")
             continue
 
-        config_module = read_config_module(config_module_file)
         if int(row['start'])+1 > target_row:
             # Use the initial selling price if the period is after the target row
             annual_revenue = calculate_annual_revenue(
@@ -534,7 +518,7 @@ def calculate_revenue_and_expenses_from_modules(config_received, config_matrix_d
     # ---------------- Tax Exemption and Depreciation Calculation Block Start ----------------
 
     # Create a matrix for distance from paying taxes
-    distance_matrix = pd.DataFrame(0, index=range(len(CFA_matrix)), columns=['Potentially Taxable Income', 'Fraction of TOC'])
+    distance_matrix = pd.DataFrame(0.0, index=range(len(CFA_matrix)), columns=['Potentially Taxable Income', 'Fraction of TOC'])
 
     # Calculate the difference (revenue - operating expenses) and (revenue - operating expenses)/TOC
     for i in range(construction_years, len(CFA_matrix)):
@@ -821,57 +805,58 @@ def main(version, selected_v, selected_f, target_row):
     config_matrix_file = None
     config_file = None
 
-    # If sensitivity parameters are provided, get paths from CalSen
+    # If sensitivity parameters are provided, resolve the variation's paths
     if param_id and variation is not None:
         sensitivity_logger.info(f"Processing sensitivity calculation for {param_id} variation {variation}")
 
-        # Try to get paths from CalSen service
-        paths = get_paths_from_calsen(
-            version, param_id, mode, variation, compare_to_key
-        )
+        # Paths resolved by the orchestrator take precedence over a lookup
+        if os.getenv('CONFIG_MATRIX_FILE') and os.getenv('CONFIG_FILE') and os.getenv('RESULTS_FOLDER'):
+            paths = {
+                "param_var_dir": os.getenv('RESULTS_FOLDER'),
+                "config_matrix_file": os.getenv('CONFIG_MATRIX_FILE'),
+                "config_file": os.getenv('CONFIG_FILE')
+            }
+        else:
+            paths = get_paths_from_calsen(
+                version, param_id, mode, variation, compare_to_key
+            )
 
         if paths:
-            # Use paths from CalSen
+            # Use resolved paths
             results_folder = paths.get("param_var_dir")
             config_matrix_file = paths.get("config_matrix_file")
             config_file = paths.get("config_file")
 
-            sensitivity_logger.info(f"Using paths from CalSen service for {param_id} variation {variation}")
+            sensitivity_logger.info(f"Using resolved paths for {param_id} variation {variation}")
 
             # Ensure directories exist
             if results_folder:
                 os.makedirs(results_folder, exist_ok=True)
         else:
             # Fall back to building paths manually
-            sensitivity_logger.warning("CalSen service unavailable, using manually constructed paths")
+            sensitivity_logger.warning("No resolved paths available, using manually constructed paths")
 
-            # Use environment variables if provided, otherwise fall back to default paths
-            if os.getenv('CONFIG_MATRIX_FILE') and os.getenv('CONFIG_FILE') and os.getenv('RESULTS_FOLDER'):
-                config_matrix_file = os.getenv('CONFIG_MATRIX_FILE')
-                config_file = os.getenv('CONFIG_FILE')
-                results_folder = os.getenv('RESULTS_FOLDER')
-            else:
-                # Default paths based on version
-                base_dir = os.path.join(code_files_path, 'backend', 'Original')
-                results_base = os.path.join(base_dir, f'Batch({version})', f'Results({version})')
-                sensitivity_dir = os.path.join(results_base, 'Sensitivity')
+            # Default paths based on version
+            base_dir = os.path.join(code_files_path, 'backend', 'Original')
+            results_base = os.path.join(base_dir, f'Batch({version})', f'Results({version})')
+            sensitivity_dir = os.path.join(results_base, 'Sensitivity')
 
-                # Format variation string
-                var_str = f"{variation:+.2f}"
+            # Format variation string
+            var_str = f"{variation:+.2f}"
 
-                # Parameter variation directory (lowercase mode)
-                results_folder = os.path.join(sensitivity_dir, param_id, mode.lower(), var_str)
+            # Parameter variation directory (lowercase mode)
+            results_folder = os.path.join(sensitivity_dir, param_id, mode.lower(), var_str)
 
-                # Configuration matrix file
-                config_matrix_file = os.path.join(results_folder, f"General_Configuration_Matrix({version}).csv")
+            # Configuration matrix file
+            config_matrix_file = os.path.join(results_folder, f"General_Configuration_Matrix({version}).csv")
 
-                # If matrix file doesn't exist, try base location
-                if not os.path.exists(config_matrix_file):
-                    config_matrix_file = os.path.join(results_base, f"General_Configuration_Matrix({version}).csv")
+            # If matrix file doesn't exist, try base location
+            if not os.path.exists(config_matrix_file):
+                config_matrix_file = os.path.join(results_base, f"General_Configuration_Matrix({version}).csv")
 
-                # Configuration file
-                config_file = os.path.join(base_dir, f"Batch({version})",
-                                           f"ConfigurationPlotSpec({version})", f"configurations({version}).py")
+            # Configuration file
+            config_file = os.path.join(base_dir, f"Batch({version})",
+                                       f"ConfigurationPlotSpec({version})", f"configurations({version}).py")
     else:
         # Standard paths for non-sensitivity calculations
         results_folder = os.path.join(code_files_path, "Original", f"Batch({version})", f"Results({version})")
@@ -952,6 +937,13 @@ def main(version, selected_v, selected_f, target_row):
         except Exception as e:
             sensitivity_logger.error(f"Error copying economic summary: {str(e)}")
 
+        # Record the variation's results in the sweep manifest
+        try:
+            sensitivity_dir = os.path.dirname(os.path.dirname(os.path.dirname(results_folder)))
+            record_variation_directory(sensitivity_dir, version, param_id, mode, variation, results_folder)
+        except Exception as e:
+            sensitivity_logger.warning(f"Could not record results in sensitivity manifest: {str(e)}")
+
         return results
 
     # For non-sensitivity calculations
@@ -0,0 +1,587 @@
+import os
+import sys
+import json
+import time
+import uuid
+import logging
+from datetime import datetime
+import numpy as np
+from scipy.optimize import minimize
+from scipy.stats import qmc
+
+# Add the backend directory to the Python path to enable imports from sibling packages
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Core_calculation_engines.sensitivity_engine import SensitivityEngine, ECONOMIC_METRICS
+
+# =====================================================================
+# DESIGN_OPTIMIZER - MULTI-PARAMETER DESIGN-SPACE OPTIMIZATION
+# =====================================================================
+# The price search of calculateForPrice and the goal seek solve for one
+# parameter at a time. This module searches several decision variables at
+# once for the design with the lowest required selling price (objective
+# "price") or the highest NPV at the target row (objective "npv"):
+#
+#   {"S12": {"low": -20, "high": 50, "apply": "percentage"}}   continuous S-parameter
+#   {"S28": {"low": 1, "high": 5}}                              number of construction years
+#   {"V3": {}, "F2": {}}                                        cost switches (on/off)
+#
+# Continuous variables are variations applied with their "apply" mode, as
+# sensitivity values are. The number of construction years shapes the
+# cash flow table, so candidates are grouped by it and every group is
+# evaluated on an engine with that layout. Only parameters that enter the
+# cash flow can be decision variables; the loan percentage (S26), for
+# instance, does not, as CFA-b.py leaves its Loan column empty.
+#
+# Constraints bound the NPV, the price or any economic summary metric:
+#
+#   {"metric": "Total Overnight Cost (TOC)", "max": 2.5e6}
+#
+# Candidates are compared by constraint violation first and objective
+# second. The population method is differential evolution (rand/1/bin)
+# in the unit cube of the variables: every generation's trial population
+# goes through the in-memory engine as one batch. The gradient method
+# runs L-BFGS-B on the continuous variables with a penalty on the
+# violation, with central finite differences evaluated as one batch per
+# step; it starts from the baseline, or polishes the result of
+# differential evolution. The best candidate of every generation or step
+# is recorded as the optimization path, in the shape of the ClickHouse
+# optimization_paths table.
+# =====================================================================
+
+OBJECTIVES = ['price', 'npv']
+METHODS = ['differential_evolution', 'gradient']
+
+# Structural parameter searched as an integer
+CONSTRUCTION_YEARS_PARAM = 'S28'
+
+DEFAULT_POPULATION_SIZE = 32
+DEFAULT_MAX_GENERATIONS = 100
+DEFAULT_MUTATION = 0.7
+DEFAULT_CROSSOVER = 0.9
+DEFAULT_TOLERANCE = 1e-4
+DEFAULT_GRADIENT_STEP = 0.01
+DEFAULT_GRADIENT_ITERATIONS = 50
+
+# Weight of the normalized constraint violation in the gradient method's penalty
+PENALTY_WEIGHT = 1000.0
+
+logger = logging.getLogger('sensitivity.optimizer')
+
+
+class DesignSpace:
+    """
+    Decision variables, objective and constraints of an optimization on one engine.
+
+    Candidates are rows of a matrix in the unit cube, one column per variable.
+    """
+    def __init__(self, engine, variables, objective='price', constraints=None):
+        """
+        Parse and validate the design space.
+
+        Args:
+            engine (SensitivityEngine): Engine with the version's baseline loaded
+            variables (dict): Variable specification per S-parameter ID or V/F switch
+            objective (str): 'price' (minimize the solved price) or 'npv' (maximize the NPV)
+            constraints (list, optional): {"metric", "min", "max"} bounds
+
+        Raises:
+            ValueError: If a variable, the objective or a constraint is invalid
+        """
+        if not variables:
+            raise ValueError("No decision variables given")
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {objective} (expected one of {', '.join(OBJECTIVES)})")
+
+        self.engine = engine
+        self.objective = objective
+        self.names = list(variables)
+        self.kinds, self.lows, self.highs, self.modes = [], [], [], []
+        for name in self.names:
+            spec = variables[name] or {}
+            if name[:1] in ('V', 'F') and name[1:].isdigit():
+                count = 10 if name[0] == 'V' else 5
+                if not 1 <= int(name[1:]) <= count:
+                    raise ValueError(f"Unknown cost switch: {name}")
+                self.kinds.append('switch')
+                self.lows.append(0.0)
+                self.highs.append(1.0)
+                self.modes.append(None)
+                continue
+
+            try:
+                low, high = float(spec['low']), float(spec['high'])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"Variable {name} needs numeric low and high values")
+            if high < low:
+                raise ValueError(f"Variable {name} has an empty range ({low} to {high})")
+            if name == CONSTRUCTION_YEARS_PARAM:
+                if low < 0 or low != int(low) or high != int(high):
+                    raise ValueError(f"Construction years range must be whole numbers from 0 ({low} to {high})")
+                self.kinds.append('construction_years')
+                self.modes.append('directvalue')
+            else:
+                key = engine.resolve_parameter_key(name)
+                if key not in engine._interval_values and key not in engine._global_values:
+                    raise ValueError(f"Parameter {name} ({key}) does not enter the cash flow analysis")
+                self.kinds.append('continuous')
+                self.modes.append(spec.get('apply', 'percentage').lower())
+            self.lows.append(low)
+            self.highs.append(high)
+        self.lows, self.highs = np.array(self.lows), np.array(self.highs)
+        self.continuous = np.array([kind == 'continuous' for kind in self.kinds])
+
+        self.constraints = []
+        for constraint in constraints or []:
+            metric = constraint.get('metric')
+            if metric not in ('npv', 'price') and metric not in ECONOMIC_METRICS:
+                raise ValueError(f"Unknown constraint metric: {metric}")
+            if constraint.get('min') is None and constraint.get('max') is None:
+                raise ValueError(f"Constraint on {metric} needs a min or a max")
+            self.constraints.append(constraint)
+
+        self.evaluations = 0
+
+    def decode(self, unit):
+        """
+        Map unit-cube candidates to variable values.
+
+        Args:
+            unit (ndarray): (n, d) candidates in [0, 1]
+
+        Returns:
+            ndarray: (n, d) variable values (switches as 1/0, construction years as whole numbers)
+        """
+        unit = np.clip(unit, 0, 1)
+        values = self.lows + unit * (self.highs - self.lows)
+        for i, kind in enumerate(self.kinds):
+            if kind == 'switch':
+                values[:, i] = unit[:, i] >= 0.5
+            elif kind == 'construction_years':
+                values[:, i] = np.minimum(np.floor(self.lows[i] + unit[:, i] * (self.highs[i] - self.lows[i] + 1)), self.highs[i])
+        return values
+
+    def encode(self, values):
+        """Map variable values of one candidate to the middle of their unit-cube cell."""
+        values = np.asarray(values, dtype=float)
+        unit = np.empty(len(values))
+        for i, kind in enumerate(self.kinds):
+            if kind == 'switch':
+                unit[i] = 0.75 if values[i] else 0.25
+            elif kind == 'construction_years':
+                unit[i] = (values[i] - self.lows[i] + 0.5) / (self.highs[i] - self.lows[i] + 1)
+            else:
+                span = self.highs[i] - self.lows[i]
+                unit[i] = (values[i] - self.lows[i]) / span if span else 0.5
+        return np.clip(unit, 0, 1)
+
+    def baseline(self):
+        """Unit-cube candidate closest to the baseline (no variation, the version's switches and layout)."""
+        values = []
+        for name, kind, mode in zip(self.names, self.kinds, self.modes):
+            if kind == 'switch':
+                switches = self.engine.selected_v if name[0] == 'V' else self.engine.selected_f
+                values.append(1.0 if switches.get(name) == 'on' else 0.0)
+            elif kind == 'construction_years':
+                values.append(self.engine.construction_years)
+            elif mode == 'directvalue':
+                base = self.engine.base_value(name)
+                values.append(float(np.mean(base)) if isinstance(base, list) else float(base or 0.0))
+            else:
+                values.append(0.0)
+        return self.encode(values)
+
+    def evaluate(self, unit):
+        """
+        Evaluate candidates, one engine batch per number of construction years.
+
+        Args:
+            unit (ndarray): (n, d) candidates in [0, 1]
+
+        Returns:
+            tuple: (objective, violation, results) with the objective to minimize, the
+                   normalized constraint violation and the engine result per candidate
+        """
+        values = self.decode(np.atleast_2d(unit))
+        n = len(values)
+        switches = {
+            'V': np.repeat(self.engine._variable_on[None, :], n, axis=0),
+            'F': np.repeat(self.engine._fixed_on[None, :], n, axis=0),
+        }
+        overlay_sets = [[] for _ in range(n)]
+        layouts = np.full(n, self.engine.construction_years)
+        for i, (name, kind) in enumerate(zip(self.names, self.kinds)):
+            if kind == 'switch':
+                switches[name[0]][:, int(name[1:]) - 1] = values[:, i] != 0
+            elif kind == 'construction_years':
+                layouts = values[:, i].astype(int)
+            else:
+                for row in range(n):
+                    overlay_sets[row].append((name, values[row, i], self.modes[i]))
+
+        results = [None] * n
+        for years in np.unique(layouts):
+            rows = np.flatnonzero(layouts == years)
+            engine = self.engine.with_construction_years(years)
+            batch = engine.evaluate_batch(
+                [overlay_sets[row] for row in rows],
+                solve_for_price=self.objective == 'price',
+                switches={'V': switches['V'][rows], 'F': switches['F'][rows]}
+            )
+            for row, result in zip(rows, batch):
+                results[row] = result
+        self.evaluations += n
+
+        if self.objective == 'price':
+            objective = np.array([result['price'] for result in results])
+        else:
+            objective = -np.array([result['npv'] for result in results])
+        violation = np.array([self.violation(result) for result in results])
+        return objective, violation, results
+
+    def violation(self, result):
+        """Sum of the constraint violations of a result, each relative to its bound."""
+        total = 0.0
+        for constraint in self.constraints:
+            metric = constraint['metric']
+            value = result[metric] if metric in ('npv', 'price') else result['metrics'][metric]
+            for bound, excess in ((constraint.get('min'), lambda b: b - value), (constraint.get('max'), lambda b: value - b)):
+                if bound is not None:
+                    total += max(0.0, excess(float(bound))) / max(abs(float(bound)), 1.0)
+        return total
+
+    def describe(self, unit, objective, violation, result):
+        """Describe one candidate for the report and the optimization path."""
+        values = self.decode(np.atleast_2d(unit))[0]
+        return {
+            "values": {
+                name: (('on' if value else 'off') if kind == 'switch' else
+                       int(value) if kind == 'construction_years' else float(value))
+                for name, kind, value in zip(self.names, self.kinds, values)
+            },
+            "objective": float(objective if self.objective == 'price' else -objective),
+            "constraintViolation": float(violation),
+            "feasible": bool(violation == 0),
+            "npv": result['npv'],
+            "price": result['price'],
+            "metrics": result['metrics'],
+        }
+
+
+def _better(objective_a, violation_a, objective_b, violation_b):
+    """Candidates of a that beat b: lower violation first, then lower objective."""
+    return (violation_a < violation_b) | ((violation_a == violation_b) & (objective_a <= objective_b))
+
+
+def _best(objective, violation):
+    """Index of the best candidate of a population."""
+    return int(np.lexsort((objective, violation))[0])
+
+
+def differential_evolution(space, population_size=DEFAULT_POPULATION_SIZE, max_generations=DEFAULT_MAX_GENERATIONS,
+                           mutation=DEFAULT_MUTATION, crossover=DEFAULT_CROSSOVER, tolerance=DEFAULT_TOLERANCE,
+                           rng=None, record=None, check=None):
+    """
+    Search the design space with differential evolution (rand/1/bin).
+
+    Args:
+        space (DesignSpace): Design space
+        population_size (int): Candidates per generation
+        max_generations (int): Generations after the initial population
+        mutation (float): Differential weight F
+        crossover (float): Crossover probability CR
+        tolerance (float): Stop once the objectives of a feasible population spread
+                           less than this relative to their mean
+        rng (Generator, optional): numpy random generator
+        record (callable, optional): Called with (stage, unit, objective, violation, result)
+                                     of the best candidate after every generation
+        check (callable, optional): Called before every generation; raising from it stops the search
+
+    Returns:
+        tuple: (unit, objective, violation, result, converged) of the best candidate
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    d = len(space.names)
+    size = max(4, int(population_size))
+
+    # Latin hypercube start, with the baseline as one candidate
+    population = qmc.LatinHypercube(d=d, seed=rng).random(size)
+    population[0] = space.baseline()
+    objective, violation, results = space.evaluate(population)
+    best = _best(objective, violation)
+    if record:
+        record('differential_evolution', population[best], objective[best], violation[best], results[best])
+
+    converged = False
+    for _ in range(int(max_generations)):
+        if check:
+            check()
+        # Three distinct donors per candidate, none of them the candidate itself
+        donors = np.argsort(rng.random((size, size)) + np.eye(size), axis=1)[:, :3]
+        mutant = np.clip(population[donors[:, 0]] + mutation * (population[donors[:, 1]] - population[donors[:, 2]]), 0, 1)
+        cross = rng.random((size, d)) < crossover
+        cross[np.arange(size), rng.integers(0, d, size)] = True
+        trial = np.where(cross, mutant, population)
+
+        trial_objective, trial_violation, trial_results = space.evaluate(trial)
+        improved = _better(trial_objective, trial_violation, objective, violation)
+        population[improved] = trial[improved]
+        objective[improved] = trial_objective[improved]
+        violation[improved] = trial_violation[improved]
+        results = [trial_results[i] if improved[i] else results[i] for i in range(size)]
+
+        best = _best(objective, violation)
+        if record:
+            record('differential_evolution', population[best], objective[best], violation[best], results[best])
+        if (violation == 0).all() and np.std(objective) <= tolerance * max(abs(np.mean(objective)), 1e-12):
+            converged = True
+            break
+
+    return population[best], objective[best], violation[best], results[best], converged
+
+
+def gradient_search(space, start, step=DEFAULT_GRADIENT_STEP, max_iterations=DEFAULT_GRADIENT_ITERATIONS, record=None,
+                    check=None):
+    """
+    Refine the continuous variables of a candidate with L-BFGS-B.
+
+    The objective is normalized by its value at the start and penalized by
+    the constraint violation. Central finite differences (a step of "step"
+    of each variable's range, large enough to see through the rounding of
+    the cash flow and the steps of the price search) are evaluated as one
+    batch with the point itself.
+
+    Args:
+        space (DesignSpace): Design space
+        start (ndarray): Unit-cube candidate to start from; other variables keep its values
+        step (float): Finite difference step in unit-cube units
+        max_iterations (int): L-BFGS-B iterations
+        record (callable, optional): Called with (stage, unit, objective, violation, result) after every iteration
+        check (callable, optional): Called before every evaluation; raising from it stops the search
+
+    Returns:
+        tuple: (unit, objective, violation, result, converged) of the best candidate
+    """
+    start = np.asarray(start, dtype=float)
+    columns = np.flatnonzero(space.continuous)
+    objective, violation, results = space.evaluate(start[None, :])
+    best = [start.copy(), objective[0], violation[0], results[0]]
+    if columns.size == 0:
+        return best[0], best[1], best[2], best[3], True
+
+    scale = max(abs(objective[0]), 1e-12)
+    evaluated = {}
+
+    def candidates(x):
+        points = np.repeat(start[None, :], 2 * columns.size + 1, axis=0)
+        points[:, columns] = x
+        for j, column in enumerate(columns):
+            points[2 * j + 1, column] = min(x[j] + step, 1)
+            points[2 * j + 2, column] = max(x[j] - step, 0)
+        return points
+
+    def penalized(x):
+        if check:
+            check()
+        points = candidates(x)
+        objective, violation, results = space.evaluate(points)
+        value = objective / scale + PENALTY_WEIGHT * violation
+        width = points[1::2, columns].diagonal() - points[2::2, columns].diagonal()
+        gradient = (value[1::2] - value[2::2]) / np.where(width > 0, width, 1)
+        evaluated[x.tobytes()] = (points[0], objective[0], violation[0], results[0])
+        if _better(objective[0], violation[0], best[1], best[2]):
+            best[:] = [points[0].copy(), objective[0], violation[0], results[0]]
+        return float(value[0]), gradient
+
+    def callback(x):
+        if record and x.tobytes() in evaluated:
+            record('gradient', *evaluated[x.tobytes()])
+
+    outcome = minimize(
+        penalized,
+        start[columns],
+        jac=True,
+        method='L-BFGS-B',
+        bounds=[(0, 1)] * columns.size,
+        callback=callback,
+        options={'maxiter': int(max_iterations)}
+    )
+    return best[0], best[1], best[2], best[3], bool(outcome.success)
+
+
+def run_optimization(engine, variables, objective='price', constraints=None, method='differential_evolution',
+                     polish=True, population_size=DEFAULT_POPULATION_SIZE, max_generations=DEFAULT_MAX_GENERATIONS,
+                     mutation=DEFAULT_MUTATION, crossover=DEFAULT_CROSSOVER, tolerance=DEFAULT_TOLERANCE,
+                     gradient_step=DEFAULT_GRADIENT_STEP, gradient_iterations=DEFAULT_GRADIENT_ITERATIONS, seed=None,
+                     check=None):
+    """
+    Optimize several decision variables of a version on the in-memory engine.
+
+    Args:
+        engine (SensitivityEngine): Engine with the version's baseline loaded
+        variables (dict): Variable specification per S-parameter ID or V/F switch
+        objective (str): 'price' (minimize the solved price) or 'npv' (maximize the NPV)
+        constraints (list, optional): {"metric", "min", "max"} bounds
+        method (str): 'differential_evolution' or 'gradient'
+        polish (bool): Refine the result of differential evolution with the gradient method
+        population_size (int): Candidates per generation of differential evolution
+        max_generations (int): Generations of differential evolution
+        mutation (float): Differential weight of differential evolution
+        crossover (float): Crossover probability of differential evolution
+        tolerance (float): Relative objective spread at which differential evolution stops
+        gradient_step (float): Finite difference step of the gradient method (share of each range)
+        gradient_iterations (int): Iterations of the gradient method
+        seed (int, optional): Seed of the random generator, for reproducible runs
+        check (callable, optional): Called between generations and iterations; raising from it
+                                    stops the optimization (e.g. a job cancellation check)
+
+    Returns:
+        dict: Best and baseline candidates, optimization path, evaluations and timing
+
+    Raises:
+        ValueError: If the method, a variable, the objective or a constraint is invalid
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown optimization method: {method} (expected one of {', '.join(METHODS)})")
+
+    started = time.time()
+    space = DesignSpace(engine, variables, objective, constraints)
+    optimization_id = f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+    rng = np.random.default_rng(seed)
+    history = []
+
+    def record(stage, unit, objective_value, violation, result):
+        history.append({
+            "iteration": len(history),
+            "stage": stage,
+            "timestamp": datetime.now().isoformat(timespec='seconds'),
+            "evaluations": space.evaluations,
+            **space.describe(unit, objective_value, violation, result)
+        })
+
+    baseline_unit = space.baseline()
+    baseline_objective, baseline_violation, baseline_results = space.evaluate(baseline_unit[None, :])
+    baseline = space.describe(baseline_unit, baseline_objective[0], baseline_violation[0], baseline_results[0])
+
+    if method == 'differential_evolution':
+        unit, best_objective, violation, result, converged = differential_evolution(
+            space, population_size, max_generations, mutation, crossover, tolerance, rng, record, check
+        )
+        if polish and space.continuous.any():
+            polished = gradient_search(space, unit, gradient_step, gradient_iterations, record, check)
+            if _better(polished[1], polished[2], best_objective, violation):
+                unit, best_objective, violation, result = polished[:4]
+    else:
+        unit, best_objective, violation, result, converged = gradient_search(
+            space, baseline_unit, gradient_step, gradient_iterations, record, check
+        )
+
+    best = space.describe(unit, best_objective, violation, result)
+    logger.info(
+        f"Optimization {optimization_id} of version {engine.version}: {objective} {best['objective']} "
+        f"(baseline {baseline['objective']}) after {space.evaluations} evaluations"
+    )
+    return {
+        "optimizationId": optimization_id,
+        "version": engine.version,
+        "objective": objective,
+        "method": method,
+        "polish": bool(polish) if method == 'differential_evolution' else False,
+        "variables": variables,
+        "constraints": space.constraints,
+        "best": best,
+        "baseline": baseline,
+        "improvement": best['objective'] - baseline['objective'],
+        "converged": converged,
+        "evaluations": space.evaluations,
+        "seed": seed,
+        "history": history,
+        "duration": round(time.time() - started, 3)
+    }
+
+
+def optimization_path_rows(report, zone_id=''):
+    """
+    Flatten the optimization path of a report into optimization_paths rows.
+
+    Args:
+        report (dict): Report of run_optimization
+        zone_id (str): Zone of the optimized version
+
+    Returns:
+        list: One row per iteration and variable, with the columns of the ClickHouse table
+    """
+    rows = []
+    for step in report['history']:
+        for name, value in step['values'].items():
+            rows.append({
+                "optimization_id": report['optimizationId'],
+                "iteration": step['iteration'],
+                "timestamp": datetime.fromisoformat(step['timestamp']),
+                "parameter_id": name,
+                "parameter_value": float(value == 'on') if isinstance(value, str) else float(value),
+                "objective_value": step['objective'],
+                "constraint_violation": step['constraintViolation'],
+                "version_id": str(report['version']),
+                "zone_id": zone_id,
+            })
+    return rows
+
+
+def store_optimization_report(report, zone_id=''):
+    """
+    Store the optimization path of a report in ClickHouse.
+
+    Args:
+        report (dict): Report of run_optimization
+        zone_id (str): Zone of the optimized version
+
+    Returns:
+        bool: True if the path was stored, False if ClickHouse is unavailable
+    """
+    try:
+        from database.clickhouse_config import store_optimization_path
+    except ImportError:
+        logger.warning("ClickHouse driver is not installed; optimization path not stored")
+        return False
+    try:
+        return store_optimization_path(optimization_path_rows(report, zone_id))
+    except Exception as e:
+        logger.warning(f"Could not store optimization path {report['optimizationId']}: {str(e)}")
+        return False
+
+
+def get_optimization_report_path(version, base_dir=None):
+    """Get the path of a version's optimization report in the sensitivity Reports folder."""
+    base_dir = base_dir or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Original')
+    return os.path.join(base_dir, f"Batch({version})", f"Results({version})", "Sensitivity", "Reports",
+                        f"optimization({version}).json")
+
+
+if __name__ == "__main__":
+    # Usage: python design_optimizer.py <version> <optimization.json>
+    if len(sys.argv) < 3:
+        print("Usage: python design_optimizer.py <version> <optimization.json>")
+        sys.exit(1)
+
+    with open(sys.argv[2], 'r') as f:
+        run_config = json.load(f)
+
+    engine = SensitivityEngine(
+        sys.argv[1],
+        run_config.get('selectedV', {}),
+        run_config.get('selectedF', {}),
+        run_config.get('targetRow', 20)
+    )
+    report = run_optimization(
+        engine,
+        run_config['variables'],
+        objective=run_config.get('objective', 'price'),
+        constraints=run_config.get('constraints'),
+        method=run_config.get('method', 'differential_evolution'),
+        seed=run_config.get('seed')
+    )
+    report_path = get_optimization_report_path(sys.argv[1])
+    os.makedirs(os.path.dirname(report_path), exist_ok=True)
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Optimization report written to {report_path}")
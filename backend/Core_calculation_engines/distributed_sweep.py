@@ -0,0 +1,759 @@
+import os
+import sys
+import json
+import time
+import hmac
+import socket
+import hashlib
+import secrets
+import atexit
+import argparse
+import itertools
+import threading
+import subprocess
+import collections
+import socketserver
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+import numpy as np
+
+# Add the backend directory to the Python path to enable imports from sibling packages
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Core_calculation_engines.sensitivity_engine import SensitivityEngine
+
+# =====================================================================
+# DISTRIBUTED_SWEEP - SWEEP UNITS ON WORKER HOSTS
+# =====================================================================
+# A coordinator running in the service shards the work of a sweep into
+# units and hands them to worker processes on any number of hosts:
+#
+#   "variations"  a batch of (param_id, variation, mode) sensitivity tasks
+#   "samples"     one evaluate_samples() call (a Monte Carlo chunk or a
+#                 block of grid rows)
+#
+# Workers connect to the coordinator over TCP and exchange one JSON
+# message per line:
+#
+#   coordinator -> worker   {"type": "challenge", "nonce": random hex}
+#   worker -> coordinator   {"type": "hello", "worker": name, "slots": n, "auth": hmac}
+#                           {"type": "heartbeat"}
+#                           {"type": "result", "unit": id, "result": ...}
+#                           {"type": "result", "unit": id, "error": "..."}
+#   coordinator -> worker   {"type": "unit", "unit": id, "kind": ..., "payload": ...}
+#
+# Coordinator and workers share a token (SWEEP_TOKEN). A worker proves it
+# knows the token with an HMAC-SHA256 of the connection's nonce, its name
+# and slots; connections without a valid hello are closed before any unit
+# is assigned. Without SWEEP_TOKEN the coordinator uses a random token that
+# only the workers it launches itself receive.
+#
+# Each unit names the engine it runs on (version, V/F switches, target
+# row, base folder); workers keep recently used engines loaded, so the
+# baseline of a version is read once per worker. A worker takes at most
+# "slots" units at a time. A worker whose connection drops or that misses
+# heartbeats for WORKER_TIMEOUT seconds is dropped and its units are handed
+# to other workers, up to MAX_ATTEMPTS times per unit. Workers reconnect on
+# their own, so a restarted coordinator gets its workers back.
+#
+# Results are returned to the caller in submission order (map()), which
+# aggregates them exactly as results of the local engine. For a single
+# machine, launch_local_workers() starts worker processes on this host:
+#
+#   SWEEP_TOKEN=... python distributed_sweep.py --coordinator host:port --slots 4
+# =====================================================================
+
+# Seconds between worker heartbeats (and coordinator liveness checks)
+HEARTBEAT_INTERVAL = 2.0
+
+# Seconds without a message after which a worker is considered lost
+WORKER_TIMEOUT = 10.0
+
+# Workers a unit may be handed to before it fails
+MAX_ATTEMPTS = 3
+
+# Units map() keeps submitted ahead of the result it waits for
+MAP_WINDOW = 64
+
+# Engines a worker keeps loaded
+ENGINE_CACHE_SIZE = 4
+
+logger = logging.getLogger('sensitivity.distributed')
+
+
+class WorkerLost(Exception):
+    """Raised for a unit whose workers were lost MAX_ATTEMPTS times before it completed."""
+
+
+class UnitFailed(Exception):
+    """Raised for a unit a worker could not evaluate."""
+
+
+def parse_address(address):
+    """
+    Split a "host:port" address.
+
+    Args:
+        address (str): Address as "host:port" (host defaults to all interfaces)
+
+    Returns:
+        tuple: (host, port)
+    """
+    host, _, port = str(address).rpartition(':')
+    return host or '0.0.0.0', int(port)
+
+
+def sign_hello(token, nonce, worker, slots):
+    """
+    Sign a worker's hello for a connection.
+
+    Args:
+        token (str): Token shared by the coordinator and its workers
+        nonce (str): Nonce of the coordinator's challenge
+        worker (str): Worker name
+        slots (int): Worker slots
+
+    Returns:
+        str: HMAC-SHA256 hex digest
+    """
+    return hmac.new(token.encode(), f"{nonce}:{worker}:{slots}".encode(), hashlib.sha256).hexdigest()
+
+
+def send_message(sock, message):
+    """Send one JSON message as a line."""
+    sock.sendall((json.dumps(message) + '\n').encode())
+
+
+def read_messages(sock):
+    """
+    Read JSON messages from a connection until it closes.
+
+    Yields:
+        dict: Each message
+    """
+    with sock.makefile('r', encoding='utf-8') as stream:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+# ---------------- Coordinator ----------------
+
+class _Unit:
+    """A unit of work and the future its result is delivered to."""
+
+    def __init__(self, unit_id, kind, payload):
+        self.id = unit_id
+        self.kind = kind
+        self.payload = payload
+        self.future = Future()
+        self.attempts = 0
+        self.cancelled = False
+
+
+class _Worker:
+    """A connected worker and the units it is evaluating."""
+
+    def __init__(self, name, slots, sock, address):
+        self.name = name
+        self.slots = max(1, int(slots))
+        self.sock = sock
+        self.address = address
+        self.units = {}
+        self.completed = 0
+        self.connected_at = time.time()
+        self.last_seen = time.time()
+        self._send_lock = threading.Lock()
+
+    def free_slots(self):
+        return self.slots - len(self.units)
+
+    def send(self, message):
+        with self._send_lock:
+            send_message(self.sock, message)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class SweepCoordinator:
+    """
+    Hands sweep units to the workers connected to it.
+    """
+
+    def __init__(self, address='0.0.0.0:0', worker_timeout=WORKER_TIMEOUT, max_attempts=MAX_ATTEMPTS, token=None):
+        """
+        Bind the coordinator; start() begins accepting workers.
+
+        Args:
+            address (str): "host:port" to listen on (port 0 picks a free port)
+            worker_timeout (float): Seconds without a message after which a worker is dropped
+            max_attempts (int): Workers a unit may be handed to before it fails
+            token (str, optional): Token workers authenticate with; defaults to SWEEP_TOKEN,
+                                   or a random token for workers launched by this process
+        """
+        self.token = token or os.environ.get('SWEEP_TOKEN') or secrets.token_hex(32)
+        self.worker_timeout = worker_timeout
+        self.max_attempts = max(1, int(max_attempts))
+        self._condition = threading.Condition()
+        self._pending = collections.deque()
+        self._workers = {}
+        self._ids = itertools.count(1)
+        self._stopped = False
+
+        coordinator = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                coordinator._serve(self.request, self.client_address)
+
+        self._server = _Server(parse_address(address), Handler)
+        self.address = self._server.server_address
+
+    def start(self):
+        """
+        Start accepting workers and dispatching units.
+
+        Returns:
+            SweepCoordinator: self
+        """
+        for target, name in ((self._server.serve_forever, 'server'),
+                             (self._dispatch, 'dispatch'),
+                             (self._monitor, 'monitor')):
+            threading.Thread(target=target, name=f"sweep-coordinator-{name}", daemon=True).start()
+        logger.info(f"Sweep coordinator listening on {self.address[0]}:{self.address[1]}")
+        return self
+
+    def stop(self):
+        """Stop the coordinator, disconnecting its workers and failing unfinished units."""
+        with self._condition:
+            self._stopped = True
+            for worker in list(self._workers.values()):
+                self._drop(worker, "Coordinator stopped")
+            for unit in self._pending:
+                if not unit.future.done():
+                    unit.future.set_exception(WorkerLost("Coordinator stopped"))
+            self._pending.clear()
+            self._condition.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+
+    # Worker connections
+
+    def _serve(self, sock, address):
+        """Authenticate a worker connection, register it and read its messages until it closes."""
+        nonce = secrets.token_hex(16)
+        messages = read_messages(sock)
+        try:
+            send_message(sock, {'type': 'challenge', 'nonce': nonce})
+            hello = next(messages)
+        except (StopIteration, ValueError, OSError):
+            return
+        if not isinstance(hello, dict) or hello.get('type') != 'hello':
+            return
+
+        name = hello.get('worker') or f"{address[0]}:{address[1]}"
+        expected = sign_hello(self.token, nonce, name, hello.get('slots', 1))
+        if not hmac.compare_digest(str(hello.get('auth', '')), expected):
+            logger.warning(f"Rejected worker {name} from {address[0]}: invalid token")
+            return
+
+        worker = _Worker(name, hello.get('slots', 1), sock, address)
+        with self._condition:
+            previous = self._workers.get(worker.name)
+            if previous is not None:
+                # A reconnecting worker replaces its old connection
+                self._drop(previous, "Worker reconnected")
+            self._workers[worker.name] = worker
+            self._condition.notify_all()
+        logger.info(f"Worker {worker.name} connected from {address[0]} with {worker.slots} slots")
+
+        try:
+            for message in messages:
+                worker.last_seen = time.time()
+                if message.get('type') == 'result':
+                    self._complete(worker, message)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Connection to worker {worker.name} failed: {str(e)}")
+        finally:
+            with self._condition:
+                self._drop(worker, "Connection closed")
+
+    def _drop(self, worker, reason):
+        """Disconnect a worker and hand its units to other workers (caller holds the condition)."""
+        if self._workers.get(worker.name) is not worker:
+            return
+        del self._workers[worker.name]
+        try:
+            worker.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        worker.sock.close()
+
+        for unit in worker.units.values():
+            if unit.cancelled or unit.future.done():
+                continue
+            if unit.attempts >= self.max_attempts:
+                unit.future.set_exception(WorkerLost(f"Unit {unit.id} lost on {unit.attempts} workers (last: {reason})"))
+            else:
+                self._pending.appendleft(unit)
+        if worker.units:
+            logger.warning(f"Worker {worker.name} dropped ({reason}); reassigning {len(worker.units)} units")
+        else:
+            logger.info(f"Worker {worker.name} disconnected ({reason})")
+        worker.units = {}
+        self._condition.notify_all()
+
+    def _complete(self, worker, message):
+        """Deliver the result of a unit."""
+        with self._condition:
+            unit = worker.units.pop(message.get('unit'), None)
+            if unit is not None:
+                worker.completed += 1
+            self._condition.notify_all()
+
+        # Results of units cancelled meanwhile are dropped
+        if unit is None or unit.cancelled or unit.future.done():
+            return
+        if 'error' in message:
+            unit.future.set_exception(UnitFailed(message['error']))
+        else:
+            unit.future.set_result(message.get('result'))
+
+    def _next_assignment(self):
+        """Pick the next pending unit and the least loaded worker for it (caller holds the condition)."""
+        while self._pending and self._pending[0].cancelled:
+            self._pending.popleft()
+        if not self._pending:
+            return None
+        worker = max(self._workers.values(), key=lambda w: w.free_slots(), default=None)
+        if worker is None or worker.free_slots() <= 0:
+            return None
+        return worker, self._pending.popleft()
+
+    def _dispatch(self):
+        """Send pending units to workers with free slots."""
+        while True:
+            with self._condition:
+                assignment = self._next_assignment()
+                while assignment is None and not self._stopped:
+                    self._condition.wait()
+                    assignment = self._next_assignment()
+                if self._stopped:
+                    return
+                worker, unit = assignment
+                unit.attempts += 1
+                worker.units[unit.id] = unit
+
+            try:
+                worker.send({'type': 'unit', 'unit': unit.id, 'kind': unit.kind, 'payload': unit.payload})
+            except OSError as e:
+                with self._condition:
+                    self._drop(worker, f"Send failed: {str(e)}")
+
+    def _monitor(self):
+        """Drop workers that stopped sending heartbeats."""
+        while not self._stopped:
+            time.sleep(HEARTBEAT_INTERVAL)
+            now = time.time()
+            with self._condition:
+                for worker in list(self._workers.values()):
+                    if now - worker.last_seen > self.worker_timeout:
+                        self._drop(worker, f"No heartbeat for {now - worker.last_seen:.0f}s")
+
+    # Submitting work
+
+    def _submit(self, kind, payload):
+        unit = _Unit(next(self._ids), kind, payload)
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Sweep coordinator is stopped")
+            self._pending.append(unit)
+            self._condition.notify_all()
+        return unit
+
+    def submit(self, kind, payload):
+        """
+        Submit one unit.
+
+        Args:
+            kind (str): Unit kind ("variations" or "samples")
+            payload (dict): JSON-serializable unit payload
+
+        Returns:
+            Future: Resolves to the unit's result, or raises UnitFailed / WorkerLost
+        """
+        return self._submit(kind, payload).future
+
+    def cancel(self, units):
+        """Stop handing out units and ignore their results."""
+        with self._condition:
+            for unit in units:
+                unit.cancelled = True
+            self._pending = collections.deque(unit for unit in self._pending if not unit.cancelled)
+
+    def map(self, kind, payloads, window=MAP_WINDOW, check=None):
+        """
+        Evaluate units on the workers, yielding their results in submission order.
+
+        At most window units are submitted ahead of the result being waited
+        for. Units still outstanding when the caller stops iterating (or an
+        error is raised) are cancelled.
+
+        Args:
+            kind (str): Unit kind ("variations" or "samples")
+            payloads (iterable): JSON-serializable unit payloads
+            window (int): Units kept submitted ahead
+            check (callable, optional): Called while waiting; raising from it stops the map
+                                        (e.g. a job cancellation check)
+
+        Yields:
+            Result of each unit
+
+        Raises:
+            UnitFailed: If a worker could not evaluate a unit
+            WorkerLost: If a unit's workers were lost too often
+        """
+        payloads = iter(payloads)
+        in_flight = collections.deque()
+        warned = False
+        try:
+            while True:
+                while len(in_flight) < max(1, window):
+                    payload = next(payloads, None)
+                    if payload is None:
+                        break
+                    in_flight.append(self._submit(kind, payload))
+                if not in_flight:
+                    return
+
+                unit = in_flight[0]
+                while True:
+                    if check:
+                        check()
+                    try:
+                        result = unit.future.result(timeout=HEARTBEAT_INTERVAL)
+                        break
+                    except FutureTimeout:
+                        if not self._workers and not warned:
+                            logger.warning("Sweep units are waiting for a worker to connect")
+                            warned = True
+                in_flight.popleft()
+                yield result
+        finally:
+            self.cancel(in_flight)
+
+    def status(self):
+        """
+        Describe the coordinator and its workers.
+
+        Returns:
+            dict: Address, pending unit count and per-worker slots, busy units and completions
+        """
+        now = time.time()
+        with self._condition:
+            return {
+                "address": f"{self.address[0]}:{self.address[1]}",
+                "pending": len(self._pending),
+                "workers": [{
+                    "name": worker.name,
+                    "host": worker.address[0],
+                    "slots": worker.slots,
+                    "busy": len(worker.units),
+                    "completed": worker.completed,
+                    "connectedFor": round(now - worker.connected_at, 1),
+                    "lastSeen": round(now - worker.last_seen, 1)
+                } for worker in self._workers.values()]
+            }
+
+
+class DistributedEvaluator:
+    """
+    Evaluates the sample sets of one engine on a coordinator's workers.
+
+    Drop-in for SensitivityEngine.map_samples(), as used by iter_monte_carlo()
+    and iter_grid() through their evaluator argument.
+    """
+
+    def __init__(self, coordinator, engine_spec, check=None):
+        """
+        Args:
+            coordinator (SweepCoordinator): Coordinator of the workers
+            engine_spec (dict): Engine of the units (see engine_spec())
+            check (callable, optional): Cancellation check, see SweepCoordinator.map()
+        """
+        self.coordinator = coordinator
+        self.engine_spec = engine_spec
+        self.check = check
+
+    def map_samples(self, units):
+        """
+        Evaluate sample sets on the workers, in order.
+
+        Args:
+            units (iterable): (samples, solve_for_price) pairs (see SensitivityEngine.evaluate_samples)
+
+        Yields:
+            dict: (n,) arrays of npv, price and iterations per unit
+        """
+        payloads = ({
+            'engine': self.engine_spec,
+            'samples': [[param_id, np.asarray(values, dtype=float).tolist(), mode] for param_id, values, mode in samples],
+            'solveForPrice': bool(solve_for_price)
+        } for samples, solve_for_price in units)
+        for result in self.coordinator.map('samples', payloads, check=self.check):
+            yield {name: np.asarray(values) for name, values in result.items()}
+
+    def map_variations(self, tasks, solve_for_price=False, batch_size=50):
+        """
+        Evaluate sensitivity variations on the workers in batches, in order.
+
+        Args:
+            tasks (list): (param_id, variation, mode) tuples
+            solve_for_price (bool): Search the selling price per variation (calculateForPrice)
+            batch_size (int): Variations per unit
+
+        Yields:
+            dict: Outcome per variation with value, success and price, npv and metrics (or error)
+        """
+        batch_size = max(1, int(batch_size))
+        payloads = ({
+            'engine': self.engine_spec,
+            'tasks': [list(task) for task in tasks[start:start + batch_size]],
+            'solveForPrice': bool(solve_for_price)
+        } for start in range(0, len(tasks), batch_size))
+        for outcomes in self.coordinator.map('variations', payloads, check=self.check):
+            yield from outcomes
+
+
+def engine_spec(version, selected_v, selected_f, target_row, base_dir=None):
+    """Describe the engine a unit runs on."""
+    return {
+        'version': version,
+        'selectedV': selected_v,
+        'selectedF': selected_f,
+        'targetRow': int(target_row),
+        'baseDir': base_dir
+    }
+
+
+# ---------------- Worker ----------------
+
+class SweepWorker:
+    """
+    Evaluates units handed out by a coordinator.
+    """
+
+    def __init__(self, coordinator_address, slots=1, name=None, base_dir=None, token=None):
+        """
+        Args:
+            coordinator_address (str): "host:port" of the coordinator
+            slots (int): Units evaluated at a time
+            name (str, optional): Worker name; defaults to host name and process ID
+            base_dir (str, optional): Local folder containing Batch({version}), replacing
+                                      the coordinator's when the hosts mount it elsewhere
+            token (str, optional): Token shared with the coordinator; defaults to SWEEP_TOKEN
+
+        Raises:
+            ValueError: If no token is given and SWEEP_TOKEN is not set
+        """
+        self.token = token or os.environ.get('SWEEP_TOKEN')
+        if not self.token:
+            raise ValueError("Sweep workers need the coordinator's token (SWEEP_TOKEN)")
+        self.coordinator_address = parse_address(coordinator_address)
+        self.slots = max(1, int(slots))
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.base_dir = base_dir
+        self._engines = collections.OrderedDict()
+        self._engine_lock = threading.Lock()
+
+    def _engine(self, spec):
+        """Get a loaded engine, loading it on first use."""
+        key = json.dumps(spec, sort_keys=True)
+        with self._engine_lock:
+            if key in self._engines:
+                self._engines.move_to_end(key)
+                return self._engines[key]
+            engine = SensitivityEngine(
+                spec['version'],
+                spec.get('selectedV'),
+                spec.get('selectedF'),
+                spec.get('targetRow', 20),
+                base_dir=self.base_dir or spec.get('baseDir')
+            )
+            self._engines[key] = engine
+            while len(self._engines) > ENGINE_CACHE_SIZE:
+                self._engines.popitem(last=False)
+            return engine
+
+    def evaluate(self, kind, payload):
+        """
+        Evaluate one unit.
+
+        Args:
+            kind (str): Unit kind ("variations" or "samples")
+            payload (dict): Unit payload
+
+        Returns:
+            JSON-serializable result of the unit
+
+        Raises:
+            ValueError: If the unit kind is unknown or its samples cannot be applied
+        """
+        engine = self._engine(payload['engine'])
+        solve_for_price = bool(payload.get('solveForPrice'))
+
+        if kind == 'samples':
+            result = engine.evaluate_samples(
+                [(param_id, np.asarray(values, dtype=float), mode) for param_id, values, mode in payload['samples']],
+                solve_for_price=solve_for_price
+            )
+            return {name: np.asarray(values).tolist() for name, values in result.items()}
+
+        if kind == 'variations':
+            outcomes = [None] * len(payload['tasks'])
+            runnable = []
+            for i, (param_id, variation, mode) in enumerate(payload['tasks']):
+                try:
+                    engine.resolve_parameter_key(param_id)
+                    runnable.append(i)
+                except ValueError as e:
+                    outcomes[i] = {'value': variation, 'success': False, 'error': str(e)}
+
+            results = engine.evaluate_batch(
+                [[tuple(payload['tasks'][i])] for i in runnable],
+                solve_for_price=solve_for_price
+            )
+            for i, result in zip(runnable, results):
+                outcomes[i] = {
+                    'value': payload['tasks'][i][1],
+                    'success': True,
+                    'price': result['price'],
+                    'npv': result['npv'],
+                    'metrics': result['metrics']
+                }
+            return outcomes
+
+        raise ValueError(f"Unknown unit kind: {kind}")
+
+    def _run_unit(self, sock, send_lock, message):
+        """Evaluate a unit and send its result."""
+        try:
+            reply = {'type': 'result', 'unit': message['unit'], 'result': self.evaluate(message['kind'], message['payload'])}
+        except Exception as e:
+            logger.error(f"Unit {message['unit']} failed: {str(e)}")
+            reply = {'type': 'result', 'unit': message['unit'], 'error': str(e)}
+        try:
+            with send_lock:
+                send_message(sock, reply)
+        except OSError:
+            # The coordinator hands the unit to another worker
+            pass
+
+    def _heartbeat(self, sock, send_lock, stopped):
+        while not stopped.wait(HEARTBEAT_INTERVAL):
+            try:
+                with send_lock:
+                    send_message(sock, {'type': 'heartbeat'})
+            except OSError:
+                return
+
+    def serve(self, sock):
+        """Serve one coordinator connection until it closes."""
+        send_lock = threading.Lock()
+        stopped = threading.Event()
+        messages = read_messages(sock)
+        challenge = next(messages, None)
+        if not challenge or challenge.get('type') != 'challenge':
+            return
+        send_message(sock, {
+            'type': 'hello', 'worker': self.name, 'slots': self.slots,
+            'auth': sign_hello(self.token, challenge['nonce'], self.name, self.slots)
+        })
+        threading.Thread(target=self._heartbeat, args=(sock, send_lock, stopped), daemon=True).start()
+        executor = ThreadPoolExecutor(max_workers=self.slots)
+        try:
+            for message in messages:
+                if message.get('type') == 'unit':
+                    executor.submit(self._run_unit, sock, send_lock, message)
+        finally:
+            stopped.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def run_forever(self, retry_interval=HEARTBEAT_INTERVAL):
+        """Serve the coordinator, reconnecting whenever the connection is lost."""
+        host, port = self.coordinator_address
+        while True:
+            try:
+                with socket.create_connection((host, port)) as sock:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+                    logger.info(f"Worker {self.name} connected to {host}:{port} with {self.slots} slots")
+                    self.serve(sock)
+                logger.warning(f"Worker {self.name} lost the coordinator connection, reconnecting")
+            except (OSError, ValueError) as e:
+                logger.debug(f"Worker {self.name} cannot reach {host}:{port}: {str(e)}")
+            time.sleep(retry_interval)
+
+
+def launch_local_workers(address, count, slots=1, base_dir=None, token=None):
+    """
+    Start worker processes on this host.
+
+    The processes are terminated when this process exits.
+
+    Args:
+        address (tuple or str): Coordinator address; "0.0.0.0" connects to 127.0.0.1
+        count (int): Number of worker processes
+        slots (int): Units evaluated at a time per worker
+        base_dir (str, optional): Folder containing Batch({version}) for the workers
+        token (str, optional): Coordinator token, passed to the workers as SWEEP_TOKEN
+
+    Returns:
+        list: Worker processes
+    """
+    host, port = parse_address(address) if isinstance(address, str) else address
+    if host in ('', '0.0.0.0', '::'):
+        host = '127.0.0.1'
+
+    command = [sys.executable, os.path.abspath(__file__), '--coordinator', f"{host}:{port}", '--slots', str(slots)]
+    if base_dir:
+        command += ['--base-dir', base_dir]
+
+    # The token is passed in the environment, where other users cannot read it
+    env = {**os.environ, 'SWEEP_TOKEN': token} if token else None
+    processes = []
+    for i in range(int(count)):
+        processes.append(subprocess.Popen(command + ['--name', f"{socket.gethostname()}-local-{i + 1}"], env=env))
+
+    def stop_workers():
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+
+    atexit.register(stop_workers)
+    logger.info(f"Started {len(processes)} local sweep workers for {host}:{port}")
+    return processes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate sensitivity sweep units for a coordinator")
+    parser.add_argument('--coordinator', required=True, help="Coordinator address as host:port")
+    parser.add_argument('--slots', type=int, default=1, help="Units evaluated at a time")
+    parser.add_argument('--name', help="Worker name (default: host name and process ID)")
+    parser.add_argument('--base-dir', help="Local folder containing Batch(version) folders")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    try:
+        worker = SweepWorker(args.coordinator, slots=args.slots, name=args.name, base_dir=args.base_dir)
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
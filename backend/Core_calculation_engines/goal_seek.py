@@ -0,0 +1,240 @@
+import os
+import sys
+import time
+import logging
+import numpy as np
+import pandas as pd
+
+# Add the backend directory to the Python path to enable imports from sibling packages
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Core_calculation_engines.sensitivity_engine import apply_variation, NPV_TOLERANCE
+
+# =====================================================================
+# GOAL_SEEK - BREAK-EVEN VALUES OF SENSITIVITY PARAMETERS
+# =====================================================================
+# The price search of calculateForPrice only solves for the selling price.
+# This module answers the same inverse question for any S-parameter: which
+# variation of the parameter (BEC, feedstock cost, utilization, IRR, ...)
+# brings the NPV at the target row to zero at the baseline selling price.
+#
+# Every parameter is solved on its own, with all others at the baseline,
+# by a bracketing root finder (Illinois variant of regula falsi). All
+# parameters are solved concurrently: each iteration evaluates the next
+# point of every unfinished parameter in one engine batch.
+#
+# The bracket of a parameter is given in variation units of its mode:
+#
+#   {"mode": "percentage", "low": -100, "high": 100}
+#
+# When the NPV has the same sign at both ends, the bracket is widened
+# around its midpoint a few times before the parameter is reported as
+# having no break-even.
+# =====================================================================
+
+DEFAULT_BRACKETS = {
+    'percentage': (-100.0, 100.0),
+    'absolutedeparture': (-1.0, 1.0),   # scaled by the baseline value
+    'directvalue': (0.0, 2.0),          # scaled by the baseline value
+}
+BRACKET_EXPANSIONS = 6
+MAX_ITERATIONS = 100
+
+# Status of a solved parameter
+CONVERGED = 'converged'
+NO_BRACKET = 'no_bracket'
+MAX_ITERATIONS_REACHED = 'max_iterations'
+
+logger = logging.getLogger('sensitivity.goalseek')
+
+
+def _scalar_base(engine, param_id):
+    """Baseline value of a parameter as one number (the mean over intervals)."""
+    base = engine.base_value(param_id)
+    return float(np.mean(base)) if isinstance(base, list) else float(base or 0.0)
+
+
+def default_bracket(engine, param_id, mode):
+    """
+    Get the default bracket of a parameter in variation units of its mode.
+
+    Args:
+        engine (SensitivityEngine): Engine with the version's baseline loaded
+        param_id (str): S-parameter ID
+        mode (str): Variation mode
+
+    Returns:
+        tuple: (low, high)
+    """
+    mode = mode.lower()
+    low, high = DEFAULT_BRACKETS.get(mode, DEFAULT_BRACKETS['percentage'])
+    if mode in ('absolutedeparture', 'directvalue'):
+        scale = abs(_scalar_base(engine, param_id)) or 1.0
+        low, high = low * scale, high * scale
+    return low, high
+
+
+def _evaluate(engine, points):
+    """Evaluate one (param_id, variation, mode) point per row and return the NPVs."""
+    results = engine.evaluate_batch([[point] for point in points])
+    return np.array([result['npv'] for result in results])
+
+
+def solve_break_even(engine, param_ids, brackets=None, tolerance=NPV_TOLERANCE, max_iterations=MAX_ITERATIONS):
+    """
+    Find the break-even variation of several parameters concurrently.
+
+    Args:
+        engine (SensitivityEngine): Engine with the version's baseline loaded
+        param_ids (list): S-parameter IDs
+        brackets (dict, optional): {"mode", "low", "high"} per parameter ID; defaults per mode
+        tolerance (float): NPV within which a point counts as break-even
+        max_iterations (int): Root finder iterations per parameter
+
+    Returns:
+        dict: Baseline NPV, one result per parameter, skipped parameters and timing
+    """
+    started = time.time()
+    brackets = brackets or {}
+
+    params, skipped = [], {}
+    for param_id in dict.fromkeys(param_ids):
+        spec = brackets.get(param_id) or {}
+        mode = str(spec.get('mode', 'percentage')).lower()
+        try:
+            key = engine.resolve_parameter_key(param_id)
+            low, high = default_bracket(engine, param_id, mode)
+            low, high = float(spec.get('low', low)), float(spec.get('high', high))
+        except (TypeError, ValueError) as e:
+            skipped[param_id] = str(e)
+            continue
+        if high <= low:
+            skipped[param_id] = f"Empty bracket ({low} to {high})"
+            continue
+        params.append((param_id, key, mode, low, high))
+
+    base_npv = engine.evaluate()['npv']
+    n = len(params)
+    ids = [param[0] for param in params]
+    modes = [param[2] for param in params]
+    lows = np.array([param[3] for param in params], dtype=float)
+    highs = np.array([param[4] for param in params], dtype=float)
+
+    def evaluate(rows, xs):
+        return _evaluate(engine, [(ids[i], x, modes[i]) for i, x in zip(rows, xs)]) if len(rows) else np.empty(0)
+
+    # Bracket: widen around the midpoint until the NPV changes sign
+    all_rows = np.arange(n)
+    f_low = evaluate(all_rows, lows)
+    f_high = evaluate(all_rows, highs)
+    for _ in range(BRACKET_EXPANSIONS):
+        unbracketed = np.nonzero(np.sign(f_low) == np.sign(f_high))[0]
+        if unbracketed.size == 0:
+            break
+        mid = (lows[unbracketed] + highs[unbracketed]) / 2
+        half = (highs[unbracketed] - lows[unbracketed])
+        lows[unbracketed], highs[unbracketed] = mid - half, mid + half
+        f_low[unbracketed] = evaluate(unbracketed, lows[unbracketed])
+        f_high[unbracketed] = evaluate(unbracketed, highs[unbracketed])
+
+    status = np.full(n, MAX_ITERATIONS_REACHED, dtype=object)
+    status[np.sign(f_low) == np.sign(f_high)] = NO_BRACKET
+    x = np.where(np.abs(f_low) <= np.abs(f_high), lows, highs)
+    f_x = np.where(np.abs(f_low) <= np.abs(f_high), f_low, f_high)
+    iterations = np.zeros(n, dtype=int)
+    side = np.zeros(n, dtype=int)  # Bracket end kept on the previous step: -1 low, +1 high
+
+    converged = (np.abs(f_x) <= tolerance) & (status != NO_BRACKET)
+    status[converged] = CONVERGED
+    active = status == MAX_ITERATIONS_REACHED
+    while active.any() and iterations.max() < max_iterations:
+        rows = np.nonzero(active)[0]
+        a, b, fa, fb = lows[rows], highs[rows], f_low[rows], f_high[rows]
+        # Regula falsi step; bisect where the secant would stall
+        candidate = b - fb * (b - a) / (fb - fa)
+        stalled = ~np.isfinite(candidate) | (candidate <= a) | (candidate >= b)
+        candidate[stalled] = ((a + b) / 2)[stalled]
+
+        f_c = evaluate(rows, candidate)
+        iterations[rows] += 1
+        x[rows], f_x[rows] = candidate, f_c
+
+        same_as_low = np.sign(f_c) == np.sign(fa)
+        # Illinois: halve the value of the end that is kept twice in a row
+        keep_high = rows[same_as_low]
+        lows[keep_high], f_low[keep_high] = candidate[same_as_low], f_c[same_as_low]
+        f_high[keep_high[side[keep_high] == 1]] /= 2
+        side[keep_high] = 1
+        keep_low = rows[~same_as_low]
+        highs[keep_low], f_high[keep_low] = candidate[~same_as_low], f_c[~same_as_low]
+        f_low[keep_low[side[keep_low] == -1]] /= 2
+        side[keep_low] = -1
+
+        done = rows[np.abs(f_c) <= tolerance]
+        status[done] = CONVERGED
+        active = (status == MAX_ITERATIONS_REACHED) & (iterations < max_iterations)
+
+    results = []
+    for i, (param_id, key, mode, _, _) in enumerate(params):
+        base = engine.base_value(param_id)
+        solved = status[i] != NO_BRACKET
+        if isinstance(base, list):
+            value = apply_variation(np.array(base), x[i], mode).tolist() if solved else None
+        else:
+            value = float(apply_variation(base, x[i], mode)) if solved and base is not None else None
+        results.append({
+            "paramId": param_id,
+            "key": key,
+            "mode": mode,
+            "status": status[i],
+            "variation": float(x[i]) if solved else None,
+            "baseValue": base,
+            "breakEvenValue": value,
+            "npv": float(f_x[i]) if solved else None,
+            "bracket": [float(lows[i]), float(highs[i])],
+            "iterations": int(iterations[i]),
+        })
+
+    logger.info(f"Goal seek of {n} parameters on version {engine.version}: "
+                f"{int((status == CONVERGED).sum())} converged in {time.time() - started:.3f}s")
+    return {
+        "version": engine.version,
+        "targetRow": engine.target_row,
+        "baselineNpv": base_npv,
+        "tolerance": tolerance,
+        "results": results,
+        "skipped": skipped,
+        "duration": round(time.time() - started, 3)
+    }
+
+
+def write_goal_seek_table(goal_seek, path):
+    """
+    Write the break-even results as a CSV table.
+
+    Args:
+        goal_seek (dict): Result of solve_break_even
+        path (str): Path of the CSV file
+    """
+    rows = []
+    for result in goal_seek['results']:
+        value = result['breakEvenValue']
+        rows.append({
+            'Parameter': result['paramId'],
+            'Key': result['key'],
+            'Mode': result['mode'],
+            'Status': result['status'],
+            'Break-even Variation': result['variation'],
+            'Baseline Value': np.mean(result['baseValue']) if isinstance(result['baseValue'], list) else result['baseValue'],
+            'Break-even Value': np.mean(value) if isinstance(value, list) else value,
+            'NPV': result['npv'],
+            'Iterations': result['iterations'],
+        })
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+def get_goal_seek_table_path(version, base_dir=None):
+    """Get the path of a version's break-even table in the sensitivity Reports folder."""
+    base_dir = base_dir or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Original')
+    return os.path.join(base_dir, f"Batch({version})", f"Results({version})", "Sensitivity", "Reports",
+                        f"goal_seek({version}).csv")
@@ -0,0 +1,216 @@
+import os
+import time
+import logging
+import numpy as np
+
+# =====================================================================
+# GRID_SWEEP - TWO-PARAMETER SENSITIVITY GRID
+# =====================================================================
+# Evaluates the full N x M cartesian product of two S-parameters' values
+# on the in-memory engine, for heatmaps such as price vs feedstock cost or
+# capacity vs BEC. Rows of the grid (one x value against every y value)
+# are evaluated together in vectorized batches that share the baseline,
+# and each row is yielded as soon as its batch completes.
+#
+# Every cell holds the NPV at the baseline selling price and, when
+# requested, the solved (break-even) selling price. The break-even contour
+# is the NPV = 0 line, interpolated linearly between neighbouring cells.
+#
+# Batches are evaluated through an evaluator's map_samples(): the engine
+# itself by default, or a DistributedEvaluator that spreads the batches
+# over worker hosts.
+# =====================================================================
+
+# Cells evaluated per vectorized batch
+DEFAULT_BATCH_CELLS = 5000
+
+logger = logging.getLogger('sensitivity.grid')
+
+
+def axis_values(axis):
+    """
+    Get the values of a grid axis.
+
+    An axis lists its values explicitly, or spans {"low", "high", "steps"}
+    with evenly spaced values.
+
+    Args:
+        axis (dict): Axis specification
+
+    Returns:
+        ndarray: Axis values
+
+    Raises:
+        ValueError: If the axis has neither values nor a valid range
+    """
+    if axis.get('values') is not None:
+        return np.asarray(axis['values'], dtype=float)
+    try:
+        return np.linspace(float(axis['low']), float(axis['high']), int(axis['steps']))
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Grid axis {axis.get('paramId')} needs values or low, high and steps")
+
+
+def break_even_contour(x_values, y_values, npv):
+    """
+    Find the points where the NPV crosses zero between neighbouring grid cells.
+
+    Args:
+        x_values (ndarray): (N,) values of the row parameter
+        y_values (ndarray): (M,) values of the column parameter
+        npv (ndarray): (N, M) NPV matrix
+
+    Returns:
+        list: {"x", "y"} points on the NPV = 0 line
+    """
+    points = []
+
+    def crossings(a, b):
+        # Pairs of neighbours with opposite signs, or an exact zero in the first
+        return (a == 0) | (a * b < 0)
+
+    # Along each row (varying y)
+    rows, cols = np.nonzero(crossings(npv[:, :-1], npv[:, 1:]))
+    for i, j in zip(rows, cols):
+        a, b = npv[i, j], npv[i, j + 1]
+        t = 0.0 if a == 0 else a / (a - b)
+        points.append({"x": float(x_values[i]), "y": float(y_values[j] + t * (y_values[j + 1] - y_values[j]))})
+
+    # Along each column (varying x)
+    rows, cols = np.nonzero(crossings(npv[:-1, :], npv[1:, :]))
+    for i, j in zip(rows, cols):
+        a, b = npv[i, j], npv[i + 1, j]
+        if a == 0:
+            continue  # Already found along the row
+        t = a / (a - b)
+        points.append({"x": float(x_values[i] + t * (x_values[i + 1] - x_values[i])), "y": float(y_values[j])})
+
+    # The last cell of every row is not the first of any row pair
+    for i in np.nonzero(npv[:, -1] == 0)[0]:
+        points.append({"x": float(x_values[i]), "y": float(y_values[-1])})
+
+    return points
+
+
+def iter_grid(engine, x_axis, y_axis, solve_for_price=True, batch_cells=DEFAULT_BATCH_CELLS, skip_rows=None,
+              evaluator=None):
+    """
+    Evaluate a two-parameter grid, yielding each row as it completes.
+
+    Args:
+        engine (SensitivityEngine): Engine with the version's baseline loaded
+        x_axis (dict): Row parameter as {"paramId", "values" (or "low", "high", "steps"), "mode"}
+        y_axis (dict): Column parameter, as x_axis
+        solve_for_price (bool): Also search the break-even selling price of every cell
+        batch_cells (int): Cells evaluated per vectorized batch (whole rows at a time)
+        skip_rows (iterable, optional): Indices of rows already evaluated (e.g. by an interrupted run)
+        evaluator (optional): Object whose map_samples() evaluates the batches; the engine if None
+
+    Yields:
+        dict: {"row", "x", "npv": [...], "price": [...]} per grid row
+
+    Raises:
+        ValueError: If an axis has no values or both axes vary the same parameter
+    """
+    x_param, y_param = x_axis['paramId'], y_axis['paramId']
+    x_values, y_values = axis_values(x_axis), axis_values(y_axis)
+    if x_values.size == 0 or y_values.size == 0:
+        raise ValueError("Both grid axes need at least one value")
+    if engine.resolve_parameter_key(x_param) == engine.resolve_parameter_key(y_param):
+        raise ValueError(f"Grid axes {x_param} and {y_param} vary the same parameter")
+
+    x_mode = x_axis.get('mode', 'percentage')
+    y_mode = y_axis.get('mode', 'percentage')
+    m = y_values.size
+    rows_per_batch = max(1, int(batch_cells) // m)
+    skip_rows = set(skip_rows or [])
+    pending = np.array([i for i in range(x_values.size) if i not in skip_rows], dtype=int)
+    batches = [pending[start:start + rows_per_batch] for start in range(0, pending.size, rows_per_batch)]
+
+    def units():
+        for indices in batches:
+            block = x_values[indices]
+            samples = [
+                (x_param, np.repeat(block, m), x_mode),
+                (y_param, np.tile(y_values, block.size), y_mode),
+            ]
+            yield samples, False
+            if solve_for_price:
+                yield samples, True
+
+    results = (evaluator or engine).map_samples(units())
+    for indices in batches:
+        block = x_values[indices]
+        npv = next(results)['npv'].reshape(block.size, m)
+        price = next(results)['price'].reshape(block.size, m) if solve_for_price else None
+
+        for k, x in enumerate(block):
+            row = {"row": int(indices[k]), "x": float(x), "npv": npv[k].tolist()}
+            if solve_for_price:
+                row["price"] = price[k].tolist()
+            yield row
+
+
+def assemble_grid(engine, x_axis, y_axis, rows, duration):
+    """
+    Assemble the rows of a completed grid into matrices with the break-even contour.
+
+    Args:
+        engine (SensitivityEngine): Engine the grid was evaluated on
+        x_axis (dict): Row parameter axis
+        y_axis (dict): Column parameter axis
+        rows (list): Rows yielded by iter_grid (in any order)
+        duration (float): Seconds spent evaluating
+
+    Returns:
+        dict: Axes, NPV (and price) matrices, break-even contour and timing
+    """
+    x_values, y_values = axis_values(x_axis), axis_values(y_axis)
+    rows = sorted(rows, key=lambda row: row["row"])
+    npv = [row["npv"] for row in rows]
+    result = {
+        "version": engine.version,
+        "x": {"paramId": x_axis['paramId'], "mode": x_axis.get('mode', 'percentage'), "values": x_values.tolist()},
+        "y": {"paramId": y_axis['paramId'], "mode": y_axis.get('mode', 'percentage'), "values": y_values.tolist()},
+        "npv": npv,
+        "breakEvenContour": break_even_contour(x_values, y_values, np.array(npv)),
+        "duration": round(duration, 3)
+    }
+    if rows and "price" in rows[0]:
+        result["price"] = [row["price"] for row in rows]
+    return result
+
+
+def run_grid(engine, x_axis, y_axis, solve_for_price=True, batch_cells=DEFAULT_BATCH_CELLS, row_callback=None):
+    """
+    Evaluate a two-parameter grid to completion.
+
+    Args:
+        engine (SensitivityEngine): Engine with the version's baseline loaded
+        x_axis (dict): Row parameter axis (see iter_grid)
+        y_axis (dict): Column parameter axis
+        solve_for_price (bool): Also search the break-even selling price of every cell
+        batch_cells (int): Cells evaluated per vectorized batch
+        row_callback (callable, optional): Called with every row as it completes
+
+    Returns:
+        dict: Axes, NPV (and price) matrices, break-even contour and timing
+    """
+    started = time.time()
+    rows = []
+    for row in iter_grid(engine, x_axis, y_axis, solve_for_price, batch_cells):
+        rows.append(row)
+        if row_callback:
+            row_callback(row)
+
+    result = assemble_grid(engine, x_axis, y_axis, rows, time.time() - started)
+    logger.info(f"Grid {x_axis['paramId']} x {y_axis['paramId']} ({len(result['npv'])}x{len(result['y']['values'])}) "
+                f"in {result['duration']}s")
+    return result
+
+
+def get_grid_report_path(version, x_param, y_param, base_dir=None):
+    """Get the path of a grid report in the version's sensitivity Reports folder."""
+    base_dir = base_dir or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Original')
+    return os.path.join(base_dir, f"Batch({version})", f"Results({version})", "Sensitivity", "Reports",
+                        f"grid_{x_param}_vs_{y_param}({version}).json")
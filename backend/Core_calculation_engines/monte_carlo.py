@@ -0,0 +1,372 @@
+import os
+import sys
+import json
+import time
+import logging
+import numpy as np
+
+# Add the backend directory to the Python path to enable imports from sibling packages
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Core_calculation_engines.sensitivity_engine import SensitivityEngine
+
+# =====================================================================
+# MONTE_CARLO - MONTE CARLO SENSITIVITY ON THE IN-MEMORY ENGINE
+# =====================================================================
+# Each S-parameter of a Monte Carlo run is given a distribution instead of
+# a list of values:
+#
+#   {"type": "normal", "mean": 0, "std": 10, "apply": "percentage"}
+#   {"type": "triangular", "min": -20, "likely": 0, "max": 30}
+#   {"type": "uniform", "min": -10, "max": 10}
+#   {"type": "lognormal", "mean": 0, "sigma": 0.25, "apply": "directvalue"}
+#   {"type": "empirical", "values": [...], "weights": [...]}
+#
+# The sampled numbers are variations applied with the "apply" mode
+# (percentage by default, or directvalue / absolutedeparture), exactly as
+# sensitivity values are. For lognormal, mean and sigma are those of the
+# underlying normal distribution.
+#
+# All draws of a run are sampled as one array per parameter and evaluated
+# in chunks through SensitivityEngine.evaluate_samples(), so one chunk of
+# thousands of draws costs a few numpy passes over the cash flow table.
+# Running statistics (mean, standard deviation, P5/P50/P95 and histograms
+# of NPV and solved price) are updated after every chunk and yielded, so
+# callers can stream them while the run continues. Chunks are evaluated
+# through an evaluator's map_samples(): the engine itself by default, or a
+# DistributedEvaluator that spreads them over worker hosts.
+#
+# With a checkpoint file, the statistics and generator state are saved after
+# every chunk; a run started again with the same inputs and seed resumes
+# after the last saved chunk with the same result as an uninterrupted run.
+# =====================================================================
+
+DISTRIBUTION_TYPES = ['normal', 'triangular', 'uniform', 'lognormal', 'empirical']
+
+DEFAULT_SAMPLES = 10000
+DEFAULT_CHUNK_SIZE = 2000
+HISTOGRAM_BINS = 50
+PERCENTILES = [5, 50, 95]
+
+# Draws kept for percentiles and histograms; runs beyond this keep a uniform reservoir
+RESERVOIR_SIZE = 100000
+
+logger = logging.getLogger('sensitivity.montecarlo')
+
+
+def sample_distribution(spec, n, rng):
+    """
+    Draw samples from a distribution specification.
+
+    Args:
+        spec (dict): Distribution specification with a "type" and its parameters
+        n (int): Number of draws
+        rng (Generator): numpy random generator
+
+    Returns:
+        ndarray: (n,) array of draws
+
+    Raises:
+        ValueError: If the type is unknown or a parameter is missing or invalid
+    """
+    dist_type = str(spec.get('type', '')).lower()
+    try:
+        if dist_type == 'normal':
+            return rng.normal(float(spec['mean']), float(spec['std']), n)
+        if dist_type == 'triangular':
+            return rng.triangular(float(spec['min']), float(spec['likely']), float(spec['max']), n)
+        if dist_type == 'uniform':
+            return rng.uniform(float(spec['min']), float(spec['max']), n)
+        if dist_type == 'lognormal':
+            return rng.lognormal(float(spec['mean']), float(spec['sigma']), n)
+        if dist_type == 'empirical':
+            values = np.asarray(spec['values'], dtype=float)
+            if values.size == 0:
+                raise ValueError("Empirical distribution needs at least one value")
+            weights = spec.get('weights')
+            if weights is not None:
+                weights = np.asarray(weights, dtype=float)
+                weights = weights / weights.sum()
+            return rng.choice(values, size=n, replace=True, p=weights)
+    except KeyError as e:
+        raise ValueError(f"Distribution {dist_type} is missing parameter {e.args[0]}")
+
+    raise ValueError(f"Unknown distribution type: {spec.get('type')} (expected one of {', '.join(DISTRIBUTION_TYPES)})")
+
+
+class RunningStatistics:
+    """
+    Running statistics of one output over chunks of draws.
+
+    Mean and standard deviation are exact (chunks are merged with Chan's
+    parallel update). Percentiles and histograms come from the kept draws,
+    which are all draws up to RESERVOIR_SIZE and a uniform sample beyond.
+    """
+    def __init__(self, rng, capacity=RESERVOIR_SIZE):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self._rng = rng
+        self._capacity = capacity
+        self._kept = np.empty(0)
+
+    def update(self, values):
+        """Add a chunk of draws."""
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return
+
+        n, chunk_mean = values.size, float(values.mean())
+        chunk_m2 = float(((values - chunk_mean) ** 2).sum())
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += chunk_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+
+        # Reservoir sampling (algorithm R) applied to the whole chunk at once
+        room = self._capacity - self._kept.size
+        if room > 0:
+            self._kept = np.concatenate([self._kept, values[:room]])
+            values = values[room:]
+        if values.size:
+            seen = total - values.size + np.arange(1, values.size + 1)
+            slots = (self._rng.random(values.size) * seen).astype(np.int64)
+            keep = slots < self._capacity
+            self._kept[slots[keep]] = values[keep]
+
+    def get_state(self, prefix):
+        """State of the statistics as arrays named with a prefix (for np.savez)."""
+        return {
+            f"{prefix}scalars": np.array([self.count, self.mean, self._m2, self.minimum, self.maximum]),
+            f"{prefix}kept": self._kept,
+        }
+
+    def set_state(self, state, prefix):
+        """Restore the statistics saved by get_state()."""
+        count, self.mean, self._m2, self.minimum, self.maximum = state[f"{prefix}scalars"].tolist()
+        self.count = int(count)
+        self._kept = state[f"{prefix}kept"]
+
+    def summary(self, bins=HISTOGRAM_BINS):
+        """
+        Summarize the draws seen so far.
+
+        Returns:
+            dict: count, mean, std, min, max, percentiles (P5/P50/P95) and histogram
+        """
+        if self.count == 0:
+            return {"count": 0}
+
+        counts, edges = np.histogram(self._kept, bins=bins)
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": float(np.sqrt(self._m2 / (self.count - 1))) if self.count > 1 else 0.0,
+            "min": self.minimum,
+            "max": self.maximum,
+            "percentiles": {f"P{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(self._kept, PERCENTILES))},
+            "histogram": {"counts": counts.tolist(), "edges": edges.tolist()}
+        }
+
+
+def save_checkpoint(path, completed, rng, outputs, inputs):
+    """Save the state of a run after a chunk atomically."""
+    state = {
+        "completed": np.array(completed),
+        "rng": np.array(json.dumps(rng.bit_generator.state)),
+    }
+    for name, stats in outputs.items():
+        state.update(stats.get_state(f"output_{name}_"))
+    for param_id, stats in inputs.items():
+        state.update(stats.get_state(f"input_{param_id}_"))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp.npz"
+    np.savez(temp_path, **state)
+    os.replace(temp_path, path)
+
+
+def load_checkpoint(path, rng, outputs, inputs):
+    """
+    Restore the state of a run from its checkpoint file.
+
+    Returns:
+        int: Draws completed, or 0 if the file is missing or does not fit the run
+    """
+    try:
+        with np.load(path) as state:
+            rng.bit_generator.state = json.loads(str(state["rng"]))
+            for name, stats in outputs.items():
+                stats.set_state(state, f"output_{name}_")
+            for param_id, stats in inputs.items():
+                stats.set_state(state, f"input_{param_id}_")
+            return int(state["completed"])
+    except (OSError, KeyError, ValueError) as e:
+        logger.warning(f"Ignoring Monte Carlo checkpoint {path}: {str(e)}")
+        return 0
+
+
+def iter_monte_carlo(engine, distributions, samples=DEFAULT_SAMPLES, chunk_size=DEFAULT_CHUNK_SIZE,
+                     seed=None, solve_for_price=False, checkpoint_file=None, evaluator=None):
+    """
+    Run a Monte Carlo sensitivity analysis, yielding the running summary after every chunk.
+
+    Args:
+        engine (SensitivityEngine): Engine with the version's baseline loaded
+        distributions (dict): Distribution specification per S-parameter ID
+        samples (int): Number of draws
+        chunk_size (int): Draws evaluated per vectorized batch
+        seed (int, optional): Seed of the random generator, for reproducible runs
+        solve_for_price (bool): Search the selling price per draw (calculateForPrice)
+        checkpoint_file (str, optional): .npz file saving the run state after every chunk;
+            an existing file is resumed. Resuming needs the seed of the interrupted run.
+        evaluator (optional): Object whose map_samples() evaluates the chunks; the engine if None
+
+    Yields:
+        dict: Run summary with the distributions, statistics of NPV (and solved
+              price), input statistics, draws completed and timing
+
+    Raises:
+        ValueError: If no distributions are given, or one cannot be sampled or applied
+    """
+    if not distributions:
+        raise ValueError("No Monte Carlo distributions given")
+    samples = int(samples)
+    chunk_size = max(1, int(chunk_size))
+    if samples < 1:
+        raise ValueError("Number of samples must be at least 1")
+
+    # Fail before sampling if a parameter cannot be varied
+    for param_id in distributions:
+        engine.resolve_parameter_key(param_id)
+
+    rng = np.random.default_rng(seed)
+    draws = {
+        param_id: sample_distribution(spec, samples, rng)
+        for param_id, spec in distributions.items()
+    }
+
+    outputs = {"npv": RunningStatistics(rng)}
+    if solve_for_price:
+        outputs["price"] = RunningStatistics(rng)
+    inputs = {param_id: RunningStatistics(rng) for param_id in distributions}
+
+    resumed = 0
+    if checkpoint_file and os.path.exists(checkpoint_file):
+        resumed = load_checkpoint(checkpoint_file, rng, outputs, inputs)
+        if resumed:
+            logger.info(f"Resuming Monte Carlo run of version {engine.version} after {resumed} draws")
+
+    started = time.time()
+
+    def summarize(completed):
+        return {
+            "version": engine.version,
+            "samples": samples,
+            "completed": completed,
+            "resumedAt": resumed,
+            "seed": seed,
+            "solveForPrice": solve_for_price,
+            "distributions": distributions,
+            "outputs": {name: stats.summary() for name, stats in outputs.items()},
+            "inputs": {param_id: stats.summary() for param_id, stats in inputs.items()},
+            "duration": round(time.time() - started, 3)
+        }
+
+    if resumed >= samples:
+        # The interrupted run had already finished its last chunk
+        yield summarize(samples)
+        return
+
+    chunks = [slice(offset, min(offset + chunk_size, samples)) for offset in range(resumed, samples, chunk_size)]
+    results = (evaluator or engine).map_samples(
+        ([(param_id, draws[param_id][chunk], spec.get('apply', 'percentage'))
+          for param_id, spec in distributions.items()], solve_for_price)
+        for chunk in chunks
+    )
+
+    for chunk in chunks:
+        result = next(results)
+
+        for name, stats in outputs.items():
+            stats.update(result[name])
+        for param_id, stats in inputs.items():
+            stats.update(draws[param_id][chunk])
+        if checkpoint_file:
+            save_checkpoint(checkpoint_file, chunk.stop, rng, outputs, inputs)
+
+        yield summarize(chunk.stop)
+
+
+def run_monte_carlo(engine, distributions, samples=DEFAULT_SAMPLES, chunk_size=DEFAULT_CHUNK_SIZE,
+                    seed=None, solve_for_price=False, progress_callback=None):
+    """
+    Run a Monte Carlo sensitivity analysis to completion.
+
+    Args:
+        engine (SensitivityEngine): Engine with the version's baseline loaded
+        distributions (dict): Distribution specification per S-parameter ID
+        samples (int): Number of draws
+        chunk_size (int): Draws evaluated per vectorized batch
+        seed (int, optional): Seed of the random generator, for reproducible runs
+        solve_for_price (bool): Search the selling price per draw (calculateForPrice)
+        progress_callback (callable, optional): Called with the summary after every chunk
+
+    Returns:
+        dict: Final run summary (see iter_monte_carlo)
+    """
+    summary = None
+    for summary in iter_monte_carlo(engine, distributions, samples, chunk_size, seed, solve_for_price):
+        if progress_callback:
+            progress_callback(summary)
+
+    logger.info(f"Monte Carlo run of version {engine.version}: {summary['samples']} draws in {summary['duration']}s")
+    return summary
+
+
+def get_monte_carlo_folder(version, base_dir=None):
+    """Get the MonteCarlo results folder of a version."""
+    base_dir = base_dir or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Original')
+    return os.path.join(base_dir, f"Batch({version})", f"Results({version})", "Sensitivity", "MonteCarlo")
+
+
+def write_summary(summary, path):
+    """Write a run summary atomically so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    os.replace(temp_path, path)
+
+
+if __name__ == "__main__":
+    # Usage: python monte_carlo.py <version> <distributions.json> [samples] [--price]
+    if len(sys.argv) < 3:
+        print("Usage: python monte_carlo.py <version> <distributions.json> [samples] [--price]")
+        sys.exit(1)
+
+    args = [arg for arg in sys.argv[1:] if arg != '--price']
+    with open(args[1], 'r') as f:
+        run_config = json.load(f)
+
+    engine = SensitivityEngine(
+        args[0],
+        run_config.get('selectedV', {}),
+        run_config.get('selectedF', {}),
+        run_config.get('targetRow', 20)
+    )
+    result = run_monte_carlo(
+        engine,
+        run_config['distributions'],
+        samples=int(args[2]) if len(args) > 2 else run_config.get('samples', DEFAULT_SAMPLES),
+        seed=run_config.get('seed'),
+        solve_for_price='--price' in sys.argv
+    )
+    output_file = os.path.join(get_monte_carlo_folder(args[0]), f"monte_carlo_results({args[0]}).json")
+    write_summary(result, output_file)
+    print(f"Monte Carlo results written to {output_file}")
@@ -0,0 +1,330 @@
+import os
+import sys
+import json
+import time
+import logging
+import numpy as np
+
+# Add the backend directory to the Python path to enable imports from sibling packages
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Core_calculation_engines.sensitivity_engine import SensitivityEngine
+from Core_calculation_engines.monte_carlo import RunningStatistics
+
+# =====================================================================
+# SCENARIO_PATHS - STOCHASTIC YEAR-BY-YEAR SCENARIOS
+# =====================================================================
+# Sensitivity and Monte Carlo runs vary a parameter by one number for the
+# whole project life. A scenario run gives per-interval parameters (selling
+# price, inflation, cost escalations, ...) a stochastic process instead,
+# and draws thousands of paths with one value per CFA row (year):
+#
+#   {"process": "mean_reverting", "speed": 0.3, "volatility": 0.15, "mean": 1.0}
+#   {"process": "random_walk", "drift": 0, "volatility": 0.005}
+#   {"process": "geometric", "drift": 0.02, "volatility": 0.05}
+#
+# mean_reverting is an Ornstein-Uhlenbeck process on the log of the value
+# (speed is the share of the gap to the log mean closed each year),
+# geometric a geometric Brownian motion and random_walk an arithmetic
+# random walk. The two multiplicative processes are factors on the
+# baseline with the default "apply" mode percentage (start and mean
+# default to 1); with directvalue, start and mean are levels in the
+# parameter's units. random_walk paths are added to the baseline
+# (absolutedeparture) unless another "apply" mode is given; start
+# defaults to 0.
+#
+# The yearly shocks of all processes are standard normal draws, correlated
+# through the Cholesky factor of an optional correlation matrix whose rows
+# follow the order of the processes. All paths are drawn as arrays and
+# evaluated in chunks through SensitivityEngine.evaluate_paths(), so 5,000
+# paths over 40 years cost a few numpy passes over the cash flow table.
+# Distributions of the cumulative cash flow (NPV), after-tax cash flow and
+# selling price are reported per year.
+# =====================================================================
+
+PATH_PROCESSES = ['mean_reverting', 'random_walk', 'geometric']
+
+# Processes whose paths multiply the baseline
+MULTIPLICATIVE_PROCESSES = ['mean_reverting', 'geometric']
+
+DEFAULT_SCENARIOS = 5000
+DEFAULT_CHUNK_SIZE = 5000
+PERCENTILES = [5, 25, 50, 75, 95]
+
+logger = logging.getLogger('sensitivity.scenarios')
+
+
+def get_apply_mode(spec):
+    """
+    Get the mode a path is applied with.
+
+    Args:
+        spec (dict): Process specification
+
+    Returns:
+        str: percentage, directvalue or absolutedeparture
+
+    Raises:
+        ValueError: If the process is unknown or cannot be applied with the mode
+    """
+    process = str(spec.get('process', '')).lower()
+    if process not in PATH_PROCESSES:
+        raise ValueError(f"Unknown path process: {spec.get('process')} (expected one of {', '.join(PATH_PROCESSES)})")
+    if process in MULTIPLICATIVE_PROCESSES:
+        mode = str(spec.get('apply', 'percentage')).lower()
+        if mode not in ('percentage', 'directvalue'):
+            raise ValueError(f"A {process} path is applied as percentage or directvalue, not {mode}")
+        return mode
+    mode = str(spec.get('apply', 'absolutedeparture')).lower()
+    if mode not in ('percentage', 'directvalue', 'absolutedeparture'):
+        raise ValueError(f"Unknown apply mode: {mode}")
+    return mode
+
+
+def get_cholesky_factor(correlation, size):
+    """
+    Get the Cholesky factor of a correlation matrix.
+
+    Args:
+        correlation (list): (size, size) correlation matrix, or None for independent shocks
+        size (int): Number of processes
+
+    Returns:
+        ndarray: Lower triangular factor, or None for independent shocks
+
+    Raises:
+        ValueError: If the matrix is not a valid correlation matrix
+    """
+    if correlation is None:
+        return None
+    try:
+        matrix = np.asarray(correlation, dtype=float)
+    except (TypeError, ValueError):
+        raise ValueError("Correlation matrix must contain numbers")
+    if matrix.shape != (size, size):
+        raise ValueError(f"Correlation matrix has shape {matrix.shape}, expected ({size}, {size})")
+    if not np.allclose(matrix, matrix.T) or not np.allclose(np.diag(matrix), 1) or np.abs(matrix).max() > 1:
+        raise ValueError("Correlation matrix must be symmetric with a unit diagonal and entries between -1 and 1")
+    try:
+        return np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        raise ValueError("Correlation matrix is not positive definite")
+
+
+def generate_paths(processes, n, years, correlation=None, rng=None):
+    """
+    Draw correlated year-indexed paths of several processes.
+
+    Args:
+        processes (dict): Process specification per S-parameter ID
+        n (int): Number of paths
+        years (int): Values per path (the first one is the start value)
+        correlation (list, optional): Correlation matrix of the yearly shocks, in process order
+        rng (Generator, optional): numpy random generator
+
+    Returns:
+        dict: (n, years) array of variations per S-parameter ID, ready to apply
+              with the process's apply mode
+
+    Raises:
+        ValueError: If a specification or the correlation matrix is invalid
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    factor = get_cholesky_factor(correlation, len(processes))
+    shocks = rng.standard_normal((n, max(years - 1, 0), len(processes)))
+    if factor is not None:
+        shocks = shocks @ factor.T
+
+    paths = {}
+    for i, (param_id, spec) in enumerate(processes.items()):
+        process = str(spec.get('process', '')).lower()
+        mode = get_apply_mode(spec)
+        try:
+            volatility = float(spec['volatility'])
+            drift = float(spec.get('drift', 0))
+            start = float(spec['start']) if 'start' in spec else None
+        except KeyError as e:
+            raise ValueError(f"Path process of {param_id} is missing parameter {e.args[0]}")
+        except (TypeError, ValueError):
+            raise ValueError(f"Path process of {param_id} has a non-numeric parameter")
+        if volatility < 0:
+            raise ValueError(f"Path process of {param_id} has a negative volatility")
+        z = shocks[:, :, i]
+
+        if process == 'random_walk':
+            start = 0.0 if start is None else start
+            steps = drift + volatility * z
+            values = start + np.concatenate([np.zeros((n, 1)), np.cumsum(steps, axis=1)], axis=1)
+        else:
+            if start is None:
+                if mode == 'directvalue':
+                    raise ValueError(f"A directvalue {process} path of {param_id} needs a start level")
+                start = 1.0
+            if start <= 0:
+                raise ValueError(f"A {process} path of {param_id} needs a positive start")
+            log_values = np.empty((n, years))
+            log_values[:, 0] = np.log(start)
+            if process == 'geometric':
+                steps = drift - volatility ** 2 / 2 + volatility * z
+                log_values[:, 1:] = log_values[:, :1] + np.cumsum(steps, axis=1)
+            else:
+                mean = float(spec.get('mean', start))
+                speed = float(spec.get('speed', 0.5))
+                if mean <= 0 or not 0 <= speed <= 1:
+                    raise ValueError(f"A mean_reverting path of {param_id} needs a positive mean and a speed between 0 and 1")
+                log_mean = np.log(mean)
+                for year in range(1, years):
+                    previous = log_values[:, year - 1]
+                    log_values[:, year] = previous + speed * (log_mean - previous) + volatility * z[:, year - 1]
+            values = np.exp(log_values)
+            if mode == 'percentage':
+                values = (values - 1) * 100
+
+        paths[param_id] = values
+    return paths
+
+
+def year_statistics(values):
+    """
+    Summarize a set of paths year by year.
+
+    Args:
+        values (ndarray): (n, years) array
+
+    Returns:
+        dict: mean, std and percentiles, each a list with one value per year
+    """
+    return {
+        "mean": values.mean(axis=0).tolist(),
+        "std": values.std(axis=0, ddof=1).tolist() if len(values) > 1 else [0.0] * values.shape[1],
+        "percentiles": {
+            f"P{p}": row.tolist() for p, row in zip(PERCENTILES, np.percentile(values, PERCENTILES, axis=0))
+        }
+    }
+
+
+def run_scenarios(engine, processes, scenarios=DEFAULT_SCENARIOS, correlation=None, seed=None,
+                  solve_for_price=False, chunk_size=DEFAULT_CHUNK_SIZE, check=None):
+    """
+    Evaluate stochastic year-by-year scenarios of per-interval parameters.
+
+    Args:
+        engine (SensitivityEngine): Engine with the version's baseline loaded
+        processes (dict): Process specification per S-parameter ID
+        scenarios (int): Number of paths
+        correlation (list, optional): Correlation matrix of the yearly shocks, in process order
+        seed (int, optional): Seed of the random generator, for reproducible runs
+        solve_for_price (bool): Search the selling price per path (calculateForPrice)
+        chunk_size (int): Paths evaluated per vectorized batch
+        check (callable, optional): Called before every batch; raising from it stops the
+                                    run (e.g. a job cancellation check)
+
+    Returns:
+        dict: Distributions of the NPV (and solved price) at the target row, yearly
+              distributions of the cash flow, selling price and input paths, and timing
+
+    Raises:
+        ValueError: If no processes are given, or one cannot be drawn or applied
+    """
+    if not processes:
+        raise ValueError("No path processes given")
+    scenarios = int(scenarios)
+    chunk_size = max(1, int(chunk_size))
+    if scenarios < 1:
+        raise ValueError("Number of scenarios must be at least 1")
+
+    # Fail before drawing if a parameter cannot follow a path
+    modes = {}
+    for param_id, spec in processes.items():
+        key = engine.resolve_parameter_key(param_id)
+        if key not in engine._interval_values:
+            raise ValueError(f"Parameter {param_id} ({key}) is not a per-interval parameter and cannot follow a yearly path")
+        modes[param_id] = get_apply_mode(spec)
+
+    started = time.time()
+    rng = np.random.default_rng(seed)
+    years = engine.total_years
+    paths = generate_paths(processes, scenarios, years, correlation, rng)
+
+    npv = np.empty(scenarios)
+    price = np.empty(scenarios)
+    yearly = {name: np.empty((scenarios, years)) for name in ('cumulative', 'after_tax', 'selling_price')}
+    for offset in range(0, scenarios, chunk_size):
+        if check:
+            check()
+        chunk = slice(offset, min(offset + chunk_size, scenarios))
+        result = engine.evaluate_paths(
+            [(param_id, paths[param_id][chunk], modes[param_id]) for param_id in processes],
+            solve_for_price=solve_for_price
+        )
+        npv[chunk] = result['npv']
+        price[chunk] = result['price']
+        for name, values in yearly.items():
+            values[chunk] = result[name]
+
+    outputs = {"npv": RunningStatistics(rng)}
+    outputs["npv"].update(npv)
+    if solve_for_price:
+        outputs["price"] = RunningStatistics(rng)
+        outputs["price"].update(price)
+
+    cumulative = year_statistics(yearly['cumulative'])
+    cumulative["paybackProbability"] = (yearly['cumulative'] >= 0).mean(axis=0).tolist()
+    summary = {
+        "version": engine.version,
+        "scenarios": scenarios,
+        "years": years,
+        "constructionYears": engine.construction_years,
+        "targetRow": engine.target_row,
+        "seed": seed,
+        "solveForPrice": solve_for_price,
+        "processes": processes,
+        "correlation": correlation,
+        "outputs": {name: stats.summary() for name, stats in outputs.items()},
+        "yearly": {
+            "cumulativeCashFlow": cumulative,
+            "afterTaxCashFlow": year_statistics(yearly['after_tax']),
+            "sellingPrice": year_statistics(yearly['selling_price'])
+        },
+        "inputs": {param_id: year_statistics(values) for param_id, values in paths.items()},
+        "duration": round(time.time() - started, 3)
+    }
+    logger.info(f"Scenario run of version {engine.version}: {scenarios} paths over {years} years in {summary['duration']}s")
+    return summary
+
+
+def get_scenario_report_path(version, base_dir=None):
+    """Get the path of a version's scenario report in the sensitivity Reports folder."""
+    base_dir = base_dir or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Original')
+    return os.path.join(base_dir, f"Batch({version})", f"Results({version})", "Sensitivity", "Reports",
+                        f"scenario_paths({version}).json")
+
+
+if __name__ == "__main__":
+    # Usage: python scenario_paths.py <version> <processes.json> [scenarios] [--price]
+    if len(sys.argv) < 3:
+        print("Usage: python scenario_paths.py <version> <processes.json> [scenarios] [--price]")
+        sys.exit(1)
+
+    args = [arg for arg in sys.argv[1:] if arg != '--price']
+    with open(args[1], 'r') as f:
+        run_config = json.load(f)
+
+    engine = SensitivityEngine(
+        args[0],
+        run_config.get('selectedV', {}),
+        run_config.get('selectedF', {}),
+        run_config.get('targetRow', 20)
+    )
+    report = run_scenarios(
+        engine,
+        run_config['processes'],
+        scenarios=int(args[2]) if len(args) > 2 else run_config.get('scenarios', DEFAULT_SCENARIOS),
+        correlation=run_config.get('correlation'),
+        seed=run_config.get('seed'),
+        solve_for_price='--price' in sys.argv
+    )
+    report_path = get_scenario_report_path(args[0])
+    os.makedirs(os.path.dirname(report_path), exist_ok=True)
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Scenario report written to {report_path}")
@@ -0,0 +1,785 @@
+import os
+import sys
+import copy
+import logging
+import numpy as np
+import pandas as pd
+
+# Add the backend directory to the Python path to enable imports from sibling packages
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Configuration_management.config_bundle import load_config_modules, get_bundle_path, write_config_bundle
+from Configuration_management.config_diff import load_compiled_config, load_version_config, write_compiled_config
+
+# =====================================================================
+# SENSITIVITY_ENGINE - IN-MEMORY SENSITIVITY EVALUATION
+# =====================================================================
+# The file-based sensitivity path copies the configuration matrix, the
+# compiled configuration and every interval module into one directory per
+# parameter variation, then starts CFA-b.py once per directory.
+#
+# This engine loads the baseline of a version once (compiled configuration,
+# General_Configuration_Matrix and interval modules) and applies every
+# variation as an in-memory overlay on the compiled parameters. Variations
+# are evaluated together as a batch: each parameter becomes an array with
+# one row per variation, and the cash flow analysis of CFA-b.py is computed
+# with numpy over all rows at once.
+#
+# Per-interval parameters can also follow year-indexed paths (one value per
+# CFA row and row of the batch, see evaluate_paths()); the cash flow is then
+# computed per CFA row instead of per interval.
+#
+# Only results are persisted by the caller. A variation directory with the
+# same files the file-based path produces can still be written on demand
+# with materialize_variation() for debugging.
+#
+# Overlays are applied to the interval modules and to the project-level
+# values of the compiled configuration (TOC components, tax rates, IRR),
+# so variations of project-level parameters also reach the cash flow.
+# =====================================================================
+
+# Per-interval parameters read from the config modules
+INTERVAL_KEYS = [
+    'numberOfUnitsAmount12',
+    'initialSellingPriceAmount13',
+    'totalOperatingCostPercentageAmount14',
+    'use_direct_operating_expensesAmount18',
+    'generalInflationRateAmount23',
+    'rawmaterialAmount34',
+    'laborAmount35',
+    'utilityAmount36',
+    'maintenanceAmount37',
+    'insuranceAmount38',
+]
+
+# Fixed cost parameters in F1..F5 order
+FIXED_COST_KEYS = ['rawmaterialAmount34', 'laborAmount35', 'utilityAmount36', 'maintenanceAmount37', 'insuranceAmount38']
+
+# Project-level parameters read from the compiled configuration
+GLOBAL_KEYS = [
+    'bECAmount11',
+    'initialSellingPriceAmount13',
+    'engineering_Procurement_and_Construction_EPC_Amount15',
+    'process_contingency_PC_Amount16',
+    'project_Contingency_PT_BEC_EPC_PCAmount17',
+    'iRRAmount30',
+    'stateTaxRateAmount32',
+    'federalTaxRateAmount33',
+]
+
+# Parameters that change the shape of the cash flow table; they cannot be overlaid
+STRUCTURAL_KEYS = ['plantLifetimeAmount10', 'numberofconstructionYearsAmount28']
+
+# Price search used by calculateForPrice (same steps and tolerance as CFA-b.py)
+NPV_TOLERANCE = 1000
+PRICE_STEP_UP = 1.02
+PRICE_STEP_DOWN = 0.985
+MAX_PRICE_ITERATIONS = 10000
+
+ECONOMIC_METRICS = [
+    'Internal Rate of Return',
+    'Average Selling Price (Project Life Cycle)',
+    'Total Overnight Cost (TOC)',
+    'Average Annual Revenue',
+    'Average Annual Operating Expenses',
+    'Average Annual Depreciation',
+    'Average Annual State Taxes',
+    'Average Annual Federal Taxes',
+    'Average Annual After-Tax Cash Flow',
+    'Cumulative NPV',
+]
+
+
+def apply_variation(value, variation, mode):
+    """
+    Apply a sensitivity variation to a parameter value.
+
+    Uses the same rules as apply_sensitivity_variation in the sensitivity
+    service, on scalars or numpy arrays.
+
+    Args:
+        value (float or ndarray): Original value(s)
+        variation (float): Variation value
+        mode (str): Variation mode (percentage, directvalue, absolutedeparture, ...)
+
+    Returns:
+        float or ndarray: Modified value(s)
+    """
+    mode = (mode or 'percentage').lower()
+    if mode == 'directvalue':
+        return value * 0 + variation
+    if mode == 'absolutedeparture':
+        return value + variation
+    # percentage, symmetrical, multipoint and unknown modes vary by percent
+    return value * (1 + variation / 100)
+
+
+class SensitivityEngine:
+    """
+    Evaluates sensitivity variations of one version in memory.
+    """
+    def __init__(self, version, selected_v, selected_f, target_row, base_dir=None):
+        """
+        Load the baseline of a version once.
+
+        Args:
+            version (int): Version number
+            selected_v (dict): Variable cost switches (V1..V10 -> 'on'/'off')
+            selected_f (dict): Fixed cost switches (F1..F5 -> 'on'/'off')
+            target_row (int): CFA row whose cumulative cash flow is the NPV
+            base_dir (str, optional): Folder containing Batch({version}); defaults to backend/Original
+        """
+        self.version = version
+        self.selected_v = selected_v or {}
+        self.selected_f = selected_f or {}
+        self.target_row = int(target_row)
+        self.base_dir = base_dir or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Original')
+        self.results_folder = os.path.join(self.base_dir, f"Batch({version})", f"Results({version})")
+        self.logger = logging.getLogger('sensitivity.engine')
+
+        self._load_baseline()
+
+    # ---------------- Baseline Loading ----------------
+
+    def _load_baseline(self):
+        """Load the compiled configuration, matrix and interval modules and build the baseline arrays."""
+        config_file = os.path.join(self.base_dir, f"Batch({self.version})",
+                                   f"ConfigurationPlotSpec({self.version})", f"configurations({self.version}).py")
+        if os.path.exists(config_file):
+            self.compiled_config = load_compiled_config(config_file)
+        else:
+            # Compiled configuration kept in the main Original folder (or as base + delta)
+            self.compiled_config = load_version_config(self.version)
+        self.config = self.compiled_config['attributes']
+
+        matrix_file = os.path.join(self.results_folder, f"General_Configuration_Matrix({self.version}).csv")
+        if not os.path.exists(matrix_file):
+            raise FileNotFoundError(f"Config matrix file not found: {matrix_file}")
+        self.config_matrix_df = pd.read_csv(matrix_file)
+
+        self.config_modules = dict(load_config_modules(self.results_folder, self.version))
+        if not self.config_modules:
+            raise FileNotFoundError(f"No config modules found in {self.results_folder}")
+
+        self.plant_lifetime = int(self.config['plantLifetimeAmount10'])
+        self.construction_years = int(self.config['numberofconstructionYearsAmount28'])
+        self.total_years = self.plant_lifetime + self.construction_years
+        if not 0 <= self.target_row < self.total_years:
+            raise ValueError(f"Target row {self.target_row} is outside the cash flow table (0-{self.total_years - 1})")
+
+        # Intervals of the matrix that have a config module, in matrix order
+        self.intervals = []
+        for _, row in self.config_matrix_df.iterrows():
+            start = int(row['start'])
+            if start not in self.config_modules:
+                self.logger.warning(f"Config module {start} not found in {self.results_folder}")
+                continue
+            self.intervals.append((start, int(row['end'])))
+
+        modules = [self.config_modules[start] for start, _ in self.intervals]
+        self._interval_values = {}
+        for key in INTERVAL_KEYS:
+            if key == 'use_direct_operating_expensesAmount18':
+                self._interval_values[key] = np.array([1.0 if m[key] else 0.0 for m in modules])
+            else:
+                self._interval_values[key] = np.array([float(m[key]) for m in modules])
+        self._global_values = {key: float(self.config[key]) for key in GLOBAL_KEYS}
+
+        self._variable_costs = np.array([self._pad(m['variable_costsAmount4'], 10) for m in modules]).reshape(-1, 10)
+        self._amounts_per_unit = np.array([self._pad(m['amounts_per_unitAmount5'], 10) for m in modules]).reshape(-1, 10)
+        self._variable_on = np.array([self.selected_v.get(f'V{i+1}') == 'on' for i in range(10)])
+        self._fixed_on = np.array([self.selected_f.get(f'F{i+1}') == 'on' for i in range(5)])
+
+        # Intervals after the target row keep their own selling price
+        self._after_target = np.array([start + 1 > self.target_row for start, _ in self.intervals])
+        self._interval_lengths = np.array([end - start + 1 for start, end in self.intervals])
+        self._row_source = self._build_row_sources()
+        self._year_interval = self._build_year_intervals()
+
+        self.logger.info(
+            f"Loaded baseline for version {self.version}: {len(self.intervals)} intervals, "
+            f"{self.total_years} cash flow rows"
+        )
+
+    @staticmethod
+    def _pad(values, length):
+        """Pad or trim a list of costs to a fixed length."""
+        values = [float(v) for v in values][:length]
+        return values + [0.0] * (length - len(values))
+
+    def _build_row_sources(self):
+        """
+        Map every CFA row to the interval whose revenue and expenses it holds.
+
+        Follows the two passes CFA-b.py uses to fill the CFA matrix, so row
+        placement (including the one-year shift of the second pass) is identical.
+
+        Returns:
+            ndarray: Interval index per CFA row, -1 for rows without an interval
+        """
+        row_source = np.full(self.total_years, -1)
+        for k, (start, end) in enumerate(self.intervals):
+            for year in range(start + self.construction_years, end + self.construction_years + 1):
+                if year < self.total_years:
+                    row_source[year] = k
+        for k, (start, end) in enumerate(self.intervals):
+            for year in range(start + self.construction_years, end + self.construction_years + 1):
+                if year < self.total_years and year - 1 >= 0:
+                    row_source[year - 1] = k
+        return row_source
+
+    def _build_year_intervals(self):
+        """
+        Map every CFA row holding a year of an interval to that interval (units sold along yearly paths).
+
+        Returns:
+            ndarray: Interval index per CFA row, -1 for rows without an interval
+        """
+        year_interval = np.full(self.total_years, -1)
+        for k, (start, end) in enumerate(self.intervals):
+            year_interval[start + self.construction_years:end + self.construction_years + 1] = k
+        return year_interval
+
+    def with_construction_years(self, construction_years):
+        """
+        Get an engine of the same baseline with another number of construction years.
+
+        The number of construction years shapes the cash flow table, so it
+        cannot be overlaid; the returned engine shares the loaded baseline
+        and only rebuilds the row layout.
+
+        Args:
+            construction_years (int): Number of construction years
+
+        Returns:
+            SensitivityEngine: This engine if the number is unchanged, otherwise a copy
+
+        Raises:
+            ValueError: If the number is negative or moves the target row out of the table
+        """
+        construction_years = int(construction_years)
+        if construction_years == self.construction_years:
+            return self
+        if construction_years < 0:
+            raise ValueError(f"Number of construction years cannot be negative ({construction_years})")
+
+        engine = copy.copy(self)
+        engine.construction_years = construction_years
+        engine.total_years = engine.plant_lifetime + construction_years
+        if not 0 <= engine.target_row < engine.total_years:
+            raise ValueError(f"Target row {engine.target_row} is outside the cash flow table (0-{engine.total_years - 1})")
+        engine._row_source = engine._build_row_sources()
+        engine._year_interval = engine._build_year_intervals()
+        return engine
+
+    # ---------------- Overlays ----------------
+
+    def resolve_parameter_key(self, param_id):
+        """
+        Find the configuration key of a sensitivity parameter ID.
+
+        Args:
+            param_id (str): Parameter ID (e.g., "S35")
+
+        Returns:
+            str: Configuration key ending in Amount{number}
+
+        Raises:
+            ValueError: If no key matches or the parameter cannot be overlaid
+        """
+        if param_id.startswith('S') and param_id[1:].isdigit():
+            suffix = f"Amount{param_id[1:]}"
+            first_module = next(iter(self.config_modules.values()))
+            for key in list(first_module.keys()) + list(self.config.keys()):
+                if key.endswith(suffix):
+                    if key in STRUCTURAL_KEYS:
+                        raise ValueError(f"Parameter {param_id} ({key}) changes the interval layout and cannot be varied in memory")
+                    return key
+        raise ValueError(f"No parameter found in configuration matching ID: {param_id}")
+
+    def base_value(self, param_id):
+        """
+        Get the baseline value of a sensitivity parameter.
+
+        Args:
+            param_id (str): Parameter ID (e.g., "S35")
+
+        Returns:
+            list or float: Per-interval values of interval parameters, otherwise the project-level value
+        """
+        key = self.resolve_parameter_key(param_id)
+        if key in self._interval_values:
+            return self._interval_values[key].tolist()
+        if key in self._global_values:
+            return self._global_values[key]
+        try:
+            return float(self.config[key])
+        except (TypeError, ValueError):
+            return None
+
+    def _build_values(self, overlay_sets, switches=None):
+        """
+        Build parameter arrays with one row per overlay set.
+
+        Args:
+            overlay_sets (list): One list of (param_id, variation, mode) tuples per row
+            switches (dict, optional): 'V' (n, 10) and 'F' (n, 5) boolean arrays of
+                                       cost switches per row; the version's switches if None
+
+        Returns:
+            dict: Interval keys -> (n, intervals) arrays, global keys -> (n,) arrays
+        """
+        n = len(overlay_sets)
+        values = {key: np.repeat(base[None, :], n, axis=0) for key, base in self._interval_values.items()}
+        globals_ = {key: np.full(n, base) for key, base in self._global_values.items()}
+
+        for i, overlays in enumerate(overlay_sets):
+            for param_id, variation, mode in overlays:
+                key = self.resolve_parameter_key(param_id)
+                if key in values:
+                    values[key][i] = apply_variation(self._interval_values[key], float(variation), mode)
+                if key in globals_:
+                    globals_[key][i] = apply_variation(self._global_values[key], float(variation), mode)
+                if key not in values and key not in globals_:
+                    self.logger.debug(f"Parameter {param_id} ({key}) does not enter the cash flow analysis")
+
+        if switches is not None:
+            return {'interval': values, 'global': globals_, 'switches': {
+                'V': np.asarray(switches['V'], dtype=bool).reshape(n, 10),
+                'F': np.asarray(switches['F'], dtype=bool).reshape(n, 5),
+            }}
+        return {'interval': values, 'global': globals_}
+
+    def _build_sampled_values(self, samples):
+        """
+        Build parameter arrays from sampled variations, one row per draw.
+
+        Args:
+            samples (list): (param_id, variations, mode) tuples where variations is an (n,) array
+
+        Returns:
+            dict: Interval keys -> (n, intervals) arrays, global keys -> (n,) arrays
+        """
+        n = len(samples[0][1]) if samples else 1
+        values = {key: np.repeat(base[None, :], n, axis=0) for key, base in self._interval_values.items()}
+        globals_ = {key: np.full(n, base) for key, base in self._global_values.items()}
+
+        for param_id, variations, mode in samples:
+            key = self.resolve_parameter_key(param_id)
+            variations = np.asarray(variations, dtype=float)
+            if key in values:
+                values[key] = apply_variation(self._interval_values[key][None, :], variations[:, None], mode)
+            if key in globals_:
+                globals_[key] = apply_variation(self._global_values[key], variations, mode)
+            if key not in values and key not in globals_:
+                self.logger.debug(f"Parameter {param_id} ({key}) does not enter the cash flow analysis")
+
+        return {'interval': values, 'global': globals_}
+
+    def _build_path_values(self, paths):
+        """
+        Build parameter arrays from year-indexed variation paths, one row per path.
+
+        Args:
+            paths (list): (param_id, variations, mode) tuples where variations is an
+                          (n, years) array with one variation per CFA row
+
+        Returns:
+            dict: Baseline interval and global arrays, plus the paths by configuration key
+
+        Raises:
+            ValueError: If a parameter is not a per-interval parameter or a path has the wrong shape
+        """
+        n = len(paths[0][1]) if paths else 1
+        values = {key: np.repeat(base[None, :], n, axis=0) for key, base in self._interval_values.items()}
+        globals_ = {key: np.full(n, base) for key, base in self._global_values.items()}
+
+        yearly = {}
+        for param_id, variations, mode in paths:
+            key = self.resolve_parameter_key(param_id)
+            if key not in values:
+                raise ValueError(f"Parameter {param_id} ({key}) is not a per-interval parameter and cannot follow a yearly path")
+            variations = np.asarray(variations, dtype=float)
+            if variations.shape != (n, self.total_years):
+                raise ValueError(
+                    f"Path of {param_id} has shape {variations.shape}, expected ({n}, {self.total_years})"
+                )
+            yearly[key] = (variations, mode)
+
+        return {'interval': values, 'global': globals_, 'paths': yearly}
+
+    # ---------------- Cash Flow Analysis ----------------
+
+    def _cash_flow(self, values, price):
+        """
+        Compute the CFA matrix columns for every row of a parameter batch.
+
+        Args:
+            values (dict): Parameter arrays from _build_values (or _build_path_values)
+            price (ndarray): Selling price per row used before the target row
+
+        Returns:
+            dict: CFA columns as (n, years) arrays plus per-row TOC and total units sold
+                  (and the selling price of every CFA row when parameters follow paths)
+        """
+        iv, gv = values['interval'], values['global']
+        units = iv['numberOfUnitsAmount12']
+        paths = values.get('paths') or {}
+        c, T = self.construction_years, self.total_years
+        n = len(price)
+
+        TOC = gv['bECAmount11']
+        EPC = gv['engineering_Procurement_and_Construction_EPC_Amount15']
+        PC = gv['process_contingency_PC_Amount16']
+        PT = gv['project_Contingency_PT_BEC_EPC_PCAmount17']
+        TOC = TOC + EPC * TOC + PC * (TOC + EPC * TOC) + PT * (TOC + EPC * TOC + PC * (TOC + EPC * TOC))
+
+        # With yearly paths every CFA row is its own interval, holding its source interval's values
+        row_source = self._row_source
+        after_target, variable_base, amounts_base = self._after_target, self._variable_costs, self._amounts_per_unit
+        if paths:
+            columns = np.maximum(self._row_source, 0)
+            iv = {key: v[:, columns] for key, v in iv.items()}
+            for key, (variations, mode) in paths.items():
+                if key != 'initialSellingPriceAmount13':
+                    iv[key] = apply_variation(iv[key], variations, mode)
+            after_target, variable_base, amounts_base = after_target[columns], variable_base[columns], amounts_base[columns]
+            row_source = np.where(self._row_source >= 0, np.arange(T), -1)
+
+        # Interval revenue and operating expenses
+        inflation = iv['generalInflationRateAmount23']
+        interval_price = np.where(after_target[None, :], iv['initialSellingPriceAmount13'], price[:, None])
+        if 'initialSellingPriceAmount13' in paths:
+            # A price path varies the price each row sells at, so a solved price scales the whole path
+            variations, mode = paths['initialSellingPriceAmount13']
+            interval_price = apply_variation(interval_price, variations, mode)
+        revenue = np.trunc(iv['numberOfUnitsAmount12'] * interval_price * (1 + inflation))
+
+        # V/F switches of the version, or per row of the batch
+        variable_on, fixed_on = self._variable_on, self._fixed_on
+        if 'switches' in values:
+            variable_on, fixed_on = values['switches']['V'][:, None, :], values['switches']['F'][:, None, :]
+
+        variable_costs = np.where(variable_on, np.round(variable_base[None] * (1 + inflation[..., None])), 0)
+        amounts = np.where(variable_on, amounts_base[None], 0)
+        annual_variable_cost = (variable_costs * amounts).sum(axis=-1)
+        fixed_costs = np.stack([iv[key] for key in FIXED_COST_KEYS], axis=-1)
+        total_fixed_cost = np.where(fixed_on, np.round(fixed_costs * (1 + inflation[..., None])), 0).sum(axis=-1)
+
+        expenses = np.where(
+            iv['use_direct_operating_expensesAmount18'] != 0,
+            np.trunc(iv['totalOperatingCostPercentageAmount14'] * revenue),
+            np.trunc(annual_variable_cost + total_fixed_cost)
+        )
+
+        # Place interval values on the CFA rows
+        rows = row_source >= 0
+        rev = np.zeros((n, T))
+        opex = np.zeros((n, T))
+        rev[:, rows] = revenue[:, row_source[rows]]
+        opex[:, rows] = expenses[:, row_source[rows]]
+
+        # Construction years
+        cumulative = np.zeros((n, T))
+        if c > 0:
+            opex[:, :c] = (-TOC / c)[:, None]
+            cumulative[:, :c] = np.cumsum(opex[:, :c], axis=1)
+        construction_total = cumulative[:, c - 1] if c > 0 else np.zeros(n)
+
+        # Depreciation from the fraction of TOC recovered each year
+        safe_toc = np.where(TOC != 0, TOC, 1)
+        fraction = np.zeros((n, T))
+        fraction[:, c:] = np.where((TOC != 0)[:, None], np.round((rev[:, c:] - opex[:, c:]) / safe_toc[:, None], 9), 0)
+
+        depreciation = np.zeros((n, T))
+        exceeded = np.cumsum(fraction[:, c:], axis=1) > 1
+        end_year = np.where(exceeded.any(axis=1), exceeded.argmax(axis=1) + c, 0)
+        has_end = end_year != 0
+        years = np.arange(T)
+        in_period = has_end[:, None] & (years[None, :] >= c) & (years[None, :] < end_year[:, None])
+        depreciation[in_period] = np.trunc(fraction * TOC[:, None])[in_period]
+        remaining = np.trunc(TOC - depreciation.sum(axis=1))
+        depreciation[has_end, end_year[has_end]] = remaining[has_end]
+
+        # Taxes and after-tax cash flow
+        taxable = np.maximum(rev - opex - depreciation, 0)
+        state_taxes = np.zeros((n, T))
+        federal_taxes = np.zeros((n, T))
+        state_taxes[:, c:] = taxable[:, c:] * gv['stateTaxRateAmount32'][:, None]
+        federal_taxes[:, c:] = taxable[:, c:] * gv['federalTaxRateAmount33'][:, None]
+
+        after_tax = np.zeros((n, T))
+        after_tax[:, c:] = rev[:, c:] - opex[:, c:] - state_taxes[:, c:] - federal_taxes[:, c:]
+        irr = gv['iRRAmount30']
+        discounted = np.zeros((n, T))
+        discounted[:, c:] = np.where((irr != -1)[:, None], after_tax[:, c:] / np.where(irr != -1, 1 + irr, 1)[:, None], 0)
+        cumulative[:, c:] = np.cumsum(np.concatenate([construction_total[:, None], discounted[:, c:]], axis=1), axis=1)[:, 1:]
+
+        if 'numberOfUnitsAmount12' in paths:
+            # Units of every year of the table, varied by the path at the year's row
+            years_covered = self._year_interval >= 0
+            variations, mode = paths['numberOfUnitsAmount12']
+            interval_units = apply_variation(
+                units[:, self._year_interval[years_covered]], variations[:, years_covered], mode
+            ).sum(axis=1)
+        else:
+            interval_units = (units * self._interval_lengths[None, :]).sum(axis=1)
+        if self.plant_lifetime > 1:
+            total_units_sold = interval_units * self.plant_lifetime / (self.plant_lifetime - 1)
+        else:
+            total_units_sold = interval_units
+
+        # The CFA matrix is stored as integers
+        cfa = {
+            'Revenue': np.trunc(rev),
+            'Operating Expenses': np.trunc(opex),
+            'Depreciation': np.trunc(depreciation),
+            'State Taxes': np.trunc(state_taxes),
+            'Federal Taxes': np.trunc(federal_taxes),
+            'After-Tax Cash Flow': np.trunc(after_tax),
+            'Discounted Cash Flow': np.trunc(discounted),
+            'Cumulative Cash Flow': np.trunc(cumulative),
+            'TOC': TOC,
+            'total_units_sold': total_units_sold,
+        }
+        if paths:
+            selling_price = np.zeros((n, T))
+            selling_price[:, rows] = interval_price[:, row_source[rows]]
+            cfa['Selling Price'] = selling_price
+        return cfa
+
+    def _summarize(self, cfa, values, price, iterations, i):
+        """Build the result of one row of a batch, with the economic summary metrics."""
+        c = self.construction_years
+        years = self.plant_lifetime
+        total_revenue = cfa['Revenue'][i, c:].sum()
+        units = cfa['total_units_sold'][i]
+
+        def average(column):
+            return float(cfa[column][i, c:].sum() / years) if years > 0 else 0.0
+
+        metrics = {
+            'Internal Rate of Return': float(values['global']['iRRAmount30'][i]),
+            'Average Selling Price (Project Life Cycle)': float(total_revenue / units) if units > 0 else 0.0,
+            'Total Overnight Cost (TOC)': float(cfa['TOC'][i]),
+            'Average Annual Revenue': average('Revenue'),
+            'Average Annual Operating Expenses': average('Operating Expenses'),
+            'Average Annual Depreciation': average('Depreciation'),
+            'Average Annual State Taxes': average('State Taxes'),
+            'Average Annual Federal Taxes': average('Federal Taxes'),
+            'Average Annual After-Tax Cash Flow': average('After-Tax Cash Flow'),
+            'Cumulative NPV': float(cfa['Cumulative Cash Flow'][i, -1]),
+        }
+        return {
+            'npv': float(cfa['Cumulative Cash Flow'][i, self.target_row]),
+            'price': float(price[i]),
+            'iterations': int(iterations[i]),
+            'metrics': metrics,
+        }
+
+    def evaluate_batch(self, overlay_sets, solve_for_price=False, switches=None):
+        """
+        Evaluate many variations of the baseline at once.
+
+        Args:
+            overlay_sets (list): One list of (param_id, variation, mode) tuples per variation
+            solve_for_price (bool): Search the selling price that brings the NPV within
+                                    tolerance, as CFA-b.py does for calculateForPrice
+            switches (dict, optional): 'V' (n, 10) and 'F' (n, 5) boolean arrays of cost
+                                       switches per variation; the version's switches if None
+
+        Returns:
+            list: One result dict per overlay set with npv, price, iterations and metrics
+        """
+        if not overlay_sets:
+            return []
+
+        values = self._build_values(overlay_sets, switches)
+        cfa, price, iterations = self._solve(values, solve_for_price)
+        return [self._summarize(cfa, values, price, iterations, i) for i in range(len(overlay_sets))]
+
+    def evaluate_samples(self, samples, solve_for_price=False):
+        """
+        Evaluate sampled variations as arrays, without per-draw result dicts.
+
+        Args:
+            samples (list): (param_id, variations, mode) tuples where variations is an (n,) array
+            solve_for_price (bool): Search the selling price per draw as CFA-b.py does for calculateForPrice
+
+        Returns:
+            dict: (n,) arrays of npv, price and iterations
+        """
+        values = self._build_sampled_values(samples)
+        cfa, price, iterations = self._solve(values, solve_for_price)
+        return {
+            'npv': cfa['Cumulative Cash Flow'][:, self.target_row].copy(),
+            'price': price,
+            'iterations': iterations,
+        }
+
+    def map_samples(self, units):
+        """
+        Evaluate sample sets one after another.
+
+        Sweeps evaluate through this method (or the same method of a
+        DistributedEvaluator, which spreads the sets over worker hosts).
+
+        Args:
+            units (iterable): (samples, solve_for_price) pairs (see evaluate_samples)
+
+        Yields:
+            dict: Result of each set, in order
+        """
+        for samples, solve_for_price in units:
+            yield self.evaluate_samples(samples, solve_for_price=solve_for_price)
+
+    def evaluate_paths(self, paths, solve_for_price=False):
+        """
+        Evaluate year-indexed parameter paths as arrays.
+
+        Each path gives a variation per CFA row, applied with its mode to the
+        value the row holds (its interval's value, or for the selling price
+        the price the row sells at). With solve_for_price, the price searched
+        per path is the one before the target row, so percentage price paths
+        are scaled by it.
+
+        Args:
+            paths (list): (param_id, variations, mode) tuples where variations is an (n, years) array
+            solve_for_price (bool): Search the selling price per path as CFA-b.py does for calculateForPrice
+
+        Returns:
+            dict: (n,) arrays of npv, price and iterations, and (n, years) arrays of the
+                  cumulative cash flow, after-tax cash flow and selling price per CFA row
+        """
+        if not paths:
+            raise ValueError("No parameter paths given")
+        values = self._build_path_values(paths)
+        cfa, price, iterations = self._solve(values, solve_for_price)
+        return {
+            'npv': cfa['Cumulative Cash Flow'][:, self.target_row].copy(),
+            'price': price,
+            'iterations': iterations,
+            'cumulative': cfa['Cumulative Cash Flow'],
+            'after_tax': cfa['After-Tax Cash Flow'],
+            'selling_price': cfa['Selling Price'],
+        }
+
+    def _solve(self, values, solve_for_price):
+        """
+        Compute the cash flow of a parameter batch, searching the price if requested.
+
+        Args:
+            values (dict): Parameter arrays from _build_values or _build_sampled_values
+            solve_for_price (bool): Search the selling price that brings the NPV within tolerance
+
+        Returns:
+            tuple: (cfa, price, iterations) with per-row prices and iteration counts
+        """
+        price = values['global']['initialSellingPriceAmount13'].copy()
+        iterations = np.ones(len(price), dtype=int)
+        cfa = self._cash_flow(values, price)
+
+        if solve_for_price:
+            npv = cfa['Cumulative Cash Flow'][:, self.target_row]
+            active = np.abs(npv) > NPV_TOLERANCE
+            while active.any():
+                if iterations.max() >= MAX_PRICE_ITERATIONS:
+                    self.logger.warning(f"Price search stopped after {MAX_PRICE_ITERATIONS} iterations for {int(active.sum())} variations")
+                    break
+                price[active] *= np.where(npv[active] < 0, PRICE_STEP_UP, PRICE_STEP_DOWN)
+                iterations[active] += 1
+
+                subset = {
+                    'interval': {k: v[active] for k, v in values['interval'].items()},
+                    'global': {k: v[active] for k, v in values['global'].items()},
+                    'paths': {k: (v[active], mode) for k, (v, mode) in values.get('paths', {}).items()},
+                }
+                if 'switches' in values:
+                    subset['switches'] = {k: v[active] for k, v in values['switches'].items()}
+                partial = self._cash_flow(subset, price[active])
+                for column, data in partial.items():
+                    cfa[column][active] = data
+                npv = cfa['Cumulative Cash Flow'][:, self.target_row]
+                active = np.abs(npv) > NPV_TOLERANCE
+
+        return cfa, price, iterations
+
+    def evaluate(self, overlays=None, solve_for_price=False):
+        """
+        Evaluate one variation of the baseline.
+
+        Args:
+            overlays (list, optional): (param_id, variation, mode) tuples; the baseline if None
+            solve_for_price (bool): Search the selling price as CFA-b.py does for calculateForPrice
+
+        Returns:
+            dict: Result with npv, price, iterations and metrics
+        """
+        return self.evaluate_batch([overlays or []], solve_for_price=solve_for_price)[0]
+
+    # ---------------- On-Demand Materialization ----------------
+
+    def materialize_variation(self, overlays, directory, solve_for_price=False):
+        """
+        Write the files of one variation to a directory for debugging.
+
+        The directory receives the configuration matrix, the varied compiled
+        configuration and config module bundle, and the CFA table and economic
+        summary the engine computed for the variation.
+
+        Args:
+            overlays (list): (param_id, variation, mode) tuples
+            directory (str): Target directory
+            solve_for_price (bool): Search the selling price before writing results
+
+        Returns:
+            str: The directory
+        """
+        os.makedirs(directory, exist_ok=True)
+        version = self.version
+
+        compiled = copy.deepcopy(self.compiled_config)
+        modules = copy.deepcopy(self.config_modules)
+        for param_id, variation, mode in overlays:
+            key = self.resolve_parameter_key(param_id)
+            if key in compiled['attributes']:
+                compiled['attributes'][key] = apply_variation(float(compiled['attributes'][key]), float(variation), mode)
+            for module in modules.values():
+                if key in module:
+                    module[key] = apply_variation(float(module[key]), float(variation), mode)
+
+        self.config_matrix_df.to_csv(os.path.join(directory, f"General_Configuration_Matrix({version}).csv"), index=False)
+        write_compiled_config(compiled, os.path.join(directory, f"configurations({version}).py"))
+        write_config_bundle(get_bundle_path(directory, version), modules, version)
+
+        values = self._build_values([overlays])
+        result = self.evaluate(overlays, solve_for_price=solve_for_price)
+        cfa = self._cash_flow(values, np.array([result['price']]))
+
+        columns = ['Revenue', 'Operating Expenses', 'Depreciation', 'State Taxes', 'Federal Taxes',
+                   'After-Tax Cash Flow', 'Discounted Cash Flow', 'Cumulative Cash Flow']
+        cfa_df = pd.DataFrame({'Year': range(1, self.total_years + 1)})
+        for column in columns:
+            cfa_df[column] = cfa[column][0].astype(int)
+        cfa_df.to_csv(os.path.join(directory, f"CFA({version}).csv"), index=False)
+
+        metrics = result['metrics']
+        economic_summary = pd.DataFrame({
+            'Metric': ECONOMIC_METRICS + ['Calculation Mode'],
+            'Value': [
+                f"{metrics['Internal Rate of Return']:.2%}",
+                f"${metrics['Average Selling Price (Project Life Cycle)']:,.2f}",
+                f"${metrics['Total Overnight Cost (TOC)']:,.0f}",
+                f"${metrics['Average Annual Revenue']:,.0f}",
+                f"${metrics['Average Annual Operating Expenses']:,.0f}",
+                f"${metrics['Average Annual Depreciation']:,.0f}",
+                f"${metrics['Average Annual State Taxes']:,.0f}",
+                f"${metrics['Average Annual Federal Taxes']:,.0f}",
+                f"${metrics['Average Annual After-Tax Cash Flow']:,.0f}",
+                f"${metrics['Cumulative NPV']:,.0f}",
+                'calculateForPrice' if solve_for_price else 'freeFlowNPV'
+            ]
+        })
+        economic_summary.to_csv(os.path.join(directory, f"Economic_Summary({version}).csv"), index=False)
+
+        self.logger.info(f"Materialized variation {overlays} of version {version} in {directory}")
+        return directory
@@ -0,0 +1,272 @@
+import os
+import sys
+import json
+import time
+import logging
+import numpy as np
+from scipy.stats import qmc
+
+# Add the backend directory to the Python path to enable imports from sibling packages
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Core_calculation_engines.sensitivity_engine import SensitivityEngine
+
+# =====================================================================
+# SOBOL_SENSITIVITY - VARIANCE-BASED GLOBAL SENSITIVITY ANALYSIS
+# =====================================================================
+# One-at-a-time sweeps vary a single parameter around the baseline and so
+# cannot show interactions between parameters. This module estimates
+# first-order and total-order Sobol indices of all enabled S-parameters at
+# once from Saltelli sample matrices:
+#
+#   A, B   two independent (N, d) matrices taken from one scrambled Sobol
+#          sequence of dimension 2d
+#   AB_i   A with column i taken from B, for every parameter i
+#
+# Every parameter varies over a range given as {"low", "high", "apply"};
+# the sampled numbers are variations applied with the "apply" mode
+# (percentage by default), as sensitivity values are.
+#
+# The N * (d + 2) model evaluations of a round go through the in-memory
+# engine in large vectorized batches. Rounds double N until the indices
+# change by less than the tolerance between rounds or the evaluation
+# budget is spent. Confidence intervals are bootstrap percentile intervals.
+#
+# First-order indices use the Saltelli (2010) estimator, total-order
+# indices the Jansen estimator.
+# =====================================================================
+
+DEFAULT_BASE_SAMPLES = 512
+DEFAULT_MAX_EVALUATIONS = 200000
+DEFAULT_TOLERANCE = 0.01
+DEFAULT_BOOTSTRAP = 200
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_CHUNK_SIZE = 20000
+
+logger = logging.getLogger('sensitivity.sobol')
+
+
+def estimate_indices(f_a, f_b, f_ab):
+    """
+    Estimate first-order and total-order Sobol indices.
+
+    Args:
+        f_a (ndarray): (N,) model outputs on matrix A
+        f_b (ndarray): (N,) model outputs on matrix B
+        f_ab (ndarray): (d, N) model outputs on the AB_i matrices
+
+    Returns:
+        tuple: (first_order, total_order) arrays of length d
+    """
+    variance = np.var(np.concatenate([f_a, f_b]))
+    if variance == 0:
+        return np.zeros(len(f_ab)), np.zeros(len(f_ab))
+    first_order = np.mean(f_b[None, :] * (f_ab - f_a[None, :]), axis=1) / variance
+    total_order = 0.5 * np.mean((f_a[None, :] - f_ab) ** 2, axis=1) / variance
+    return first_order, total_order
+
+
+def bootstrap_intervals(f_a, f_b, f_ab, resamples, confidence, rng):
+    """
+    Bootstrap percentile confidence intervals of the Sobol indices.
+
+    Args:
+        f_a (ndarray): (N,) model outputs on matrix A
+        f_b (ndarray): (N,) model outputs on matrix B
+        f_ab (ndarray): (d, N) model outputs on the AB_i matrices
+        resamples (int): Number of bootstrap resamples
+        confidence (float): Confidence level (e.g. 0.95)
+        rng (Generator): numpy random generator
+
+    Returns:
+        tuple: (first_order, total_order) arrays of shape (d, 2) with lower and upper bounds
+    """
+    n = len(f_a)
+    first, total = [], []
+    for _ in range(resamples):
+        rows = rng.integers(0, n, n)
+        s1, st = estimate_indices(f_a[rows], f_b[rows], f_ab[:, rows])
+        first.append(s1)
+        total.append(st)
+
+    alpha = (1 - confidence) / 2 * 100
+    bounds = [alpha, 100 - alpha]
+    return np.percentile(first, bounds, axis=0).T, np.percentile(total, bounds, axis=0).T
+
+
+def run_sobol_analysis(engine, parameters, base_samples=DEFAULT_BASE_SAMPLES, max_evaluations=DEFAULT_MAX_EVALUATIONS,
+                       tolerance=DEFAULT_TOLERANCE, bootstrap=DEFAULT_BOOTSTRAP, confidence=DEFAULT_CONFIDENCE,
+                       seed=None, solve_for_price=False, chunk_size=DEFAULT_CHUNK_SIZE, check=None):
+    """
+    Estimate Sobol indices of several parameters on a loaded engine.
+
+    Args:
+        engine (SensitivityEngine): Engine with the version's baseline loaded
+        parameters (dict): {"low", "high", "apply"} range per S-parameter ID
+        base_samples (int): N of the first round; rounded up to a power of two
+        max_evaluations (int): Budget of model evaluations over all rounds
+        tolerance (float): Stop once no index changes by more than this between rounds
+        bootstrap (int): Bootstrap resamples for the confidence intervals (0 to skip)
+        confidence (float): Confidence level of the intervals
+        seed (int, optional): Seed for the Sobol scrambling and the bootstrap
+        solve_for_price (bool): Analyse the solved selling price instead of the NPV
+        chunk_size (int): Model evaluations per vectorized batch
+        check (callable, optional): Called before every batch; raising from it stops the
+                                    analysis (e.g. a job cancellation check)
+
+    Returns:
+        dict: Indices per parameter with confidence intervals, convergence history and timing
+
+    Raises:
+        ValueError: If fewer than two parameters are given or a range is invalid
+    """
+    if len(parameters) < 2:
+        raise ValueError("Sobol analysis needs at least two parameters")
+
+    param_ids = list(parameters)
+    d = len(param_ids)
+    lows, highs = [], []
+    for param_id in param_ids:
+        engine.resolve_parameter_key(param_id)
+        spec = parameters[param_id]
+        try:
+            low, high = float(spec['low']), float(spec['high'])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Parameter {param_id} needs numeric low and high values")
+        if high <= low:
+            raise ValueError(f"Parameter {param_id} has an empty range ({low} to {high})")
+        lows.append(low)
+        highs.append(high)
+    lows, highs = np.array(lows), np.array(highs)
+    modes = [parameters[param_id].get('apply', 'percentage') for param_id in param_ids]
+    output = 'price' if solve_for_price else 'npv'
+
+    def evaluate(matrix):
+        """Evaluate the rows of a sample matrix in batches."""
+        results = []
+        for offset in range(0, len(matrix), chunk_size):
+            if check:
+                check()
+            rows = matrix[offset:offset + chunk_size]
+            samples = [(param_ids[j], rows[:, j], modes[j]) for j in range(d)]
+            results.append(engine.evaluate_samples(samples, solve_for_price=solve_for_price)[output])
+        return np.concatenate(results)
+
+    sampler = qmc.Sobol(d=2 * d, scramble=True, seed=seed)
+    rng = np.random.default_rng(seed)
+    n_round = 2 ** int(np.ceil(np.log2(max(2, int(base_samples)))))
+
+    f_a = np.empty(0)
+    f_b = np.empty(0)
+    f_ab = np.empty((d, 0))
+    history = []
+    previous = None
+    converged = False
+    started = time.time()
+
+    while True:
+        if (len(f_a) + n_round) * (d + 2) > max_evaluations and len(f_a) > 0:
+            break
+
+        points = np.tile(lows, 2) + sampler.random(n_round) * np.tile(highs - lows, 2)
+        a, b = points[:, :d], points[:, d:]
+        ab = np.repeat(a[None], d, axis=0)
+        for i in range(d):
+            ab[i, :, i] = b[:, i]
+
+        # One stacked matrix: A, B and every AB_i
+        outputs = evaluate(np.concatenate([a, b, ab.reshape(-1, d)]))
+        f_a = np.concatenate([f_a, outputs[:n_round]])
+        f_b = np.concatenate([f_b, outputs[n_round:2 * n_round]])
+        f_ab = np.concatenate([f_ab, outputs[2 * n_round:].reshape(d, n_round)], axis=1)
+
+        first_order, total_order = estimate_indices(f_a, f_b, f_ab)
+        change = None if previous is None else float(max(
+            np.abs(first_order - previous[0]).max(), np.abs(total_order - previous[1]).max()
+        ))
+        history.append({
+            "baseSamples": len(f_a),
+            "evaluations": len(f_a) * (d + 2),
+            "firstOrder": first_order.tolist(),
+            "totalOrder": total_order.tolist(),
+            "maxChange": change
+        })
+        logger.info(f"Sobol round with N={len(f_a)}: max index change {change}")
+
+        if change is not None and change < tolerance:
+            converged = True
+            break
+        previous = (first_order, total_order)
+        # Doubling N keeps the Sobol sequence balanced
+        n_round = len(f_a)
+
+    if bootstrap:
+        first_ci, total_ci = bootstrap_intervals(f_a, f_b, f_ab, int(bootstrap), confidence, rng)
+        first_ci, total_ci = first_ci.tolist(), total_ci.tolist()
+    else:
+        first_ci = total_ci = [[None, None]] * d
+
+    indices = {}
+    for i, param_id in enumerate(param_ids):
+        indices[param_id] = {
+            "range": {"low": float(lows[i]), "high": float(highs[i]), "apply": modes[i]},
+            "firstOrder": float(first_order[i]),
+            "firstOrderConfidence": first_ci[i],
+            "totalOrder": float(total_order[i]),
+            "totalOrderConfidence": total_ci[i],
+        }
+
+    all_outputs = np.concatenate([f_a, f_b])
+    return {
+        "version": engine.version,
+        "output": output,
+        "outputMean": float(all_outputs.mean()),
+        "outputVariance": float(all_outputs.var()),
+        "baseSamples": len(f_a),
+        "evaluations": len(f_a) * (d + 2),
+        "converged": converged,
+        "tolerance": tolerance,
+        "confidence": confidence,
+        "bootstrap": int(bootstrap),
+        "seed": seed,
+        "indices": indices,
+        "history": history,
+        "duration": round(time.time() - started, 3)
+    }
+
+
+def get_sobol_report_path(version, base_dir=None):
+    """Get the path of a version's Sobol indices report in the sensitivity Reports folder."""
+    base_dir = base_dir or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Original')
+    return os.path.join(base_dir, f"Batch({version})", f"Results({version})", "Sensitivity", "Reports",
+                        f"sobol_indices({version}).json")
+
+
+if __name__ == "__main__":
+    # Usage: python sobol_sensitivity.py <version> <parameters.json> [--price]
+    if len(sys.argv) < 3:
+        print("Usage: python sobol_sensitivity.py <version> <parameters.json> [--price]")
+        sys.exit(1)
+
+    with open(sys.argv[2], 'r') as f:
+        run_config = json.load(f)
+
+    engine = SensitivityEngine(
+        sys.argv[1],
+        run_config.get('selectedV', {}),
+        run_config.get('selectedF', {}),
+        run_config.get('targetRow', 20)
+    )
+    report = run_sobol_analysis(
+        engine,
+        run_config['parameters'],
+        base_samples=run_config.get('baseSamples', DEFAULT_BASE_SAMPLES),
+        max_evaluations=run_config.get('maxEvaluations', DEFAULT_MAX_EVALUATIONS),
+        tolerance=run_config.get('tolerance', DEFAULT_TOLERANCE),
+        seed=run_config.get('seed'),
+        solve_for_price='--price' in sys.argv
+    )
+    report_path = get_sobol_report_path(sys.argv[1])
+    os.makedirs(os.path.dirname(report_path), exist_ok=True)
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Sobol indices written to {report_path}")
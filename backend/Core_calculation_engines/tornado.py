@@ -0,0 +1,106 @@
+import time
+import logging
+
+# =====================================================================
+# TORNADO - ONE-SHOT TORNADO CHART DATA
+# =====================================================================
+# A tornado chart shows, per parameter, how far the result moves when the
+# parameter is set to a low and a high value while all others stay at the
+# baseline. This module evaluates the baseline and every low/high point of
+# all parameters in one batch on the in-memory engine and returns the bars
+# sorted by swing, without any variation directory or subprocess.
+#
+# The swing applies to every parameter unless overridden per parameter:
+#
+#   swing = {"mode": "percentage", "low": -10, "high": 10,
+#            "overrides": {"S13": {"low": -5, "high": 5}}}
+# =====================================================================
+
+DEFAULT_SWING = {"mode": "percentage", "low": -10, "high": 10}
+
+logger = logging.getLogger('sensitivity.tornado')
+
+
+def build_tornado(engine, param_ids, swing=None, solve_for_price=True, sort_by='npv'):
+    """
+    Evaluate the low/high swings of several parameters and build tornado bars.
+
+    NPV deltas are taken at the baseline selling price. With solve_for_price,
+    the selling price that brings the NPV within tolerance is also searched
+    for every point, giving the price deltas.
+
+    Args:
+        engine (SensitivityEngine): Engine with the version's baseline loaded
+        param_ids (list): S-parameter IDs
+        swing (dict, optional): Swing specification (see module header)
+        solve_for_price (bool): Also compute solved price deltas
+        sort_by (str): 'npv' or 'price', the swing the bars are sorted by
+
+    Returns:
+        dict: Baseline, bars sorted by descending swing, skipped parameters and timing
+    """
+    started = time.time()
+    swing = dict(DEFAULT_SWING, **(swing or {}))
+    overrides = swing.pop('overrides', None) or {}
+
+    points = []
+    skipped = {}
+    for param_id in dict.fromkeys(param_ids):
+        spec = dict(swing, **overrides.get(param_id, {}))
+        try:
+            key = engine.resolve_parameter_key(param_id)
+            low, high = float(spec['low']), float(spec['high'])
+        except (TypeError, ValueError) as e:
+            skipped[param_id] = str(e)
+            continue
+        points.append((param_id, key, spec['mode'], low, high))
+
+    # Row 0 is the baseline, then the low and high row of every parameter
+    overlay_sets = [[]]
+    for param_id, _, mode, low, high in points:
+        overlay_sets.append([(param_id, low, mode)])
+        overlay_sets.append([(param_id, high, mode)])
+
+    npv_results = engine.evaluate_batch(overlay_sets)
+    price_results = engine.evaluate_batch(overlay_sets, solve_for_price=True) if solve_for_price else None
+
+    base_npv = npv_results[0]['npv']
+    base_price = price_results[0]['price'] if solve_for_price else npv_results[0]['price']
+
+    def point(row, variation):
+        result = {
+            "variation": variation,
+            "npv": npv_results[row]['npv'],
+            "npvDelta": npv_results[row]['npv'] - base_npv,
+        }
+        if solve_for_price:
+            result["price"] = price_results[row]['price']
+            result["priceDelta"] = price_results[row]['price'] - base_price
+        return result
+
+    bars = []
+    for i, (param_id, key, mode, low, high) in enumerate(points):
+        bar = {
+            "paramId": param_id,
+            "key": key,
+            "mode": mode,
+            "low": point(1 + 2 * i, low),
+            "high": point(2 + 2 * i, high),
+        }
+        bar["npvSwing"] = abs(bar["high"]["npv"] - bar["low"]["npv"])
+        if solve_for_price:
+            bar["priceSwing"] = abs(bar["high"]["price"] - bar["low"]["price"])
+        bars.append(bar)
+
+    sort_key = "priceSwing" if sort_by == 'price' and solve_for_price else "npvSwing"
+    bars.sort(key=lambda bar: bar[sort_key], reverse=True)
+
+    return {
+        "version": engine.version,
+        "baseline": {"npv": base_npv, "price": base_price},
+        "swing": swing,
+        "sortBy": sort_key,
+        "bars": bars,
+        "skipped": skipped,
+        "duration": round(time.time() - started, 3)
+    }
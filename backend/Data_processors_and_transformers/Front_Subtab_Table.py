@@ -1,11 +1,14 @@
 """Flask service (port:8007) - Processes CSV files from batch results using pandas"""
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
-import os, logging, logging.config
+import os, sys, logging, logging.config
 import pandas as pd
 from typing import List, Dict, Union, Any
 from os import PathLike
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Configuration_management.columnar_table import get_columnar_table_path, read_columnar_table
+
 app = Flask(__name__)
 CORS(app)
 
@@ -44,6 +47,39 @@ def get_csv_files(version: str) -> Any:
 
     return jsonify(csv_files)
 
+@app.route('/api/variable-table/<version>')
+def get_variable_table(version: str) -> Any:
+    """Serve a column/year slice of Variable_Table, e.g. ?columns=Price,Number of Units&start=1&end=10"""
+    results_path = os.path.join(BASE_PATH, f"Batch({version})", f"Results({version})")
+    columns_arg = request.args.get('columns')
+    columns = [c.strip() for c in columns_arg.split(',') if c.strip()] if columns_arg else None
+    start = request.args.get('start', type=int)
+    end = request.args.get('end', type=int)
+
+    columnar_path = get_columnar_table_path(results_path, version)
+    csv_path = os.path.join(results_path, f"Variable_Table({version}).csv")
+    # The columnar copy is only current when it was written after the CSV
+    columnar_current = os.path.exists(columnar_path) and (
+        not os.path.exists(csv_path) or os.path.getmtime(columnar_path) >= os.path.getmtime(csv_path)
+    )
+    try:
+        if columnar_current:
+            df = read_columnar_table(columnar_path, columns, start, end)
+        elif os.path.exists(csv_path):
+            df = pd.read_csv(csv_path, index_col='Year', usecols=['Year'] + columns if columns else None)
+            df = df.loc[(start if start is not None else df.index.min()):(end if end is not None else df.index.max())]
+        else:
+            logging.warning(f"Variable table not found for version {version}")
+            return jsonify({"error": f"Variable table not found for version {version}"}), 404
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "name": f"Variable_Table({version})",
+        "columns": list(df.columns),
+        "data": df.reset_index().fillna("null").to_dict(orient='records')
+    })
+
 if __name__ == '__main__':
     versions = get_versions(BASE_PATH)
     app.run(port=8007)
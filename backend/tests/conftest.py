@@ -0,0 +1,138 @@
+import os
+import sys
+import json
+import importlib.util
+import numpy as np
+import pandas as pd
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# =====================================================================
+# Shared fixtures: a small compiled version on disk, laid out as the
+# configuration build leaves it (compiled configuration, configuration
+# matrix and one config module per interval).
+# =====================================================================
+
+FIXTURE_VERSION = 7
+FIXTURE_INTERVALS = [(1, 4), (5, 9), (10, 15), (16, 19)]
+FIXTURE_CONFIG = dict(
+    plantLifetimeAmount10=20, numberofconstructionYearsAmount28=3, bECAmount11=3e5,
+    engineering_Procurement_and_Construction_EPC_Amount15=0.1, process_contingency_PC_Amount16=0.05,
+    project_Contingency_PT_BEC_EPC_PCAmount17=0.1, iRRAmount30=0.05, stateTaxRateAmount32=0.05,
+    federalTaxRateAmount33=0.21, initialSellingPriceAmount13=2.0, numberOfUnitsAmount12=30000,
+    totalOperatingCostPercentageAmount14=0.1, use_direct_operating_expensesAmount18=False,
+    generalInflationRateAmount23=0.0, rawmaterialAmount34=10000, laborAmount35=24000, utilityAmount36=5000,
+    maintenanceAmount37=2500, insuranceAmount38=500, variable_costsAmount4=[1.5, 2, 3, 4, 5, 6, 7, 8, 9, 10],
+    amounts_per_unitAmount5=[100, 200, 3, 4, 5, 6, 7, 8, 9, 10],
+)
+ALL_V_ON = {f'V{i+1}': 'on' for i in range(10)}
+ALL_F_ON = {f'F{i+1}': 'on' for i in range(5)}
+
+
+def load_module(name, path):
+    """Import a module from a file path (for scripts whose names are not importable)."""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(BACKEND_DIR, path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_fixture_version(base_dir, version=FIXTURE_VERSION, config=None):
+    """Write a compiled version with one config module per interval under base_dir."""
+    config = dict(config or FIXTURE_CONFIG)
+    results_folder = os.path.join(base_dir, f"Batch({version})", f"Results({version})")
+    spec_folder = os.path.join(base_dir, f"Batch({version})", f"ConfigurationPlotSpec({version})")
+    os.makedirs(results_folder, exist_ok=True)
+    os.makedirs(spec_folder, exist_ok=True)
+
+    with open(os.path.join(spec_folder, f"configurations({version}).py"), 'w') as f:
+        for key, value in config.items():
+            f.write(f"{key}={value!r}\n")
+        f.write("filtered_values_json=[]\n")
+
+    pd.DataFrame([{'start': s, 'end': e, 'length': e - s + 1} for s, e in FIXTURE_INTERVALS]).to_csv(
+        os.path.join(results_folder, f"General_Configuration_Matrix({version}).csv"), index=False
+    )
+    # Intervals differ in units, labor, inflation and the direct operating expenses switch
+    rng = np.random.default_rng(0)
+    for start, _ in FIXTURE_INTERVALS:
+        module = dict(config)
+        module['numberOfUnitsAmount12'] = float(rng.integers(20000, 40000))
+        module['laborAmount35'] = float(rng.integers(10000, 30000))
+        module['generalInflationRateAmount23'] = float(rng.choice([0, 0.02]))
+        module['use_direct_operating_expensesAmount18'] = bool(start == 10)
+        with open(os.path.join(results_folder, f"{version}_config_module_{start}.json"), 'w') as f:
+            json.dump(module, f)
+    return results_folder
+
+
+def raw_configuration(config, filtered_values):
+    """Raw configuration in the layout the form saves as U_configurations(v).py."""
+    items = []
+    for key, value in config.items():
+        if isinstance(value, list):
+            amount = 'Amount4' if key.endswith('Amount4') else 'Amount5'
+            items.extend({"id": f"vector{amount}{i}", "value": v} for i, v in enumerate(value))
+        else:
+            items.append({"id": key, "value": f'"{value}"' if isinstance(value, bool) else value})
+    content = '{"filteredValues":[' + ','.join(
+        '{"id":"%s","value":%s,"remarks":""}' % (item["id"], item["value"]) for item in items
+    ) + ']}\n'
+    for fv in filtered_values:
+        content += json.dumps({"filteredValue": fv}, separators=(',', ':')) + '\n'
+    return content
+
+
+@pytest.fixture
+def fixture_base(tmp_path):
+    """Folder containing Batch(7) of the fixture version."""
+    base_dir = str(tmp_path / "Original")
+    write_fixture_version(base_dir)
+    return base_dir
+
+
+@pytest.fixture
+def engine(fixture_base):
+    """In-memory sensitivity engine over the fixture version."""
+    from Core_calculation_engines.sensitivity_engine import SensitivityEngine
+    return SensitivityEngine(FIXTURE_VERSION, ALL_V_ON, ALL_F_ON, 19, base_dir=fixture_base)
+
+
+@pytest.fixture
+def ll(fixture_base, tmp_path, monkeypatch):
+    """Calculations_and_Sensitivity-LL.py with its job queue, run workspaces and versions under tmp_path."""
+    from utils.run_workspace import WorkspaceRegistry
+
+    module = load_module('calculations_and_sensitivity', os.path.join(
+        'API_endpoints_and_controllers', 'Calculations_and_Sensitivity-LL.py'
+    ))
+    monkeypatch.setattr(module, 'LOGS_DIR', str(tmp_path))
+    monkeypatch.setattr(module, 'SENSITIVITY_CONFIG_STATUS_PATH', str(tmp_path / "sensitivity_config_status.json"))
+    monkeypatch.setattr(module, 'SENSITIVITY_CONFIG_DATA_PATH', str(tmp_path / "sensitivity_config_data.pkl"))
+    monkeypatch.setattr(module, 'JOB_QUEUE_PATH', str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(module, 'RUN_WORKSPACES', WorkspaceRegistry(str(tmp_path / "runs")))
+    monkeypatch.setattr(module, 'ORIGINAL_BASE_DIR', fixture_base)
+    # Keep the tracked SENSITIVITY.log out of the tests
+    module.sensitivity_logger.removeHandler(module.sensitivity_handler)
+    module.sensitivity_handler.close()
+    return module
+
+
+@pytest.fixture
+def original(tmp_path, monkeypatch):
+    """Point the batch creation and configuration build steps at an Original folder under tmp_path."""
+    from Configuration_management import config_diff, formatter, module1, config_modules, Table
+    from API_endpoints_and_controllers import Create_new_batch
+
+    base_dir = tmp_path / "Original"
+    base_dir.mkdir()
+    monkeypatch.setattr(config_diff, 'CODE_FILES_PATH', str(base_dir))
+    monkeypatch.setattr(formatter, 'UPLOAD_DIR', base_dir)
+    monkeypatch.setattr(module1, 'code_files_path', base_dir)
+    monkeypatch.setattr(config_modules, 'CODE_FILES_PATH', str(base_dir))
+    monkeypatch.setattr(Table, 'CODE_FILES_PATH', str(base_dir))
+    monkeypatch.setattr(Create_new_batch, 'STATIC_FOLDER', str(base_dir))
+    return base_dir
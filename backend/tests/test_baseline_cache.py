@@ -0,0 +1,54 @@
+import os
+
+from conftest import BACKEND_DIR
+from utils.baseline_cache import (
+    baseline_fingerprint, get_baseline_inputs, get_results_folder, get_script_dependencies,
+    list_baseline_outputs
+)
+
+
+def _write(path, content=''):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def test_inputs_include_modules_the_scripts_import():
+    scripts = [os.path.join(BACKEND_DIR, 'Configuration_management', 'config_modules.py')]
+
+    dependencies = get_script_dependencies(scripts)
+
+    for name in (('Configuration_management', 'config_bundle.py'), ('Configuration_management', 'config_diff.py'),
+                 ('utils', 'stage_completion.py')):
+        assert os.path.join(BACKEND_DIR, *name) in dependencies
+    assert scripts[0] not in dependencies
+
+
+def test_fingerprint_changes_with_an_imported_module(tmp_path):
+    _write(str(tmp_path / 'pkg' / 'script.py'), 'from pkg.mapping import property_mapping\n')
+    _write(str(tmp_path / 'pkg' / 'mapping.py'), 'property_mapping = {"a": "A"}\n')
+    scripts = [str(tmp_path / 'pkg' / 'script.py')]
+    inputs = get_baseline_inputs(str(tmp_path), 1, scripts)
+    before = baseline_fingerprint({"version": 1}, inputs)
+
+    _write(str(tmp_path / 'pkg' / 'mapping.py'), 'property_mapping = {"a": "B"}\n')
+
+    assert baseline_fingerprint({"version": 1}, get_baseline_inputs(str(tmp_path), 1, scripts)) != before
+
+
+def test_outputs_are_the_known_output_files(tmp_path):
+    results_folder = get_results_folder(str(tmp_path), 3)
+    expected = [
+        os.path.join(results_folder, 'CFA(3).csv'),
+        os.path.join(results_folder, '3_config_module_1.json'),
+        os.path.join(results_folder, '3_PieStaticPlots', 'Operational_Cost_Breakdown_Pie_Chart(3).png'),
+        os.path.join(str(tmp_path), 'Batch(3)', 'ConfigurationPlotSpec(3)', 'configurations(3).py'),
+    ]
+    for path in expected:
+        _write(path)
+    # Written by other requests or stages at the same time
+    _write(os.path.join(results_folder, 'Sensitivity', 'S35', 'CFA(3).csv'))
+    _write(os.path.join(results_folder, 'CFA(4).csv'))
+    _write(os.path.join(results_folder, 'notes.txt'))
+
+    assert list_baseline_outputs(results_folder, 3) == sorted(expected)
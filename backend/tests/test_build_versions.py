@@ -0,0 +1,60 @@
+import os
+import json
+import pytest
+
+from conftest import FIXTURE_CONFIG, raw_configuration
+from Configuration_management.build_versions import build_version, build_versions, order_by_base_version
+
+
+def _write_raw_version(original, version, config):
+    config_folder = original / f"Batch({version})" / f"ConfigurationPlotSpec({version})"
+    config_folder.mkdir(parents=True)
+    (original / f"Batch({version})" / f"Results({version})").mkdir()
+    (config_folder / f"U_configurations({version}).py").write_text(raw_configuration(config, []))
+
+
+@pytest.fixture
+def versions(original):
+    """Versions 1 and 3 with their own raw configuration; version 2 is stored as a delta of version 1."""
+    from API_endpoints_and_controllers.Create_new_batch import create_batch
+
+    _write_raw_version(original, 1, FIXTURE_CONFIG)
+    _write_raw_version(original, 3, dict(FIXTURE_CONFIG, initialSellingPriceAmount13=3.0))
+    # A new batch is diffed against its base version's compiled configuration
+    assert build_version(1)["status"] == "success"
+    create_batch(2, 1)
+    return original
+
+
+def _config_module(original, version, start=1):
+    path = original / f"Batch({version})" / f"Results({version})" / f"{version}_config_module_{start}.json"
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_delta_versions_are_built_after_their_base(versions):
+    assert order_by_base_version([2, 1, 3]) == [[1, 3], [2]]
+    # Without its base in the build, a delta version has nothing to wait for
+    assert order_by_base_version([2, 3]) == [[2, 3]]
+
+
+def test_versions_build_concurrently(versions):
+    report = build_versions([2, 1, 3, 1], max_workers=2)
+
+    assert report["status"] == "success", report["versions"]
+    assert report["workers"] == 2
+    assert sorted(report["succeeded"]) == ['1', '2', '3']
+    assert list(report["versions"]) == ['2', '1', '3']
+    for version in (1, 2, 3):
+        assert os.path.exists(versions / f"Batch({version})" / f"Results({version})" / f"Variable_Table({version}).csv")
+    assert _config_module(versions, 2) == _config_module(versions, 1)
+    assert _config_module(versions, 3)["initialSellingPriceAmount13"] == 3.0
+
+
+def test_a_failing_version_does_not_stop_the_others(versions):
+    report = build_versions([1, 4], max_workers=2)
+
+    assert report["status"] == "partial"
+    assert report["succeeded"] == ['1']
+    assert report["failed"] == ['4']
+    assert report["versions"]['4']["error"].startswith("formatter")
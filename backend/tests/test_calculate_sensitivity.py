@@ -0,0 +1,107 @@
+import json
+import time
+import pickle
+import threading
+import pytest
+
+from conftest import FIXTURE_VERSION
+
+SEN_PARAMETERS = {
+    'S35': {'enabled': True, 'mode': 'percentage', 'values': [10, -10, 20]},
+    'S36': {'enabled': True, 'mode': 'directvalue', 'values': [6000]},
+}
+
+
+class VariationRunner:
+    """Stands in for CFA-b.py; records how many variations run at once."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.failing = set()
+        self.price = None
+
+    def __call__(self, cfa_b_script, version, config, task, timeout=300):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.2)
+        with self.lock:
+            self.active -= 1
+        if (task['param_id'], task['variation']) in self.failing:
+            return task, {'value': task['variation'], 'success': False, 'error': 'CFA-b.py failed'}
+        outcome = {'value': task['variation'], 'success': True}
+        if self.price is not None:
+            outcome['price'] = self.price
+        return task, outcome
+
+
+@pytest.fixture
+def calculate(ll, tmp_path, monkeypatch):
+    with open(ll.SENSITIVITY_CONFIG_STATUS_PATH, 'w') as f:
+        json.dump({'configured': True}, f)
+    with open(ll.SENSITIVITY_CONFIG_DATA_PATH, 'wb') as f:
+        pickle.dump({
+            'versions': [FIXTURE_VERSION], 'selectedV': {}, 'selectedF': {}, 'targetRow': 20,
+            'calculationOption': 'freeFlowNPV', 'SenParameters': SEN_PARAMETERS
+        }, f)
+    monkeypatch.setattr(ll, 'BASE_DIR', str(tmp_path / "root"))
+    monkeypatch.setattr(ll, 'JOB_SCHEDULER_CAPACITY', 4)
+    runner = VariationRunner()
+    monkeypatch.setattr(ll, 'run_sensitivity_variation', runner)
+
+    def call(**data):
+        return ll.app.test_client().post('/calculate-sensitivity', json=data)
+    return call, runner
+
+
+def test_max_workers_defaults_to_the_configured_concurrency(ll, monkeypatch):
+    monkeypatch.setattr(ll, 'SENSITIVITY_MAX_WORKERS', 6)
+
+    assert ll.get_sensitivity_max_workers() == 6
+    assert ll.get_sensitivity_max_workers(3) == 3
+    assert ll.get_sensitivity_max_workers('x') == 6
+    assert ll.get_sensitivity_max_workers(-2) == 1
+
+
+@pytest.mark.parametrize('max_workers', [1, 3])
+def test_variations_run_on_a_bounded_pool(calculate, max_workers):
+    call, runner = calculate
+
+    response = call(maxWorkers=max_workers)
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['status'] == 'success'
+    assert sorted(body['results']['S35']['variations']) == ['+10.00', '+20.00', '-10.00']
+    assert list(body['results']['S36']['variations']) == ['+6000.00']
+    assert runner.peak == max_workers
+
+
+def test_a_failing_variation_does_not_stop_the_others(calculate):
+    call, runner = calculate
+    runner.failing.add(('S35', -10.0))
+
+    body = call(maxWorkers=4).get_json()
+
+    assert body['status'] == 'partial_success'
+    assert body['results']['S35']['success'] is False
+    assert body['results']['S35']['variations']['-10.00']['error'] == 'CFA-b.py failed'
+    assert body['results']['S35']['variations']['+10.00']['success'] is True
+    assert body['results']['S36']['success'] is True
+
+
+def test_pipelined_sweep_plots_every_parameter(calculate):
+    call, runner = calculate
+    runner.price = 2.5
+
+    body = call(maxWorkers=2, pipeline=True).get_json()
+
+    assert body['status'] == 'success'
+    stages = body['pipeline']['stages']
+    assert stages['extract']['items'] == 4
+    assert stages['extract']['errors'] == []
+    assert stages['plot']['items'] == 2
+    assert stages['plot']['errors'] == []
+    assert sorted(body['results']) == ['S35', 'S36']
+    assert all(body['results'][param_id]['plots'] for param_id in ('S35', 'S36'))
@@ -0,0 +1,58 @@
+import os
+import pytest
+
+from conftest import BACKEND_DIR, load_module
+from Configuration_management import config_diff
+
+
+@pytest.fixture
+def calculations(tmp_path, monkeypatch):
+    module = load_module('calculations', os.path.join('API_endpoints_and_controllers', 'Calculations.py'))
+    # Keep the tracked CFA_CALC.log out of the tests
+    module.logger.removeHandler(module.file_handler)
+    module.file_handler.close()
+    monkeypatch.setattr(config_diff, 'CODE_FILES_PATH', str(tmp_path))
+    # /run changes to the backend directory; restore the working directory afterwards
+    monkeypatch.chdir(BACKEND_DIR)
+    monkeypatch.setitem(module.CALCULATION_SCRIPTS, 'freeFlowNPV', module.CALCULATION_SCRIPTS['calculateForPrice'])
+    return module
+
+
+def _run(calculations, monkeypatch, failing, option='calculateForPrice'):
+    """POST /run for versions 1-3 with process_version failing on the given versions."""
+    processed = []
+
+    def process_version(version, *args):
+        processed.append(version)
+        return f"Version {version} failed" if version in failing else None
+
+    monkeypatch.setattr(calculations, 'process_version', process_version)
+    response = calculations.app.test_client().post('/run', json={
+        'selectedVersions': [1, 2, 3], 'selectedCalculationOption': option, 'maxWorkers': 3
+    })
+    assert sorted(processed) == [1, 2, 3]
+    return response
+
+
+@pytest.mark.parametrize('option', ['calculateForPrice', 'freeFlowNPV'])
+def test_partial_failure_reports_every_version(calculations, monkeypatch, option):
+    response = _run(calculations, monkeypatch, failing={2}, option=option)
+
+    assert response.status_code == 207
+    body = response.get_json()
+    assert body['status'] == 'partial'
+    assert body['succeeded'] == ['1', '3']
+    assert body['failed'] == ['2']
+    assert body['versions']['2']['error'] == "Version 2 failed"
+
+
+def test_all_versions_failing_is_an_error(calculations, monkeypatch):
+    response = _run(calculations, monkeypatch, failing={1, 2, 3})
+
+    assert response.status_code == 500
+    assert response.get_json()['failed'] == ['1', '2', '3']
+
+
+def test_full_success(calculations, monkeypatch):
+    assert _run(calculations, monkeypatch, failing=set()).get_json()['status'] == 'success'
+    assert _run(calculations, monkeypatch, failing=set(), option='freeFlowNPV').status_code == 204
@@ -0,0 +1,36 @@
+import os
+import json
+import pytest
+
+from conftest import load_module
+from utils.calsen_paths import get_sensitivity_config_path, invalidate_path_index
+
+
+@pytest.fixture
+def calsen(fixture_base, monkeypatch):
+    module = load_module('calsen', os.path.join('API_endpoints_and_controllers', 'CalSen.py'))
+    monkeypatch.setattr(module, 'ORIGINAL_BASE_DIR', fixture_base)
+    invalidate_path_index()
+    return module
+
+
+def test_list_parameters_returns_indexed_parameters(calsen, fixture_base):
+    config_path = get_sensitivity_config_path(7, fixture_base)
+    os.makedirs(os.path.dirname(config_path), exist_ok=True)
+    with open(config_path, 'w') as f:
+        json.dump({"S35": {"enabled": True, "mode": "percentage", "values": [-10, 10]},
+                   "S13": {"enabled": False, "mode": "percentage", "values": [5]}}, f)
+
+    response = calsen.app.test_client().post('/list_parameters', json={"version": 7})
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["count"] == 1
+    assert body["parameters"]["S35"]["mode"] == "percentage"
+    assert len(body["parameters"]["S35"]["variations"]) == 2
+
+
+def test_list_parameters_without_sensitivity_config(calsen):
+    response = calsen.app.test_client().post('/list_parameters', json={"version": 7})
+
+    assert response.status_code == 404
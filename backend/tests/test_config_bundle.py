@@ -0,0 +1,44 @@
+import os
+import json
+
+from Configuration_management.config_bundle import (
+    get_bundle_path, write_config_bundle, read_bundle_index, read_config_module_from_bundle,
+    read_all_config_modules, load_config_modules, write_config_module_files
+)
+
+MODULES = {
+    1: {"numberOfUnitsAmount12": 30000, "variable_costsAmount4": [1.5, 2]},
+    10: {"numberOfUnitsAmount12": 25000, "remarks": "ünïcode"},
+    5: {"numberOfUnitsAmount12": 28000, "use_direct_operating_expensesAmount18": True},
+}
+
+
+def test_bundle_round_trip(tmp_path):
+    bundle_path = write_config_bundle(get_bundle_path(str(tmp_path), 7), MODULES, 7)
+
+    assert read_bundle_index(bundle_path) == [1, 5, 10]
+    assert read_all_config_modules(bundle_path) == sorted(MODULES.items())
+    assert read_config_module_from_bundle(bundle_path, 10) == MODULES[10]
+    assert read_config_module_from_bundle(bundle_path, 2) is None
+    assert load_config_modules(str(tmp_path), 7) == sorted(MODULES.items())
+    assert [f for f in os.listdir(tmp_path) if f.endswith('.tmp')] == []
+
+
+def test_load_config_modules_falls_back_to_module_files(tmp_path):
+    for start, module in MODULES.items():
+        with open(tmp_path / f"7_config_module_{start}.json", 'w') as f:
+            json.dump(module, f)
+    (tmp_path / "7_config_modules.bundle").write_bytes(b"not a bundle")
+
+    assert load_config_modules(str(tmp_path), 7) == sorted(MODULES.items())
+    assert load_config_modules(str(tmp_path / "missing"), 7) == []
+
+
+def test_write_config_module_files_expands_bundle(tmp_path):
+    write_config_bundle(get_bundle_path(str(tmp_path), 7), MODULES, 7)
+
+    file_paths = write_config_module_files(str(tmp_path), 7)
+
+    assert [os.path.basename(p) for p in file_paths] == [f"7_config_module_{s}.json" for s in (1, 5, 10)]
+    with open(file_paths[2]) as f:
+        assert json.load(f) == MODULES[10]
@@ -0,0 +1,109 @@
+import os
+import json
+import pytest
+
+from conftest import FIXTURE_CONFIG, raw_configuration
+from Configuration_management import config_diff
+from Configuration_management.config_diff import (
+    apply_config_delta, diff_compiled_configs, load_compiled_config, write_compiled_config
+)
+
+BASE_VERSION = 1
+DELTA_VERSION = 2
+
+
+def _fv(id, value, start, end):
+    return {"id": id, "value": value, "start": start, "end": end, "remarks": ""}
+
+
+def _write_config(path, attributes, filtered_values):
+    write_compiled_config({"attributes": attributes, "filtered_values": filtered_values}, str(path))
+    return load_compiled_config(str(path))
+
+
+def _same_config(a, b):
+    """Compare compiled configurations; filtered values are a set of entries."""
+    def key(fv):
+        return json.dumps(fv, sort_keys=True)
+    return a["attributes"] == b["attributes"] and \
+        sorted(map(key, a["filtered_values"])) == sorted(map(key, b["filtered_values"]))
+
+
+def test_apply_diff_rebuilds_target(tmp_path):
+    base = _write_config(tmp_path / "base.py", dict(FIXTURE_CONFIG), [
+        _fv("laborAmount35", 30000, 5, 9), _fv("numberOfUnitsAmount12", 25000, 10, 15)
+    ])
+    target_attributes = dict(FIXTURE_CONFIG, initialSellingPriceAmount13=2.5, variable_costsAmount4=[1, 2, 3])
+    del target_attributes['insuranceAmount38']
+    target = _write_config(tmp_path / "target.py", target_attributes, [
+        _fv("laborAmount35", 32000, 5, 9), _fv("numberOfUnitsAmount12", 25000, 10, 15), _fv("utilityAmount36", 1, 2, 3)
+    ])
+
+    delta = diff_compiled_configs(base, target)
+
+    assert delta["attributes"]["removed"] == ['insuranceAmount38']
+    assert len(delta["filtered_values"]["added"]) == 2
+    assert len(delta["filtered_values"]["removed"]) == 1
+    assert _same_config(apply_config_delta(base, delta), target)
+    assert _same_config(apply_config_delta(base, diff_compiled_configs(base, base)), base)
+
+
+@pytest.fixture
+def built_base_version(original):
+    config_folder = original / f"Batch({BASE_VERSION})" / f"ConfigurationPlotSpec({BASE_VERSION})"
+    config_folder.mkdir(parents=True)
+    (original / f"Batch({BASE_VERSION})" / f"Results({BASE_VERSION})").mkdir()
+    (config_folder / f"U_configurations({BASE_VERSION}).py").write_text(
+        raw_configuration(FIXTURE_CONFIG, [_fv("laborAmount35", 30000, 5, 9)])
+    )
+
+    from Configuration_management.build_versions import build_version
+    assert build_version(BASE_VERSION)["status"] == "success"
+    return build_version
+
+
+def _results_path(version, name):
+    return os.path.join(config_diff.CODE_FILES_PATH, f"Batch({version})", f"Results({version})", name)
+
+
+def test_new_batch_from_a_base_version_stores_only_the_delta(built_base_version):
+    from API_endpoints_and_controllers.Create_new_batch import create_batch
+    create_batch(DELTA_VERSION, BASE_VERSION)
+
+    config_folder = os.path.dirname(config_diff.get_delta_path(DELTA_VERSION))
+    assert os.listdir(config_folder) == [f"config_delta({DELTA_VERSION}).json"]
+    # The form shows the base version's raw configuration until the new version is saved
+    assert config_diff.get_raw_config_path(DELTA_VERSION) == os.path.join(
+        config_diff.CODE_FILES_PATH, f"Batch({BASE_VERSION})", f"ConfigurationPlotSpec({BASE_VERSION})",
+        f"U_configurations({BASE_VERSION}).py"
+    )
+
+
+def test_delta_batch_builds(built_base_version):
+    from API_endpoints_and_controllers.Create_new_batch import create_batch
+    create_batch(DELTA_VERSION, BASE_VERSION)
+
+    report = built_base_version(DELTA_VERSION)
+
+    assert report["status"] == "success", report["error"]
+    assert os.path.exists(_results_path(DELTA_VERSION, f"Variable_Table({DELTA_VERSION}).csv"))
+    assert _same_config(config_diff.load_version_config(DELTA_VERSION), config_diff.load_version_config(BASE_VERSION))
+
+
+def test_delta_batch_builds_from_the_delta_the_user_wrote(built_base_version):
+    from API_endpoints_and_controllers.Create_new_batch import create_batch
+    create_batch(DELTA_VERSION, BASE_VERSION)
+    with open(config_diff.get_delta_path(DELTA_VERSION)) as f:
+        record = json.load(f)
+    record["attributes"]["changed"]["initialSellingPriceAmount13"] = 3.5
+    with open(config_diff.get_delta_path(DELTA_VERSION), 'w') as f:
+        json.dump(record, f)
+
+    report = built_base_version(DELTA_VERSION)
+
+    assert report["status"] == "success", report["error"]
+    with open(_results_path(DELTA_VERSION, f"{DELTA_VERSION}_config_module_1.json")) as f:
+        assert json.load(f)["initialSellingPriceAmount13"] == 3.5
+    # The build does not rewrite the stored delta
+    with open(config_diff.get_delta_path(DELTA_VERSION)) as f:
+        assert json.load(f) == record
@@ -0,0 +1,71 @@
+import pytest
+
+from Core_calculation_engines.design_optimizer import run_optimization
+
+VARIABLES = {
+    'S13': {'low': -10, 'high': 20},
+    'S35': {'low': -20, 'high': 20},
+}
+OPEX = 'Average Annual Operating Expenses'
+
+
+def test_npv_is_maximized_within_the_bounds(engine):
+    report = run_optimization(engine, VARIABLES, objective='npv', population_size=12, max_generations=30, seed=2)
+
+    best = report['best']
+    # A higher price and lower labor cost both raise the NPV
+    assert best['values']['S13'] == pytest.approx(20, abs=0.5)
+    assert best['values']['S35'] == pytest.approx(-20, abs=0.5)
+    for name, value in best['values'].items():
+        assert VARIABLES[name]['low'] <= value <= VARIABLES[name]['high']
+    overlays = [(name, value, 'percentage') for name, value in best['values'].items()]
+    assert best['npv'] == engine.evaluate(overlays)['npv']
+    assert report['baseline']['npv'] == engine.evaluate()['npv']
+    assert report['improvement'] > 0
+
+
+def test_constraints_bound_the_price_search(engine):
+    # Price objectives report metrics at the solved price
+    baseline_opex = engine.evaluate(solve_for_price=True)['metrics'][OPEX]
+
+    constrained = run_optimization(engine, {'S35': VARIABLES['S35']}, objective='price',
+                                   constraints=[{'metric': OPEX, 'min': baseline_opex}],
+                                   population_size=8, max_generations=20, seed=4)
+    free = run_optimization(engine, {'S35': VARIABLES['S35']}, objective='price',
+                            population_size=8, max_generations=20, seed=4)
+
+    best = constrained['best']
+    # Lower labor lowers the price, but operating expenses may not drop below the baseline
+    assert best['feasible']
+    assert best['values']['S35'] >= 0
+    assert best['metrics'][OPEX] >= baseline_opex
+    assert best['price'] <= constrained['baseline']['price']
+    assert free['best']['values']['S35'] < 0
+    assert free['best']['price'] < best['price']
+
+
+def test_seeded_runs_are_reproducible(engine):
+    first = run_optimization(engine, VARIABLES, objective='npv', population_size=8, max_generations=5, polish=False, seed=9)
+    second = run_optimization(engine, VARIABLES, objective='npv', population_size=8, max_generations=5, polish=False, seed=9)
+
+    assert first['best'] == second['best']
+    assert [step['objective'] for step in first['history']] == [step['objective'] for step in second['history']]
+
+
+def test_gradient_method_improves_on_the_baseline(engine):
+    report = run_optimization(engine, VARIABLES, objective='npv', method='gradient')
+
+    assert report['polish'] is False
+    assert report['best']['npv'] > report['baseline']['npv']
+    assert report['history'][0]['stage'] != 'differential_evolution'
+
+
+@pytest.mark.parametrize('variables,kwargs,message', [
+    ({'S99': {'low': 0, 'high': 1}}, {}, "S99"),
+    ({'S35': {'low': 5, 'high': -5}}, {}, "empty range"),
+    (VARIABLES, {'method': 'annealing'}, "Unknown optimization method"),
+    (VARIABLES, {'constraints': [{'metric': 'NPV margin', 'max': 1}]}, "Unknown constraint metric"),
+])
+def test_invalid_problems_are_rejected(engine, variables, kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        run_optimization(engine, variables, **kwargs)
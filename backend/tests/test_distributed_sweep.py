@@ -0,0 +1,73 @@
+import socket
+import threading
+import time
+import pytest
+
+from conftest import ALL_F_ON, ALL_V_ON, FIXTURE_VERSION
+from Core_calculation_engines.distributed_sweep import (
+    SweepCoordinator, SweepWorker, engine_spec, read_messages, send_message, sign_hello
+)
+
+
+@pytest.fixture
+def coordinator():
+    coordinator = SweepCoordinator('127.0.0.1:0', token='secret').start()
+    yield coordinator
+    coordinator.stop()
+
+
+def _start_worker(coordinator, token, name):
+    worker = SweepWorker(f"127.0.0.1:{coordinator.address[1]}", name=name, token=token)
+    # Connects once: the thread outlives the coordinator and must not keep retrying (and logging)
+    threading.Thread(target=worker.run_forever, kwargs={'retry_interval': 3600}, daemon=True).start()
+    return worker
+
+
+def _connected(coordinator, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with coordinator._condition:
+            names = sorted(coordinator._workers)
+        if names:
+            return names
+        time.sleep(0.05)
+    return []
+
+
+def test_worker_with_the_token_evaluates_units(coordinator, fixture_base):
+    _start_worker(coordinator, 'secret', 'good')
+    assert _connected(coordinator) == ['good']
+
+    spec = engine_spec(FIXTURE_VERSION, ALL_V_ON, ALL_F_ON, 20, fixture_base)
+    outcomes = coordinator.submit('variations', {'engine': spec, 'tasks': [['S35', 10, 'percentage']]}).result(30)
+
+    assert outcomes[0]['success'] is True
+
+
+def test_worker_with_a_wrong_token_gets_no_units(coordinator):
+    _start_worker(coordinator, 'wrong', 'bad')
+
+    assert _connected(coordinator, timeout=1) == []
+
+
+def test_hello_replayed_on_another_connection_is_rejected(coordinator):
+    address = ('127.0.0.1', coordinator.address[1])
+    with socket.create_connection(address) as first:
+        nonce = next(read_messages(first))['nonce']
+        send_message(first, {'type': 'hello', 'worker': 'w', 'slots': 1, 'auth': sign_hello('secret', nonce, 'w', 1)})
+        assert _connected(coordinator) == ['w']
+
+    with socket.create_connection(address) as second:
+        next(read_messages(second))
+        send_message(second, {'type': 'hello', 'worker': 'replayed', 'slots': 1,
+                              'auth': sign_hello('secret', nonce, 'replayed', 1)})
+        time.sleep(0.3)
+        with coordinator._condition:
+            assert 'replayed' not in coordinator._workers
+
+
+def test_worker_needs_a_token(monkeypatch):
+    monkeypatch.delenv('SWEEP_TOKEN', raising=False)
+
+    with pytest.raises(ValueError):
+        SweepWorker('127.0.0.1:1')
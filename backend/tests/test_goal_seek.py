@@ -0,0 +1,51 @@
+import os
+import pandas as pd
+import pytest
+
+from conftest import ALL_F_ON, ALL_V_ON, FIXTURE_VERSION
+from Core_calculation_engines.goal_seek import CONVERGED, NO_BRACKET, solve_break_even
+
+TOLERANCE = 1000
+
+
+def test_break_even_variations_zero_the_npv(engine):
+    goal_seek = solve_break_even(engine, ['S13', 'S35', 'S12'], tolerance=TOLERANCE)
+
+    assert goal_seek['baselineNpv'] == engine.evaluate()['npv']
+    for result in goal_seek['results']:
+        assert result['status'] == CONVERGED, result['paramId']
+        npv = engine.evaluate([(result['paramId'], result['variation'], result['mode'])])['npv']
+        assert abs(npv) <= TOLERANCE, result['paramId']
+        assert npv == result['npv']
+
+
+def test_price_break_even_matches_the_price_search(engine):
+    goal_seek = solve_break_even(engine, ['S13'], tolerance=TOLERANCE)
+
+    # Both stop within the NPV tolerance, so the prices agree closely
+    break_even_price = goal_seek['results'][0]['breakEvenValue'][0]
+    assert break_even_price == pytest.approx(engine.evaluate(solve_for_price=True)['price'], rel=1e-2)
+
+
+def test_parameters_that_cannot_reach_break_even_are_reported(engine):
+    goal_seek = solve_break_even(engine, ['S38', 'S99'], brackets={'S38': {'low': -1, 'high': 1}})
+
+    (result,) = goal_seek['results']
+    assert result['status'] == NO_BRACKET
+    assert result['variation'] is None and result['breakEvenValue'] is None
+    assert list(goal_seek['skipped']) == ['S99']
+
+
+def test_endpoint_writes_the_break_even_table(ll):
+    response = ll.app.test_client().post('/sensitivity/goal-seek', json={
+        'version': FIXTURE_VERSION, 'selectedV': ALL_V_ON, 'selectedF': ALL_F_ON, 'targetRow': 19,
+        'parameters': ['S13', 'S35'], 'brackets': {'S35': {'mode': 'percentage', 'low': 0, 'high': 100}}
+    })
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['tableFile'].startswith(ll.ORIGINAL_BASE_DIR)
+    table = pd.read_csv(body['tableFile'])
+    assert table['Parameter'].tolist() == ['S13', 'S35']
+    assert (table['Status'] == CONVERGED).all()
+    assert os.path.basename(body['tableFile']) == f"goal_seek({FIXTURE_VERSION}).csv"
@@ -0,0 +1,61 @@
+import os
+import json
+import numpy as np
+import pytest
+
+from conftest import ALL_F_ON, ALL_V_ON, FIXTURE_VERSION
+from Core_calculation_engines.grid_sweep import break_even_contour, run_grid
+
+X_AXIS = {'paramId': 'S13', 'values': [-30, 0, 30]}
+Y_AXIS = {'paramId': 'S35', 'low': -50, 'high': 50, 'steps': 4}
+
+
+def test_cells_match_single_evaluations(engine):
+    grid = run_grid(engine, X_AXIS, Y_AXIS, batch_cells=5)
+
+    assert np.array(grid['npv']).shape == (3, 4)
+    assert grid['y']['values'] == pytest.approx([-50, -50 / 3, 50 / 3, 50])
+    for i, x in enumerate(grid['x']['values']):
+        for j, y in enumerate(grid['y']['values']):
+            overlays = [('S13', x, 'percentage'), ('S35', y, 'percentage')]
+            assert grid['npv'][i][j] == pytest.approx(engine.evaluate(overlays)['npv'])
+            assert grid['price'][i][j] == pytest.approx(engine.evaluate(overlays, solve_for_price=True)['price'])
+
+
+def test_batch_size_does_not_change_the_grid(engine):
+    one_row_per_batch = run_grid(engine, X_AXIS, Y_AXIS, solve_for_price=False, batch_cells=1)
+    one_batch = run_grid(engine, X_AXIS, Y_AXIS, solve_for_price=False)
+
+    assert one_row_per_batch['npv'] == one_batch['npv']
+    assert 'price' not in one_batch
+
+
+def test_break_even_contour_interpolates_sign_changes():
+    npv = np.array([[-10.0, 10.0], [0.0, 30.0]])
+
+    points = break_even_contour(np.array([0.0, 1.0]), np.array([0.0, 2.0]), npv)
+
+    assert {'x': 0.0, 'y': 1.0} in points
+    assert {'x': 1.0, 'y': 0.0} in points
+    assert len(points) == 2
+
+
+def test_axes_must_vary_different_parameters(engine):
+    with pytest.raises(ValueError, match="vary the same parameter"):
+        run_grid(engine, X_AXIS, dict(X_AXIS, values=[1, 2]))
+
+
+def test_endpoint_streams_rows_and_writes_the_report(ll, engine):
+    response = ll.app.test_client().post('/sensitivity/grid', json={
+        'version': FIXTURE_VERSION, 'selectedV': ALL_V_ON, 'selectedF': ALL_F_ON, 'targetRow': 19,
+        'x': X_AXIS, 'y': Y_AXIS, 'solveForPrice': False, 'stream': True
+    })
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line['row'] for line in lines[:-1]] == [0, 1, 2]
+    assert lines[-1]['done'] is True
+    with open(lines[-1]['reportFile']) as f:
+        report = json.load(f)
+    assert os.path.dirname(lines[-1]['reportFile']).startswith(ll.ORIGINAL_BASE_DIR)
+    assert report['npv'] == run_grid(engine, X_AXIS, Y_AXIS, solve_for_price=False)['npv']
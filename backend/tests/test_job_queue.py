@@ -0,0 +1,108 @@
+import threading
+import time
+import pytest
+
+from conftest import ALL_F_ON, ALL_V_ON, FIXTURE_VERSION
+from utils.job_queue import CANCELLED, SUCCEEDED, JobCancelled, JobScheduler, current_job
+from Core_calculation_engines.sensitivity_engine import SensitivityEngine
+from Core_calculation_engines.sobol_sensitivity import run_sobol_analysis
+from Core_calculation_engines.scenario_paths import run_scenarios
+from Core_calculation_engines.design_optimizer import run_optimization
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    return JobScheduler(str(tmp_path / "jobs.db"), capacity=4, poll_interval=0.05)
+
+
+def test_jobs_sharing_a_key_run_in_submission_order(scheduler):
+    order = []
+    running = []
+    overlaps = []
+
+    def handler(payload):
+        running.append(payload['n'])
+        if len(running) > 1:
+            overlaps.append(list(running))
+        time.sleep(0.05)
+        order.append(payload['n'])
+        running.remove(payload['n'])
+        return payload['n']
+
+    scheduler.register('work', handler)
+    job_ids = [scheduler.submit('work', {'n': n}, keys=['version:1']) for n in range(4)]
+    scheduler.start()
+
+    for job_id in job_ids:
+        assert scheduler.wait(job_id, timeout=10)['status'] == SUCCEEDED
+    assert order == [0, 1, 2, 3]
+    assert overlaps == []
+
+
+def test_cancelled_queued_job_never_runs(scheduler):
+    started = []
+    scheduler.register('work', lambda payload: started.append(payload))
+    job_id = scheduler.submit('work', {'n': 1})
+
+    scheduler.cancel(job_id, "No longer needed")
+    scheduler.start()
+    job = scheduler.wait(job_id, timeout=10)
+    time.sleep(0.2)
+
+    assert job['status'] == CANCELLED
+    assert job['error'] == "No longer needed"
+    assert started == []
+
+
+def test_running_job_stops_at_its_next_check(scheduler):
+    entered = threading.Event()
+
+    def handler(payload):
+        entered.set()
+        while True:
+            current_job().check()
+            time.sleep(0.01)
+
+    scheduler.register('work', handler)
+    job_id = scheduler.submit('work', {})
+    scheduler.start()
+    assert entered.wait(10)
+
+    scheduler.cancel(job_id)
+
+    assert scheduler.wait(job_id, timeout=10)['status'] == CANCELLED
+
+
+@pytest.fixture
+def engine(fixture_base):
+    return SensitivityEngine(FIXTURE_VERSION, ALL_V_ON, ALL_F_ON, 20, base_dir=fixture_base)
+
+
+def _cancel_on_call(n):
+    """Cancellation check that raises on its n-th call."""
+    calls = []
+
+    def check():
+        calls.append(1)
+        if len(calls) >= n:
+            raise JobCancelled("Job cancelled")
+    return check, calls
+
+
+@pytest.mark.parametrize('run', [
+    lambda engine, check: run_sobol_analysis(
+        engine, {"S13": {"low": -10, "high": 10}, "S35": {"low": -10, "high": 10}},
+        base_samples=64, chunk_size=32, bootstrap=0, seed=1, check=check),
+    lambda engine, check: run_scenarios(
+        engine, {"S13": {"process": "geometric", "drift": 0.02, "volatility": 0.05}},
+        scenarios=200, chunk_size=50, seed=1, check=check),
+    lambda engine, check: run_optimization(
+        engine, {"S13": {"low": -10, "high": 10}, "S35": {"low": -20, "high": 20}},
+        objective='npv', population_size=6, max_generations=20, seed=1, check=check),
+], ids=['sobol', 'scenarios', 'optimize'])
+def test_sweeps_stop_when_cancelled(engine, run):
+    check, calls = _cancel_on_call(2)
+
+    with pytest.raises(JobCancelled):
+        run(engine, check)
+    assert len(calls) == 2
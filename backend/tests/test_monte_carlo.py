@@ -0,0 +1,50 @@
+import pytest
+
+from Core_calculation_engines.monte_carlo import iter_monte_carlo, run_monte_carlo
+
+DISTRIBUTIONS = {
+    'S35': {'type': 'normal', 'mean': 0, 'std': 10},
+    'S13': {'type': 'triangular', 'min': -20, 'likely': 0, 'max': 10},
+}
+
+
+def test_seeded_runs_are_reproducible(engine):
+    first = run_monte_carlo(engine, DISTRIBUTIONS, samples=600, chunk_size=200, seed=42)
+    second = run_monte_carlo(engine, DISTRIBUTIONS, samples=600, chunk_size=200, seed=42)
+    other = run_monte_carlo(engine, DISTRIBUTIONS, samples=600, chunk_size=200, seed=43)
+
+    assert first['outputs'] == second['outputs']
+    assert first['inputs'] == second['inputs']
+    assert first['outputs']['npv']['count'] == 600
+    assert other['outputs']['npv']['mean'] != first['outputs']['npv']['mean']
+
+
+def test_interrupted_run_resumes_from_its_checkpoint(engine, tmp_path):
+    checkpoint_file = str(tmp_path / "monte_carlo.npz")
+    uninterrupted = run_monte_carlo(engine, DISTRIBUTIONS, samples=1000, chunk_size=200, seed=7, solve_for_price=True)
+
+    run = iter_monte_carlo(engine, DISTRIBUTIONS, samples=1000, chunk_size=200, seed=7, solve_for_price=True,
+                           checkpoint_file=checkpoint_file)
+    assert [next(run)['completed'] for _ in range(2)] == [200, 400]
+    run.close()
+
+    summaries = list(iter_monte_carlo(engine, DISTRIBUTIONS, samples=1000, chunk_size=200, seed=7,
+                                      solve_for_price=True, checkpoint_file=checkpoint_file))
+
+    assert [summary['completed'] for summary in summaries] == [600, 800, 1000]
+    assert summaries[-1]['resumedAt'] == 400
+    assert summaries[-1]['outputs'] == uninterrupted['outputs']
+    assert summaries[-1]['inputs'] == uninterrupted['inputs']
+
+
+def test_degenerate_distributions_reproduce_the_baseline(engine):
+    summary = run_monte_carlo(engine, {'S35': {'type': 'uniform', 'min': 0, 'max': 0}}, samples=50, seed=1)
+
+    npv = summary['outputs']['npv']
+    assert npv['mean'] == pytest.approx(engine.evaluate()['npv'])
+    assert npv['std'] == pytest.approx(0, abs=1e-6)
+
+
+def test_unknown_distributions_are_rejected(engine):
+    with pytest.raises(ValueError, match="Unknown distribution type"):
+        run_monte_carlo(engine, {'S35': {'type': 'poisson', 'lam': 3}}, samples=10)
@@ -0,0 +1,68 @@
+import os
+import time
+
+from utils.run_workspace import (
+    BASELINE_COMPLETED, CONFIG_COMPLETED, PAYLOAD_REGISTERED, WorkspaceRegistry
+)
+
+
+def test_runs_keep_their_own_state(tmp_path):
+    registry = WorkspaceRegistry(str(tmp_path))
+    first, second = registry.create('first'), registry.create('second')
+    first.activate()
+    second.activate()
+
+    first.mark(PAYLOAD_REGISTERED)
+    first.mark(BASELINE_COMPLETED)
+    second.mark(PAYLOAD_REGISTERED)
+    second.cancel("Abandoned")
+
+    assert first.current_step() == 'sensitivity_configure'
+    assert second.current_step() == 'cancelled'
+    assert not second.is_set(PAYLOAD_REGISTERED)
+
+    # Another process sees the saved state
+    reloaded = WorkspaceRegistry(str(tmp_path))
+    assert reloaded.get('first').state()['steps'] == first.state()['steps']
+    assert reloaded.get('second').cancel_reason == "Abandoned"
+    assert reloaded.latest(active_only=True).run_id == 'first'
+
+
+def test_workspace_lookups_stay_inside_the_registry(tmp_path):
+    registry = WorkspaceRegistry(str(tmp_path / "runs"))
+    registry.create('run1')
+
+    assert registry.get('run1') is not None
+    assert registry.get('missing') is None
+    assert registry.get('../runs') is None
+    assert registry.get('run1/..') is None
+
+
+def test_collect_removes_stale_workspaces(tmp_path):
+    registry = WorkspaceRegistry(str(tmp_path))
+    stale, kept, fresh = registry.create('stale'), registry.create('kept'), registry.create('fresh')
+    time.sleep(0.5)
+    fresh.mark(CONFIG_COMPLETED)
+
+    removed = registry.collect(ttl=0.3, keep=['kept'])
+
+    assert removed == ['stale']
+    assert not os.path.exists(stale.path)
+    assert [workspace.run_id for workspace in registry.list()] == ['fresh', 'kept']
+
+
+def test_registered_payloads_start_separate_runs(ll):
+    client = ll.app.test_client()
+
+    first = client.post('/register_payload', json={'selectedVersions': [1]}).get_json()['runId']
+    second = client.post('/register_payload', json={'selectedVersions': [2]}).get_json()['runId']
+    client.post('/reset_pipeline', json={'runId': first})
+
+    assert first != second
+    assert client.get('/status', query_string={'runId': first}).get_json()['pipeline_active'] is False
+    status = client.get('/status', headers={'X-Run-Id': second}).get_json()
+    assert status['pipeline_active'] is True
+    assert status['steps']['payload_registered'] is True
+    assert status['activeRuns'] == [second]
+    assert os.path.exists(ll.RUN_WORKSPACES.get(second).payload_path)
+    assert client.post('/reset_pipeline', json={'runId': 'missing'}).status_code == 404
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from Core_calculation_engines.scenario_paths import generate_paths, run_scenarios
+
+PROCESSES = {
+    'S35': {'process': 'mean_reverting', 'speed': 0.3, 'volatility': 0.15},
+    'S13': {'process': 'geometric', 'drift': 0.02, 'volatility': 0.05},
+}
+
+
+def test_seeded_runs_are_reproducible(engine):
+    first = run_scenarios(engine, PROCESSES, scenarios=200, seed=5)
+    chunked = run_scenarios(engine, PROCESSES, scenarios=200, seed=5, chunk_size=7)
+    other = run_scenarios(engine, PROCESSES, scenarios=200, seed=6)
+
+    assert first['outputs'] == chunked['outputs']
+    assert first['yearly'] == chunked['yearly']
+    assert first['inputs'] == chunked['inputs']
+    assert other['outputs']['npv']['mean'] != first['outputs']['npv']['mean']
+    assert len(first['yearly']['cumulativeCashFlow']['mean']) == engine.total_years
+
+
+def test_flat_paths_reproduce_the_baseline(engine):
+    flat = {'S35': {'process': 'geometric', 'volatility': 0}}
+
+    summary = run_scenarios(engine, flat, scenarios=20, seed=1)
+    solved = run_scenarios(engine, flat, scenarios=20, seed=1, solve_for_price=True)
+
+    assert summary['outputs']['npv']['mean'] == pytest.approx(engine.evaluate()['npv'])
+    assert summary['outputs']['npv']['std'] == pytest.approx(0, abs=1e-6)
+    baseline = engine.evaluate(solve_for_price=True)
+    assert solved['outputs']['npv']['mean'] == pytest.approx(baseline['npv'])
+    assert solved['outputs']['price']['mean'] == pytest.approx(baseline['price'])
+
+
+def test_shocks_follow_the_correlation_matrix():
+    processes = {
+        'S35': {'process': 'random_walk', 'volatility': 1},
+        'S13': {'process': 'random_walk', 'volatility': 1},
+    }
+
+    paths = generate_paths(processes, 4000, 3, correlation=[[1, 0.8], [0.8, 1]], rng=np.random.default_rng(0))
+
+    assert paths['S35'].shape == (4000, 3)
+    assert (paths['S35'][:, 0] == 0).all()
+    steps = [np.diff(paths[param_id], axis=1).ravel() for param_id in ('S35', 'S13')]
+    assert np.corrcoef(*steps)[0, 1] == pytest.approx(0.8, abs=0.03)
+
+
+@pytest.mark.parametrize('correlation,message', [
+    ([[1, 0.5], [0.4, 1]], "symmetric"),
+    ([[1, 0.5, 0], [0.5, 1, 0], [0, 0, 1]], "shape"),
+    ([[1, 1], [1, 1]], "positive definite"),
+])
+def test_invalid_correlation_matrices_are_rejected(engine, correlation, message):
+    with pytest.raises(ValueError, match=message):
+        run_scenarios(engine, PROCESSES, scenarios=10, correlation=correlation)
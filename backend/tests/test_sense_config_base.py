@@ -0,0 +1,88 @@
+import os
+import json
+import logging
+import threading
+import pytest
+
+from conftest import FIXTURE_VERSION, load_module
+from Configuration_management.config_bundle import (
+    get_bundle_path, load_config_modules, read_bundle_index, write_config_bundle
+)
+from utils.stage_completion import mark_stage_complete
+
+SEN_PARAMETERS = {'S35': {'enabled': True, 'mode': 'multipoint', 'values': [10, -20]}}
+
+
+def _apply_sensitivity_variation(config, param_id, variation, mode):
+    config['laborAmount35'] = config['laborAmount35'] * (1 + variation / 100)
+    return config
+
+
+@pytest.fixture
+def sense_config_base(fixture_base, tmp_path, monkeypatch):
+    root, sensitivity = logging.getLogger(), logging.getLogger('sensitivity')
+    before = {root: list(root.handlers), sensitivity: list(sensitivity.handlers)}
+    level = root.level
+    logging.disable(logging.INFO)
+    try:
+        module = load_module('sense_config_base', os.path.join('API_endpoints_and_controllers', 'sense_config_base.py'))
+    finally:
+        logging.disable(logging.NOTSET)
+    # Keep the tracked CONFIG_COPY.log and SENSITIVITY.log out of the tests
+    for logger, handlers in before.items():
+        for handler in [h for h in logger.handlers if h not in handlers]:
+            logger.removeHandler(handler)
+            handler.close()
+    root.setLevel(level)
+
+    monkeypatch.setattr(module, 'ORIGINAL_BASE_DIR', fixture_base)
+    monkeypatch.setattr(module, 'BASE_DIR', str(tmp_path / "root"))
+    monkeypatch.setattr(module, 'import_sensitivity_functions',
+                        lambda: (_apply_sensitivity_variation, lambda config, param_id: 'laborAmount35'))
+    return module
+
+
+@pytest.fixture
+def bundle_only_version(fixture_base):
+    """The fixture version with its config modules in the bundle only."""
+    results_folder = os.path.join(fixture_base, f"Batch({FIXTURE_VERSION})", f"Results({FIXTURE_VERSION})")
+    modules = load_config_modules(results_folder, FIXTURE_VERSION)
+    write_config_bundle(get_bundle_path(results_folder, FIXTURE_VERSION), modules, FIXTURE_VERSION)
+    for start, _ in modules:
+        os.remove(os.path.join(results_folder, f"{FIXTURE_VERSION}_config_module_{start}.json"))
+    return dict(modules)
+
+
+def test_variations_of_a_bundle_only_version_are_written_as_bundles(sense_config_base, bundle_only_version):
+    summary = sense_config_base.process_config_modules(FIXTURE_VERSION, SEN_PARAMETERS)
+
+    assert summary['errors'] == []
+    assert summary['total_modified'] == 2 * len(bundle_only_version)
+    results_folder = os.path.join(sense_config_base.BASE_DIR, 'backend', 'Original',
+                                  f"Batch({FIXTURE_VERSION})", f"Results({FIXTURE_VERSION})")
+    variation_dir = os.path.join(results_folder, 'Sensitivity', 'S35', 'multipoint', '+10.00')
+    bundle_path = get_bundle_path(variation_dir, FIXTURE_VERSION)
+    assert read_bundle_index(bundle_path) == sorted(bundle_only_version)
+    assert not [f for f in os.listdir(variation_dir) if f.endswith('.json')]
+    for start, module in load_config_modules(variation_dir, FIXTURE_VERSION):
+        assert module['laborAmount35'] == pytest.approx(bundle_only_version[start]['laborAmount35'] * 1.1)
+
+    with open(os.path.join(results_folder, f"SensitivityPlotDatapoints_{FIXTURE_VERSION}.json")) as f:
+        datapoints = json.load(f)
+    first_interval = bundle_only_version[min(bundle_only_version)]
+    assert datapoints['S35,S13']['baseline'] == {str(int(first_interval['laborAmount35'])): None}
+
+
+def test_waits_for_config_modules_when_only_the_matrix_exists(sense_config_base, fixture_base, monkeypatch):
+    # module1.py has written the matrix; config_modules has not finished
+    monkeypatch.setattr(sense_config_base, 'STAGE_WAIT_TIMEOUT', 30)
+    results_folder = os.path.join(fixture_base, f"Batch({FIXTURE_VERSION})", f"Results({FIXTURE_VERSION})")
+    worker = threading.Thread(target=sense_config_base.process_config_modules, args=(FIXTURE_VERSION, SEN_PARAMETERS))
+    worker.start()
+
+    worker.join(0.5)
+    assert worker.is_alive()
+
+    mark_stage_complete(results_folder, 'config_modules', {"version": str(FIXTURE_VERSION)})
+    worker.join(10)
+    assert not worker.is_alive()
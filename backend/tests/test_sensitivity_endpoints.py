@@ -0,0 +1,36 @@
+import os
+
+from conftest import FIXTURE_VERSION
+
+
+def test_solve_for_price_defaults_to_calculation_option(ll):
+    price_config = {'calculationOption': 'calculateForPrice'}
+
+    assert ll.get_solve_for_price({}, price_config) is True
+    assert ll.get_solve_for_price(None, price_config) is True
+    assert ll.get_solve_for_price({'solveForPrice': False}, price_config) is False
+    assert ll.get_solve_for_price({}, {'calculationOption': 'freeFlowNPV'}) is False
+    assert ll.get_solve_for_price({'solveForPrice': True}, None) is True
+
+
+def test_job_queue_opens_on_first_use(ll, tmp_path):
+    assert ll.JOB_SCHEDULER is None
+    assert not os.path.exists(ll.JOB_QUEUE_PATH)
+
+    response = ll.app.test_client().post('/api/sensitivity/visualize', json={'version': FIXTURE_VERSION})
+
+    assert response.status_code == 400
+    assert ll.JOB_QUEUE_PATH == str(tmp_path / "jobs.db")
+    assert os.path.exists(ll.JOB_QUEUE_PATH)
+
+
+def test_visualize_runs_as_a_job_keyed_by_version(ll):
+    client = ll.app.test_client()
+
+    client.post('/api/sensitivity/visualize', json={'version': FIXTURE_VERSION})
+    client.post('/api/sensitivity/visualize', json={'version': 8})
+
+    jobs = ll.get_job_scheduler().list_jobs(kind='visualize', key=f"version:{FIXTURE_VERSION}")
+    assert len(jobs) == 1
+    assert jobs[0]['status'] == 'failed'
+    assert ll.get_job_scheduler().get(jobs[0]['id'])['payload']['json'] == {'version': FIXTURE_VERSION}
@@ -0,0 +1,74 @@
+import os
+import logging
+import importlib.util
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ALL_F_ON, FIXTURE_VERSION, load_module
+from Core_calculation_engines.sensitivity_engine import SensitivityEngine
+
+CFA_COLUMNS = ['Revenue', 'Operating Expenses', 'Depreciation', 'State Taxes', 'Federal Taxes',
+               'After-Tax Cash Flow', 'Discounted Cash Flow', 'Cumulative Cash Flow']
+SOME_V_ON = {f'V{i+1}': ('on' if i < 2 else 'off') for i in range(10)}
+
+
+@pytest.fixture(scope='module')
+def cfa_b(tmp_path_factory):
+    """CFA-b.py with its log files written under a temporary directory."""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('cfa_b'))
+    logging.disable(logging.INFO)
+    try:
+        module = load_module('cfa_b', os.path.join('Core_calculation_engines', 'CFA-b.py'))
+    finally:
+        logging.disable(logging.NOTSET)
+        os.chdir(cwd)
+    # Keep the tracked SENSITIVITY.log out of the tests
+    module.sensitivity_logger.removeHandler(module.sensitivity_handler)
+    module.sensitivity_handler.close()
+    return module
+
+
+def _cfa_b_result(cfa_b, directory, selected_v, selected_f, price, target_row):
+    """Run CFA-b.py's cash flow on a variation directory written by the engine."""
+    spec = importlib.util.spec_from_file_location('config', os.path.join(directory, f"configurations({FIXTURE_VERSION}).py"))
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    matrix = pd.read_csv(os.path.join(directory, f"General_Configuration_Matrix({FIXTURE_VERSION}).csv"))
+    result = cfa_b.calculate_revenue_and_expenses_from_modules(
+        config, matrix, directory, FIXTURE_VERSION, selected_v, selected_f, price, target_row, 0
+    )
+    return result['primary_result'], pd.read_csv(os.path.join(directory, f"CFA({FIXTURE_VERSION}).csv"))
+
+
+@pytest.mark.parametrize('target_row,selected_v', [(10, SOME_V_ON), (18, SOME_V_ON), (5, {})])
+@pytest.mark.parametrize('overlays', [
+    [],
+    [('S35', 10, 'percentage')],
+    [('S13', -15, 'percentage'), ('S12', 5000, 'absolutedeparture')],
+], ids=['baseline', 'labor', 'price-and-units'])
+def test_engine_matches_cfa_b(cfa_b, fixture_base, tmp_path, target_row, selected_v, overlays):
+    engine = SensitivityEngine(FIXTURE_VERSION, selected_v, ALL_F_ON, target_row, base_dir=fixture_base)
+    directory = engine.materialize_variation(overlays, str(tmp_path / "variation"))
+    engine_cfa = pd.read_csv(os.path.join(directory, f"CFA({FIXTURE_VERSION}).csv"))
+    result = engine.evaluate(overlays)
+
+    npv, cfa = _cfa_b_result(cfa_b, directory, selected_v, ALL_F_ON, result['price'], target_row)
+
+    assert result['npv'] == npv
+    for column in CFA_COLUMNS:
+        np.testing.assert_array_equal(engine_cfa[column].to_numpy(), cfa[column].to_numpy(), err_msg=column)
+
+
+def test_solved_price_meets_cfa_b_tolerance(cfa_b, fixture_base, tmp_path):
+    engine = SensitivityEngine(FIXTURE_VERSION, SOME_V_ON, ALL_F_ON, 19, base_dir=fixture_base)
+    overlays = [('S35', 25, 'percentage')]
+    directory = engine.materialize_variation(overlays, str(tmp_path / "variation"), solve_for_price=True)
+    result = engine.evaluate(overlays, solve_for_price=True)
+
+    npv, _ = _cfa_b_result(cfa_b, directory, SOME_V_ON, ALL_F_ON, result['price'], 19)
+
+    # CFA-b.py's price search stops within +/-1000 of a zero NPV
+    assert -1000 <= npv <= 1000
+    assert result['npv'] == npv
@@ -0,0 +1,65 @@
+import os
+
+from conftest import FIXTURE_VERSION
+from utils.sensitivity_manifest import (
+    CASH_FLOW, CONFIG_MODULES, CONFIGURATION_MATRIX, ECONOMIC_SUMMARY, PARAM_CONFIG,
+    find_artifact, list_artifacts, record_artifact, record_variation_directory
+)
+
+
+def _touch(directory, name):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+    with open(path, 'w') as f:
+        f.write(name)
+    return path
+
+
+def _variation_dir(fixture_base, variation):
+    return os.path.join(fixture_base, f"Batch({FIXTURE_VERSION})", f"Results({FIXTURE_VERSION})",
+                        'Sensitivity', 'S35', 'percentage', f"{variation:+.2f}")
+
+
+def test_variation_directory_artifacts_are_found_without_globbing(fixture_base):
+    sensitivity_dir = os.path.join(fixture_base, f"Batch({FIXTURE_VERSION})", f"Results({FIXTURE_VERSION})", 'Sensitivity')
+    directory = _variation_dir(fixture_base, 10)
+    summary = _touch(directory, f"Economic_Summary({FIXTURE_VERSION}).csv")
+    _touch(directory, f"CFA({FIXTURE_VERSION}).csv")
+    _touch(directory, f"General_Configuration_Matrix({FIXTURE_VERSION}).csv")
+    _touch(directory, f"{FIXTURE_VERSION}_config_module_1.json")
+    _touch(directory, f"{FIXTURE_VERSION}_config_module_5.json")
+    _touch(directory, "notes.txt")
+
+    artifacts = record_variation_directory(sensitivity_dir, FIXTURE_VERSION, 'S35', 'Percentage', 10.0, directory)
+
+    assert set(artifacts) == {ECONOMIC_SUMMARY, CASH_FLOW, CONFIGURATION_MATRIX, CONFIG_MODULES}
+    assert artifacts[CONFIG_MODULES] == directory
+    assert find_artifact(sensitivity_dir, FIXTURE_VERSION, 'S35', '+10.00', ECONOMIC_SUMMARY) == summary
+    assert find_artifact(sensitivity_dir, FIXTURE_VERSION, 'S35', 10, CONFIG_MODULES, mode='percentage') == directory
+    assert find_artifact(sensitivity_dir, FIXTURE_VERSION, 'S35', -10, ECONOMIC_SUMMARY) is None
+    assert find_artifact(sensitivity_dir, FIXTURE_VERSION, 'S35', 10, ECONOMIC_SUMMARY, mode='directvalue') is None
+
+
+def test_rerecorded_artifacts_replace_older_ones(fixture_base):
+    sensitivity_dir = os.path.join(fixture_base, 'Sensitivity')
+    first = _touch(_variation_dir(fixture_base, 20), "S35_config.json")
+    second = _touch(_variation_dir(fixture_base, 20), "S35_config_v2.json")
+
+    record_artifact(sensitivity_dir, FIXTURE_VERSION, 'S35', 'percentage', 20, PARAM_CONFIG, first)
+    record_artifact(sensitivity_dir, FIXTURE_VERSION, 'S35', 'percentage', 20, PARAM_CONFIG, second)
+
+    records = list_artifacts(sensitivity_dir, version=FIXTURE_VERSION, artifact_type=PARAM_CONFIG)
+    assert [record['path'] for record in records] == [second]
+    assert records[0]['variation'] == '+20.00'
+
+
+def test_missing_files_are_not_returned(fixture_base):
+    sensitivity_dir = os.path.join(fixture_base, 'Sensitivity')
+    summary = _touch(_variation_dir(fixture_base, -10), f"Economic_Summary({FIXTURE_VERSION}).csv")
+    record_artifact(sensitivity_dir, FIXTURE_VERSION, 'S35', 'percentage', -10, ECONOMIC_SUMMARY, summary)
+
+    os.remove(summary)
+
+    # Callers fall back to searching the tree
+    assert find_artifact(sensitivity_dir, FIXTURE_VERSION, 'S35', -10, ECONOMIC_SUMMARY) is None
+    assert list_artifacts(os.path.join(fixture_base, 'Unrecorded')) == []
@@ -0,0 +1,58 @@
+import time
+import threading
+
+from utils.stage_pipeline import StagePipeline
+
+
+def test_later_stages_start_before_earlier_ones_finish():
+    done = []
+    pipeline = StagePipeline('test')
+
+    def calculate(item):
+        time.sleep(0.05)
+        pipeline.put('extract', item * 10)
+
+    pipeline.add_stage('calculate', calculate, workers=2)
+    pipeline.add_stage('extract', done.append)
+    for item in range(8):
+        pipeline.put('calculate', item)
+
+    summary = pipeline.close()
+
+    # Items handed downstream while closing are not lost
+    assert sorted(done) == [item * 10 for item in range(8)]
+    stages = summary['stages']
+    assert stages['calculate']['items'] == stages['extract']['items'] == 8
+    assert stages['extract']['firstDoneAt'] < stages['calculate']['finishedAt']
+    # Two workers take about half the serial time
+    assert summary['elapsedSeconds'] < stages['calculate']['busySeconds']
+
+
+def test_failing_items_are_counted_without_stopping_the_stage():
+    done = []
+
+    def handle(item):
+        if item % 3 == 0:
+            raise ValueError(f"item {item}")
+        done.append(item)
+
+    with StagePipeline('test') as pipeline:
+        stage = pipeline.add_stage('handle', handle)
+        for item in range(7):
+            pipeline.put('handle', item)
+
+    assert done == [1, 2, 4, 5]
+    assert stage.items == 7
+    assert stage.errors == ["item 0", "item 3", "item 6"]
+    assert pipeline.close()['stages']['handle']['errors'] == stage.errors
+
+
+def test_initializer_runs_in_every_worker():
+    bound = []
+    pipeline = StagePipeline('test', initializer=lambda tag: bound.append((tag, threading.current_thread().name)),
+                             initargs=('job',))
+    pipeline.add_stage('first', lambda item: None, workers=2)
+    pipeline.add_stage('second', lambda item: None)
+    pipeline.close()
+
+    assert sorted(bound) == [('job', 'test-first-0'), ('job', 'test-first-1'), ('job', 'test-second-0')]
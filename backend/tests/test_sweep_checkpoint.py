@@ -0,0 +1,96 @@
+import os
+import pytest
+
+from conftest import FIXTURE_VERSION
+from utils.sweep_checkpoint import SweepCheckpoint, sweep_id
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def test_resume_skips_units_with_intact_artifacts(tmp_path):
+    checkpoint = SweepCheckpoint(str(tmp_path / "checkpoints.db"))
+    sweep = sweep_id('calculate_sensitivity', {'version': 1, 'params': ['S35']})
+    for unit in ('S35|+10.00', 'S35|-10.00', 'S35|+20.00'):
+        path = str(tmp_path / unit.replace('|', '_') / 'CFA(1).csv')
+        _write(path, unit)
+        checkpoint.record(sweep, unit, {'price': 1.0}, [path])
+    checkpoint.record(sweep, 'summary', {'done': True})
+
+    _write(str(tmp_path / 'S35_-10.00' / 'CFA(1).csv'), 'changed')
+    os.remove(str(tmp_path / 'S35_+20.00' / 'CFA(1).csv'))
+
+    # Reopened as after a restart
+    completed = SweepCheckpoint(str(tmp_path / "checkpoints.db")).completed(sweep)
+
+    assert completed == {'S35|+10.00': {'price': 1.0}, 'summary': {'done': True}}
+    assert sorted(checkpoint.completed(sweep)) == ['S35|+10.00', 'summary']
+    assert checkpoint.completed(sweep_id('calculate_sensitivity', {'version': 2})) == {}
+
+
+def test_clear_starts_the_sweep_over(tmp_path):
+    checkpoint = SweepCheckpoint(str(tmp_path / "checkpoints.db"))
+    checkpoint.record('grid:1', 0, {'row': 0})
+    checkpoint.record('grid:2', 0, {'row': 0})
+
+    checkpoint.clear('grid:1')
+
+    assert checkpoint.completed('grid:1') == {}
+    assert checkpoint.summary()['grid:2']['units'] == 1
+
+
+class FakeRequests:
+    """Stands in for the HTTP calls of /run-all-sensitivity; each step writes one file."""
+    def __init__(self, results_folder):
+        self.results_folder = results_folder
+        self.calls = []
+
+    def post(self, url, headers=None, json=None):
+        path = url.split(':2500', 1)[1]
+        self.calls.append(path if path != '/calculate-sensitivity' else f"{path}:{json['param_id']}")
+        name = self.calls[-1].strip('/').replace('/', '_').replace(':', '_')
+        _write(os.path.join(self.results_folder, 'Sensitivity', f"{name}.json"), str(len(self.calls)))
+        return FakeResponse({"status": "success", "step": name})
+
+    def get(self, url):
+        return FakeResponse({"exists": True})
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+@pytest.fixture
+def run_all(ll, fixture_base, monkeypatch):
+    ll.RUN_WORKSPACES.create('run1')
+    fake = FakeRequests(ll.get_results_folder(fixture_base, FIXTURE_VERSION))
+    monkeypatch.setattr(ll, 'requests', fake)
+    client = ll.app.test_client()
+
+    def call():
+        response = client.post('/run-all-sensitivity', json={
+            'selectedVersions': [FIXTURE_VERSION], 'enabledParams': ['S35'], 'runId': 'run1'
+        })
+        assert response.status_code == 200
+        calls, fake.calls = fake.calls, []
+        return calls, response.get_json()['resumedSteps']
+    return call, fake
+
+
+def test_run_all_resumes_after_steps_with_unchanged_artifacts(run_all):
+    call, fake = run_all
+    steps = ['/sensitivity/configure', '/runs', '/calculate-sensitivity:S35', '/run-script-econ']
+
+    assert call() == (steps, [])
+    assert call() == ([], ['calculate_sensitivity:S35', 'configure', 'run_script_econ', 'runs'])
+
+    # The files of /runs were changed: it and every later step run again
+    _write(os.path.join(fake.results_folder, 'Sensitivity', 'runs.json'), 'changed')
+    assert call() == (steps[1:], ['configure'])
@@ -0,0 +1,51 @@
+import pytest
+
+from conftest import ALL_F_ON, ALL_V_ON, FIXTURE_VERSION
+from Core_calculation_engines.tornado import build_tornado
+
+PARAM_IDS = ['S35', 'S13', 'S12', 'S36']
+
+
+def test_bars_are_sorted_by_swing_around_the_baseline(engine):
+    tornado = build_tornado(engine, PARAM_IDS, swing={'overrides': {'S13': {'low': -5, 'high': 5}}})
+
+    assert tornado['baseline']['npv'] == engine.evaluate()['npv']
+    assert tornado['baseline']['price'] == engine.evaluate(solve_for_price=True)['price']
+    swings = [bar['npvSwing'] for bar in tornado['bars']]
+    assert swings == sorted(swings, reverse=True)
+    assert sorted(bar['paramId'] for bar in tornado['bars']) == sorted(PARAM_IDS)
+
+    for bar in tornado['bars']:
+        expected = (-5, 5) if bar['paramId'] == 'S13' else (-10, 10)
+        for side, variation in zip(('low', 'high'), expected):
+            point = bar[side]
+            assert point['variation'] == variation
+            assert point['npv'] == engine.evaluate([(bar['paramId'], variation, 'percentage')])['npv']
+            assert point['npvDelta'] == pytest.approx(point['npv'] - tornado['baseline']['npv'])
+
+
+def test_bars_sorted_by_price_swing(engine):
+    tornado = build_tornado(engine, PARAM_IDS, sort_by='price')
+
+    assert tornado['sortBy'] == 'priceSwing'
+    swings = [bar['priceSwing'] for bar in tornado['bars']]
+    assert swings == sorted(swings, reverse=True)
+
+
+def test_endpoint_skips_parameters_that_cannot_be_varied(ll):
+    response = ll.app.test_client().post('/sensitivity/tornado', json={
+        'version': FIXTURE_VERSION, 'selectedV': ALL_V_ON, 'selectedF': ALL_F_ON, 'targetRow': 19,
+        'parameters': ['S35', 'S99'], 'solveForPrice': False
+    })
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [bar['paramId'] for bar in body['bars']] == ['S35']
+    assert list(body['skipped']) == ['S99']
+    assert 'price' not in body['bars'][0]['low']
+
+
+def test_endpoint_needs_parameters(ll):
+    response = ll.app.test_client().post('/sensitivity/tornado', json={'version': FIXTURE_VERSION})
+
+    assert response.status_code == 400
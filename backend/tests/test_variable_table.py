@@ -0,0 +1,35 @@
+import os
+import pandas as pd
+
+from conftest import load_module
+from Configuration_management.columnar_table import get_columnar_table_path, write_columnar_table
+from Configuration_management.Table import expand_intervals_to_years
+
+
+def test_expand_intervals_keeps_boolean_columns_before_first_interval():
+    interval_df = pd.DataFrame({'Price': [2.0, 3.0], 'Use Direct Operating Expenses': [False, True]}, index=[3, 6])
+
+    df = expand_intervals_to_years(interval_df, 8)
+
+    assert list(df.index) == list(range(1, 9))
+    assert df.loc[1:2].isna().all().all()
+    assert df.loc[6, 'Use Direct Operating Expenses'] == True  # noqa: E712
+    assert df.loc[5, 'Price'] == 2.0
+
+
+def test_variable_table_ignores_columnar_copy_older_than_csv(tmp_path, monkeypatch):
+    module = load_module('front_subtab_table', os.path.join('Data_processors_and_transformers', 'Front_Subtab_Table.py'))
+    monkeypatch.setattr(module, 'BASE_PATH', str(tmp_path))
+    results_path = tmp_path / "Batch(7)" / "Results(7)"
+    results_path.mkdir(parents=True)
+
+    stale = pd.DataFrame({'Price': [1.0, 1.0]}, index=pd.Index([1, 2], name='Year'))
+    columnar_path = write_columnar_table(stale, get_columnar_table_path(str(results_path), 7))
+    csv_path = results_path / "Variable_Table(7).csv"
+    pd.DataFrame({'Price': [2.0, 2.0]}, index=pd.Index([1, 2], name='Year')).to_csv(csv_path)
+    os.utime(columnar_path, (0, 0))
+
+    response = module.app.test_client().get('/api/variable-table/7?columns=Price')
+
+    assert response.status_code == 200
+    assert [row['Price'] for row in response.get_json()['data']] == [2.0, 2.0]
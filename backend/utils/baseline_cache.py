@@ -0,0 +1,215 @@
+"""
+Baseline Cache Module
+
+This module lets the baseline stage skip versions whose baseline is
+already up to date, instead of rerunning the configuration scripts and
+the calculation script on every request.
+
+A baseline is fingerprinted from the payload fields that shape it
+(version, V/F switches, calculation option, target row) and the SHA-256
+digests of its input files: the version's U_configurations file, its
+base + delta file (and the base version's inputs), the scripts that run
+and the backend modules they import. After a successful run, the
+fingerprint, the result and the digests of the files the scripts write
+are kept in the 'baseline' stage marker of the version's Results folder. A later run with the same fingerprint
+reuses that result, as long as every recorded artifact is still
+unchanged.
+"""
+
+import os
+import ast
+import glob
+import json
+import hashlib
+import logging
+
+from utils.stage_completion import mark_stage_complete, read_stage_marker, clear_stage
+from utils.sweep_checkpoint import file_digest
+
+# Set up logging
+logger = logging.getLogger('baseline_cache')
+
+STAGE = 'baseline'
+
+# Files the configuration scripts and the calculation script write to the
+# Results folder of version {v}
+BASELINE_OUTPUTS = (
+    "Configuration_Matrix({v}).csv",
+    "General_Configuration_Matrix({v}).csv",
+    "Sorted_Points({v}).csv",
+    "Filtered_Value_Intervals({v}).csv",
+    "{v}_config_module_*.json",
+    "{v}_config_modules.bundle",
+    "Variable_Table({v}).csv",
+    "Variable_Table({v}).npz",
+    "CFA({v}).csv",
+    "Distance_From_Paying_Taxes({v}).csv",
+    "Economic_Summary({v}).csv",
+    "Fixed_Opex_Table_({v}).csv",
+    "Variable_Opex_Table_({v}).csv",
+    "Cumulative_Opex_Table_({v}).csv",
+    os.path.join("{v}_PieStaticPlots", "*.png"),
+)
+
+def get_results_folder(base_dir, version):
+    """Get the Results folder of a version."""
+    return os.path.join(base_dir, f"Batch({version})", f"Results({version})")
+
+def get_script_dependencies(scripts):
+    """
+    List the backend modules the scripts import, directly or through each other.
+
+    Imports are resolved against the backend folder the scripts' packages live
+    in (e.g. Configuration_management.config_bundle, utils.stage_completion),
+    so the property mappings and helpers a script takes from another module
+    are part of the fingerprint; standard library and installed packages are
+    not.
+
+    Args:
+        scripts (list): Script paths
+
+    Returns:
+        list: Paths of the imported backend modules, sorted
+    """
+    dependencies = set()
+    pending = [os.path.abspath(script) for script in scripts]
+    seen = set()
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                tree = ast.parse(f.read())
+        except (OSError, SyntaxError, ValueError):
+            continue
+
+        root = os.path.dirname(os.path.dirname(path))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            elif isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            else:
+                continue
+            for name in names:
+                module_path = os.path.join(root, *name.split('.')) + '.py'
+                if os.path.isfile(module_path):
+                    dependencies.add(module_path)
+                    pending.append(module_path)
+    return sorted(dependencies - {os.path.abspath(script) for script in scripts})
+
+def get_baseline_inputs(base_dir, version, scripts):
+    """
+    List the input files of a version's baseline.
+
+    Args:
+        base_dir (str): Folder containing Batch({version})
+        version (int): Version number
+        scripts (list): Scripts the baseline runs
+
+    Returns:
+        list: Paths of the input files (missing files included, so their absence is fingerprinted),
+              including the backend modules the scripts import
+    """
+    spec_folder = os.path.join(base_dir, f"Batch({version})", f"ConfigurationPlotSpec({version})")
+    delta_path = os.path.join(spec_folder, f"config_delta({version}).json")
+    inputs = [os.path.join(spec_folder, f"U_configurations({version}).py"), delta_path] + list(scripts)
+    inputs += get_script_dependencies(scripts)
+
+    # A base + delta version also depends on its base version's inputs
+    try:
+        with open(delta_path, 'r') as f:
+            base_version = json.load(f).get('base_version')
+    except (OSError, ValueError):
+        base_version = None
+    if base_version is not None and str(base_version) != str(version):
+        base_spec_folder = os.path.join(base_dir, f"Batch({base_version})", f"ConfigurationPlotSpec({base_version})")
+        inputs.append(os.path.join(base_spec_folder, f"U_configurations({base_version}).py"))
+    return inputs
+
+def baseline_fingerprint(settings, inputs):
+    """
+    Fingerprint a baseline.
+
+    Args:
+        settings (dict): Payload fields of the baseline (version, V/F switches, option, target row)
+        inputs (list): Input file paths
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    state = {
+        "settings": settings,
+        "inputs": {path: file_digest(path) for path in inputs}
+    }
+    return hashlib.sha256(json.dumps(state, sort_keys=True, default=str).encode()).hexdigest()
+
+def find_cached_baseline(results_folder, fingerprint):
+    """
+    Find an up-to-date baseline result.
+
+    Args:
+        results_folder (str): Results folder of the version
+        fingerprint (str): Fingerprint of the requested baseline
+
+    Returns:
+        dict: Marker details (fingerprint, result, artifacts), or None if the
+              baseline must be calculated
+    """
+    marker = read_stage_marker(results_folder, STAGE)
+    details = (marker or {}).get('details') or {}
+    if details.get('fingerprint') != fingerprint:
+        return None
+
+    changed = [path for path, digest in details.get('artifacts', {}).items() if file_digest(path) != digest]
+    if changed:
+        logger.info(f"Baseline in {results_folder} is outdated: {len(changed)} artifacts changed or are missing")
+        return None
+    return details
+
+def list_baseline_outputs(results_folder, version):
+    """
+    List the files a baseline run writes.
+
+    Only the scripts' known output paths are listed, so files other requests
+    write to the Results folder at the same time are not taken for artifacts.
+
+    Args:
+        results_folder (str): Results folder of the version
+        version (int): Version number
+
+    Returns:
+        list: Paths of the existing output files, including the compiled
+              configurations({version}).py
+    """
+    outputs = set()
+    for pattern in BASELINE_OUTPUTS:
+        outputs.update(glob.glob(os.path.join(glob.escape(results_folder), pattern.format(v=version))))
+
+    batch_folder = os.path.dirname(results_folder)
+    config_file = os.path.join(batch_folder, f"ConfigurationPlotSpec({version})", f"configurations({version}).py")
+    if os.path.exists(config_file):
+        outputs.add(config_file)
+    return sorted(outputs)
+
+def invalidate_baseline(results_folder):
+    """Forget a version's baseline before it is calculated again."""
+    clear_stage(results_folder, STAGE)
+
+def record_baseline(results_folder, fingerprint, result, artifacts):
+    """
+    Record a completed baseline.
+
+    Args:
+        results_folder (str): Results folder of the version
+        fingerprint (str): Fingerprint of the baseline
+        result (dict): JSON-serializable result returned again while the baseline is up to date
+        artifacts (list): Paths of the files the run wrote
+    """
+    mark_stage_complete(results_folder, STAGE, {
+        "fingerprint": fingerprint,
+        "result": result,
+        "artifacts": {path: file_digest(path) for path in artifacts}
+    })
@@ -0,0 +1,373 @@
+"""
+CalSen Path Resolver Module
+
+This module resolves the file paths used by sensitivity calculations
+(variation directories, configuration matrix and configuration file) for a
+version and its enabled sensitivity parameters.
+
+The path sets of a version are built once from its sensitivity_config.json
+and kept in a memoized, version-scoped index. The index entry is rebuilt only
+when the sensitivity configuration changes (its modification time or size),
+so callers can resolve paths in-process for every variation without an HTTP
+round trip to the CalSen service or a crawl of the Sensitivity tree.
+"""
+
+import os
+import json
+import glob
+import threading
+import logging
+
+from utils.sensitivity_manifest import list_artifacts, get_manifest_path
+
+# Set up logging
+logger = logging.getLogger('calsen_paths')
+
+# Root of the batch folders used by the sensitivity calculations
+ORIGINAL_BASE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Original')
+
+# Mode directory with capitalized name
+MODE_DIR_MAPPING = {
+    'percentage': 'Percentage',
+    'directvalue': 'DirectValue',
+    'absolutedeparture': 'AbsoluteDeparture',
+    'montecarlo': 'MonteCarlo'
+}
+
+# (base_dir, version) -> {"signature": ..., "path_sets": ...}
+_path_index = {}
+_index_lock = threading.Lock()
+
+def get_sensitivity_config_path(version, base_dir=None):
+    """
+    Get the path of a version's sensitivity configuration file.
+
+    Args:
+        version (int): Version number
+        base_dir (str, optional): Root of the batch folders; defaults to backend/Original
+
+    Returns:
+        str: Path to Sensitivity/Reports/sensitivity_config.json
+    """
+    return os.path.join(
+        base_dir or ORIGINAL_BASE_DIR,
+        f"Batch({version})",
+        f"Results({version})",
+        "Sensitivity",
+        "Reports",
+        "sensitivity_config.json"
+    )
+
+def _index_signature(version, base_dir):
+    """
+    Identify the state of the inputs a version's path sets are built from.
+
+    The sensitivity configuration file is used when it exists; otherwise the
+    path sets come from the sweep manifest or the parameter directories, so
+    the manifest and the Sensitivity directory itself are used.
+    """
+    config_path = get_sensitivity_config_path(version, base_dir)
+    try:
+        stat = os.stat(config_path)
+        return ("config", stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        pass
+
+    sensitivity_dir = os.path.dirname(os.path.dirname(config_path))
+    try:
+        stat = os.stat(sensitivity_dir)
+    except OSError:
+        return None
+
+    # Variations recorded in the manifest (including its write-ahead log)
+    manifest_path = get_manifest_path(sensitivity_dir)
+    manifest_mtimes = tuple(
+        os.stat(path).st_mtime_ns if os.path.exists(path) else None
+        for path in (manifest_path, f"{manifest_path}-wal")
+    )
+    return ("directories", stat.st_mtime_ns, manifest_mtimes)
+
+def _load_sensitivity_config(version, base_dir):
+    """
+    Load the sensitivity parameters of a version.
+
+    Falls back to a configuration derived from the sweep manifest or the
+    parameter directories when sensitivity_config.json does not exist.
+
+    Returns:
+        dict: Sensitivity parameters keyed by parameter ID, or None if unavailable
+    """
+    sensitivity_config_path = get_sensitivity_config_path(version, base_dir)
+
+    if os.path.exists(sensitivity_config_path):
+        logger.info(f"Found sensitivity configuration at {sensitivity_config_path}")
+        try:
+            with open(sensitivity_config_path, 'r') as f:
+                sensitivity_config = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading sensitivity configuration: {str(e)}")
+            return None
+        # Extract parameters from the nested structure if needed
+        if 'parameters' in sensitivity_config:
+            sensitivity_config = sensitivity_config['parameters']
+        return sensitivity_config
+
+    # Try to find any sensitivity directories if config not found
+    logger.warning(f"No sensitivity configuration found at {sensitivity_config_path}")
+    sensitivity_dir = os.path.dirname(os.path.dirname(sensitivity_config_path))
+
+    if not os.path.exists(sensitivity_dir):
+        logger.warning(f"No sensitivity directory found at {sensitivity_dir}")
+        return None
+
+    # Parameters, modes and variations recorded in the sweep manifest
+    sensitivity_config = {}
+    for record in list_artifacts(sensitivity_dir, version):
+        param_config = sensitivity_config.setdefault(record["param_id"], {
+            "enabled": True,
+            "mode": record["mode"],
+            "number": record["param_id"][1:] if record["param_id"][1:].isdigit() else None,
+            "values": []
+        })
+        if record["mode"] == param_config["mode"] and float(record["variation"]) not in param_config["values"]:
+            param_config["values"].append(float(record["variation"]))
+    if sensitivity_config:
+        return sensitivity_config
+
+    # Look for parameter directories
+    param_dirs = glob.glob(os.path.join(sensitivity_dir, "S*"))
+    if not param_dirs:
+        logger.warning(f"No parameter directories found in {sensitivity_dir}")
+        return None
+
+    # Build a simple config based on directory structure
+    for param_dir in param_dirs:
+        param_id = os.path.basename(param_dir)
+        mode_dirs = glob.glob(os.path.join(param_dir, "*"))
+
+        if mode_dirs:
+            mode = os.path.basename(mode_dirs[0])
+            sensitivity_config[param_id] = {
+                "enabled": True,
+                "mode": mode,
+                "number": param_id[1:] if param_id.startswith('S') and param_id[1:].isdigit() else None
+            }
+    return sensitivity_config
+
+def build_variation_paths(version, param_id, mode, variation, base_dir=None):
+    """
+    Build the paths of a single parameter variation and create its directories.
+
+    Args:
+        version (int): Version number
+        param_id (str): Parameter ID (e.g., "S35")
+        mode (str): Sensitivity mode (percentage, directvalue, absolutedeparture, montecarlo)
+        variation (float): Variation value
+        base_dir (str, optional): Root of the batch folders; defaults to backend/Original
+
+    Returns:
+        dict: Path information for the variation
+    """
+    code_files_path = base_dir or ORIGINAL_BASE_DIR
+    mode = mode.lower()
+    var_str = f"{variation:+.2f}"
+    sensitivity_dir = os.path.join(code_files_path, f"Batch({version})", f"Results({version})", "Sensitivity")
+
+    # Economic variation directory (lowercase mode)
+    Econ_var_dir = os.path.join(sensitivity_dir, param_id, mode, "Configuration", f"{param_id}_{var_str}")
+    # Parameter variation directory (lowercase mode)
+    param_var_dir = os.path.join(sensitivity_dir, param_id, mode, var_str)
+    # Configuration directory (capitalized mode)
+    config_var_dir = os.path.join(
+        sensitivity_dir,
+        MODE_DIR_MAPPING.get(mode, 'Percentage'),
+        "Configuration",
+        f"{param_id}_{var_str}"
+    )
+
+    # Configuration matrix file, falling back to the version's base matrix
+    config_matrix_file = os.path.join(param_var_dir, f"General_Configuration_Matrix({version}).csv")
+    if not os.path.exists(config_matrix_file):
+        alt_config_matrix_file = os.path.join(
+            code_files_path,
+            f"Batch({version})",
+            f"Results({version})",
+            f"General_Configuration_Matrix({version}).csv"
+        )
+        if os.path.exists(alt_config_matrix_file):
+            config_matrix_file = alt_config_matrix_file
+
+    # Configuration file
+    config_file = os.path.join(
+        code_files_path,
+        f"Batch({version})",
+        f"ConfigurationPlotSpec({version})",
+        f"configurations({version}).py"
+    )
+
+    os.makedirs(param_var_dir, exist_ok=True)
+    os.makedirs(config_var_dir, exist_ok=True)
+
+    return {
+        "param_var_dir": param_var_dir,
+        "config_var_dir": config_var_dir,
+        "config_matrix_file": config_matrix_file,
+        "config_file": config_file,
+        "Econ_var_dir": Econ_var_dir,
+        "mode": mode,
+        "variation": variation,
+        "variation_str": var_str
+    }
+
+def build_paths_for_version(version, base_dir=None):
+    """
+    Build all required paths for a given version using the sensitivity config.
+
+    This always reads the configuration; use get_path_index() for the
+    memoized index.
+
+    Args:
+        version (int): Version number
+        base_dir (str, optional): Root of the batch folders; defaults to backend/Original
+
+    Returns:
+        dict: Dictionary of path sets for each enabled parameter, or None if
+              the version has no sensitivity configuration
+    """
+    logger.info(f"Building paths for version {version}")
+
+    sensitivity_config = _load_sensitivity_config(version, base_dir)
+    if sensitivity_config is None:
+        return None
+
+    # Build path sets for all enabled S parameters
+    path_sets = {}
+
+    for param_id, config in sensitivity_config.items():
+        if not config.get('enabled', False):
+            continue
+        if not (param_id.startswith('S') and param_id[1:].isdigit()):
+            continue
+
+        mode = config.get('mode', 'percentage').lower()
+        values = config.get('values', [])
+
+        if not values:
+            continue
+
+        try:
+            # For all modes, use the values provided directly without special handling
+            variations = [float(v) for v in values if v is not None]
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid values for {mode} mode in {param_id}: {values}")
+            continue
+
+        param_paths = {}
+        for variation in variations:
+            paths = build_variation_paths(version, param_id, mode, variation, base_dir)
+            param_paths[paths["variation_str"]] = paths
+
+        if param_paths:
+            path_sets[param_id] = {
+                "mode": mode,
+                "variations": param_paths,
+                "compareToKey": config.get('compareToKey', 'S13'),
+                "comparisonType": config.get('comparisonType', 'primary')
+            }
+
+    logger.info(f"Built path sets for {len(path_sets)} parameters")
+    return path_sets
+
+def get_path_index(version, base_dir=None):
+    """
+    Get the memoized path sets of a version.
+
+    The index entry is rebuilt when the version's sensitivity configuration
+    has changed since it was built.
+
+    Args:
+        version (int): Version number
+        base_dir (str, optional): Root of the batch folders; defaults to backend/Original
+
+    Returns:
+        dict: Path sets as returned by build_paths_for_version(), or None
+    """
+    key = (base_dir or ORIGINAL_BASE_DIR, str(version))
+    signature = _index_signature(version, base_dir)
+
+    with _index_lock:
+        entry = _path_index.get(key)
+        if entry is not None and entry["signature"] == signature:
+            return entry["path_sets"]
+
+        path_sets = build_paths_for_version(version, base_dir)
+        _path_index[key] = {"signature": signature, "path_sets": path_sets}
+        return path_sets
+
+def resolve_variation_paths(version, param_id, variation, base_dir=None):
+    """
+    Resolve the paths of one parameter variation from the path index.
+
+    Args:
+        version (int): Version number
+        param_id (str): Parameter ID (e.g., "S35")
+        variation (float): Variation value
+        base_dir (str, optional): Root of the batch folders; defaults to backend/Original
+
+    Returns:
+        dict: Path information for the variation, or None if the variation is
+              not part of the version's enabled sensitivity configuration
+    """
+    path_sets = get_path_index(version, base_dir)
+    if not path_sets or param_id not in path_sets:
+        return None
+
+    paths = path_sets[param_id]["variations"].get(f"{variation:+.2f}")
+    if not paths:
+        return None
+
+    # The variation's own matrix may have been copied in after the index was built
+    paths = dict(paths)
+    variation_matrix_file = os.path.join(paths["param_var_dir"], f"General_Configuration_Matrix({version}).csv")
+    if os.path.exists(variation_matrix_file):
+        paths["config_matrix_file"] = variation_matrix_file
+    return paths
+
+def list_parameters(version, base_dir=None):
+    """
+    List the enabled sensitivity parameters of a version from the path index.
+
+    Args:
+        version (int): Version number
+        base_dir (str, optional): Root of the batch folders; defaults to backend/Original
+
+    Returns:
+        dict: Parameter information keyed by parameter ID, or None if unavailable
+    """
+    path_sets = get_path_index(version, base_dir)
+    if not path_sets:
+        return None
+
+    return {
+        param_id: {
+            "mode": path_set.get("mode"),
+            "variations": list(path_set.get("variations", {}).keys()),
+            "compareToKey": path_set.get("compareToKey"),
+            "comparisonType": path_set.get("comparisonType")
+        }
+        for param_id, path_set in path_sets.items()
+    }
+
+def invalidate_path_index(version=None):
+    """
+    Drop memoized path sets so they are rebuilt on next use.
+
+    Args:
+        version (int, optional): Version to drop; drops every version if None
+    """
+    with _index_lock:
+        if version is None:
+            _path_index.clear()
+        else:
+            for key in [key for key in _path_index if key[1] == str(version)]:
+                del _path_index[key]
@@ -0,0 +1,684 @@
+"""
+Job Queue Module
+
+This module schedules long-running service operations (calculation runs,
+sensitivity sweeps, global sensitivity analysis) as jobs in a persistent
+queue instead of serializing every request behind one global lock.
+
+Jobs are stored in a SQLite database (WAL mode) shared by every service
+process. Each job carries conflict keys, e.g. "version:3": jobs sharing a
+key run one after another in submission order, while jobs on unrelated keys
+run concurrently. Each job also declares the CPU slots it uses; a scheduler
+admits jobs while their slots fit its capacity (the number of cores by
+default), so throughput scales with the machine instead of one request at
+a time.
+
+A scheduler only claims jobs of the kinds it has a handler for. Claiming is
+a single write transaction, so schedulers in several processes never run
+conflicting jobs at once. Jobs left running by a process that died are
+queued again when their heartbeat goes stale.
+
+Jobs can be cancelled from any process. A queued job is never started; a
+running job is flagged on its owner's next heartbeat, and every child
+process it started through run_process() is terminated. A job's timeout is
+a deadline: child processes and jobs submitted from inside it never run
+past it.
+"""
+
+import os
+import json
+import time
+import signal
+import socket
+import sqlite3
+import subprocess
+import threading
+import logging
+
+# Set up logging
+logger = logging.getLogger('job_queue')
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+TIMED_OUT = 'timed_out'
+CANCELLED = 'cancelled'
+FINISHED_STATES = (SUCCEEDED, FAILED, TIMED_OUT, CANCELLED)
+
+# Seconds a writer waits for another process holding the queue
+BUSY_TIMEOUT = 30
+
+# Seconds between scheduler passes when nothing wakes it up
+POLL_INTERVAL = 0.5
+
+# Seconds without a heartbeat after which a running job is considered orphaned
+STALE_AFTER = 60
+
+# Seconds a terminated child process gets to exit before it is killed
+TERMINATE_GRACE = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    keys TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    cpus INTEGER NOT NULL,
+    timeout REAL,
+    owner TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    heartbeat_at REAL,
+    cancel_requested TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+_COLUMNS = ("id", "kind", "keys", "payload", "status", "cpus", "timeout", "owner", "attempts",
+            "result", "error", "created_at", "started_at", "finished_at", "heartbeat_at", "cancel_requested")
+
+_job_context = threading.local()
+
+class JobError(Exception):
+    """Raised by a handler to fail its job while still recording a result."""
+    def __init__(self, message, result=None):
+        super().__init__(message)
+        self.result = result
+
+class JobCancelled(Exception):
+    """Raised inside a job once it has been cancelled or has run past its timeout."""
+
+class JobContext:
+    """State of a running job, available to its handler through current_job()."""
+    def __init__(self, job):
+        self.id = job['id']
+        self.kind = job['kind']
+        self.keys = job['keys']
+        self.cpus = job['cpus']
+        self.timeout = job['timeout']
+        self.started_at = time.time()
+        self.deadline = self.started_at + job['timeout'] if job['timeout'] else None
+        self.cancelled = threading.Event()
+        self.cancel_reason = None
+        self._processes = set()
+        self._lock = threading.Lock()
+
+    def remaining(self):
+        """Seconds left before the job's timeout, or None without a timeout."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+
+    def cancel(self, reason="Job cancelled"):
+        """Flag the job as cancelled and terminate its child processes."""
+        with self._lock:
+            if self.cancel_reason is None:
+                self.cancel_reason = reason
+            processes = list(self._processes)
+        self.cancelled.set()
+        for process in processes:
+            terminate_process(process)
+
+    def check(self):
+        """
+        Raise JobCancelled if the job has been cancelled.
+
+        Handlers call this between units of work so they stop dispatching
+        new work once the job is abandoned.
+        """
+        if self.cancelled.is_set():
+            raise JobCancelled(self.cancel_reason or "Job cancelled")
+
+    def track(self, process):
+        """Track a child process so cancelling the job terminates it."""
+        with self._lock:
+            self._processes.add(process)
+            cancelled = self.cancelled.is_set()
+        if cancelled:
+            terminate_process(process)
+
+    def untrack(self, process):
+        """Stop tracking a finished child process."""
+        with self._lock:
+            self._processes.discard(process)
+
+def current_job():
+    """
+    Get the context of the job running in this thread.
+
+    Returns:
+        JobContext: Context of the running job, or None outside a job
+    """
+    return getattr(_job_context, 'job', None)
+
+def bind_job(context):
+    """
+    Make a job the current job of this thread.
+
+    Used as the initializer of worker threads a job starts, so their child
+    processes and cancellation checks belong to the job.
+
+    Args:
+        context (JobContext): Context of the job, or None
+    """
+    _job_context.job = context
+
+def terminate_process(process, grace=TERMINATE_GRACE):
+    """
+    Terminate a child process and the processes it started.
+
+    The process group gets SIGTERM, then SIGKILL if it is still running
+    after the grace period.
+
+    Args:
+        process (subprocess.Popen): Process started in its own session
+        grace (float): Seconds to wait between SIGTERM and SIGKILL
+    """
+    if process.poll() is not None:
+        return
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGTERM)
+        else:
+            process.terminate()
+        process.wait(grace)
+    except subprocess.TimeoutExpired:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+def run_process(command, timeout=None, **kwargs):
+    """
+    Run a child process that stops with the job running in this thread.
+
+    Works like subprocess.run(capture_output=True, text=True). Inside a job,
+    the process is bounded by the job's remaining time and terminated (with
+    its own children) as soon as the job is cancelled.
+
+    Args:
+        command (list): Command and arguments
+        timeout (float, optional): Seconds the process may run
+        **kwargs: Further subprocess.Popen arguments (cwd, env, ...)
+
+    Returns:
+        subprocess.CompletedProcess: Return code and captured output
+
+    Raises:
+        subprocess.TimeoutExpired: If the process ran past its timeout or the job's deadline
+        JobCancelled: If the job was cancelled while the process ran
+    """
+    context = current_job()
+    if context is None:
+        return subprocess.run(command, capture_output=True, text=True, timeout=timeout, **kwargs)
+
+    context.check()
+    remaining = context.remaining()
+    if remaining is not None:
+        timeout = remaining if timeout is None else min(timeout, remaining)
+    deadline = time.time() + timeout if timeout is not None else None
+
+    process = subprocess.Popen(
+        command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        start_new_session=(os.name == 'posix'), **kwargs
+    )
+    context.track(process)
+    try:
+        while True:
+            wait = POLL_INTERVAL if deadline is None else max(0.0, min(POLL_INTERVAL, deadline - time.time()))
+            try:
+                stdout, stderr = process.communicate(timeout=wait)
+                break
+            except subprocess.TimeoutExpired:
+                if context.cancelled.is_set():
+                    terminate_process(process)
+                    process.communicate()
+                    context.check()
+                if deadline is not None and time.time() >= deadline:
+                    terminate_process(process)
+                    stdout, stderr = process.communicate()
+                    raise subprocess.TimeoutExpired(command, timeout, output=stdout, stderr=stderr)
+    finally:
+        context.untrack(process)
+
+    # A process killed by cancellation may exit before the poll notices
+    context.check()
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+def _row_to_job(row):
+    """Convert a jobs row to a dict with decoded JSON fields."""
+    job = dict(zip(_COLUMNS, row))
+    job['keys'] = json.loads(job['keys'])
+    job['payload'] = json.loads(job['payload'])
+    job['result'] = json.loads(job['result']) if job['result'] is not None else None
+    return job
+
+class JobScheduler:
+    """
+    Persistent job queue with per-key ordering and CPU slot admission.
+    """
+    def __init__(self, db_path, capacity=None, poll_interval=POLL_INTERVAL, stale_after=STALE_AFTER):
+        """
+        Open (or create) the queue database.
+
+        Args:
+            db_path (str): Path of the SQLite queue database
+            capacity (int, optional): CPU slots of this scheduler; defaults to the number of cores
+            poll_interval (float): Seconds between scheduler passes
+            stale_after (float): Seconds without heartbeat before a running job is re-queued
+        """
+        self.db_path = db_path
+        self.capacity = max(1, int(capacity or os.cpu_count() or 1))
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._handlers = {}
+        self._running = {}
+        self._finished = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            # Queues created before cancellation existed lack its column
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(jobs)")]
+            if 'cancel_requested' not in columns:
+                connection.execute("ALTER TABLE jobs ADD COLUMN cancel_requested TEXT")
+        finally:
+            connection.close()
+
+    def _connect(self):
+        """Open a connection to the queue database."""
+        return sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+
+    # ---------------- Submission and Inspection ----------------
+
+    def register(self, kind, handler):
+        """
+        Register the handler of a job kind.
+
+        Args:
+            kind (str): Job kind
+            handler (callable): Called with the job payload; returns a JSON-serializable result
+        """
+        self._handlers[kind] = handler
+        self._wakeup.set()
+
+    def submit(self, kind, payload, keys=None, cpus=1, timeout=None):
+        """
+        Queue a job.
+
+        Args:
+            kind (str): Job kind
+            payload (dict): JSON-serializable handler input
+            keys (list, optional): Conflict keys; jobs sharing a key never run concurrently
+            cpus (int): CPU slots the job uses (capped at the scheduler capacity)
+            timeout (float, optional): Seconds the job may run; a job submitted from
+                inside another job never runs past the deadline of that job
+
+        Returns:
+            int: Job ID
+        """
+        parent = current_job()
+        if parent is not None and parent.deadline is not None:
+            timeout = parent.remaining() if timeout is None else min(float(timeout), parent.remaining())
+
+        connection = self._connect()
+        try:
+            cursor = connection.execute(
+                "INSERT INTO jobs (kind, keys, payload, status, cpus, timeout, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, json.dumps(sorted(set(keys or []))), json.dumps(payload), QUEUED,
+                 max(1, min(int(cpus), self.capacity)), timeout, time.time())
+            )
+            job_id = cursor.lastrowid
+        finally:
+            connection.close()
+
+        logger.info(f"Queued {kind} job {job_id} with keys {keys}")
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        """
+        Get a job.
+
+        Args:
+            job_id (int): Job ID
+
+        Returns:
+            dict: Job record, or None if unknown
+        """
+        connection = self._connect()
+        try:
+            row = connection.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            connection.close()
+        return _row_to_job(row) if row else None
+
+    def list_jobs(self, status=None, kind=None, key=None, limit=100):
+        """
+        List jobs, newest first.
+
+        Args:
+            status (str, optional): Job state
+            kind (str, optional): Job kind
+            key (str, optional): Conflict key the job must carry
+            limit (int): Maximum number of jobs
+
+        Returns:
+            list: Job records without payloads and results
+        """
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if key:
+            clauses.append("EXISTS (SELECT 1 FROM json_each(jobs.keys) WHERE json_each.value = ?)")
+            params.append(key)
+
+        query = f"SELECT {', '.join(_COLUMNS)} FROM jobs"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(int(limit))
+
+        connection = self._connect()
+        try:
+            rows = connection.execute(query, params).fetchall()
+        finally:
+            connection.close()
+
+        jobs = []
+        for row in rows:
+            job = _row_to_job(row)
+            del job['payload'], job['result']
+            jobs.append(job)
+        return jobs
+
+    def stats(self):
+        """
+        Summarize the queue and this scheduler's load.
+
+        Returns:
+            dict: Job counts per state, capacity and slots in use
+        """
+        connection = self._connect()
+        try:
+            counts = dict(connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        finally:
+            connection.close()
+        with self._lock:
+            used = sum(context.cpus for context in self._running.values())
+            running = sorted(self._running)
+        return {
+            "owner": self.owner,
+            "capacity": self.capacity,
+            "cpusInUse": used,
+            "runningHere": running,
+            "counts": {state: counts.get(state, 0) for state in (QUEUED, RUNNING) + FINISHED_STATES},
+            "kinds": sorted(self._handlers),
+        }
+
+    def wait(self, job_id, timeout=None):
+        """
+        Wait for a job to finish.
+
+        Args:
+            job_id (int): Job ID
+            timeout (float, optional): Maximum seconds to wait
+
+        Returns:
+            dict: Job record (still queued or running if the wait timed out)
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            with self._lock:
+                done = self._finished.setdefault(job_id, threading.Event())
+            job = self.get(job_id)
+            remaining = None if deadline is None else deadline - time.time()
+            if job is None or job['status'] in FINISHED_STATES or (remaining is not None and remaining <= 0):
+                with self._lock:
+                    self._finished.pop(job_id, None)
+                return job
+            # Jobs run by other processes are noticed on the poll interval
+            done.wait(self.poll_interval if remaining is None else min(self.poll_interval, remaining))
+
+    def cancel(self, job_id, reason="Job cancelled"):
+        """
+        Cancel a job.
+
+        A queued job is marked cancelled and never starts. A running job is
+        cancelled at once when this scheduler runs it, otherwise on the next
+        heartbeat of the scheduler that does.
+
+        Args:
+            job_id (int): Job ID
+            reason (str): Reason recorded as the job's error
+
+        Returns:
+            dict: Job record, or None if unknown
+        """
+        connection = self._connect()
+        try:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ?, cancel_requested = ? "
+                "WHERE id = ? AND status = ?",
+                (CANCELLED, reason, time.time(), reason, job_id, QUEUED)
+            )
+            if not cursor.rowcount:
+                connection.execute(
+                    "UPDATE jobs SET cancel_requested = ? WHERE id = ? AND status = ?",
+                    (reason, job_id, RUNNING)
+                )
+        finally:
+            connection.close()
+
+        with self._lock:
+            context = self._running.get(job_id)
+            done = self._finished.get(job_id) if cursor.rowcount else None
+        if context is not None:
+            context.cancel(reason)
+        if done is not None:
+            done.set()
+        logger.info(f"Cancellation of job {job_id} requested: {reason}")
+        return self.get(job_id)
+
+    def cancel_jobs(self, key, reason="Job cancelled"):
+        """
+        Cancel every queued or running job carrying a conflict key.
+
+        Args:
+            key (str): Conflict key (e.g. "run:20250101_120000_ab12cd")
+            reason (str): Reason recorded as the jobs' error
+
+        Returns:
+            list: IDs of the cancelled jobs
+        """
+        job_ids = [job['id'] for status in (QUEUED, RUNNING) for job in self.list_jobs(status=status, key=key, limit=1000)]
+        for job_id in job_ids:
+            self.cancel(job_id, reason)
+        return job_ids
+
+    # ---------------- Scheduling ----------------
+
+    def start(self):
+        """Start the scheduler thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._loop, name="job-scheduler", daemon=True)
+            self._thread.start()
+        logger.info(f"Job scheduler {self.owner} started with {self.capacity} CPU slots")
+
+    def _loop(self):
+        """Scheduler pass: heartbeats, timeouts, orphan recovery, then claim what fits."""
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            try:
+                self._heartbeat()
+                self._requeue_orphans()
+                while self._claim_next():
+                    pass
+            except Exception as e:
+                logger.error(f"Job scheduler pass failed: {str(e)}")
+
+    def _heartbeat(self):
+        """Refresh the heartbeat of this scheduler's jobs and cancel those past their timeout or cancelled elsewhere."""
+        now = time.time()
+        with self._lock:
+            running = dict(self._running)
+        if not running:
+            return
+
+        for context in running.values():
+            if context.deadline is not None and now > context.deadline and not context.cancelled.is_set():
+                logger.warning(f"Job {context.id} exceeded its timeout of {context.timeout}s")
+                context.cancel(f"Job exceeded its timeout of {context.timeout}s")
+
+        placeholders = ', '.join('?' * len(running))
+        connection = self._connect()
+        try:
+            connection.execute(f"UPDATE jobs SET heartbeat_at = ? WHERE id IN ({placeholders})", [now] + list(running))
+            requested = connection.execute(
+                f"SELECT id, cancel_requested FROM jobs WHERE id IN ({placeholders}) AND cancel_requested IS NOT NULL",
+                list(running)
+            ).fetchall()
+        finally:
+            connection.close()
+
+        for job_id, reason in requested:
+            if not running[job_id].cancelled.is_set():
+                running[job_id].cancel(reason)
+
+    def _requeue_orphans(self):
+        """Queue again the running jobs whose scheduler stopped sending heartbeats."""
+        connection = self._connect()
+        try:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = ?, owner = NULL WHERE status = ? AND heartbeat_at < ?",
+                (QUEUED, RUNNING, time.time() - self.stale_after)
+            )
+            if cursor.rowcount:
+                logger.warning(f"Re-queued {cursor.rowcount} orphaned jobs")
+        finally:
+            connection.close()
+
+    def _claim_next(self):
+        """
+        Claim and start the oldest queued job that can run now.
+
+        A job can run when none of its keys is held by a running job or by an
+        older queued job (which keeps jobs on the same key in order) and its
+        CPU slots fit the free capacity.
+
+        Returns:
+            bool: True if a job was started
+        """
+        with self._lock:
+            free = self.capacity - sum(context.cpus for context in self._running.values())
+        if free <= 0 or not self._handlers:
+            return False
+
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            held = set()
+            for (keys,) in connection.execute("SELECT keys FROM jobs WHERE status = ?", (RUNNING,)):
+                held.update(json.loads(keys))
+
+            claimed = None
+            rows = connection.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE status = ? ORDER BY id", (QUEUED,)
+            ).fetchall()
+            for row in rows:
+                job = _row_to_job(row)
+                keys = set(job['keys'])
+                runnable = job['kind'] in self._handlers and not keys & held and job['cpus'] <= free
+                # Later jobs on the same keys wait behind this one
+                held.update(keys)
+                if runnable:
+                    claimed = job
+                    break
+
+            if claimed is None:
+                connection.execute("COMMIT")
+                return False
+
+            now = time.time()
+            connection.execute(
+                "UPDATE jobs SET status = ?, owner = ?, started_at = ?, heartbeat_at = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                (RUNNING, self.owner, now, now, claimed['id'])
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+        finally:
+            connection.close()
+
+        context = JobContext(claimed)
+        with self._lock:
+            self._running[claimed['id']] = context
+        threading.Thread(
+            target=self._run, args=(claimed, context), name=f"job-{claimed['id']}", daemon=True
+        ).start()
+        return True
+
+    def _run(self, job, context):
+        """Run a claimed job and record its outcome."""
+        _job_context.job = context
+        status, result, error = SUCCEEDED, None, None
+        logger.info(f"Started {job['kind']} job {job['id']} ({job['cpus']} CPU slots)")
+        try:
+            result = self._handlers[job['kind']](job['payload'])
+        except JobCancelled as e:
+            status, error = CANCELLED, str(e)
+        except JobError as e:
+            status, result, error = FAILED, e.result, str(e)
+        except Exception as e:
+            status, error = FAILED, str(e)
+            logger.error(f"Job {job['id']} failed: {error}")
+        finally:
+            _job_context.job = None
+
+        timed_out = context.deadline is not None and time.time() >= context.deadline
+        if context.cancelled.is_set() or (timed_out and status == FAILED):
+            status = TIMED_OUT if timed_out else CANCELLED
+            error = context.cancel_reason or (f"Job exceeded its timeout of {context.timeout}s" if timed_out else error)
+
+        connection = self._connect()
+        try:
+            connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ? AND owner = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job['id'], self.owner)
+            )
+        finally:
+            connection.close()
+
+        with self._lock:
+            self._running.pop(job['id'], None)
+            done = self._finished.get(job['id'])
+        if done is not None:
+            done.set()
+        logger.info(f"Job {job['id']} {status} after {time.time() - context.started_at:.1f}s")
+        self._wakeup.set()
@@ -0,0 +1,292 @@
+"""
+Run Workspace Module
+
+This module gives every pipeline run (register_payload -> baseline ->
+sensitivity configure -> runs) its own workspace instead of process-wide
+singletons, so runs of different users or versions progress in parallel
+without overwriting each other's state.
+
+A workspace is a folder Logs/runs/{runId} holding:
+- state.json: the run's pipeline steps and whether it is active
+- payload.json: the registered payload
+- sensitivity_config_status.json / sensitivity_config_data.pkl: the run's
+  sensitivity configuration snapshot
+- artifacts/: intermediate outputs of the run (e.g. the baseline result)
+- checkpoints.db: completed units of the run's sweeps, so they resume after
+  a restart (see sweep_checkpoint)
+
+Each workspace also has its own set of threading events mirroring the
+steps, so code in the serving process can wait on a run's progress. The
+state file is written on every change, so a workspace can be reloaded by
+another process or after a restart. WorkspaceRegistry.collect() removes
+workspaces that have not changed for a given age.
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import threading
+import logging
+from utils.sweep_checkpoint import SweepCheckpoint
+
+# Set up logging
+logger = logging.getLogger('run_workspace')
+
+# Pipeline steps of a run, in order
+PAYLOAD_REGISTERED = 'payload_registered'
+BASELINE_COMPLETED = 'baseline_completed'
+CONFIG_COMPLETED = 'config_completed'
+RUNS_COMPLETED = 'runs_completed'
+RUN_STEPS = [PAYLOAD_REGISTERED, BASELINE_COMPLETED, CONFIG_COMPLETED, RUNS_COMPLETED]
+
+# Seconds without changes after which a workspace may be collected (default: 7 days)
+DEFAULT_TTL = 7 * 24 * 3600
+
+STATE_FILE = "state.json"
+PAYLOAD_FILE = "payload.json"
+CONFIG_STATUS_FILE = "sensitivity_config_status.json"
+CONFIG_DATA_FILE = "sensitivity_config_data.pkl"
+CHECKPOINT_FILE = "checkpoints.db"
+ARTIFACTS_DIR = "artifacts"
+
+def _write_json(path, data):
+    """Write JSON atomically so readers never see a partial file."""
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp_path, path)
+
+class RunWorkspace:
+    """
+    State, configuration snapshot, artifacts and events of one pipeline run.
+    """
+    def __init__(self, root, run_id):
+        """
+        Open a workspace, loading its saved state if it exists.
+
+        Args:
+            root (str): Folder holding all run workspaces
+            run_id (str): Run ID
+        """
+        self.run_id = run_id
+        self.path = os.path.join(root, run_id)
+        self.events = {step: threading.Event() for step in RUN_STEPS}
+        self.active = threading.Event()
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.cancel_reason = None
+        self._lock = threading.Lock()
+
+        state_path = self.file(STATE_FILE)
+        if os.path.exists(state_path):
+            with open(state_path, 'r') as f:
+                state = json.load(f)
+            self.created_at = state.get('createdAt', self.created_at)
+            self.updated_at = state.get('updatedAt', self.updated_at)
+            self.cancel_reason = state.get('cancelReason')
+            for step in RUN_STEPS:
+                if state.get('steps', {}).get(step):
+                    self.events[step].set()
+            if state.get('active'):
+                self.active.set()
+
+    def file(self, name):
+        """Path of a file in the workspace."""
+        return os.path.join(self.path, name)
+
+    def artifact(self, name):
+        """Path of an intermediate artifact of the run (the artifacts folder is created on demand)."""
+        folder = self.file(ARTIFACTS_DIR)
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, name)
+
+    @property
+    def payload_path(self):
+        return self.file(PAYLOAD_FILE)
+
+    @property
+    def config_status_path(self):
+        return self.file(CONFIG_STATUS_FILE)
+
+    @property
+    def config_data_path(self):
+        return self.file(CONFIG_DATA_FILE)
+
+    @property
+    def checkpoint(self):
+        """Checkpoint of the run's sweeps."""
+        return SweepCheckpoint(self.file(CHECKPOINT_FILE))
+
+    def is_set(self, step):
+        """Check whether a pipeline step of the run has completed."""
+        return self.events[step].is_set()
+
+    def mark(self, step):
+        """Mark a pipeline step as completed."""
+        self.events[step].set()
+        self.save()
+
+    def clear(self, step):
+        """Mark a pipeline step as not completed."""
+        self.events[step].clear()
+        self.save()
+
+    def activate(self):
+        """Start the pipeline of the run with no step completed."""
+        for event in self.events.values():
+            event.clear()
+        self.active.set()
+        self.cancel_reason = None
+        self.save()
+
+    def reset(self):
+        """Clear every step and deactivate the run."""
+        for event in self.events.values():
+            event.clear()
+        self.active.clear()
+        self.save()
+
+    def cancel(self, reason):
+        """Deactivate the run and record why it was abandoned, so later steps can report it."""
+        self.cancel_reason = reason
+        self.reset()
+
+    def current_step(self):
+        """Name of the next step the run is waiting for."""
+        if not self.active.is_set():
+            return "cancelled" if self.cancel_reason else "none"
+        for step, endpoint in zip(RUN_STEPS, ["register_payload", "baseline_calculation", "sensitivity_configure", "runs"]):
+            if not self.is_set(step):
+                return endpoint
+        return "complete"
+
+    def state(self):
+        """Run state as a dict."""
+        return {
+            "runId": self.run_id,
+            "active": self.active.is_set(),
+            "steps": {step: self.is_set(step) for step in RUN_STEPS},
+            "currentStep": self.current_step(),
+            "cancelReason": self.cancel_reason,
+            "createdAt": self.created_at,
+            "updatedAt": self.updated_at,
+        }
+
+    def save(self):
+        """Write the run state to the workspace."""
+        with self._lock:
+            self.updated_at = time.time()
+            os.makedirs(self.path, exist_ok=True)
+            _write_json(self.file(STATE_FILE), self.state())
+
+class WorkspaceRegistry:
+    """
+    Creates, finds and collects the run workspaces under one folder.
+    """
+    def __init__(self, root):
+        """
+        Args:
+            root (str): Folder holding all run workspaces
+        """
+        self.root = root
+        self._workspaces = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def create(self, run_id=None):
+        """
+        Create the workspace of a new run.
+
+        Args:
+            run_id (str, optional): Run ID; a unique timestamped ID if None
+
+        Returns:
+            RunWorkspace: The new workspace
+        """
+        run_id = run_id or f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        workspace = RunWorkspace(self.root, run_id)
+        workspace.save()
+        with self._lock:
+            self._workspaces[run_id] = workspace
+        logger.info(f"Created workspace for run {run_id}")
+        return workspace
+
+    def get(self, run_id):
+        """
+        Get the workspace of a run.
+
+        Args:
+            run_id (str): Run ID
+
+        Returns:
+            RunWorkspace: The workspace, or None if the run has none
+        """
+        run_id = str(run_id or '')
+        if run_id in ('', '.', '..') or os.path.basename(run_id) != run_id:
+            return None
+        with self._lock:
+            workspace = self._workspaces.get(run_id)
+            if workspace is None and os.path.exists(os.path.join(self.root, run_id, STATE_FILE)):
+                workspace = self._workspaces[run_id] = RunWorkspace(self.root, run_id)
+        return workspace
+
+    def list(self):
+        """
+        List every workspace, most recently created first.
+
+        Returns:
+            list: RunWorkspace objects
+        """
+        try:
+            run_ids = [name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name))]
+        except OSError:
+            run_ids = []
+        workspaces = [workspace for workspace in map(self.get, run_ids) if workspace is not None]
+        return sorted(workspaces, key=lambda workspace: workspace.created_at, reverse=True)
+
+    def latest(self, active_only=False):
+        """
+        Get the most recently created workspace.
+
+        Args:
+            active_only (bool): Only consider runs whose pipeline is active
+
+        Returns:
+            RunWorkspace: The workspace, or None if there is none
+        """
+        for workspace in self.list():
+            if workspace.active.is_set() or not active_only:
+                return workspace
+        return None
+
+    def collect(self, ttl=DEFAULT_TTL, keep=None):
+        """
+        Remove workspaces not updated within the time to live.
+
+        Active runs are reset after the pipeline timeout, so a workspace that
+        is still marked active after the time to live was left by a process
+        that stopped.
+
+        Args:
+            ttl (float): Seconds since the last update after which a workspace is removed
+            keep (list, optional): Run IDs never to remove
+
+        Returns:
+            list: Run IDs of the removed workspaces
+        """
+        cutoff = time.time() - ttl
+        keep = set(keep or [])
+        removed = []
+        for workspace in self.list():
+            if workspace.run_id in keep or workspace.updated_at >= cutoff:
+                continue
+            shutil.rmtree(workspace.path, ignore_errors=True)
+            with self._lock:
+                self._workspaces.pop(workspace.run_id, None)
+            removed.append(workspace.run_id)
+
+        if removed:
+            logger.info(f"Collected {len(removed)} run workspaces older than {ttl}s")
+        return removed
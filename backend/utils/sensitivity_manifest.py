@@ -0,0 +1,243 @@
+"""
+Sensitivity Manifest Module
+
+This module maintains a manifest of the artifacts produced by a sensitivity
+sweep, so consumers can look files up directly instead of globbing the
+Sensitivity tree for every variation.
+
+Each version's Sensitivity folder holds one SQLite manifest
+(Reports/sensitivity_manifest.db) with one row per artifact keyed by
+(version, parameter, mode, variation, artifact type). Producers record an
+artifact when they write it; consumers call find_artifact() and fall back
+to searching the tree only when the manifest has no entry (e.g. results
+written before the manifest existed).
+"""
+
+import os
+import time
+import sqlite3
+import threading
+import logging
+
+# Set up logging
+logger = logging.getLogger('sensitivity_manifest')
+
+# Artifact types recorded for each variation
+CONFIGURATION_MATRIX = 'configuration_matrix'
+CONFIGURATION_FILE = 'configuration_file'
+CONFIG_MODULES = 'config_modules'
+ECONOMIC_SUMMARY = 'economic_summary'
+CASH_FLOW = 'cash_flow'
+PARAM_CONFIG = 'param_config'
+
+# Seconds a writer waits for another process holding the manifest
+BUSY_TIMEOUT = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    version TEXT NOT NULL,
+    param_id TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    variation TEXT NOT NULL,
+    artifact_type TEXT NOT NULL,
+    path TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (version, param_id, mode, variation, artifact_type)
+)
+"""
+
+_initialized = set()
+_init_lock = threading.Lock()
+
+def get_manifest_path(sensitivity_dir):
+    """
+    Get the path of the manifest of a Sensitivity folder.
+
+    Args:
+        sensitivity_dir (str): Sensitivity folder of a version
+
+    Returns:
+        str: Path to Reports/sensitivity_manifest.db
+    """
+    return os.path.join(sensitivity_dir, "Reports", "sensitivity_manifest.db")
+
+def _variation_key(variation):
+    """Format a variation the way variation directories are named (e.g. "+10.00")."""
+    try:
+        return f"{float(variation):+.2f}"
+    except (TypeError, ValueError):
+        return str(variation)
+
+def _connect(sensitivity_dir):
+    """Open the manifest, creating it on first use."""
+    manifest_path = get_manifest_path(sensitivity_dir)
+    with _init_lock:
+        if manifest_path not in _initialized or not os.path.exists(manifest_path):
+            os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+            connection = sqlite3.connect(manifest_path, timeout=BUSY_TIMEOUT)
+            # WAL lets the concurrent CFA-b.py processes of a sweep record while others read
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(_SCHEMA)
+            connection.commit()
+            _initialized.add(manifest_path)
+            return connection
+    return sqlite3.connect(manifest_path, timeout=BUSY_TIMEOUT)
+
+def record_artifacts(sensitivity_dir, version, param_id, mode, variation, artifacts):
+    """
+    Record the artifacts of one parameter variation.
+
+    An artifact of the same type recorded earlier for the variation is replaced.
+
+    Args:
+        sensitivity_dir (str): Sensitivity folder of the version
+        version (int): Version number
+        param_id (str): Parameter ID (e.g., "S35")
+        mode (str): Sensitivity mode of the variation directory
+        variation (float): Variation value
+        artifacts (dict): Paths keyed by artifact type
+    """
+    if not artifacts:
+        return
+
+    recorded_at = time.time()
+    rows = [
+        (str(version), param_id, mode.lower(), _variation_key(variation), artifact_type, path, recorded_at)
+        for artifact_type, path in artifacts.items()
+    ]
+
+    connection = _connect(sensitivity_dir)
+    try:
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO artifacts "
+                "(version, param_id, mode, variation, artifact_type, path, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+    finally:
+        connection.close()
+
+def record_artifact(sensitivity_dir, version, param_id, mode, variation, artifact_type, path):
+    """
+    Record a single artifact of a parameter variation.
+
+    Args:
+        sensitivity_dir (str): Sensitivity folder of the version
+        version (int): Version number
+        param_id (str): Parameter ID
+        mode (str): Sensitivity mode of the variation directory
+        variation (float): Variation value
+        artifact_type (str): Artifact type (e.g. ECONOMIC_SUMMARY)
+        path (str): Path of the artifact
+    """
+    record_artifacts(sensitivity_dir, version, param_id, mode, variation, {artifact_type: path})
+
+def record_variation_directory(sensitivity_dir, version, param_id, mode, variation, directory):
+    """
+    Record every known artifact found in a variation directory.
+
+    The directory is listed once; per-interval config module files are
+    recorded as the directory that holds them.
+
+    Args:
+        sensitivity_dir (str): Sensitivity folder of the version
+        version (int): Version number
+        param_id (str): Parameter ID
+        mode (str): Sensitivity mode of the variation directory
+        variation (float): Variation value
+        directory (str): Variation directory
+
+    Returns:
+        dict: Recorded paths keyed by artifact type
+    """
+    known_files = {
+        f"General_Configuration_Matrix({version}).csv": CONFIGURATION_MATRIX,
+        f"configurations({version}).py": CONFIGURATION_FILE,
+        f"{version}_config_modules.bundle": CONFIG_MODULES,
+        f"Economic_Summary({version}).csv": ECONOMIC_SUMMARY,
+        f"CFA({version}).csv": CASH_FLOW,
+        f"{param_id}_config.json": PARAM_CONFIG,
+    }
+
+    artifacts = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if entry.name in known_files:
+                    artifacts[known_files[entry.name]] = entry.path
+                elif entry.name.startswith(f"{version}_config_module_") and entry.name.endswith('.json'):
+                    artifacts.setdefault(CONFIG_MODULES, directory)
+    except OSError as e:
+        logger.warning(f"Could not list variation directory {directory}: {str(e)}")
+        return {}
+
+    record_artifacts(sensitivity_dir, version, param_id, mode, variation, artifacts)
+    return artifacts
+
+def list_artifacts(sensitivity_dir, version=None, param_id=None, mode=None, variation=None, artifact_type=None):
+    """
+    List recorded artifacts matching the given filters.
+
+    Args:
+        sensitivity_dir (str): Sensitivity folder of the version
+        version (int, optional): Version number
+        param_id (str, optional): Parameter ID
+        mode (str, optional): Sensitivity mode
+        variation (float, optional): Variation value
+        artifact_type (str, optional): Artifact type
+
+    Returns:
+        list: Artifact records (dicts), most recently recorded first
+    """
+    if not os.path.exists(get_manifest_path(sensitivity_dir)):
+        return []
+
+    filters = {
+        "version": None if version is None else str(version),
+        "param_id": param_id,
+        "mode": None if mode is None else mode.lower(),
+        "variation": None if variation is None else _variation_key(variation),
+        "artifact_type": artifact_type,
+    }
+    clauses = [f"{column} = ?" for column, value in filters.items() if value is not None]
+    params = [value for value in filters.values() if value is not None]
+
+    query = "SELECT version, param_id, mode, variation, artifact_type, path, recorded_at FROM artifacts"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY recorded_at DESC"
+
+    connection = _connect(sensitivity_dir)
+    try:
+        rows = connection.execute(query, params).fetchall()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not read sensitivity manifest in {sensitivity_dir}: {str(e)}")
+        return []
+    finally:
+        connection.close()
+
+    columns = ("version", "param_id", "mode", "variation", "artifact_type", "path", "recorded_at")
+    return [dict(zip(columns, row)) for row in rows]
+
+def find_artifact(sensitivity_dir, version, param_id, variation, artifact_type, mode=None):
+    """
+    Look up the path of one artifact of a parameter variation.
+
+    Args:
+        sensitivity_dir (str): Sensitivity folder of the version
+        version (int): Version number
+        param_id (str): Parameter ID
+        variation (float): Variation value
+        artifact_type (str): Artifact type
+        mode (str, optional): Sensitivity mode; any mode if None
+
+    Returns:
+        str: Path of the most recently recorded artifact that still exists, or None
+    """
+    for record in list_artifacts(sensitivity_dir, version, param_id, mode, variation, artifact_type):
+        if os.path.exists(record["path"]):
+            return record["path"]
+    return None
@@ -0,0 +1,295 @@
+"""
+Sensitivity Results Store Module
+
+This module keeps the results of sensitivity variations in one SQLite store
+per version instead of rewriting a {param}_vs_{compare}_{mode}_results.json
+file for every update.
+
+The store (Sensitivity/Reports/sensitivity_results.db) holds one row per
+variation keyed by (version, parameter, compare-to key, mode, variation),
+plus the top-level fields of each result set. Recording a variation is a
+single-row upsert in WAL mode, so concurrent writers neither rewrite whole
+files nor lose each other's updates. The JSON results files remain the
+format readers and the frontend use; they are views exported from the store
+on demand by export_results_view().
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+import logging
+import filelock
+
+# Set up logging
+logger = logging.getLogger('sensitivity_results_store')
+
+# Seconds a writer waits for another process holding the store
+BUSY_TIMEOUT = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS result_sets (
+    version TEXT NOT NULL,
+    param_id TEXT NOT NULL,
+    compare_to_key TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (version, param_id, compare_to_key, mode)
+);
+CREATE TABLE IF NOT EXISTS variation_results (
+    version TEXT NOT NULL,
+    param_id TEXT NOT NULL,
+    compare_to_key TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    variation TEXT NOT NULL,
+    data TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (version, param_id, compare_to_key, mode, variation)
+);
+"""
+
+_initialized = set()
+_init_lock = threading.Lock()
+
+def get_results_store_path(sensitivity_dir):
+    """
+    Get the path of the results store of a Sensitivity folder.
+
+    Args:
+        sensitivity_dir (str): Sensitivity folder of a version
+
+    Returns:
+        str: Path to Reports/sensitivity_results.db
+    """
+    return os.path.join(sensitivity_dir, "Reports", "sensitivity_results.db")
+
+def _connect(sensitivity_dir):
+    """Open the results store, creating it on first use."""
+    store_path = get_results_store_path(sensitivity_dir)
+    with _init_lock:
+        if store_path not in _initialized or not os.path.exists(store_path):
+            os.makedirs(os.path.dirname(store_path), exist_ok=True)
+            connection = sqlite3.connect(store_path, timeout=BUSY_TIMEOUT)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            connection.commit()
+            _initialized.add(store_path)
+            return connection
+    return sqlite3.connect(store_path, timeout=BUSY_TIMEOUT)
+
+def _set_key(version, param_id, compare_to_key, mode):
+    """Key of a result set as stored."""
+    return (str(version), param_id, compare_to_key, str(mode).lower())
+
+def record_results(sensitivity_dir, version, param_id, compare_to_key, mode, variations, metadata=None):
+    """
+    Record the results of one or more variations of a result set.
+
+    Each variation replaces an earlier result of the same variation; other
+    variations of the set are left as they are.
+
+    Args:
+        sensitivity_dir (str): Sensitivity folder of the version
+        version (int): Version number
+        param_id (str): Parameter ID (e.g., "S35")
+        compare_to_key (str): Comparison parameter (e.g., "S13")
+        mode (str): Sensitivity mode
+        variations (dict): Result data keyed by variation string (e.g. "+10.00")
+        metadata (dict, optional): Top-level fields of the result set other than variations
+    """
+    key = _set_key(version, param_id, compare_to_key, mode)
+    recorded_at = time.time()
+    if metadata is None:
+        metadata = {'param_id': param_id, 'compare_to_key': compare_to_key, 'mode': mode}
+
+    connection = _connect(sensitivity_dir)
+    try:
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO result_sets "
+                "(version, param_id, compare_to_key, mode, metadata, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                key + (json.dumps(metadata), recorded_at)
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO variation_results "
+                "(version, param_id, compare_to_key, mode, variation, data, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [key + (str(variation), json.dumps(data), recorded_at) for variation, data in variations.items()]
+            )
+    finally:
+        connection.close()
+
+def record_result_data(sensitivity_dir, version, result_data, param_id=None, compare_to_key=None, mode=None):
+    """
+    Record a result set in the layout of a results file.
+
+    Args:
+        sensitivity_dir (str): Sensitivity folder of the version
+        version (int): Version number
+        result_data (dict): Result set with a "variations" dict and top-level fields
+        param_id (str, optional): Parameter ID; taken from result_data if None
+        compare_to_key (str, optional): Comparison parameter; taken from result_data if None
+        mode (str, optional): Sensitivity mode; taken from result_data if None
+    """
+    metadata = {name: value for name, value in result_data.items() if name != 'variations'}
+    record_results(
+        sensitivity_dir,
+        version,
+        param_id or result_data.get('param_id'),
+        compare_to_key or result_data.get('compare_to_key', 'S13'),
+        mode or result_data.get('mode', 'multiple'),
+        result_data.get('variations') or {},
+        metadata
+    )
+
+def has_result_set(sensitivity_dir, version, param_id, compare_to_key, mode):
+    """Check whether the store holds a result set."""
+    if not os.path.exists(get_results_store_path(sensitivity_dir)):
+        return False
+    connection = _connect(sensitivity_dir)
+    try:
+        row = connection.execute(
+            "SELECT 1 FROM result_sets WHERE version = ? AND param_id = ? AND compare_to_key = ? AND mode = ?",
+            _set_key(version, param_id, compare_to_key, mode)
+        ).fetchone()
+    finally:
+        connection.close()
+    return row is not None
+
+def import_results_file(sensitivity_dir, version, param_id, compare_to_key, mode, results_file):
+    """
+    Import a results file written before the store existed.
+
+    Nothing is imported when the store already holds the result set or the
+    file does not exist.
+
+    Args:
+        sensitivity_dir (str): Sensitivity folder of the version
+        version (int): Version number
+        param_id (str): Parameter ID
+        compare_to_key (str): Comparison parameter
+        mode (str): Sensitivity mode
+        results_file (str): Path of the results file
+
+    Returns:
+        bool: True if the file was imported
+    """
+    if not os.path.exists(results_file) or has_result_set(sensitivity_dir, version, param_id, compare_to_key, mode):
+        return False
+    try:
+        with open(results_file, 'r') as f:
+            result_data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not import results file {results_file}: {str(e)}")
+        return False
+
+    record_result_data(sensitivity_dir, version, result_data, param_id, compare_to_key, mode)
+    logger.info(f"Imported {len(result_data.get('variations') or {})} variations from {results_file}")
+    return True
+
+def load_results(sensitivity_dir, version, param_id, compare_to_key, mode):
+    """
+    Load a result set in the layout of a results file.
+
+    Args:
+        sensitivity_dir (str): Sensitivity folder of the version
+        version (int): Version number
+        param_id (str): Parameter ID
+        compare_to_key (str): Comparison parameter
+        mode (str): Sensitivity mode
+
+    Returns:
+        dict: Top-level fields with a "variations" dict, or None if the set is not stored
+    """
+    if not os.path.exists(get_results_store_path(sensitivity_dir)):
+        return None
+
+    key = _set_key(version, param_id, compare_to_key, mode)
+    connection = _connect(sensitivity_dir)
+    try:
+        # One read transaction so the set and its variations are consistent
+        connection.execute("BEGIN")
+        row = connection.execute(
+            "SELECT metadata FROM result_sets WHERE version = ? AND param_id = ? AND compare_to_key = ? AND mode = ?",
+            key
+        ).fetchone()
+        rows = connection.execute(
+            "SELECT variation, data FROM variation_results "
+            "WHERE version = ? AND param_id = ? AND compare_to_key = ? AND mode = ? ORDER BY recorded_at, variation",
+            key
+        ).fetchall()
+        connection.rollback()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not read sensitivity results store in {sensitivity_dir}: {str(e)}")
+        return None
+    finally:
+        connection.close()
+
+    if row is None:
+        return None
+    result_data = json.loads(row[0])
+    result_data['variations'] = {variation: json.loads(data) for variation, data in rows}
+    return result_data
+
+def export_results_view(sensitivity_dir, version, param_id, compare_to_key, mode, results_file):
+    """
+    Export a result set to its JSON results file.
+
+    The file is replaced atomically; exports of the same file are serialized
+    so the last one written always reflects every committed variation.
+
+    Args:
+        sensitivity_dir (str): Sensitivity folder of the version
+        version (int): Version number
+        param_id (str): Parameter ID
+        compare_to_key (str): Comparison parameter
+        mode (str): Sensitivity mode
+        results_file (str): Path of the results file
+
+    Returns:
+        dict: Exported result data, or None if the set is not stored
+    """
+    os.makedirs(os.path.dirname(results_file), exist_ok=True)
+    with filelock.FileLock(f"{results_file}.lock", timeout=60):
+        result_data = load_results(sensitivity_dir, version, param_id, compare_to_key, mode)
+        if result_data is None:
+            return None
+        temp_file = f"{results_file}.tmp"
+        with open(temp_file, 'w') as f:
+            json.dump(result_data, f, indent=2)
+        os.replace(temp_file, results_file)
+    return result_data
+
+def list_result_sets(sensitivity_dir, version=None):
+    """
+    List the stored result sets.
+
+    Args:
+        sensitivity_dir (str): Sensitivity folder of the version
+        version (int, optional): Version number
+
+    Returns:
+        list: Result set keys and variation counts (dicts)
+    """
+    if not os.path.exists(get_results_store_path(sensitivity_dir)):
+        return []
+
+    query = (
+        "SELECT s.version, s.param_id, s.compare_to_key, s.mode, s.updated_at, COUNT(v.variation) "
+        "FROM result_sets s LEFT JOIN variation_results v USING (version, param_id, compare_to_key, mode)"
+    )
+    params = []
+    if version is not None:
+        query += " WHERE s.version = ?"
+        params.append(str(version))
+    query += " GROUP BY s.version, s.param_id, s.compare_to_key, s.mode ORDER BY s.param_id"
+
+    connection = _connect(sensitivity_dir)
+    try:
+        rows = connection.execute(query, params).fetchall()
+    finally:
+        connection.close()
+
+    columns = ("version", "param_id", "compare_to_key", "mode", "updated_at", "variations")
+    return [dict(zip(columns, row)) for row in rows]
@@ -0,0 +1,145 @@
+"""
+Stage Completion Module
+
+This module lets pipeline stages signal completion explicitly instead of
+consumers sleeping for a fixed time or polling for files.
+
+A producer calls mark_stage_complete() after its last output is written.
+This writes a small completion marker (.{stage}.complete) into the stage's
+output folder atomically and wakes every waiter in the same process. A
+consumer calls wait_for_stage(), which returns as soon as the marker exists
+(immediately when the stage has already finished) or when the expected
+output files are all present.
+"""
+
+import os
+import json
+import time
+import tempfile
+import threading
+import logging
+
+# Set up logging
+logger = logging.getLogger('stage_completion')
+
+# Waiters in this process are notified directly; markers written by other
+# processes are picked up on this re-check interval (seconds)
+RECHECK_INTERVAL = 0.2
+
+_stage_condition = threading.Condition()
+
+def get_marker_path(folder, stage):
+    """
+    Get the path of a stage's completion marker.
+
+    Args:
+        folder (str): Output folder of the stage
+        stage (str): Stage name (e.g. "config_modules")
+
+    Returns:
+        str: Path to .{stage}.complete inside folder
+    """
+    return os.path.join(folder, f".{stage}.complete")
+
+def mark_stage_complete(folder, stage, details=None):
+    """
+    Record that a stage has finished writing its outputs.
+
+    Args:
+        folder (str): Output folder of the stage
+        stage (str): Stage name
+        details (dict, optional): Extra information stored in the marker
+
+    Returns:
+        str: Path to the marker file
+    """
+    os.makedirs(folder, exist_ok=True)
+    marker_path = get_marker_path(folder, stage)
+    marker = {
+        "stage": stage,
+        "completed_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "details": details or {}
+    }
+
+    fd, temp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(marker, f)
+        os.replace(temp_path, marker_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    with _stage_condition:
+        _stage_condition.notify_all()
+
+    logger.info(f"Stage {stage} complete in {folder}")
+    return marker_path
+
+def clear_stage(folder, stage):
+    """
+    Remove a stage's completion marker before the stage runs again.
+
+    Args:
+        folder (str): Output folder of the stage
+        stage (str): Stage name
+    """
+    marker_path = get_marker_path(folder, stage)
+    if os.path.exists(marker_path):
+        os.remove(marker_path)
+
+def read_stage_marker(folder, stage):
+    """
+    Read a stage's completion marker.
+
+    Args:
+        folder (str): Output folder of the stage
+        stage (str): Stage name
+
+    Returns:
+        dict: The marker contents, or None if the stage has not completed
+    """
+    marker_path = get_marker_path(folder, stage)
+    try:
+        with open(marker_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def wait_for_stage(folder, stage, timeout=None, outputs=None):
+    """
+    Wait until a stage has completed.
+
+    Returns immediately when the marker already exists. Outputs written
+    by producers that do not mark completion can be passed in outputs;
+    the stage then also counts as complete once all of them exist.
+
+    Args:
+        folder (str): Output folder of the stage
+        stage (str): Stage name
+        timeout (float, optional): Maximum seconds to wait; wait indefinitely if None
+        outputs (list, optional): Paths whose joint existence also means completion
+
+    Returns:
+        bool: True if the stage completed, False on timeout
+    """
+    def is_complete():
+        if os.path.exists(get_marker_path(folder, stage)):
+            return True
+        return bool(outputs) and all(os.path.exists(path) for path in outputs)
+
+    if is_complete():
+        return True
+
+    logger.info(f"Waiting for stage {stage} in {folder}")
+    deadline = None if timeout is None else time.time() + timeout
+    with _stage_condition:
+        while not is_complete():
+            remaining = None if deadline is None else deadline - time.time()
+            if remaining is not None and remaining <= 0:
+                logger.warning(f"Timed out after {timeout}s waiting for stage {stage} in {folder}")
+                return False
+            _stage_condition.wait(RECHECK_INTERVAL if remaining is None else min(RECHECK_INTERVAL, remaining))
+
+    return True
@@ -0,0 +1,183 @@
+"""
+Stage Pipeline Module
+
+This module runs the stages of a sweep as a pipeline instead of one after
+another. Each stage has its own worker threads and input queue; an item
+is handed to the next stage as soon as it leaves the previous one, so
+results of early items are extracted and plotted while later items are
+still being calculated. The end-to-end time approaches that of the
+slowest stage instead of the sum of all stages.
+
+Stages are closed in the order they were added: a stage only stops once
+every stage before it has stopped and its own queue is drained, so no
+item handed downstream is lost. A failing item is logged and counted
+without stopping its stage.
+"""
+
+import time
+import queue
+import threading
+import logging
+
+# Set up logging
+logger = logging.getLogger('stage_pipeline')
+
+# Marks the end of a stage's input
+_CLOSE = object()
+
+class Stage:
+    """
+    One stage of a pipeline.
+    """
+    def __init__(self, name, handler, workers=1):
+        """
+        Create a stage.
+
+        Args:
+            name (str): Stage name
+            handler (callable): Called with each item put into the stage
+            workers (int): Number of worker threads
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, int(workers))
+        self.queue = queue.Queue()
+        self.threads = []
+        self.items = 0
+        self.errors = []
+        self.busy = 0.0
+        self.first_done_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def run(self, started_at):
+        """Process items until the stage is closed."""
+        while True:
+            item = self.queue.get()
+            if item is _CLOSE:
+                return
+            began = time.time()
+            try:
+                self.handler(item)
+            except Exception as e:
+                logger.error(f"Stage {self.name} failed on an item: {str(e)}")
+                with self._lock:
+                    self.errors.append(str(e))
+            finally:
+                done = time.time()
+                with self._lock:
+                    self.items += 1
+                    self.busy += done - began
+                    if self.first_done_at is None:
+                        self.first_done_at = done - started_at
+
+class StagePipeline:
+    """
+    Stages connected by queues.
+    """
+    def __init__(self, name, initializer=None, initargs=()):
+        """
+        Create an empty pipeline.
+
+        Args:
+            name (str): Pipeline name, used in thread names and logs
+            initializer (callable, optional): Called in every worker thread before it starts
+                                              (e.g. bind_job, so workers belong to the current job)
+            initargs (tuple): Arguments of the initializer
+        """
+        self.name = name
+        self.initializer = initializer
+        self.initargs = initargs
+        self.stages = {}
+        self.started_at = time.time()
+        self.closed = False
+
+    def add_stage(self, name, handler, workers=1):
+        """
+        Add a stage and start its workers.
+
+        Args:
+            name (str): Stage name
+            handler (callable): Called with each item put into the stage; may put
+                                items into later stages
+            workers (int): Number of worker threads
+
+        Returns:
+            Stage: The new stage
+        """
+        stage = Stage(name, handler, workers)
+        self.stages[name] = stage
+        for index in range(stage.workers):
+            thread = threading.Thread(
+                target=self._work,
+                args=(stage,),
+                name=f"{self.name}-{name}-{index}",
+                daemon=True
+            )
+            stage.threads.append(thread)
+            thread.start()
+        return stage
+
+    def _work(self, stage):
+        """Run a worker of a stage."""
+        if self.initializer:
+            self.initializer(*self.initargs)
+        stage.run(self.started_at)
+
+    def put(self, stage, item):
+        """
+        Hand an item to a stage.
+
+        Args:
+            stage (str): Stage name
+            item: Item passed to the stage's handler
+        """
+        self.stages[stage].queue.put(item)
+
+    def close(self):
+        """
+        Wait for every stage to process its items, in the order the stages were added.
+
+        Returns:
+            dict: Summary of the pipeline (see summary())
+        """
+        if not self.closed:
+            self.closed = True
+            for stage in self.stages.values():
+                for _ in stage.threads:
+                    stage.queue.put(_CLOSE)
+                for thread in stage.threads:
+                    thread.join()
+                stage.finished_at = time.time() - self.started_at
+                logger.info(f"Pipeline {self.name}: stage {stage.name} processed {stage.items} items "
+                            f"({len(stage.errors)} errors) in {stage.busy:.2f}s of work")
+        return self.summary()
+
+    def summary(self):
+        """
+        Summarize the pipeline.
+
+        Returns:
+            dict: Items, errors, busy seconds, and seconds from the start of the
+                  pipeline to the first item done and to the end of each stage
+        """
+        return {
+            "stages": {
+                stage.name: {
+                    "items": stage.items,
+                    "errors": stage.errors,
+                    "busySeconds": round(stage.busy, 3),
+                    "firstDoneAt": round(stage.first_done_at, 3) if stage.first_done_at is not None else None,
+                    "finishedAt": round(stage.finished_at, 3) if stage.finished_at is not None else None
+                }
+                for stage in self.stages.values()
+            },
+            "elapsedSeconds": round(time.time() - self.started_at, 3)
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
@@ -0,0 +1,183 @@
+"""
+Sweep Checkpoint Module
+
+This module records the completed units of long sweeps (a parameter
+variation, a grid row, a Monte Carlo chunk, a step of a pipeline run) in a
+durable checkpoint, so a sweep interrupted by a restart, deploy or crash
+continues where it stopped instead of starting over.
+
+Each run workspace holds one SQLite checkpoint (checkpoints.db) with one row
+per completed unit keyed by (sweep, unit). A row keeps the unit's outcome
+and the SHA-256 digest of every artifact the unit wrote. When a sweep is
+resumed, completed() only returns the units whose artifacts still exist
+unchanged; units with missing or modified artifacts are dropped and run
+again.
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+
+# Set up logging
+logger = logging.getLogger('sweep_checkpoint')
+
+# Seconds a writer waits for another process holding the checkpoint
+BUSY_TIMEOUT = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    sweep TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    artifacts TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    PRIMARY KEY (sweep, unit)
+)
+"""
+
+def sweep_id(name, spec):
+    """
+    Build the ID of a sweep from its kind and the inputs that define it.
+
+    Requests with the same inputs resume the same sweep; any change in the
+    inputs starts a new one.
+
+    Args:
+        name (str): Sweep kind (e.g. "calculate_sensitivity")
+        spec (dict): JSON-serializable inputs of the sweep
+
+    Returns:
+        str: "{name}:{digest}"
+    """
+    digest = hashlib.sha1(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()[:12]
+    return f"{name}:{digest}"
+
+def file_digest(path):
+    """
+    Compute the SHA-256 digest of a file.
+
+    Args:
+        path (str): File path
+
+    Returns:
+        str: Hex digest, or None if the file cannot be read
+    """
+    sha = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+    except OSError:
+        return None
+    return sha.hexdigest()
+
+class SweepCheckpoint:
+    """
+    Completed units of the sweeps of one run.
+    """
+    def __init__(self, path):
+        """
+        Open (or create) a checkpoint.
+
+        Args:
+            path (str): Path of the SQLite checkpoint
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(_SCHEMA)
+            connection.commit()
+        finally:
+            connection.close()
+
+    def _connect(self):
+        """Open a connection to the checkpoint."""
+        return sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+
+    def record(self, sweep, unit, outcome=None, artifacts=None):
+        """
+        Record a completed unit.
+
+        Args:
+            sweep (str): Sweep ID
+            unit (str): Unit key within the sweep
+            outcome (dict, optional): JSON-serializable outcome returned again on resume
+            artifacts (list, optional): Paths of the files the unit wrote
+        """
+        digests = {path: file_digest(path) for path in artifacts or []}
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO units (sweep, unit, outcome, artifacts, completed_at) VALUES (?, ?, ?, ?, ?)",
+                    (sweep, str(unit), json.dumps(outcome), json.dumps(digests), time.time())
+                )
+        finally:
+            connection.close()
+
+    def completed(self, sweep):
+        """
+        Get the completed units of a sweep whose artifacts are intact.
+
+        Args:
+            sweep (str): Sweep ID
+
+        Returns:
+            dict: Outcome keyed by unit
+        """
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT unit, outcome, artifacts FROM units WHERE sweep = ? ORDER BY completed_at", (sweep,)
+            ).fetchall()
+
+            units, stale = {}, []
+            for unit, outcome, artifacts in rows:
+                digests = json.loads(artifacts)
+                if all(file_digest(path) == digest for path, digest in digests.items()):
+                    units[unit] = json.loads(outcome)
+                else:
+                    stale.append(unit)
+
+            if stale:
+                with connection:
+                    connection.executemany("DELETE FROM units WHERE sweep = ? AND unit = ?", [(sweep, unit) for unit in stale])
+                logger.warning(f"Dropped {len(stale)} units of sweep {sweep} whose artifacts changed or are missing")
+        finally:
+            connection.close()
+        return units
+
+    def clear(self, sweep):
+        """
+        Forget every unit of a sweep, so it runs from the start.
+
+        Args:
+            sweep (str): Sweep ID
+        """
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("DELETE FROM units WHERE sweep = ?", (sweep,))
+        finally:
+            connection.close()
+
+    def summary(self):
+        """
+        Summarize the checkpoint.
+
+        Returns:
+            dict: Completed unit count and last completion time per sweep
+        """
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT sweep, COUNT(*), MAX(completed_at) FROM units GROUP BY sweep ORDER BY sweep"
+            ).fetchall()
+        finally:
+            connection.close()
+        return {sweep: {"units": count, "lastCompletedAt": last} for sweep, count, last in rows}